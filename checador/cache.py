@@ -0,0 +1,238 @@
+"""
+Capa de cache del proyecto.
+
+Las claves se agrupan por espacio (p.ej. 'organigrama', 'dashboard') y
+llevan la versión vigente del espacio:
+
+    <espacio>:v<version>:<partes>
+
+Invalidar un espacio solo incrementa su versión; las claves viejas dejan
+de leerse y expiran solas. Así no hace falta conocer ni borrar cada clave
+y funciona igual con cache en disco, en base de datos o Redis (ver CACHES
+en settings).
+
+    @cacheado('organigrama', ttl=600)
+    def obtener_arbol_organigrama(): ...
+
+    class TipoHorarioViewSet(viewsets.ModelViewSet):
+        @respuesta_cacheada('horarios', ttl=600)
+        def list(self, request, *args, **kwargs): ...
+
+    # en models.py
+    invalidar_con_senales('organigrama', Departamento)
+
+Los aciertos y fallos se cuentan por espacio en cada proceso y se suman al
+cache compartido cada INTERVALO_ESTADISTICAS segundos; estadisticas_cache()
+los reporta (expuestos en /api/cache/estadisticas/ para staff).
+"""
+import functools
+import hashlib
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+logger = logging.getLogger(__name__)
+
+INTERVALO_ESTADISTICAS = 30  # segundos
+LONGITUD_MAXIMA_CLAVE = 200
+
+_FALTANTE = object()
+_CLAVE_ESPACIOS = 'cache:espacios'
+
+_contadores = Counter()
+_lock = threading.Lock()
+_ultimo_envio = time.monotonic()
+
+
+# ---------------------------------------------------------------------------
+# Claves y versiones
+# ---------------------------------------------------------------------------
+
+def _clave_version(espacio):
+    return f"{espacio}:version"
+
+
+def _version_inicial():
+    # Si el backend descarta la clave de versión (p.ej. al llenarse el cache
+    # en disco) se reinicia con un valor nuevo, nunca con uno ya usado
+    return int(time.time() * 1000)
+
+
+def version_espacio(espacio):
+    version = cache.get(_clave_version(espacio))
+    if version is None:
+        cache.add(_clave_version(espacio), _version_inicial(), None)
+        version = cache.get(_clave_version(espacio), _version_inicial())
+    return version
+
+
+def clave(espacio, *partes):
+    """Clave versionada del espacio; las partes largas se resumen con sha1."""
+    texto = ':'.join(str(parte) for parte in partes)
+    if len(texto) > LONGITUD_MAXIMA_CLAVE or any(c.isspace() for c in texto):
+        texto = hashlib.sha1(texto.encode()).hexdigest()
+    return f"{espacio}:v{version_espacio(espacio)}:{texto}"
+
+
+def invalidar_espacio(espacio):
+    """Invalida todas las claves del espacio."""
+    try:
+        cache.incr(_clave_version(espacio))
+    except ValueError:
+        cache.set(_clave_version(espacio), _version_inicial(), None)
+
+
+def invalidar_con_senales(espacio, *modelos):
+    """
+    Invalida el espacio cuando se guarda o elimina una instancia de los
+    modelos dados (al confirmar la transacción).
+    """
+    def _invalidar(sender, **kwargs):
+        transaction.on_commit(lambda: invalidar_espacio(espacio))
+
+    for modelo in modelos:
+        uid = f"cache:{espacio}:{modelo._meta.label}"
+        post_save.connect(_invalidar, sender=modelo, weak=False, dispatch_uid=uid)
+        post_delete.connect(_invalidar, sender=modelo, weak=False, dispatch_uid=uid)
+
+
+# ---------------------------------------------------------------------------
+# Lectura
+# ---------------------------------------------------------------------------
+
+def obtener_o_calcular(espacio, partes, calcular, ttl=300):
+    """Valor cacheado de `partes` en el espacio, o calcular() si no está."""
+    llave = clave(espacio, *partes)
+    valor = cache.get(llave, _FALTANTE)
+    if valor is not _FALTANTE:
+        _registrar(espacio, 'aciertos')
+        return valor
+    _registrar(espacio, 'fallos')
+    valor = calcular()
+    cache.set(llave, valor, ttl)
+    return valor
+
+
+def cacheado(espacio, ttl=300):
+    """
+    Cachea el valor de retorno de la función. La clave incluye el nombre
+    de la función y sus argumentos (deben tener un str() estable).
+    """
+    def decorador(func):
+        nombre = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def envoltura(*args, **kwargs):
+            partes = (nombre, *args, *(f"{k}={v}" for k, v in sorted(kwargs.items())))
+            return obtener_o_calcular(espacio, partes, lambda: func(*args, **kwargs), ttl)
+
+        envoltura.invalidar = lambda: invalidar_espacio(espacio)
+        return envoltura
+    return decorador
+
+
+def respuesta_cacheada(espacio, ttl=300, por_usuario=False):
+    """
+    Para métodos GET de vistas DRF: cachea response.data por ruta completa
+    (incluye query string y paginación). Con por_usuario=True cada usuario
+    tiene su propia entrada.
+    """
+    from rest_framework.response import Response
+
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def envoltura(self, request, *args, **kwargs):
+            if request.method != 'GET':
+                return metodo(self, request, *args, **kwargs)
+
+            partes = [type(self).__name__, metodo.__name__, request.get_full_path()]
+            if por_usuario:
+                partes.append(f"u{request.user.pk}")
+            llave = clave(espacio, *partes)
+
+            datos = cache.get(llave, _FALTANTE)
+            if datos is not _FALTANTE:
+                _registrar(espacio, 'aciertos')
+                return Response(datos)
+
+            _registrar(espacio, 'fallos')
+            respuesta = metodo(self, request, *args, **kwargs)
+            if respuesta.status_code == 200:
+                cache.set(llave, respuesta.data, ttl)
+            return respuesta
+        return envoltura
+    return decorador
+
+
+# ---------------------------------------------------------------------------
+# Estadísticas
+# ---------------------------------------------------------------------------
+
+def _registrar(espacio, tipo):
+    global _ultimo_envio
+    with _lock:
+        _contadores[(espacio, tipo)] += 1
+        if time.monotonic() - _ultimo_envio < INTERVALO_ESTADISTICAS:
+            return
+        pendientes = dict(_contadores)
+        _contadores.clear()
+        _ultimo_envio = time.monotonic()
+    _enviar_contadores(pendientes)
+
+
+def _enviar_contadores(pendientes):
+    """Suma los contadores locales a los del cache compartido."""
+    try:
+        espacios = set(cache.get(_CLAVE_ESPACIOS) or ())
+        nuevos = {espacio for espacio, _ in pendientes} - espacios
+        if nuevos:
+            cache.set(_CLAVE_ESPACIOS, sorted(espacios | nuevos), None)
+        for (espacio, tipo), cantidad in pendientes.items():
+            llave = f"cache:estadisticas:{espacio}:{tipo}"
+            if not cache.add(llave, cantidad, None):
+                cache.incr(llave, cantidad)
+    except Exception as e:
+        # Las estadísticas nunca deben romper una petición
+        logger.warning(f"No se pudieron guardar las estadisticas de cache: {e}")
+
+
+def estadisticas_cache():
+    """
+    Aciertos y fallos acumulados por espacio (todos los procesos):
+    {espacio: {'aciertos', 'fallos', 'tasa_aciertos'}}
+    """
+    global _ultimo_envio
+    with _lock:
+        pendientes = dict(_contadores)
+        _contadores.clear()
+        _ultimo_envio = time.monotonic()
+    if pendientes:
+        _enviar_contadores(pendientes)
+
+    resultado = {}
+    for espacio in cache.get(_CLAVE_ESPACIOS) or ():
+        aciertos = cache.get(f"cache:estadisticas:{espacio}:aciertos", 0)
+        fallos = cache.get(f"cache:estadisticas:{espacio}:fallos", 0)
+        total = aciertos + fallos
+        resultado[espacio] = {
+            'aciertos': aciertos,
+            'fallos': fallos,
+            'tasa_aciertos': round(aciertos / total, 3) if total else None,
+        }
+    return resultado
+
+
+def reiniciar_estadisticas():
+    with _lock:
+        _contadores.clear()
+    espacios = cache.get(_CLAVE_ESPACIOS) or ()
+    cache.delete_many([
+        f"cache:estadisticas:{espacio}:{tipo}"
+        for espacio in espacios
+        for tipo in ('aciertos', 'fallos')
+    ] + [_CLAVE_ESPACIOS])
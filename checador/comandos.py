@@ -0,0 +1,30 @@
+"""
+Opciones comunes de los comandos que crean o borran datos de prueba
+(generar_datos_sinteticos, prueba_carga, verificar_planes --sembrar).
+
+Sembrar y --limpiar escriben en la base configurada, así que los dos
+exigen DEBUG=True; --permitir-sin-debug es para un entorno de pruebas sin
+DEBUG (staging), nunca para producción.
+"""
+from django.conf import settings
+from django.core.management.base import CommandError
+from django.db import connection
+
+
+def agregar_opciones_datos_prueba(parser, ayuda_limpiar):
+    parser.add_argument('--limpiar', action='store_true', help=ayuda_limpiar)
+    parser.add_argument('--permitir-sin-debug', action='store_true',
+                        help='Sembrar o limpiar aunque DEBUG=False (nunca contra producción)')
+
+
+def exigir_entorno_de_pruebas(options, accion):
+    """
+    CommandError si DEBUG=False y no se pasó --permitir-sin-debug.
+    `accion` describe lo que se iba a hacer, p.ej. 'Borrar los datos sintéticos'.
+    """
+    if settings.DEBUG or options.get('permitir_sin_debug'):
+        return
+    raise CommandError(
+        f"{accion} escribe en la base configurada ({connection.settings_dict['NAME']}); "
+        "úselo con DEBUG=True o pase --permitir-sin-debug"
+    )
@@ -0,0 +1,132 @@
+"""
+Pool de conexiones a la base de datos: métricas y benchmark.
+
+La configuración vive en settings (TIPO_PROCESO, DB_POOL, DB_POOL_TAMANOS,
+DB_CONN_MAX_AGE). El pool es por proceso: cada worker de gunicorn, el
+scheduler y cada comando tienen el suyo, dimensionado según su tipo, y lo
+comparten todos los hilos del proceso. estadisticas_conexiones() reporta el
+del proceso que atiende la llamada.
+
+Con pool, cerrar una conexión (fin de petición, close_old_connections de los
+jobs) la devuelve al pool en lugar de cerrar el socket.
+"""
+import copy
+import logging
+import statistics
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.db.utils import load_backend
+
+logger = logging.getLogger(__name__)
+
+MODOS_BENCHMARK = ('nueva', 'persistente', 'pool')
+
+
+def _pool_activo(conexion):
+    opciones = conexion.settings_dict.get('OPTIONS') or {}
+    return conexion.vendor == 'postgresql' and bool(opciones.get('pool'))
+
+
+def _resumen_pool(stats):
+    """Traduce ConnectionPool.get_stats() de psycopg_pool a utilización y espera."""
+    maximo = stats.get('pool_max', 0)
+    abiertas = stats.get('pool_size', 0)
+    en_uso = abiertas - stats.get('pool_available', 0)
+    peticiones = stats.get('requests_num', 0)
+    creadas = stats.get('connections_num', 0)
+    return {
+        'min': stats.get('pool_min', 0),
+        'max': maximo,
+        'abiertas': abiertas,
+        'en_uso': en_uso,
+        'utilizacion': round(en_uso / maximo, 3) if maximo else None,
+        'esperando': stats.get('requests_waiting', 0),
+        'peticiones': peticiones,
+        'peticiones_en_espera': stats.get('requests_queued', 0),
+        'timeouts': stats.get('requests_errors', 0),
+        'espera_promedio_ms': round(stats.get('requests_wait_ms', 0) / peticiones, 2) if peticiones else None,
+        'conexiones_creadas': creadas,
+        'apertura_promedio_ms': round(stats.get('connections_ms', 0) / creadas, 2) if creadas else None,
+    }
+
+
+def estadisticas_conexiones():
+    """
+    {alias: {...}} del proceso actual. Con pool: tamaño, utilización,
+    peticiones en espera, timeouts y espera promedio; sin pool, el
+    CONN_MAX_AGE de las conexiones persistentes.
+    """
+    resultado = {}
+    for alias in connections:
+        conexion = connections[alias]
+        datos = {'tipo_proceso': settings.TIPO_PROCESO, 'vendor': conexion.vendor}
+        if _pool_activo(conexion):
+            datos['pool'] = _resumen_pool(conexion.pool.get_stats())
+        else:
+            datos['pool'] = None
+            datos['conn_max_age'] = conexion.settings_dict.get('CONN_MAX_AGE')
+        resultado[alias] = datos
+    return resultado
+
+
+def registrar_estadisticas():
+    """Deja las métricas del pool en el log (procesos sin endpoint HTTP, como el scheduler)."""
+    for alias, datos in estadisticas_conexiones().items():
+        if datos['pool']:
+            logger.info(f"Pool {alias} ({datos['tipo_proceso']}): {datos['pool']}")
+
+
+def medir_conexiones(modo, repeticiones=50, alias='default'):
+    """
+    Simula `repeticiones` peticiones seguidas (conectar, SELECT 1, liberar)
+    con una conexión independiente de la del proceso y regresa los tiempos
+    en ms. Modos:
+      nueva:       sin pool ni persistencia, cada petición abre su conexión
+      persistente: CONN_MAX_AGE, la conexión del hilo se reutiliza
+      pool:        pool nativo de psycopg 3 (solo PostgreSQL)
+    """
+    if modo not in MODOS_BENCHMARK:
+        raise ValueError(f"Modo desconocido: {modo}")
+    ajustes = copy.deepcopy(connections.settings[alias])
+    opciones = ajustes.setdefault('OPTIONS', {})
+    opciones.pop('pool', None)
+    if modo == 'pool':
+        if ajustes['ENGINE'] != 'django.db.backends.postgresql':
+            raise ValueError('El pool de conexiones requiere PostgreSQL')
+        opciones['pool'] = {'min_size': 1, 'max_size': 2, 'timeout': 10}
+    ajustes['CONN_MAX_AGE'] = 600 if modo == 'persistente' else 0
+
+    backend = load_backend(ajustes['ENGINE'])
+    conexion = backend.DatabaseWrapper(ajustes, alias=f'{alias}-benchmark-{modo}')
+    tiempos = []
+    try:
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            conexion.ensure_connection()
+            with conexion.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            if modo == 'persistente':
+                conexion.close_if_unusable_or_obsolete()
+            else:
+                conexion.close()
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+    finally:
+        conexion.close()
+        if modo == 'pool':
+            conexion.close_pool()
+    return tiempos
+
+
+def resumir_tiempos(tiempos):
+    """Primera petición (incluye abrir el pool o la conexión) y el resto."""
+    resto = sorted(tiempos[1:]) or tiempos
+    return {
+        'primera_ms': round(tiempos[0], 2),
+        'promedio_ms': round(statistics.mean(resto), 3),
+        'p50_ms': round(resto[len(resto) // 2], 3),
+        'p95_ms': round(resto[min(len(resto) - 1, int(len(resto) * 0.95))], 3),
+        'total_ms': round(sum(tiempos), 1),
+    }
@@ -0,0 +1,147 @@
+"""
+Instrumentación de consultas SQL por petición.
+
+MedidorConsultas registra, mientras está activo, cada consulta de todas
+las conexiones: número, tiempo total en BD, huellas repetidas (la misma
+consulta con distintos parámetros, típico de un N+1) y la consulta más
+lenta.
+
+    with MedidorConsultas() as medidor:
+        ...
+    medidor.resumen()
+
+ConsultasMiddleware mide una muestra de las peticiones (CONSULTAS_MUESTREO)
+y escribe un registro JSON por petición en el logger 'checador.consultas';
+`python manage.py perf_report` agrega esos registros por vista. Las vistas
+que pasan su presupuesto (CONSULTAS_PRESUPUESTOS o
+CONSULTAS_PRESUPUESTO_DEFAULT) se registran como warning.
+
+Para pruebas ver checador/pruebas.py.
+"""
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('checador.consultas')
+
+_RE_IN = re.compile(r'\bIN \((?:%s|\?)(?:, (?:%s|\?))*\)', re.IGNORECASE)
+_RE_CADENA = re.compile(r"'(?:[^']|'')*'")
+_RE_NUMERO = re.compile(r'\b\d+\b')
+_RE_ESPACIOS = re.compile(r'\s+')
+
+MAX_SQL_REGISTRO = 500  # caracteres de SQL por registro de log
+
+
+def huella_sql(sql):
+    """SQL normalizado: sin literales y con las listas IN (...) colapsadas."""
+    sql = _RE_ESPACIOS.sub(' ', sql).strip()
+    sql = _RE_CADENA.sub('?', sql)
+    sql = _RE_NUMERO.sub('?', sql)
+    return _RE_IN.sub('IN (...)', sql)
+
+
+class MedidorConsultas:
+    """Context manager que mide las consultas ejecutadas en su bloque."""
+
+    def __init__(self, alias=None):
+        self.alias = alias
+        self.consultas = []  # (sql, milisegundos)
+        self._pila = None
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.consultas.append((sql, (time.perf_counter() - inicio) * 1000))
+
+    def __enter__(self):
+        self._pila = ExitStack()
+        aliases = [self.alias] if self.alias else list(connections)
+        for alias in aliases:
+            self._pila.enter_context(connections[alias].execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc):
+        self._pila.close()
+        return False
+
+    @property
+    def total(self):
+        return len(self.consultas)
+
+    @property
+    def tiempo_ms(self):
+        return sum(ms for _, ms in self.consultas)
+
+    def repetidas(self, minimo=2):
+        """[(huella, veces)] de las consultas que se repiten, más frecuentes primero."""
+        conteo = Counter(huella_sql(sql) for sql, _ in self.consultas)
+        return [(huella, veces) for huella, veces in conteo.most_common() if veces >= minimo]
+
+    def mas_lenta(self):
+        if not self.consultas:
+            return None
+        return max(self.consultas, key=lambda consulta: consulta[1])
+
+    def resumen(self, max_repetidas=5):
+        lenta = self.mas_lenta()
+        return {
+            'consultas': self.total,
+            'tiempo_bd_ms': round(self.tiempo_ms, 2),
+            'repetidas': [
+                {'huella': huella[:MAX_SQL_REGISTRO], 'veces': veces}
+                for huella, veces in self.repetidas()[:max_repetidas]
+            ],
+            'mas_lenta': {
+                'sql': huella_sql(lenta[0])[:MAX_SQL_REGISTRO],
+                'ms': round(lenta[1], 2),
+            } if lenta else None,
+        }
+
+
+def _presupuesto(vista):
+    presupuestos = getattr(settings, 'CONSULTAS_PRESUPUESTOS', {})
+    return presupuestos.get(vista, getattr(settings, 'CONSULTAS_PRESUPUESTO_DEFAULT', None))
+
+
+class ConsultasMiddleware:
+    """Mide las consultas de una muestra de peticiones y las registra por vista."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.muestreo = getattr(settings, 'CONSULTAS_MUESTREO', 0)
+
+    def __call__(self, request):
+        if not self.muestreo or random.random() >= self.muestreo:
+            return self.get_response(request)
+
+        inicio = time.perf_counter()
+        with MedidorConsultas() as medidor:
+            response = self.get_response(request)
+        duracion_ms = (time.perf_counter() - inicio) * 1000
+
+        resolver = getattr(request, 'resolver_match', None)
+        vista = resolver.view_name if resolver else 'sin_vista'
+        registro = {
+            'evento': 'consultas',
+            'vista': vista,
+            'metodo': request.method,
+            'status': response.status_code,
+            'duracion_ms': round(duracion_ms, 2),
+            **medidor.resumen(),
+        }
+        limite = _presupuesto(vista)
+        if limite is not None and medidor.total > limite:
+            registro['presupuesto'] = limite
+            logger.warning(json.dumps(registro, ensure_ascii=False))
+        else:
+            logger.info(json.dumps(registro, ensure_ascii=False))
+        return response
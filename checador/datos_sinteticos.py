@@ -0,0 +1,672 @@
+"""
+Generador de datos sintéticos a escala para pruebas de rendimiento.
+
+Crea con bulk_create por lotes una organización completa: árbol de
+departamentos, empleados con supervisores y horarios, años de asistencia,
+permisos con historial, visitas, equipos con mantenimientos y tickets con
+historial de estados. La asistencia, que es la tabla grande, se inserta
+con executemany directo (_insertar_directo). Con la misma semilla y fecha
+final genera los mismos datos.
+
+    python manage.py generar_datos_sinteticos --empleados 1000 --dias 730
+    python manage.py generar_datos_sinteticos --limpiar
+
+bulk_create no llama a save() ni envía señales, así que al final se
+reconstruye lo que esos métodos mantienen: jerarquía de departamentos,
+índice de aprobadores, días de permiso, índice de búsqueda de tickets y
+versiones de cache.
+
+Todo lo generado lleva el prefijo SIN (usuarios 'sint_*', códigos 'SIN-*',
+folios 'SIN-*'), que es lo que borra limpiar().
+"""
+import logging
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as dt_time, timedelta
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, User
+from django.db import connection, models, transaction
+
+from checador.cache import invalidar_espacio
+from empleados.models import Empleado
+from horarios.models import TipoHorario
+from it_tickets.models import (
+    ActividadMantenimiento,
+    CategoriaTicket,
+    EquipoComputo,
+    EstadoEquipo,
+    EstadoTicket,
+    HistorialTicket,
+    MantenimientoEquipo,
+    PrioridadTicket,
+    Ticket,
+    TipoEquipo,
+    TipoMantenimiento,
+)
+from it_tickets.permissions import GRUPO_IT
+from it_tickets.services.busqueda import reindexar_todos
+from organizacion.models import Departamento, RelacionSupervision
+from organizacion.services import reconstruir_aprobadores
+from permisos.models import DiaPermiso, HistorialPermiso, SolicitudPermiso, TipoPermiso
+from registros.models import RegistroAsistencia
+from visitas.models import Visita
+
+logger = logging.getLogger(__name__)
+
+MEXICO_TZ = ZoneInfo('America/Mexico_City')
+
+PREFIJO = 'SIN'
+PREFIJO_USUARIO = 'sint_'
+
+NOMBRES = [
+    'Ana', 'Luis', 'María', 'José', 'Carmen', 'Jorge', 'Laura', 'Carlos', 'Sofía', 'Miguel',
+    'Lucía', 'Pedro', 'Elena', 'Raúl', 'Paola', 'Fernando', 'Diana', 'Ricardo', 'Gabriela', 'Andrés',
+]
+APELLIDOS = [
+    'García', 'Hernández', 'Martínez', 'López', 'González', 'Pérez', 'Rodríguez', 'Sánchez',
+    'Ramírez', 'Cruz', 'Flores', 'Gómez', 'Morales', 'Vázquez', 'Reyes', 'Jiménez', 'Torres', 'Ruiz',
+]
+AREAS = {
+    'Operaciones': ['Tráfico', 'Pedimentos', 'Clasificación', 'Almacén'],
+    'Administración': ['Contabilidad', 'Tesorería', 'Facturación'],
+    'Comercial': ['Ventas', 'Atención a Clientes'],
+    'Recursos Humanos': ['Nóminas', 'Reclutamiento'],
+    'Sistemas': ['Soporte', 'Desarrollo'],
+    'Jurídico': [],
+}
+HORARIOS = [
+    # codigo, nombre, entrada, salida, inicio comida, fin comida
+    ('SIN-MAT', 'Sintético matutino', dt_time(8), dt_time(17), dt_time(14), dt_time(15)),
+    ('SIN-MIX', 'Sintético mixto', dt_time(9), dt_time(18), dt_time(14, 30), dt_time(15, 30)),
+    ('SIN-VES', 'Sintético vespertino', dt_time(13), dt_time(21), None, None),
+]
+TIPOS_PERMISO = [
+    # codigo, nombre, dias maximos
+    ('SIN-VAC', 'Vacaciones (sintético)', 10),
+    ('SIN-PER', 'Permiso personal (sintético)', 2),
+    ('SIN-INC', 'Incapacidad (sintético)', 5),
+]
+MARCAS_EQUIPO = {
+    TipoEquipo.LAPTOP: [('Dell', 'Latitude 5440'), ('Lenovo', 'ThinkPad T14'), ('HP', 'ProBook 450')],
+    TipoEquipo.DESKTOP: [('Dell', 'OptiPlex 7010'), ('HP', 'ProDesk 400'), ('Lenovo', 'ThinkCentre M70')],
+}
+PROBLEMAS = {
+    CategoriaTicket.HARDWARE: ['No enciende el equipo', 'Falla el teclado', 'Pantalla parpadea', 'Impresora atascada'],
+    CategoriaTicket.SOFTWARE: ['Error al abrir el sistema de pedimentos', 'Actualización de Office', 'Correo no sincroniza'],
+    CategoriaTicket.RED: ['Sin acceso a internet', 'VPN no conecta', 'Carpeta compartida inaccesible'],
+    CategoriaTicket.OTRO: ['Solicitud de accesos', 'Alta de usuario nuevo'],
+}
+
+
+@dataclass
+class Resumen:
+    """Filas creadas por modelo y segundos totales."""
+    filas: dict = field(default_factory=dict)
+    segundos: float = 0.0
+
+    def sumar(self, modelo, cantidad):
+        nombre = modelo._meta.label
+        self.filas[nombre] = self.filas.get(nombre, 0) + cantidad
+
+
+@contextmanager
+def _fechas_manuales(*modelos):
+    """
+    Desactiva auto_now/auto_now_add de los modelos dados para poder fechar
+    en el pasado lo que se inserta con bulk_create.
+    """
+    campos = [
+        (campo, campo.auto_now, campo.auto_now_add)
+        for modelo in modelos
+        for campo in modelo._meta.concrete_fields
+        if isinstance(campo, models.DateField) and (campo.auto_now or campo.auto_now_add)
+    ]
+    for campo, _, _ in campos:
+        campo.auto_now = campo.auto_now_add = False
+    try:
+        yield
+    finally:
+        for campo, auto_now, auto_now_add in campos:
+            campo.auto_now, campo.auto_now_add = auto_now, auto_now_add
+
+
+def _insertar(modelo, objetos, resumen, lote):
+    """bulk_create por lotes de un iterable (no materializa todo en memoria)."""
+    pendientes = []
+    for objeto in objetos:
+        pendientes.append(objeto)
+        if len(pendientes) >= lote:
+            modelo.objects.bulk_create(pendientes, batch_size=lote)
+            resumen.sumar(modelo, len(pendientes))
+            pendientes = []
+    if pendientes:
+        modelo.objects.bulk_create(pendientes, batch_size=lote)
+        resumen.sumar(modelo, len(pendientes))
+
+
+def _insertar_directo(modelo, filas, resumen, lote):
+    """
+    Inserta dicts {attname: valor} con executemany, sin instanciar modelos.
+    Los campos que faltan toman su default y cada valor se adapta con las
+    operaciones del backend, igual que lo haría el ORM.
+    """
+    ops = connection.ops
+    adaptadores = {
+        models.DateTimeField: ops.adapt_datetimefield_value,
+        models.DateField: ops.adapt_datefield_value,
+        models.TimeField: ops.adapt_timefield_value,
+    }
+    campos = [campo for campo in modelo._meta.concrete_fields if not campo.primary_key]
+    columnas = []
+    for campo in campos:
+        adaptar = next(
+            (f for tipo, f in adaptadores.items() if isinstance(campo, tipo)),
+            None,
+        )
+        columnas.append((campo.attname, campo.get_default(), adaptar))
+
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        ops.quote_name(modelo._meta.db_table),
+        ', '.join(ops.quote_name(campo.column) for campo in campos),
+        ', '.join(['%s'] * len(campos)),
+    )
+
+    def valores(fila):
+        resultado = []
+        for attname, default, adaptar in columnas:
+            valor = fila.get(attname, default)
+            resultado.append(adaptar(valor) if adaptar and valor is not None else valor)
+        return resultado
+
+    with connection.cursor() as cursor:
+        pendientes = []
+        for fila in filas:
+            pendientes.append(valores(fila))
+            if len(pendientes) >= lote:
+                cursor.executemany(sql, pendientes)
+                resumen.sumar(modelo, len(pendientes))
+                pendientes = []
+        if pendientes:
+            cursor.executemany(sql, pendientes)
+            resumen.sumar(modelo, len(pendientes))
+
+
+def _momento(fecha, hora):
+    return datetime.combine(fecha, hora, tzinfo=MEXICO_TZ)
+
+
+def _sumar_minutos(hora, minutos):
+    return (datetime.combine(date(2000, 1, 1), hora) + timedelta(minutes=minutos)).time()
+
+
+def _dias_habiles(desde, hasta):
+    fecha = desde
+    while fecha <= hasta:
+        if fecha.weekday() < 5:
+            yield fecha
+        fecha += timedelta(days=1)
+
+
+class GeneradorDatos:
+    """Genera el conjunto completo; cada paso usa lo creado por los anteriores."""
+
+    def __init__(self, empleados=300, dias=365, tickets=None, visitas=None,
+                 semilla=42, hasta=None, lote=2000):
+        self.total_empleados = empleados
+        self.dias = dias
+        self.total_tickets = tickets if tickets is not None else empleados * 3
+        self.total_visitas = visitas if visitas is not None else empleados * 2
+        self.rng = random.Random(semilla)
+        self.hasta = hasta or date.today()
+        self.desde = self.hasta - timedelta(days=dias)
+        self.lote = lote
+        self.resumen = Resumen()
+
+    def generar(self):
+        inicio = time.perf_counter()
+        with transaction.atomic():
+            self._horarios()
+            self._departamentos()
+            self._empleados()
+            self._supervision()
+            self._asistencias()
+            with _fechas_manuales(SolicitudPermiso, HistorialPermiso):
+                self._permisos()
+            with _fechas_manuales(Visita):
+                self._visitas()
+            with _fechas_manuales(MantenimientoEquipo):
+                self._equipos()
+            with _fechas_manuales(Ticket, HistorialTicket):
+                self._tickets()
+            self._reconstruir_indices()
+        self.resumen.segundos = time.perf_counter() - inicio
+        return self.resumen
+
+    # ------------------------------------------------------------------
+    # Catálogos y organización
+    # ------------------------------------------------------------------
+
+    def _horarios(self):
+        self.horarios = []
+        for codigo, nombre, entrada, salida, inicio_comida, fin_comida in HORARIOS:
+            horario, _ = TipoHorario.objects.get_or_create(codigo=codigo, defaults={
+                'nombre': nombre,
+                'hora_entrada': entrada,
+                'hora_salida': salida,
+                'tiene_comida': inicio_comida is not None,
+                'hora_inicio_comida': inicio_comida,
+                'hora_fin_comida': fin_comida,
+            })
+            self.horarios.append(horario)
+
+    def _departamentos(self):
+        raiz = Departamento(nombre=f'{PREFIJO} Dirección General', codigo=f'{PREFIJO}-DG')
+        Departamento.objects.bulk_create([raiz])
+
+        areas = [
+            Departamento(nombre=f'{PREFIJO} {area}', codigo=f'{PREFIJO}-A{i:02d}', departamento_padre=raiz)
+            for i, area in enumerate(AREAS, 1)
+        ]
+        Departamento.objects.bulk_create(areas)
+
+        subareas = [
+            Departamento(
+                nombre=f'{PREFIJO} {nombre}', codigo=f'{PREFIJO}-A{i:02d}{j:02d}', departamento_padre=area
+            )
+            for i, (area, nombres) in enumerate(zip(areas, AREAS.values()), 1)
+            for j, nombre in enumerate(nombres, 1)
+        ]
+        Departamento.objects.bulk_create(subareas)
+
+        self.departamentos = [raiz, *areas, *subareas]
+        self.departamento_sistemas = next(d for d in areas if d.nombre.endswith('Sistemas'))
+        self.resumen.sumar(Departamento, len(self.departamentos))
+
+    def _empleados(self):
+        contrasena = make_password(None)
+        usuarios = []
+        for i in range(1, self.total_empleados + 1):
+            usuarios.append(User(
+                username=f'{PREFIJO_USUARIO}{i:06d}',
+                first_name=self.rng.choice(NOMBRES),
+                last_name=f'{self.rng.choice(APELLIDOS)} {self.rng.choice(APELLIDOS)}',
+                email=f'{PREFIJO_USUARIO}{i:06d}@sintetico.invalid',
+                password=contrasena,
+            ))
+        User.objects.bulk_create(usuarios, batch_size=self.lote)
+        self.resumen.sumar(User, len(usuarios))
+
+        # Cada departamento recibe al menos un empleado (su responsable)
+        asignacion = self.departamentos + [
+            self.rng.choice(self.departamentos[1:])
+            for _ in range(max(self.total_empleados - len(self.departamentos), 0))
+        ]
+        self.empleados = []
+        for i, (user, departamento) in enumerate(zip(usuarios, asignacion), 1):
+            horario = self.rng.choices(self.horarios, weights=[70, 25, 5])[0]
+            self.empleados.append(Empleado(
+                user=user,
+                codigo_empleado=f'{PREFIJO}-{i:06d}',
+                departamento=departamento.nombre,
+                departamento_obj=departamento,
+                puesto='Gerente' if i <= len(self.departamentos) else 'Analista',
+                # Algunos ingresan durante el periodo y no tienen historia completa
+                fecha_ingreso=self.desde + timedelta(
+                    days=self.rng.randint(0, self.dias) if self.rng.random() < 0.15 else -self.rng.randint(0, 3650)
+                ),
+                horario_predeterminado=horario,
+            ))
+        Empleado.objects.bulk_create(self.empleados, batch_size=self.lote)
+        self.resumen.sumar(Empleado, len(self.empleados))
+
+    def _supervision(self):
+        """Responsables de departamento, supervisores directos y relaciones funcionales."""
+        responsables = {}
+        for departamento, empleado in zip(self.departamentos, self.empleados):
+            departamento.responsable = empleado
+            responsables[departamento.pk] = empleado
+        Departamento.objects.bulk_update(self.departamentos, ['responsable'])
+
+        for empleado in self.empleados:
+            departamento = empleado.departamento_obj
+            jefe = responsables[departamento.pk]
+            if jefe.pk == empleado.pk and departamento.departamento_padre_id:
+                jefe = responsables[departamento.departamento_padre_id]
+            empleado.supervisor_directo = jefe if jefe.pk != empleado.pk else None
+        Empleado.objects.bulk_update(self.empleados, ['supervisor_directo'], batch_size=self.lote)
+
+        relaciones = []
+        vistos = set()
+        for empleado in self.rng.sample(self.empleados, len(self.empleados) // 20):
+            supervisor = self.rng.choice(self.empleados[:len(self.departamentos)])
+            if supervisor.pk == empleado.pk or (supervisor.pk, empleado.pk) in vistos:
+                continue
+            vistos.add((supervisor.pk, empleado.pk))
+            relaciones.append(RelacionSupervision(
+                supervisor=supervisor,
+                subordinado=empleado,
+                tipo_relacion=self.rng.choice(['funcional', 'temporal']),
+                fecha_inicio=self.desde,
+                fecha_fin=None if self.rng.random() < 0.7 else self.hasta + timedelta(days=90),
+            ))
+        _insertar(RelacionSupervision, relaciones, self.resumen, self.lote)
+
+        # Técnicos de IT: empleados del área de Sistemas y sus subáreas
+        grupo_it, _ = Group.objects.get_or_create(name=GRUPO_IT)
+        sistemas = self.departamento_sistemas.pk
+        self.tecnicos = [
+            e.user for e in self.empleados
+            if sistemas in (e.departamento_obj_id, e.departamento_obj.departamento_padre_id)
+        ] or [self.empleados[0].user]
+        grupo_it.user_set.add(*self.tecnicos)
+
+    # ------------------------------------------------------------------
+    # Movimientos
+    # ------------------------------------------------------------------
+
+    def _asistencias(self):
+        # La tabla más grande (un registro por empleado por día hábil) va
+        # por _insertar_directo: con bulk_create el tiempo se iba en preparar
+        # cada uno de sus ~20 valores por fila con el ORM
+        def registros():
+            ahora = _momento(self.hasta, dt_time(12))
+            for empleado in self.empleados:
+                horario = empleado.horario_predeterminado
+                inicio = max(self.desde, empleado.fecha_ingreso)
+                for fecha in _dias_habiles(inicio, self.hasta - timedelta(days=1)):
+                    if self.rng.random() < 0.03:
+                        continue  # falta
+                    retraso = int(self.rng.gauss(-5, 8))
+                    entrada = _sumar_minutos(horario.hora_entrada, retraso)
+                    registro = {
+                        'empleado_id': empleado.pk,
+                        'fecha': fecha,
+                        'hora_entrada': entrada,
+                        'reconocimiento_facial': True,
+                        'confianza_reconocimiento': round(self.rng.uniform(88, 99.5), 1),
+                        'retardo': retraso > horario.tolerancia_minutos,
+                        'fecha_creacion': _momento(fecha, entrada),
+                        'fecha_actualizacion': ahora,
+                    }
+                    minutos_comida = 0
+                    if horario.tiene_comida:
+                        salida_comida = _sumar_minutos(horario.hora_inicio_comida, self.rng.randint(-10, 20))
+                        minutos_comida = self.rng.randint(45, 70)
+                        registro['hora_salida_comida'] = salida_comida
+                        registro['hora_entrada_comida'] = _sumar_minutos(salida_comida, minutos_comida)
+                    if self.rng.random() < 0.02:
+                        registro['incidencia'] = 'sin_salida'
+                        registro['descripcion_incidencia'] = (
+                            f'Registró entrada a las {entrada} pero no ha registrado salida'
+                        )
+                    else:
+                        salida = _sumar_minutos(horario.hora_salida, int(self.rng.gauss(10, 10)))
+                        minutos = (
+                            datetime.combine(fecha, salida) - datetime.combine(fecha, entrada)
+                        ).total_seconds() / 60 - minutos_comida
+                        registro['hora_salida'] = salida
+                        registro['horas_trabajadas'] = round(minutos / 60, 2)
+                    yield registro
+
+        _insertar_directo(RegistroAsistencia, registros(), self.resumen, self.lote)
+
+    def _permisos(self):
+        tipos = []
+        for codigo, nombre, dias_maximos in TIPOS_PERMISO:
+            tipo, _ = TipoPermiso.objects.get_or_create(
+                codigo=codigo, defaults={'nombre': nombre, 'dias_maximos': dias_maximos}
+            )
+            tipos.append(tipo)
+
+        solicitudes = []
+        for empleado in self.empleados:
+            for _ in range(self.rng.randint(0, max(1, self.dias // 90))):
+                tipo = self.rng.choice(tipos)
+                inicio = self.desde + timedelta(days=self.rng.randint(0, self.dias))
+                creada = _momento(inicio - timedelta(days=self.rng.randint(1, 20)), dt_time(10))
+                estado = self.rng.choices(
+                    ['aprobado', 'rechazado', 'pendiente', 'cancelado'], weights=[70, 10, 12, 8]
+                )[0]
+                resuelta = estado in ('aprobado', 'rechazado')
+                solicitudes.append(SolicitudPermiso(
+                    empleado=empleado,
+                    tipo_permiso=tipo,
+                    fecha_inicio=inicio,
+                    fecha_fin=inicio + timedelta(days=self.rng.randint(0, max(tipo.dias_maximos, 1) - 1)),
+                    motivo=f'{tipo.nombre} solicitado por el empleado',
+                    estado=estado,
+                    aprobador=empleado.supervisor_directo if resuelta else None,
+                    fecha_resolucion=creada + timedelta(hours=self.rng.randint(1, 72)) if resuelta else None,
+                    fecha_creacion=creada,
+                    fecha_actualizacion=creada,
+                ))
+        for i in range(0, len(solicitudes), self.lote):
+            SolicitudPermiso.objects.bulk_create(solicitudes[i:i + self.lote])
+        self.resumen.sumar(SolicitudPermiso, len(solicitudes))
+
+        def historial():
+            for solicitud in solicitudes:
+                yield HistorialPermiso(
+                    solicitud=solicitud, accion='enviado', usuario=solicitud.empleado,
+                    comentarios='Solicitud enviada para aprobacion', fecha=solicitud.fecha_creacion,
+                )
+                if solicitud.estado in ('aprobado', 'rechazado', 'cancelado'):
+                    yield HistorialPermiso(
+                        solicitud=solicitud,
+                        accion=solicitud.estado,
+                        usuario=solicitud.aprobador or solicitud.empleado,
+                        fecha=solicitud.fecha_resolucion or solicitud.fecha_creacion + timedelta(days=1),
+                    )
+
+        _insertar(HistorialPermiso, historial(), self.resumen, self.lote)
+        for i in range(0, len(solicitudes), self.lote):
+            DiaPermiso.sincronizar(solicitudes[i:i + self.lote])
+
+    def _visitas(self):
+        anfitriones = self.departamentos[1:]
+
+        def visitas():
+            for i in range(self.total_visitas):
+                fecha = self.desde + timedelta(days=self.rng.randint(0, self.dias))
+                hora = dt_time(self.rng.randint(9, 17), self.rng.choice([0, 15, 30, 45]))
+                futura = fecha >= self.hasta
+                estado = 'autorizado' if futura else self.rng.choices(
+                    ['finalizado', 'no_show', 'cancelado', 'rechazado'], weights=[85, 7, 5, 3]
+                )[0]
+                visita = Visita(
+                    codigo_visita=uuid.UUID(int=self.rng.getrandbits(128), version=4),
+                    nombre_visitante=f'{self.rng.choice(NOMBRES)} {self.rng.choice(APELLIDOS)}',
+                    empresa=f'{PREFIJO} Proveedor {self.rng.randint(1, 60)}',
+                    identificacion_numero=f'{PREFIJO}{i:08d}',
+                    motivo='Reunión de seguimiento',
+                    departamento_destino=self.rng.choice(anfitriones),
+                    fecha_programada=fecha,
+                    hora_programada=hora,
+                    estado=estado,
+                    fecha_creacion=_momento(fecha - timedelta(days=self.rng.randint(0, 7)), dt_time(9)),
+                    fecha_actualizacion=_momento(fecha, hora),
+                )
+                if estado == 'finalizado':
+                    visita.fecha_entrada = _momento(fecha, hora) + timedelta(minutes=self.rng.randint(-10, 20))
+                    visita.fecha_salida = visita.fecha_entrada + timedelta(minutes=self.rng.randint(20, 180))
+                yield visita
+
+        _insertar(Visita, visitas(), self.resumen, self.lote)
+
+    def _equipos(self):
+        actividades = [a.value for a in ActividadMantenimiento]
+        equipos = []
+        mantenimientos = []
+        for i, empleado in enumerate(self.empleados, 1):
+            tipo = self.rng.choices([TipoEquipo.LAPTOP, TipoEquipo.DESKTOP], weights=[60, 40])[0]
+            marca, modelo = self.rng.choice(MARCAS_EQUIPO[tipo])
+            equipo = EquipoComputo(
+                empleado=empleado,
+                usuario_nombre=empleado.user.get_full_name(),
+                tipo=tipo,
+                numero_serie=f'{PREFIJO}-{i:08d}',
+                marca=marca,
+                modelo=modelo,
+                tiene_monitor=tipo == TipoEquipo.DESKTOP,
+                estado=self.rng.choices(
+                    [EstadoEquipo.ACTIVO, EstadoEquipo.MANTENIMIENTO, EstadoEquipo.BAJA], weights=[92, 5, 3]
+                )[0],
+            )
+            # Preventivo cada ~6 meses con algún correctivo en medio; el equipo
+            # queda con las fechas del último, como haría MantenimientoEquipo.save()
+            fecha = self.desde + timedelta(days=self.rng.randint(0, 180))
+            while fecha < self.hasta:
+                correctivo = self.rng.random() < 0.15
+                proximo = fecha + timedelta(days=self.rng.randint(150, 210))
+                mantenimientos.append(MantenimientoEquipo(
+                    equipo=equipo,
+                    tipo_mantenimiento=TipoMantenimiento.CORRECTIVO if correctivo else TipoMantenimiento.PREVENTIVO,
+                    actividades_realizadas=self.rng.sample(actividades, self.rng.randint(1, 3)),
+                    descripcion='Mantenimiento correctivo' if correctivo else 'Mantenimiento preventivo programado',
+                    fecha_realizado=fecha,
+                    fecha_proximo=proximo,
+                    tecnico=self.rng.choice(self.tecnicos).get_full_name(),
+                    costo=Decimal(self.rng.randint(300, 2500)) if correctivo else None,
+                    registrado_por=self.rng.choice(self.tecnicos),
+                    fecha_creacion=_momento(fecha, dt_time(18)),
+                ))
+                equipo.fecha_ultimo_mantenimiento = fecha
+                equipo.fecha_proximo_mantenimiento = proximo
+                fecha = proximo + timedelta(days=self.rng.randint(-20, 40))
+            equipos.append(equipo)
+
+        EquipoComputo.objects.bulk_create(equipos, batch_size=self.lote)
+        self.resumen.sumar(EquipoComputo, len(equipos))
+        self.equipos_por_empleado = {equipo.empleado_id: equipo for equipo in equipos}
+        _insertar(MantenimientoEquipo, mantenimientos, self.resumen, self.lote)
+
+    def _tickets(self):
+        transiciones = [EstadoTicket.PENDIENTE, EstadoTicket.PROCESO, EstadoTicket.CONCLUIDO]
+        tickets = []
+        for i in range(1, self.total_tickets + 1):
+            empleado = self.rng.choice(self.empleados)
+            categoria = self.rng.choice(list(PROBLEMAS))
+            creado = _momento(
+                self.desde + timedelta(days=self.rng.randint(0, self.dias)),
+                dt_time(self.rng.randint(8, 18), self.rng.randint(0, 59)),
+            )
+            # Los recientes siguen abiertos; los viejos casi siempre están concluidos
+            antiguedad = (self.hasta - creado.date()).days
+            pasos = 3 if antiguedad > 14 and self.rng.random() < 0.95 else self.rng.randint(0, 2)
+            estados = [EstadoTicket.CREADO, *transiciones[:pasos]]
+            if pasos == 2 and self.rng.random() < 0.3:
+                estados.append(EstadoTicket.ESPERA)
+            momentos = [creado]
+            for _ in estados[1:]:
+                momentos.append(momentos[-1] + timedelta(minutes=self.rng.randint(10, 60 * 48)))
+
+            ticket = Ticket(
+                folio=f'{PREFIJO}-{creado:%Y%m%d}-{i:05d}',
+                empleado=empleado,
+                equipo=self.equipos_por_empleado.get(empleado.pk) if categoria == CategoriaTicket.HARDWARE else None,
+                titulo=self.rng.choice(PROBLEMAS[categoria]),
+                descripcion=f'Reporte generado para pruebas de rendimiento ({categoria.label}).',
+                categoria=categoria,
+                prioridad=self.rng.choices(list(PrioridadTicket), weights=[5, 20, 50, 25])[0],
+                estado=estados[-1],
+                motivo_espera='Esperando refacción' if estados[-1] == EstadoTicket.ESPERA else '',
+                solucion='Se resolvió el problema reportado' if estados[-1] == EstadoTicket.CONCLUIDO else '',
+                asignado_a=self.rng.choice(self.tecnicos) if len(estados) > 2 else None,
+                fecha_creacion=creado,
+                fecha_actualizacion=momentos[-1],
+                fecha_resolucion=momentos[-1] if estados[-1] == EstadoTicket.CONCLUIDO else None,
+            )
+            ticket._historial = list(zip(estados, estados[1:], momentos[1:]))
+            tickets.append(ticket)
+
+        for i in range(0, len(tickets), self.lote):
+            Ticket.objects.bulk_create(tickets[i:i + self.lote])
+        self.resumen.sumar(Ticket, len(tickets))
+
+        def historial():
+            for ticket in tickets:
+                for anterior, nuevo, momento in ticket._historial:
+                    yield HistorialTicket(
+                        ticket=ticket,
+                        estado_anterior=anterior,
+                        estado_nuevo=nuevo,
+                        usuario=ticket.asignado_a,
+                        comentario='',
+                        fecha=momento,
+                    )
+
+        _insertar(HistorialTicket, historial(), self.resumen, self.lote)
+
+    # ------------------------------------------------------------------
+
+    def _reconstruir_indices(self):
+        """Lo que save() y las señales habrían mantenido fila por fila."""
+        Departamento.reconstruir_jerarquia()
+        reconstruir_aprobadores([empleado.pk for empleado in self.empleados])
+        reindexar_todos(tamano_lote=self.lote)
+        for espacio in ('organigrama', 'dashboard', 'horarios', 'it_metricas'):
+            transaction.on_commit(lambda espacio=espacio: invalidar_espacio(espacio))
+
+
+def generar(**opciones):
+    """Genera el conjunto de datos; ver GeneradorDatos para las opciones."""
+    resumen = GeneradorDatos(**opciones).generar()
+    logger.info(f"Datos sintéticos generados en {resumen.segundos:.1f}s: {resumen.filas}")
+    return resumen
+
+
+def _borrar_sin_senales(qs):
+    """
+    DELETE directo de las filas de `qs`, sin cargarlas en memoria.
+
+    qs.delete() no puede hacer borrado rápido en ningún modelo porque
+    storage_backends registra un post_delete global, así que traería cada
+    fila. Este DELETE no emite pre_delete/post_delete ni aplica on_delete
+    (CASCADE, SET_NULL) a las tablas que apuntan a `qs.model`: sólo sirve
+    para tablas hoja sin FileField, como las de limpiar().
+    """
+    tabla = connection.ops.quote_name(qs.model._meta.db_table)
+    columna_pk = connection.ops.quote_name(qs.model._meta.pk.column)
+    subconsulta, params = qs.values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {tabla} WHERE {columna_pk} IN ({subconsulta})', params)
+        return cursor.rowcount
+
+
+def limpiar():
+    """
+    Borra todo lo generado. Las tablas hoja grandes (historiales, registros,
+    días de permiso, mantenimientos) van primero con _borrar_sin_senales();
+    el resto con qs.delete(), que sí emite señales y aplica cascadas.
+    """
+    empleados = Empleado.objects.filter(codigo_empleado__startswith=f'{PREFIJO}-')
+    with transaction.atomic():
+        borrados = 0
+        for qs in (
+            HistorialTicket.objects.filter(ticket__folio__startswith=f'{PREFIJO}-'),
+            RegistroAsistencia.objects.filter(empleado__in=empleados),
+            DiaPermiso.objects.filter(empleado__in=empleados),
+            HistorialPermiso.objects.filter(solicitud__empleado__in=empleados),
+            MantenimientoEquipo.objects.filter(equipo__numero_serie__startswith=f'{PREFIJO}-'),
+        ):
+            borrados += _borrar_sin_senales(qs)
+        for qs in (
+            Ticket.objects.filter(folio__startswith=f'{PREFIJO}-'),
+            EquipoComputo.objects.filter(numero_serie__startswith=f'{PREFIJO}-'),
+            Visita.objects.filter(identificacion_numero__startswith=PREFIJO, empresa__startswith=PREFIJO),
+            SolicitudPermiso.objects.filter(empleado__in=empleados),
+            Departamento.objects.filter(codigo__startswith=f'{PREFIJO}-'),
+            User.objects.filter(username__startswith=PREFIJO_USUARIO),
+            TipoHorario.objects.filter(codigo__startswith=f'{PREFIJO}-'),
+            TipoPermiso.objects.filter(codigo__startswith=f'{PREFIJO}-'),
+        ):
+            borrados += qs.delete()[0]
+        for espacio in ('organigrama', 'dashboard', 'horarios', 'it_metricas'):
+            transaction.on_commit(lambda espacio=espacio: invalidar_espacio(espacio))
+    return borrados
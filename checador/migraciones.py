@@ -0,0 +1,50 @@
+"""
+Operaciones de migración del proyecto.
+
+AgregarIndiceConcurrente es un AddIndex que en PostgreSQL crea el índice
+con CREATE INDEX CONCURRENTLY (AddIndexConcurrently): no bloquea las
+escrituras de la tabla mientras se construye, lo que importa en tablas
+grandes como registros_registroasistencia. En SQLite (desarrollo) se
+comporta como AddIndex. El estado del proyecto es el mismo en ambos casos,
+así que makemigrations no detecta diferencias.
+
+La migración que la use debe declarar `atomic = False`: PostgreSQL no
+permite CONCURRENTLY dentro de una transacción. Si la construcción falla
+queda un índice INVALID; hay que borrarlo (DROP INDEX CONCURRENTLY) antes
+de reintentar la migración.
+
+    class Migration(migrations.Migration):
+        atomic = False
+        operations = [
+            AgregarIndiceConcurrente(model_name='visita', index=models.Index(...)),
+        ]
+"""
+from django.db import migrations
+
+
+def _concurrente(schema_editor):
+    return schema_editor.connection.vendor == 'postgresql'
+
+
+class AgregarIndiceConcurrente(migrations.AddIndex):
+
+    def _operacion_postgres(self):
+        # django.contrib.postgres importa psycopg; solo se carga contra PostgreSQL
+        from django.contrib.postgres.operations import AddIndexConcurrently
+
+        return AddIndexConcurrently(self.model_name, self.index)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if _concurrente(schema_editor):
+            self._operacion_postgres().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if _concurrente(schema_editor):
+            self._operacion_postgres().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+    def describe(self):
+        return f"{super().describe()} (concurrente en PostgreSQL)"
@@ -0,0 +1,143 @@
+"""
+Paginación por llave (keyset) para listados grandes.
+
+En lugar de OFFSET, cada página se pide "después de" (o "antes de") los
+valores de orden de la última fila mostrada, así la base de datos usa el
+índice y el costo no crece con el número de página:
+
+    pagina = paginar_por_llave(
+        EquipoComputo.objects.all(),
+        orden=('estado', 'marca', 'modelo', 'id'),
+        cursor=request.GET.get('cursor'),
+        direccion=request.GET.get('dir', SIGUIENTE),
+    )
+    pagina.objetos, pagina.cursor_siguiente, pagina.cursor_anterior
+
+El último campo de `orden` debe ser único (normalmente 'id') y ninguno
+puede ser nulo. Un campo con prefijo '-' se ordena descendente. Los
+valores del cursor deben ser serializables en JSON (texto y números).
+El cursor llega en la URL: cada valor se valida contra su campo y un
+cursor alterado o viejo se trata como ausente (primera página).
+"""
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+SIGUIENTE = 'siguiente'
+ANTERIOR = 'anterior'
+
+
+class PaginaLlave:
+    """Resultado de paginar_por_llave."""
+
+    def __init__(self, objetos, cursor_siguiente, cursor_anterior):
+        self.objetos = objetos
+        self.cursor_siguiente = cursor_siguiente
+        self.cursor_anterior = cursor_anterior
+
+    @property
+    def tiene_siguiente(self):
+        return self.cursor_siguiente is not None
+
+    @property
+    def tiene_anterior(self):
+        return self.cursor_anterior is not None
+
+    @property
+    def tiene_otras_paginas(self):
+        return self.tiene_siguiente or self.tiene_anterior
+
+
+def codificar_cursor(valores):
+    texto = json.dumps(list(valores), separators=(',', ':'))
+    return base64.urlsafe_b64encode(texto.encode()).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor, orden, modelo):
+    """
+    Valores del cursor convertidos al tipo de cada campo de `orden`, o None
+    si no es válido (se muestra la primera página).
+    """
+    if not cursor:
+        return None
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+    except (binascii.Error, ValueError):
+        return None
+    if not isinstance(valores, list) or len(valores) != len(orden):
+        return None
+
+    convertidos = []
+    for campo, valor in zip(orden, valores):
+        # Ningún campo de orden es nulo; listas u objetos no son un valor de llave
+        if valor is None or not isinstance(valor, (str, int, float)):
+            return None
+        try:
+            convertidos.append(modelo._meta.get_field(campo.lstrip('-')).to_python(valor))
+        except ValidationError:
+            return None
+    return convertidos
+
+
+def _filtro_llave(orden, valores, hacia_atras):
+    """
+    (a > x) OR (a = x AND b > y) OR ... respetando la dirección de cada
+    campo y de la paginación.
+    """
+    filtro = Q()
+    for i, campo in enumerate(orden):
+        descendente = campo.startswith('-')
+        lookup = 'gt' if descendente == hacia_atras else 'lt'
+        iguales = {orden[j].lstrip('-'): valores[j] for j in range(i)}
+        filtro |= Q(**iguales, **{f"{campo.lstrip('-')}__{lookup}": valores[i]})
+    return filtro
+
+
+def _invertir(campo):
+    return campo[1:] if campo.startswith('-') else f'-{campo}'
+
+
+def _llave(objeto, orden):
+    return [getattr(objeto, campo.lstrip('-')) for campo in orden]
+
+
+def paginar_por_llave(qs, orden, cursor=None, direccion=SIGUIENTE, tamano=25):
+    """
+    Página de `tamano` objetos de `qs` ordenados por `orden`, posterior
+    (direccion=SIGUIENTE) o anterior (direccion=ANTERIOR) al cursor.
+    Sin cursor regresa la primera página.
+    """
+    orden = tuple(orden)
+    valores = decodificar_cursor(cursor, orden, qs.model)
+    hacia_atras = valores is not None and direccion == ANTERIOR
+
+    if valores is not None:
+        qs = qs.filter(_filtro_llave(orden, valores, hacia_atras))
+    if hacia_atras:
+        qs = qs.order_by(*(_invertir(campo) for campo in orden))
+    else:
+        qs = qs.order_by(*orden)
+
+    objetos = list(qs[:tamano + 1])
+    hay_mas = len(objetos) > tamano
+    objetos = objetos[:tamano]
+    if hacia_atras:
+        objetos.reverse()
+
+    if not objetos:
+        return PaginaLlave([], None, None)
+
+    if hacia_atras:
+        tiene_siguiente, tiene_anterior = True, hay_mas
+    else:
+        tiene_siguiente, tiene_anterior = hay_mas, valores is not None
+
+    return PaginaLlave(
+        objetos,
+        codificar_cursor(_llave(objetos[-1], orden)) if tiene_siguiente else None,
+        codificar_cursor(_llave(objetos[0], orden)) if tiene_anterior else None,
+    )
@@ -0,0 +1,133 @@
+"""
+Catálogo de consultas calientes y verificación de sus planes de ejecución.
+
+Cada entrada reproduce un acceso frecuente del sistema (dashboard,
+reportes, detectar_incidencias, bandeja de permisos, recepción de visitas)
+y nombra la tabla grande que debe leerse por índice. verificar_planes()
+corre EXPLAIN sobre cada una y marca las que recorren esa tabla completa;
+`python manage.py verificar_planes` falla si aparece alguna.
+
+Los índices que sostienen estos accesos están en el Meta de
+RegistroAsistencia, SolicitudPermiso y Visita. Al agregar un filtro
+frecuente nuevo, agréguelo aquí con su índice.
+"""
+import re
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import Exists, Max, OuterRef
+from django.utils import timezone
+
+from permisos.models import DiaPermiso, SolicitudPermiso
+from registros.models import RegistroAsistencia
+from visitas.models import Visita
+
+
+@dataclass
+class ConsultaCritica:
+    nombre: str
+    origen: str
+    modelo: type
+    consulta: object  # callable(hoy) -> QuerySet
+
+    @property
+    def tabla(self):
+        return self.modelo._meta.db_table
+
+
+@dataclass
+class ResultadoPlan:
+    consulta: ConsultaCritica
+    filas: int
+    plan: str
+    escaneos: list = field(default_factory=list)
+
+    @property
+    def secuencial(self):
+        return bool(self.escaneos)
+
+
+CATALOGO = [
+    ConsultaCritica(
+        'registros_del_dia', 'dashboard staff (_estadisticas_staff)', RegistroAsistencia,
+        lambda hoy: RegistroAsistencia.objects.filter(fecha=hoy),
+    ),
+    ConsultaCritica(
+        'incidencias_del_dia', 'detectar_incidencias', RegistroAsistencia,
+        lambda hoy: RegistroAsistencia.objects.filter(fecha=hoy)
+        .select_related('empleado', 'empleado__user')
+        .annotate(cubierto_por_permiso=Exists(DiaPermiso.objects.filter(
+            empleado_id=OuterRef('empleado_id'), fecha=OuterRef('fecha'), dia_completo=True,
+        ))),
+    ),
+    ConsultaCritica(
+        'retardos_del_periodo', 'registros_lista_view / reportes', RegistroAsistencia,
+        lambda hoy: RegistroAsistencia.objects.filter(
+            fecha__range=[hoy - timedelta(days=30), hoy], retardo=True,
+        ),
+    ),
+    ConsultaCritica(
+        'registros_del_periodo', 'registros_lista_view / reportes', RegistroAsistencia,
+        lambda hoy: RegistroAsistencia.objects.filter(
+            fecha__range=[hoy - timedelta(days=7), hoy],
+        ).order_by('-fecha', '-hora_entrada'),
+    ),
+    ConsultaCritica(
+        'registros_con_incidencia', 'admin / revisión de incidencias', RegistroAsistencia,
+        lambda hoy: RegistroAsistencia.objects.filter(
+            fecha__range=[hoy - timedelta(days=30), hoy],
+        ).exclude(incidencia='ninguna'),
+    ),
+    ConsultaCritica(
+        'permisos_pendientes', 'aprobar_permisos_view / dashboard', SolicitudPermiso,
+        lambda hoy: SolicitudPermiso.objects.filter(estado='pendiente').order_by('fecha_creacion'),
+    ),
+    ConsultaCritica(
+        'permisos_del_periodo', 'obtener_datos_permisos', SolicitudPermiso,
+        lambda hoy: SolicitudPermiso.objects.filter(
+            fecha_inicio__lte=hoy, fecha_fin__gte=hoy - timedelta(days=7),
+        ).exclude(estado='borrador'),
+    ),
+    ConsultaCritica(
+        'visitas_del_dia', 'panel de recepción / dashboard', Visita,
+        lambda hoy: Visita.objects.filter(fecha_programada=hoy, estado='pendiente'),
+    ),
+]
+
+
+def escaneos_secuenciales(plan, tabla, vendor):
+    """Líneas del plan que recorren `tabla` completa (vacío si se lee por índice)."""
+    if vendor == 'postgresql':
+        patron = rf'Seq Scan on {re.escape(tabla)}\b'
+    elif vendor == 'sqlite':
+        patron = rf'\bSCAN {re.escape(tabla)}\b'
+    else:
+        raise ValueError(f"EXPLAIN de {vendor} no soportado (solo PostgreSQL y SQLite)")
+    return [linea.strip() for linea in plan.splitlines() if re.search(patron, linea)]
+
+
+def fecha_de_referencia():
+    """Último día con registros (los datos sintéticos pueden no llegar a hoy)."""
+    return RegistroAsistencia.objects.aggregate(ultima=Max('fecha'))['ultima'] or timezone.localdate()
+
+
+def actualizar_estadisticas():
+    """ANALYZE para que el planificador conozca el volumen real de las tablas."""
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def verificar_planes(catalogo=None, hoy=None):
+    """EXPLAIN de cada consulta del catálogo; regresa un ResultadoPlan por consulta."""
+    hoy = hoy or fecha_de_referencia()
+    resultados = []
+    for consulta in catalogo or CATALOGO:
+        plan = consulta.consulta(hoy).explain()
+        resultados.append(ResultadoPlan(
+            consulta=consulta,
+            filas=consulta.modelo.objects.count(),
+            plan=plan,
+            escaneos=escaneos_secuenciales(plan, consulta.tabla, connection.vendor),
+        ))
+    return resultados
@@ -0,0 +1,53 @@
+"""
+Ayudas para pruebas: presupuesto de consultas por endpoint.
+
+    class OrganigramaTests(PresupuestoConsultasMixin, TestCase):
+        def test_organigrama(self):
+            with self.assertPresupuestoConsultas(5):
+                self.client.get('/api/organizacion/api/departamentos/organigrama/')
+
+Con pytest se usa el context manager directamente:
+
+    with presupuesto_consultas(5):
+        client.get(...)
+
+A diferencia de assertNumQueries, falla solo si se pasa del máximo y el
+mensaje incluye las consultas repetidas (candidatas a N+1).
+"""
+from contextlib import contextmanager
+
+from .consultas import MedidorConsultas
+
+
+class PresupuestoExcedido(AssertionError):
+    pass
+
+
+def _mensaje(medidor, maximo, max_repetidas):
+    lineas = [f"{medidor.total} consultas (presupuesto: {maximo}, repetidas permitidas: {max_repetidas})"]
+    for huella, veces in medidor.repetidas():
+        lineas.append(f"  {veces}x {huella}")
+    return '\n'.join(lineas)
+
+
+@contextmanager
+def presupuesto_consultas(maximo, max_repetidas=None, alias=None):
+    """
+    Falla si el bloque ejecuta más de `maximo` consultas, o si alguna
+    huella de consulta se repite más de `max_repetidas` veces.
+    """
+    with MedidorConsultas(alias) as medidor:
+        yield medidor
+    repetidas = medidor.repetidas()
+    excede_repetidas = (
+        max_repetidas is not None and repetidas and repetidas[0][1] > max_repetidas
+    )
+    if medidor.total > maximo or excede_repetidas:
+        raise PresupuestoExcedido(_mensaje(medidor, maximo, max_repetidas))
+
+
+class PresupuestoConsultasMixin:
+    """Mixin para TestCase con assertPresupuestoConsultas."""
+
+    def assertPresupuestoConsultas(self, maximo, max_repetidas=None, alias=None):
+        return presupuesto_consultas(maximo, max_repetidas, alias)
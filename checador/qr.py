@@ -0,0 +1,115 @@
+"""
+Cache de codigos QR pre-renderizados.
+
+Cada QR se identifica por (contenido, tamano, formato) y se genera una sola
+vez; el resultado se guarda en disco local (QR_CACHE_DIR) y se reutiliza en
+las siguientes peticiones. La clave sirve tambien como ETag.
+
+No se usa MediaStorage porque agrega un timestamp al nombre de cada archivo
+y la clave dejaria de ser determinista.
+"""
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import qrcode
+import qrcode.image.svg
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.utils.functional import SimpleLazyObject
+
+logger = logging.getLogger(__name__)
+
+FORMATOS = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+}
+
+_storage = SimpleLazyObject(
+    lambda: FileSystemStorage(location=str(settings.QR_CACHE_DIR))
+)
+
+
+def clave_qr(contenido, tamano=8, formato='png', borde=2):
+    """Clave determinista del QR; se usa como nombre de archivo y ETag."""
+    base = f"{formato}|{tamano}|{borde}|{contenido}"
+    return hashlib.sha1(base.encode('utf-8')).hexdigest()
+
+
+def _renderizar(contenido, tamano, formato, borde):
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=tamano,
+        border=borde,
+    )
+    qr.add_data(contenido)
+    qr.make(fit=True)
+    buf = BytesIO()
+    if formato == 'svg':
+        qr.make_image(image_factory=qrcode.image.svg.SvgPathImage).save(buf)
+    else:
+        qr.make_image(fill_color='black', back_color='white').save(buf, format='PNG')
+    return buf.getvalue()
+
+
+def generar_qr(contenido, tamano=8, formato='png', borde=2):
+    """
+    Bytes del QR sin pasar por el cache, para contenidos de un solo uso
+    (p.ej. el UUID de una visita) que no se volverán a pedir.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de QR no soportado: {formato}")
+    return _renderizar(contenido, tamano, formato, borde)
+
+
+def obtener_qr(contenido, tamano=8, formato='png', borde=2):
+    """
+    Retorna (bytes, etag) del QR, generandolo y guardandolo en el cache
+    solo la primera vez.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de QR no soportado: {formato}")
+
+    etag = clave_qr(contenido, tamano, formato, borde)
+    nombre = f"{etag[:2]}/{etag}.{formato}"
+    try:
+        if _storage.exists(nombre):
+            with _storage.open(nombre, 'rb') as archivo:
+                return archivo.read(), etag
+    except OSError as e:
+        logger.warning(f"No se pudo leer QR en cache {nombre}: {e}")
+
+    datos = _renderizar(contenido, tamano, formato, borde)
+    try:
+        if not _storage.exists(nombre):
+            _storage.save(nombre, ContentFile(datos))
+    except OSError as e:
+        # El cache es una optimizacion: si el disco falla se sirve igual
+        logger.warning(f"No se pudo guardar QR en cache {nombre}: {e}")
+    return datos, etag
+
+
+def obtener_qr_svg(contenido, tamano=8, borde=2):
+    """SVG del QR como texto, listo para insertarse en linea en HTML."""
+    datos, _ = obtener_qr(contenido, tamano, 'svg', borde)
+    texto = datos.decode('utf-8')
+    # Quitar la declaracion XML para poder incrustarlo en HTML
+    if texto.startswith('<?xml'):
+        texto = texto[texto.index('?>') + 2:].lstrip()
+    return texto
+
+
+def pregenerar_qrs(contenidos, tamano=8, formato='png', borde=2, max_workers=4):
+    """
+    Genera en paralelo los QR que falten en el cache.
+    Retorna la lista de etags en el mismo orden que `contenidos`.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        resultados = executor.map(
+            lambda contenido: obtener_qr(contenido, tamano, formato, borde)[1],
+            contenidos,
+        )
+        return list(resultados)
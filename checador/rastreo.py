@@ -0,0 +1,92 @@
+"""
+Rastreo de cambios en modelos sin consultas adicionales.
+
+Los modelos que heredan de RastreoCambiosMixin guardan, al cargarse de la
+base de datos (from_db), el valor de los campos listados en
+`campos_rastreados`. Así las señales pueden saber el valor anterior sin
+volver a consultar la fila:
+
+    class Ticket(RastreoCambiosMixin, models.Model):
+        campos_rastreados = ('estado',)
+
+    ticket.has_changed('estado')
+    ticket.previous('estado')
+
+El valor anterior sigue disponible en pre_save y post_save; se actualiza
+al terminar save().
+"""
+
+
+class RastreoCambiosMixin:
+    """Registra los valores cargados de la BD de `campos_rastreados`."""
+
+    campos_rastreados = ()
+
+    @classmethod
+    def _attnames_rastreados(cls):
+        return {cls._meta.get_field(campo).attname for campo in cls.campos_rastreados}
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instancia = super().from_db(db, field_names, values)
+        rastreados = cls._attnames_rastreados()
+        instancia._valores_cargados = {
+            nombre: valor
+            for nombre, valor in zip(field_names, values)
+            if nombre in rastreados
+        }
+        return instancia
+
+    def _attname(self, campo):
+        return self._meta.get_field(campo).attname
+
+    def _valor_actual(self, campo):
+        valor = getattr(self, self._attname(campo))
+        # FileField/ImageField: la BD guarda solo el nombre
+        return getattr(valor, 'name', valor)
+
+    def previous(self, campo):
+        """
+        Valor del campo al cargarse de la BD; None si la instancia es nueva.
+        Si el campo no se cargó (only/defer) se consulta una sola vez.
+        """
+        attname = self._attname(campo)
+        if attname not in self._attnames_rastreados():
+            raise ValueError(f"El campo '{campo}' no está en campos_rastreados")
+        if self._state.adding or self.pk is None:
+            return None
+        cargados = self.__dict__.setdefault('_valores_cargados', {})
+        if attname not in cargados:
+            cargados[attname] = (
+                type(self)._base_manager.using(self._state.db)
+                .filter(pk=self.pk)
+                .values_list(attname, flat=True)
+                .first()
+            )
+        return cargados[attname]
+
+    def has_changed(self, campo):
+        """True si el campo cambió desde que se cargó (o si la instancia es nueva)."""
+        if self._state.adding or self.pk is None:
+            return True
+        return self.previous(campo) != self._valor_actual(campo)
+
+    def _actualizar_valores_cargados(self, campos=None):
+        cargados = self.__dict__.setdefault('_valores_cargados', {})
+        for campo in self.campos_rastreados:
+            attname = self._attname(campo)
+            if campos is not None and campo not in campos and attname not in campos:
+                continue
+            if attname in self.__dict__:
+                cargados[attname] = self._valor_actual(campo)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._actualizar_valores_cargados(kwargs.get('update_fields'))
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        campos = kwargs.get('fields')
+        if campos is None and len(args) > 1:
+            campos = args[1]
+        self._actualizar_valores_cargados(campos)
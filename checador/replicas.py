@@ -0,0 +1,140 @@
+"""
+Lecturas pesadas contra una réplica de solo lectura.
+
+Si DATABASE_REPLICA_URL está configurada, settings agrega el alias
+'replica'. Los cálculos de reportes, dashboards y métricas se marcan con
+@lectura_replica() y sus consultas van a la réplica; todo lo demás (el
+kiosco, formularios, APIs de escritura) sigue usando 'default', así que un
+reporte grande no compite con las checadas.
+
+Leer lo propio (read-your-writes): cualquier escritura fija el contexto a
+la base principal durante REPLICA_FIJAR_SEGUNDOS, lo que cubre el retraso
+de replicación. En peticiones, ReplicaMiddleware guarda esa ventana en una
+cookie para que la siguiente página del mismo usuario tampoco lea datos
+atrasados.
+
+Sin réplica configurada, o si no responde, todo va a 'default'.
+"""
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+ALIAS_REPLICA = 'replica'
+COOKIE_FIJAR = 'fijar_primaria'
+# Segundos que la réplica se da por caída después de un error de conexión
+ESPERA_REPLICA_CAIDA = 30
+
+# Sesión y cache en base de datos: se escriben en cada petición sin que eso
+# deba fijarla, y se leen justo después de escribirse; siempre en la principal
+APPS_SOLO_PRINCIPAL = {'sessions', 'django_cache'}
+
+_lectura = contextvars.ContextVar('lectura_replica', default=False)
+_fijado_hasta = contextvars.ContextVar('replica_fijado_hasta', default=0.0)
+_caida_hasta = 0.0
+
+
+def replica_configurada():
+    return ALIAS_REPLICA in settings.DATABASES
+
+
+def _replica_disponible():
+    global _caida_hasta
+    if time.monotonic() < _caida_hasta:
+        return False
+    try:
+        connections[ALIAS_REPLICA].ensure_connection()
+    except DatabaseError as e:
+        _caida_hasta = time.monotonic() + ESPERA_REPLICA_CAIDA
+        logger.warning(f"Réplica no disponible, leyendo de la principal por {ESPERA_REPLICA_CAIDA}s: {e}")
+        return False
+    return True
+
+
+def fijar_principal(segundos=None):
+    """Las lecturas de este contexto van a la principal durante `segundos`."""
+    if segundos is None:
+        segundos = settings.REPLICA_FIJAR_SEGUNDOS
+    _fijado_hasta.set(max(_fijado_hasta.get(), time.monotonic() + segundos))
+
+
+def fijado_a_principal():
+    return time.monotonic() < _fijado_hasta.get()
+
+
+@contextmanager
+def lectura_replica():
+    """
+    Las lecturas dentro del bloque (o de la función decorada) pueden ir a
+    la réplica. Sirve como decorador: @lectura_replica()
+    """
+    token = _lectura.set(True)
+    try:
+        yield
+    finally:
+        _lectura.reset(token)
+
+
+class ReplicaRouter:
+    """Lecturas marcadas a la réplica; escrituras y migraciones a 'default'."""
+
+    def db_for_read(self, model, **hints):
+        if (
+            not _lectura.get()
+            or model._meta.app_label in APPS_SOLO_PRINCIPAL
+            or not replica_configurada()
+            or fijado_a_principal()
+            # Dentro de una transacción se lee lo que ella misma escribió
+            or connections['default'].in_atomic_block
+        ):
+            return None
+        return ALIAS_REPLICA if _replica_disponible() else None
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label not in APPS_SOLO_PRINCIPAL:
+            fijar_principal()
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # La réplica es copia de 'default': un objeto leído de una se puede
+        # relacionar con uno de la otra
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != ALIAS_REPLICA
+
+
+class ReplicaMiddleware:
+    """
+    Aísla la ventana de lectura-de-lo-propio por petición y la pasa a la
+    siguiente petición del mismo navegador mediante una cookie.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_configurada():
+            return self.get_response(request)
+
+        try:
+            restante = float(request.COOKIES.get(COOKIE_FIJAR, 0)) - time.time()
+        except ValueError:
+            restante = 0
+        token = _fijado_hasta.set(time.monotonic() + restante if restante > 0 else 0.0)
+        try:
+            response = self.get_response(request)
+            restante = _fijado_hasta.get() - time.monotonic()
+            if restante > 0:
+                response.set_cookie(
+                    COOKIE_FIJAR, f'{time.time() + restante:.3f}',
+                    max_age=int(restante) + 1, httponly=True, samesite='Lax',
+                )
+        finally:
+            _fijado_hasta.reset(token)
+        return response
@@ -14,6 +14,7 @@ from pathlib import Path
 from datetime import timedelta
 from decouple import config
 import os
+import sys
 
 # Función helper para obtener variables de entorno
 def get_env(key, default=None, cast=None):
@@ -68,11 +69,15 @@ INSTALLED_APPS = [
     'visitas',
     'reportes',
     'it_tickets',
+    'correos',
+    'folios',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Serve static files
+    'checador.consultas.ConsultasMiddleware',  # Consultas SQL por vista (muestreo)
+    'checador.replicas.ReplicaMiddleware',  # Leer lo propio tras escribir (si hay réplica)
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -108,10 +113,15 @@ WSGI_APPLICATION = 'checador.wsgi.application'
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
 # Default database configuration (SQLite for development)
+# Las pruebas con SQLite usan un archivo en lugar de la BD en memoria: las
+# de concurrencia (folios) necesitan que varias conexiones se bloqueen entre sí
+PRUEBAS_SQLITE = {'NAME': BASE_DIR / 'test_db.sqlite3'}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'TEST': PRUEBAS_SQLITE,
     }
 }
 
@@ -161,6 +171,90 @@ else:
 MEDIA_URL = '/media/checador/'
 MEDIA_ROOT = BASE_DIR / get_env('MEDIA_ROOT', default='media/checador/')
 
+# Cache de codigos QR pre-renderizados (disco local, se regenera si se borra)
+QR_CACHE_DIR = BASE_DIR / get_env('QR_CACHE_DIR', default='tmp/qr_cache/')
+
+# Cache compartido entre workers (ver checador/cache.py)
+#   file:   disco local, para una sola instancia (default en desarrollo);
+#           no se comparte entre contenedores: el scheduler no vería las
+#           invalidaciones que hace la web ni al revés
+#   db:     tabla checador_cache (python manage.py createcachetable),
+#           compartida entre instancias/procesos sin servicios extra
+#           (default con DATABASE_URL)
+#   redis:  REDIS_URL (default si está definida)
+#   locmem: solo para pruebas; no se comparte entre workers
+_CACHE_BACKENDS = {
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': str(BASE_DIR / get_env('CACHE_DIR', default='tmp/cache/')),
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    'db': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'checador_cache',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': get_env('REDIS_URL', default='redis://127.0.0.1:6379/1'),
+    },
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+CACHE_BACKEND = get_env(
+    'CACHE_BACKEND',
+    default='redis' if 'REDIS_URL' in os.environ else 'db' if 'DATABASE_URL' in os.environ else 'file',
+)
+CACHES = {
+    'default': {
+        **_CACHE_BACKENDS[CACHE_BACKEND],
+        'KEY_PREFIX': 'checador',
+        'TIMEOUT': 300,
+    }
+}
+
+# Instrumentacion de consultas (checador/consultas.py)
+# Fraccion de peticiones medidas: todas en desarrollo, 5% en produccion y
+# ninguna en las pruebas (el JSON por peticion se mezclaria con su salida)
+EN_PRUEBAS = sys.argv[1:2] == ['test'] or 'pytest' in sys.modules
+CONSULTAS_MUESTREO = float(get_env(
+    'CONSULTAS_MUESTREO', default='0' if EN_PRUEBAS else '1' if DEBUG else '0.05'
+))
+# Maximo de consultas por vista (view_name); las que lo pasan se registran como warning
+CONSULTAS_PRESUPUESTO_DEFAULT = get_env('CONSULTAS_PRESUPUESTO_DEFAULT', default='50', cast=int)
+CONSULTAS_PRESUPUESTOS = {}
+# Archivo JSON lines opcional para `python manage.py perf_report`
+CONSULTAS_LOG_ARCHIVO = get_env('CONSULTAS_LOG_ARCHIVO', default=None)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'mensaje': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'consultas_consola': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'mensaje',
+        },
+    },
+    'loggers': {
+        'checador.consultas': {
+            'handlers': ['consultas_consola'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+if CONSULTAS_LOG_ARCHIVO:
+    LOGGING['handlers']['consultas_archivo'] = {
+        'class': 'logging.handlers.WatchedFileHandler',
+        'filename': CONSULTAS_LOG_ARCHIVO,
+        'formatter': 'mensaje',
+    }
+    LOGGING['loggers']['checador.consultas']['handlers'].append('consultas_archivo')
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -200,11 +294,48 @@ if 'DIGITALOCEAN_APP_DOMAIN' in os.environ:
     if domain not in CSRF_TRUSTED_ORIGINS:
         CSRF_TRUSTED_ORIGINS.append(domain)
 
+# Conexiones por tipo de proceso (ver checador/conexiones.py)
+#   web:       gunicorn / runserver (un hilo por petición)
+#   scheduler: run_scheduler o `scheduler start`, que lo invoca (hasta 10
+#              hilos de jobs de APScheduler)
+#   worker:    el resto de los comandos de manage.py
+# Se detecta por el comando; TIPO_PROCESO en el entorno lo fuerza.
+def _tipo_proceso(argv):
+    if len(argv) > 1 and os.path.basename(argv[0]) == 'manage.py':
+        if argv[1] == 'run_scheduler' or (argv[1] == 'scheduler' and 'start' in argv[2:]):
+            return 'scheduler'
+        if argv[1] != 'runserver':
+            return 'worker'
+    return 'web'
+
+
+TIPO_PROCESO = get_env('TIPO_PROCESO', default=_tipo_proceso(sys.argv))
+# Pool nativo de Django con psycopg 3 (solo PostgreSQL). Sin pool, cada hilo
+# mantiene su propia conexión persistente durante DB_CONN_MAX_AGE segundos.
+DB_POOL = get_env('DB_POOL', default='False', cast=bool)
+DB_POOL_TAMANOS = {
+    # tipo: (min_size, max_size) por proceso; multiplicar por el número de
+    # procesos (workers de gunicorn) para no pasar max_connections
+    'web': (get_env('DB_POOL_WEB_MIN', default='1', cast=int),
+            get_env('DB_POOL_WEB_MAX', default='4', cast=int)),
+    'scheduler': (get_env('DB_POOL_SCHEDULER_MIN', default='1', cast=int),
+                  get_env('DB_POOL_SCHEDULER_MAX', default='5', cast=int)),
+    'worker': (get_env('DB_POOL_WORKER_MIN', default='1', cast=int),
+               get_env('DB_POOL_WORKER_MAX', default='2', cast=int)),
+}
+# Segundos que una petición espera una conexión libre antes de PoolTimeout
+DB_POOL_TIMEOUT = get_env('DB_POOL_TIMEOUT', default='10', cast=float)
+DB_CONN_MAX_AGE = {
+    'web': get_env('DB_CONN_MAX_AGE_WEB', default='600', cast=int),
+    'scheduler': get_env('DB_CONN_MAX_AGE_SCHEDULER', default='60', cast=int),
+    'worker': get_env('DB_CONN_MAX_AGE_WORKER', default='0', cast=int),
+}
+
 # Database configuration from DATABASE_URL (for production)
 if 'DATABASE_URL' in os.environ:
     import dj_database_url
     db_config = dj_database_url.config(
-        conn_max_age=600,
+        conn_max_age=DB_CONN_MAX_AGE[TIPO_PROCESO],
         conn_health_checks=True,
     )
     # Configure SSL based on database engine
@@ -213,15 +344,47 @@ if 'DATABASE_URL' in os.environ:
         db_config['OPTIONS'] = {
             'sslmode': 'require',
         }
+        if DB_POOL:
+            pool_min, pool_max = DB_POOL_TAMANOS[TIPO_PROCESO]
+            db_config['OPTIONS']['pool'] = {
+                'min_size': pool_min,
+                'max_size': pool_max,
+                'timeout': DB_POOL_TIMEOUT,
+                'max_idle': 300,
+                'name': f'checador-{TIPO_PROCESO}',
+            }
+            # Con pool, "cerrar" devuelve la conexión al pool; Django exige CONN_MAX_AGE=0
+            db_config['CONN_MAX_AGE'] = 0
     elif 'mysql' in db_engine:
         db_config['OPTIONS'] = {
             'ssl': {'ssl-mode': 'REQUIRED'},
             'charset': 'utf8mb4',
         }
+    elif 'sqlite' in db_engine:
+        db_config['TEST'] = PRUEBAS_SQLITE
     DATABASES = {
         'default': db_config
     }
 
+# Réplica de solo lectura para reportes y dashboards (ver checador/replicas.py)
+# En local se puede probar con dos archivos SQLite:
+#   DATABASE_REPLICA_URL=sqlite:////ruta/replica.sqlite3
+if 'DATABASE_REPLICA_URL' in os.environ:
+    import dj_database_url
+    DATABASES['replica'] = dj_database_url.parse(
+        os.environ['DATABASE_REPLICA_URL'],
+        conn_max_age=DB_CONN_MAX_AGE[TIPO_PROCESO],
+        conn_health_checks=True,
+    )
+    if 'postgresql' in DATABASES['replica'].get('ENGINE', ''):
+        DATABASES['replica']['OPTIONS'] = {'sslmode': 'require'}
+    # En las pruebas la réplica es la misma base de prueba que 'default'
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+DATABASE_ROUTERS = ['checador.replicas.ReplicaRouter']
+# Segundos que las lecturas de un usuario van a la principal después de que
+# escribe (cubre el retraso de replicación)
+REPLICA_FIJAR_SEGUNDOS = get_env('REPLICA_FIJAR_SEGUNDOS', default='5', cast=float)
+
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
@@ -260,13 +423,21 @@ CORS_ALLOWED_ORIGINS = [
 CORS_ALLOW_CREDENTIALS = True
 
 # Configuración de Email con SendGrid
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+# En pruebas/desarrollo se puede usar django.core.mail.backends.locmem.EmailBackend
+# o django.core.mail.backends.filebased.EmailBackend (con EMAIL_FILE_PATH)
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
+EMAIL_FILE_PATH = config('EMAIL_FILE_PATH', default=str(BASE_DIR / 'tmp' / 'correos'))
 EMAIL_HOST = 'smtp.sendgrid.net'
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
 EMAIL_HOST_USER = 'apikey'
 EMAIL_HOST_PASSWORD = config('SENDGRID_API_KEY', default=None)
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='Sistema de Checador <notificaciones@loginco.com.mx>')
+
+# Bandeja de salida (app correos)
+CORREOS_LOTE = config('CORREOS_LOTE', default=50, cast=int)
+CORREOS_MAX_INTENTOS = config('CORREOS_MAX_INTENTOS', default=5, cast=int)
+CORREOS_INTERVALO_SEGUNDOS = config('CORREOS_INTERVALO_SEGUNDOS', default=30, cast=int)
 # === CONFIGURACIÓN DE DIGITALOCEAN SPACES ===
 # Solo configurar si USE_SPACES está habilitado
 if config('USE_SPACES', default=False, cast=bool):
@@ -316,6 +487,18 @@ else:
 FILE_UPLOAD_HANDLERS = [
     'django.core.files.uploadhandler.TemporaryFileUploadHandler',
 ]
+# === CONFIGURACIÓN DE RECONOCIMIENTO FACIAL ===
+# Clase del motor (registros/services/reconocimiento.py). La prueba de carga
+# (`python manage.py prueba_carga`) levanta su servidor con el motor sintético
+# registros.services.motor_sintetico.MotorSintetico.
+RECONOCIMIENTO_MOTOR = get_env(
+    'RECONOCIMIENTO_MOTOR',
+    default='registros.services.facial_recognition.FacialRecognitionService',
+)
+# Lado máximo (px) de la foto de checada que se decodifica en memoria con
+# OpenCV (registros/services/imagen.py); el kiosco escala a este tamaño
+CHECADA_FOTO_LADO_MAXIMO = get_env('CHECADA_FOTO_LADO_MAXIMO', default='640', cast=int)
+
 # === CONFIGURACIÓN PARA REPORTES ===
 # Directorio específico para archivos temporales de reportes
 REPORTES_TEMP_DIR = 'reportes/temp'
@@ -241,6 +241,8 @@ class FileUploadMiddleware:
 from django.db.models.signals import post_delete, pre_save
 from django.dispatch import receiver
 
+from checador.rastreo import RastreoCambiosMixin
+
 @receiver(post_delete)
 def delete_file_on_model_delete(sender, instance, **kwargs):
     """
@@ -254,23 +256,39 @@ def delete_file_on_model_delete(sender, instance, **kwargs):
                 delete_file_from_storage(file_field.name)
 
 @receiver(pre_save)
-def delete_old_file_on_change(sender, instance, **kwargs):
+def delete_old_file_on_change(sender, instance, update_fields=None, **kwargs):
     """
     Elimina archivo anterior cuando se actualiza con uno nuevo
     """
-    if not instance.pk:
+    if not instance.pk or instance._state.adding:
         return  # Es un nuevo objeto, no hay archivo anterior
-    
-    try:
-        old_instance = sender.objects.get(pk=instance.pk)
-    except sender.DoesNotExist:
+
+    # Solo campos de archivo que se van a guardar; los modelos sin archivos
+    # no consultan nada
+    campos = [
+        field for field in instance._meta.concrete_fields
+        if hasattr(field, 'upload_to')
+        and (update_fields is None or field.name in update_fields)
+    ]
+    if not campos:
         return
-    
-    # Verificar campos de archivo
-    for field in instance._meta.fields:
-        if hasattr(field, 'upload_to'):
-            old_file = getattr(old_instance, field.name)
-            new_file = getattr(instance, field.name)
-            
-            if old_file and old_file != new_file:
-                delete_file_from_storage(old_file.name)
\ No newline at end of file
+
+    if isinstance(instance, RastreoCambiosMixin) and all(
+        field.name in instance.campos_rastreados for field in campos
+    ):
+        # Valores cargados de la BD, sin consulta adicional
+        anteriores = {field.attname: instance.previous(field.name) for field in campos}
+    else:
+        anteriores = sender._base_manager.filter(pk=instance.pk).values(
+            *[field.attname for field in campos]
+        ).first()
+        if anteriores is None:
+            return
+
+    for field in campos:
+        old_name = anteriores.get(field.attname)
+        new_file = getattr(instance, field.attname)
+        new_name = new_file.name if new_file else None
+
+        if old_name and old_name != new_name:
+            delete_file_from_storage(old_name)
@@ -0,0 +1,432 @@
+from datetime import date
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.response import Response
+
+from empleados.models import Empleado
+from it_tickets.models import EquipoComputo
+from organizacion.models import Departamento
+from registros.models import RegistroAsistencia
+
+from . import cache as cache_proyecto, datos_sinteticos
+from .conexiones import _resumen_pool, estadisticas_conexiones
+from .consultas import MedidorConsultas, huella_sql
+from . import planes, replicas
+from .paginacion import ANTERIOR, codificar_cursor, paginar_por_llave
+from .pruebas import PresupuestoConsultasMixin, PresupuestoExcedido
+
+
+class HuellaSqlTests(TestCase):
+
+    def test_normaliza_literales_y_listas_in(self):
+        self.assertEqual(
+            huella_sql("SELECT * FROM t WHERE id IN (%s, %s, %s) AND n = 'x'  LIMIT 21"),
+            "SELECT * FROM t WHERE id IN (...) AND n = ? LIMIT ?",
+        )
+        self.assertEqual(
+            huella_sql('SELECT * FROM t WHERE id IN (%s)'),
+            huella_sql('SELECT * FROM t WHERE id IN (%s, %s)'),
+        )
+
+
+class MedidorConsultasTests(PresupuestoConsultasMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(3):
+            User.objects.create_user(f'medidor{i}')
+
+    def test_detecta_consultas_repetidas(self):
+        with MedidorConsultas() as medidor:
+            for user in User.objects.all():
+                User.objects.get(pk=user.pk)
+        self.assertEqual(medidor.total, 4)
+        self.assertEqual(medidor.repetidas()[0][1], 3)
+        resumen = medidor.resumen()
+        self.assertEqual(resumen['consultas'], 4)
+        self.assertIsNotNone(resumen['mas_lenta'])
+
+    def test_presupuesto(self):
+        with self.assertPresupuestoConsultas(1):
+            list(User.objects.all())
+        with self.assertRaises(PresupuestoExcedido):
+            with self.assertPresupuestoConsultas(10, max_repetidas=1):
+                for user in User.objects.all():
+                    User.objects.get(pk=user.pk)
+
+
+CACHE_PRUEBAS = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=CACHE_PRUEBAS)
+class CacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        cache_proyecto.reiniciar_estadisticas()
+
+    def test_invalidar_incrementa_la_version(self):
+        version = cache_proyecto.version_espacio('prueba')
+        self.assertEqual(cache_proyecto.version_espacio('prueba'), version)
+        llave = cache_proyecto.clave('prueba', 'a')
+
+        cache_proyecto.invalidar_espacio('prueba')
+
+        self.assertEqual(cache_proyecto.version_espacio('prueba'), version + 1)
+        self.assertNotEqual(cache_proyecto.clave('prueba', 'a'), llave)
+
+    def test_invalidar_un_espacio_sin_version_la_crea(self):
+        cache_proyecto.invalidar_espacio('nuevo')
+        self.assertIsNotNone(cache.get(cache_proyecto._clave_version('nuevo')))
+
+    def test_clave_larga_o_con_espacios_se_resume(self):
+        version = cache_proyecto.version_espacio('prueba')
+        self.assertEqual(cache_proyecto.clave('prueba', 'a', 1), f'prueba:v{version}:a:1')
+        for partes in (('x' * 300,), ('dos palabras',)):
+            resumen = cache_proyecto.clave('prueba', *partes).rsplit(':', 1)[1]
+            self.assertEqual(len(resumen), 40)
+
+    def test_senales_invalidan_al_confirmar(self):
+        self.assertEqual(cache_proyecto.obtener_o_calcular('organigrama', ['arbol'], lambda: 'v1'), 'v1')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Departamento.objects.create(nombre='Compras', codigo='COMP')
+            # Hasta confirmar la transacción se sigue leyendo la versión anterior
+            self.assertEqual(cache_proyecto.obtener_o_calcular('organigrama', ['arbol'], lambda: 'v2'), 'v1')
+
+        self.assertEqual(cache_proyecto.obtener_o_calcular('organigrama', ['arbol'], lambda: 'v2'), 'v2')
+
+    def test_respuesta_cacheada_por_ruta_y_por_usuario(self):
+        llamadas = []
+
+        class Vista:
+            @cache_proyecto.respuesta_cacheada('prueba')
+            def list(self, request):
+                llamadas.append(request.get_full_path())
+                return Response({'n': len(llamadas)})
+
+            @cache_proyecto.respuesta_cacheada('prueba', por_usuario=True)
+            def retrieve(self, request):
+                llamadas.append(request.user.pk)
+                return Response({'usuario': request.user.pk})
+
+        fabrica = RequestFactory()
+        uno, dos = User.objects.create_user('cache1'), User.objects.create_user('cache2')
+
+        def get(ruta, usuario=uno):
+            request = fabrica.get(ruta)
+            request.user = usuario
+            return request
+
+        vista = Vista()
+        self.assertEqual(vista.list(get('/x/?page=1')).data, {'n': 1})
+        self.assertEqual(vista.list(get('/x/?page=1')).data, {'n': 1})
+        self.assertEqual(vista.list(get('/x/?page=2')).data, {'n': 2})
+
+        self.assertEqual(vista.retrieve(get('/y/', uno)).data, {'usuario': uno.pk})
+        self.assertEqual(vista.retrieve(get('/y/', dos)).data, {'usuario': dos.pk})
+        self.assertEqual(vista.retrieve(get('/y/', uno)).data, {'usuario': uno.pk})
+        self.assertEqual(len(llamadas), 4)
+
+    def test_estadisticas_envian_los_contadores_pendientes(self):
+        for _ in range(3):
+            cache_proyecto.obtener_o_calcular('prueba', ['a'], lambda: 1)
+        cache_proyecto.obtener_o_calcular('prueba', ['b'], lambda: 2)
+
+        self.assertEqual(
+            cache_proyecto.estadisticas_cache()['prueba'],
+            {'aciertos': 2, 'fallos': 2, 'tasa_aciertos': 0.5},
+        )
+        # Una segunda lectura no vuelve a sumar lo ya enviado
+        self.assertEqual(cache_proyecto.estadisticas_cache()['prueba']['aciertos'], 2)
+
+        cache_proyecto.reiniciar_estadisticas()
+        self.assertEqual(cache_proyecto.estadisticas_cache(), {})
+
+
+class DatosSinteticosTests(TestCase):
+
+    def _generar(self):
+        return datos_sinteticos.generar(empleados=25, dias=20, semilla=7, hasta=date(2026, 3, 31))
+
+    def test_es_determinista_y_limpiar_borra_todo(self):
+        primero = self._generar()
+        horas = list(
+            RegistroAsistencia.objects.order_by('fecha', 'empleado__codigo_empleado')
+            .values_list('empleado__codigo_empleado', 'fecha', 'hora_entrada')
+        )
+        self.assertGreater(primero.filas['registros.RegistroAsistencia'], 0)
+        self.assertGreater(datos_sinteticos.limpiar(), 0)
+        self.assertFalse(User.objects.filter(username__startswith=datos_sinteticos.PREFIJO_USUARIO).exists())
+        self.assertFalse(RegistroAsistencia.objects.exists())
+
+        segundo = self._generar()
+        self.assertEqual(primero.filas, segundo.filas)
+        self.assertEqual(horas, list(
+            RegistroAsistencia.objects.order_by('fecha', 'empleado__codigo_empleado')
+            .values_list('empleado__codigo_empleado', 'fecha', 'hora_entrada')
+        ))
+
+    @override_settings(DEBUG=False)
+    def test_limpiar_sin_debug_exige_permiso_explicito(self):
+        self._generar()
+        with self.assertRaises(CommandError):
+            call_command('generar_datos_sinteticos', '--limpiar')
+        self.assertTrue(RegistroAsistencia.objects.exists())
+
+        call_command('generar_datos_sinteticos', '--limpiar', '--permitir-sin-debug', stdout=StringIO())
+        self.assertFalse(RegistroAsistencia.objects.exists())
+
+
+class ConexionesTests(TestCase):
+
+    def test_resumen_pool(self):
+        resumen = _resumen_pool({
+            'pool_min': 1, 'pool_max': 4, 'pool_size': 3, 'pool_available': 1,
+            'requests_num': 10, 'requests_wait_ms': 50, 'requests_queued': 2,
+            'connections_num': 3, 'connections_ms': 30,
+        })
+        self.assertEqual(resumen['en_uso'], 2)
+        self.assertEqual(resumen['utilizacion'], 0.5)
+        self.assertEqual(resumen['espera_promedio_ms'], 5)
+        self.assertEqual(resumen['apertura_promedio_ms'], 10)
+
+    def test_sin_pool_reporta_conn_max_age(self):
+        datos = estadisticas_conexiones()['default']
+        self.assertIsNone(datos['pool'])
+        self.assertIn('conn_max_age', datos)
+
+    def test_tipo_de_proceso_por_comando(self):
+        from checador.settings import _tipo_proceso
+
+        self.assertEqual(_tipo_proceso(['manage.py', 'run_scheduler']), 'scheduler')
+        self.assertEqual(_tipo_proceso(['manage.py', 'scheduler', 'start']), 'scheduler')
+        self.assertEqual(_tipo_proceso(['manage.py', 'scheduler', 'status']), 'worker')
+        self.assertEqual(_tipo_proceso(['manage.py', 'detectar_incidencias']), 'worker')
+        self.assertEqual(_tipo_proceso(['manage.py', 'runserver']), 'web')
+        self.assertEqual(_tipo_proceso(['gunicorn', 'checador.wsgi']), 'web')
+
+
+@mock.patch('checador.replicas._replica_disponible', return_value=True)
+@mock.patch('checador.replicas.replica_configurada', return_value=True)
+class ReplicaRouterTests(SimpleTestCase):
+
+    def setUp(self):
+        self.router = replicas.ReplicaRouter()
+        token = replicas._fijado_hasta.set(0.0)
+        self.addCleanup(replicas._fijado_hasta.reset, token)
+
+    def test_solo_lecturas_marcadas_van_a_la_replica(self, *mocks):
+        self.assertIsNone(self.router.db_for_read(User))
+        with replicas.lectura_replica():
+            self.assertEqual(self.router.db_for_read(User), replicas.ALIAS_REPLICA)
+        self.assertEqual(self.router.db_for_write(User), 'default')
+
+    def test_escritura_fija_la_principal(self, *mocks):
+        self.router.db_for_write(User)
+        with replicas.lectura_replica():
+            self.assertIsNone(self.router.db_for_read(User))
+
+    def test_sin_replica_disponible_lee_de_default(self, configurada, disponible):
+        disponible.return_value = False
+        with replicas.lectura_replica():
+            self.assertIsNone(self.router.db_for_read(User))
+
+    def test_middleware_pasa_la_ventana_a_la_siguiente_peticion(self, *mocks):
+        def escribe(request):
+            replicas.fijar_principal(60)
+            return HttpResponse()
+
+        def lee(request):
+            with replicas.lectura_replica():
+                return HttpResponse(str(self.router.db_for_read(User)))
+
+        factory = RequestFactory()
+        response = replicas.ReplicaMiddleware(escribe)(factory.get('/'))
+        cookie = response.cookies[replicas.COOKIE_FIJAR].value
+
+        self.assertEqual(replicas.ReplicaMiddleware(lee)(factory.get('/')).content, b'replica')
+        factory.cookies[replicas.COOKIE_FIJAR] = cookie
+        self.assertEqual(replicas.ReplicaMiddleware(lee)(factory.get('/')).content, b'None')
+
+
+class PlanesTests(TestCase):
+
+    def test_detecta_scan_secuencial(self):
+        tabla = 'registros_registroasistencia'
+        self.assertEqual(
+            planes.escaneos_secuenciales('Seq Scan on registros_registroasistencia  (cost=0.00..1.00)', tabla, 'postgresql'),
+            ['Seq Scan on registros_registroasistencia  (cost=0.00..1.00)'],
+        )
+        self.assertEqual(
+            planes.escaneos_secuenciales(f'Index Scan using registros_fecha_retardo_idx on {tabla}', tabla, 'postgresql'),
+            [],
+        )
+        self.assertTrue(planes.escaneos_secuenciales(f'3 0 0 SCAN {tabla}', tabla, 'sqlite'))
+        self.assertFalse(planes.escaneos_secuenciales(f'4 0 0 SEARCH {tabla} USING INDEX x (fecha=?)', tabla, 'sqlite'))
+
+    def test_catalogo_tiene_indice(self):
+        if connection.vendor not in ('postgresql', 'sqlite'):
+            self.skipTest('EXPLAIN solo se interpreta en PostgreSQL y SQLite')
+        # Sin estadísticas el planificador de SQLite usa cualquier índice aplicable:
+        # una consulta del catálogo sin índice que la sostenga aparece aquí
+        for resultado in planes.verificar_planes(hoy=date(2026, 3, 31)):
+            self.assertFalse(resultado.secuencial, f'{resultado.consulta.nombre}: {resultado.escaneos}')
+
+
+class QrEquipoTests(TestCase):
+
+    def test_equipo_inexistente_responde_404_sin_generar_qr(self):
+        with mock.patch('it_tickets.views.obtener_qr') as obtener:
+            response = self.client.get(reverse('it_tickets:equipo_qr', args=[999999]))
+        self.assertEqual(response.status_code, 404)
+        obtener.assert_not_called()
+
+    def test_qr_de_un_solo_uso_no_usa_el_cache(self):
+        from . import qr
+
+        with mock.patch.object(qr, '_storage') as storage:
+            datos = qr.generar_qr('5f0c9e1a-uuid-de-visita', tamano=10, borde=4)
+        self.assertTrue(datos.startswith(b'\x89PNG'))
+        storage.save.assert_not_called()
+        storage.exists.assert_not_called()
+
+
+class RastreoCambiosTests(TestCase):
+
+    def setUp(self):
+        self.jefe = Empleado.objects.create(user=User.objects.create_user('jefe'), codigo_empleado='JEFE')
+        self.otro = Empleado.objects.create(user=User.objects.create_user('otro'), codigo_empleado='OTRO')
+        Empleado.objects.create(
+            user=User.objects.create_user('emp'), codigo_empleado='EMP', supervisor_directo=self.jefe
+        )
+
+    def _cargar(self, *only):
+        qs = Empleado.objects.only(*only) if only else Empleado.objects.all()
+        return qs.get(codigo_empleado='EMP')
+
+    def test_instancia_nueva(self):
+        empleado = Empleado(codigo_empleado='NUEVO')
+        self.assertTrue(empleado.has_changed('supervisor_directo'))
+        self.assertIsNone(empleado.previous('supervisor_directo'))
+
+    def test_al_cargar_no_hay_cambios_ni_consultas(self):
+        empleado = self._cargar()
+        with self.assertNumQueries(0):
+            self.assertFalse(empleado.has_changed('supervisor_directo'))
+            empleado.supervisor_directo = self.otro
+            self.assertTrue(empleado.has_changed('supervisor_directo'))
+            self.assertEqual(empleado.previous('supervisor_directo'), self.jefe.pk)
+
+    def test_save_actualiza_el_valor_cargado(self):
+        empleado = self._cargar()
+        empleado.supervisor_directo = self.otro
+        empleado.save()
+        self.assertFalse(empleado.has_changed('supervisor_directo'))
+        self.assertEqual(empleado.previous('supervisor_directo'), self.otro.pk)
+
+    def test_save_con_update_fields_solo_actualiza_esos_campos(self):
+        empleado = self._cargar()
+        empleado.supervisor_directo = self.otro
+        empleado.save(update_fields=['puesto'])
+        self.assertTrue(empleado.has_changed('supervisor_directo'))
+        self.assertEqual(empleado.previous('supervisor_directo'), self.jefe.pk)
+
+    def test_refresh_from_db_toma_el_valor_de_la_bd(self):
+        empleado = self._cargar()
+        Empleado.objects.filter(pk=empleado.pk).update(supervisor_directo=self.otro)
+        empleado.refresh_from_db()
+        self.assertFalse(empleado.has_changed('supervisor_directo'))
+        self.assertEqual(empleado.previous('supervisor_directo'), self.otro.pk)
+
+    def test_campo_diferido_se_consulta_una_vez(self):
+        empleado = self._cargar('codigo_empleado')
+        with self.assertNumQueries(1):
+            self.assertEqual(empleado.previous('supervisor_directo'), self.jefe.pk)
+            self.assertEqual(empleado.previous('supervisor_directo'), self.jefe.pk)
+
+    def test_campo_diferido_cargado_al_leerlo(self):
+        empleado = self._cargar('codigo_empleado')
+        # Leer el campo diferido lo carga con refresh_from_db(fields=...)
+        self.assertEqual(empleado.supervisor_directo_id, self.jefe.pk)
+        with self.assertNumQueries(0):
+            self.assertFalse(empleado.has_changed('supervisor_directo'))
+        empleado.supervisor_directo = self.otro
+        self.assertTrue(empleado.has_changed('supervisor_directo'))
+
+    def test_campo_no_rastreado(self):
+        with self.assertRaises(ValueError):
+            self._cargar().previous('puesto')
+
+
+class PaginacionLlaveTests(TestCase):
+    orden = ('estado', 'marca', 'modelo', 'id')
+
+    @classmethod
+    def setUpTestData(cls):
+        # Muchos equipos con el mismo (estado, marca, modelo): el id desempata
+        for i in range(7):
+            EquipoComputo.objects.create(numero_serie=f'D{i}', marca='Dell', modelo='Latitude')
+        for i in range(3):
+            EquipoComputo.objects.create(numero_serie=f'H{i}', marca='HP', modelo='ProBook', estado='baja')
+        cls.esperados = list(
+            EquipoComputo.objects.order_by(*cls.orden).values_list('pk', flat=True)
+        )
+
+    def _pagina(self, cursor=None, direccion='siguiente'):
+        return paginar_por_llave(
+            EquipoComputo.objects.all(), self.orden, cursor=cursor, direccion=direccion, tamano=4
+        )
+
+    def _ids(self, pagina):
+        return [e.pk for e in pagina.objetos]
+
+    def test_avanza_y_regresa_sobre_prefijos_iguales(self):
+        paginas = [self._pagina()]
+        while paginas[-1].tiene_siguiente:
+            paginas.append(self._pagina(paginas[-1].cursor_siguiente))
+
+        self.assertEqual([len(p.objetos) for p in paginas], [4, 4, 2])
+        self.assertEqual(sum((self._ids(p) for p in paginas), []), self.esperados)
+        self.assertFalse(paginas[0].tiene_anterior)
+
+        anterior = self._pagina(paginas[2].cursor_anterior, ANTERIOR)
+        self.assertEqual(self._ids(anterior), self._ids(paginas[1]))
+        primera = self._pagina(anterior.cursor_anterior, ANTERIOR)
+        self.assertEqual(self._ids(primera), self._ids(paginas[0]))
+        self.assertFalse(primera.tiene_anterior)
+
+    def test_cursor_alterado_muestra_la_primera_pagina(self):
+        primera = self._ids(self._pagina())
+        for valores in (['a', 'b', 'c', 'x'], [1, 2, 3, [4]], [None] * 4, ['activo', 'Dell', 'Latitude']):
+            with self.subTest(valores=valores):
+                pagina = self._pagina(codificar_cursor(valores))
+                self.assertEqual(self._ids(pagina), primera)
+                self.assertFalse(pagina.tiene_anterior)
+        self.assertEqual(self._ids(self._pagina('no-es-base64!')), primera)
+
+    def test_pagina_vacia_tras_eliminar(self):
+        cursor = self._pagina().cursor_siguiente
+        EquipoComputo.objects.exclude(pk__in=self.esperados[:4]).delete()
+
+        pagina = self._pagina(cursor)
+
+        self.assertEqual(pagina.objetos, [])
+        self.assertFalse(pagina.tiene_otras_paginas)
+
+    def test_inventario_con_cursor_alterado_no_falla(self):
+        user = User.objects.create_user('it', is_superuser=True)
+        self.client.force_login(user)
+        response = self.client.get(
+            reverse('it_tickets:inventario_it'), {'cursor': codificar_cursor(['a', 'b', 'c', 'x'])}
+        )
+        self.assertEqual(response.status_code, 200)
@@ -29,6 +29,7 @@ from permisos.views import (
     nueva_solicitud_view,
     detalle_permiso_view,
     aprobar_permisos_view,
+    accion_masiva_permisos_view,
     accion_permiso_view,
 )
 from visitas.views import (
@@ -75,6 +76,7 @@ urlpatterns = [
     path('permisos/nueva/', nueva_solicitud_view, name='nueva_solicitud'),
     path('permisos/<int:pk>/', detalle_permiso_view, name='detalle_permiso'),
     path('permisos/aprobar/', aprobar_permisos_view, name='aprobar_permisos'),
+    path('permisos/accion-masiva/', accion_masiva_permisos_view, name='accion_masiva_permisos'),
     path('permisos/<int:pk>/<str:accion>/', accion_permiso_view, name='accion_permiso'),
 
     # Visitas
@@ -88,6 +90,10 @@ urlpatterns = [
     # API de autenticacion
     path('api/auth/', include('authentication.urls')),
 
+    # Estadisticas del cache (staff)
+    path('api/cache/estadisticas/', views.estadisticas_cache_view, name='estadisticas_cache'),
+    path('api/db/conexiones/', views.estadisticas_conexiones_view, name='estadisticas_conexiones'),
+
     # APIs principales
     path('api/empleados/', include('empleados.urls')),
     path('api/horarios/', include('horarios.urls')),
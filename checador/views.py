@@ -4,8 +4,12 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
 from django.contrib.auth.models import User
 from django.db.models import Count, Q
+from django.http import JsonResponse
 from django.utils import timezone
 from datetime import datetime, timedelta
+from checador.cache import cacheado, estadisticas_cache
+from checador.conexiones import estadisticas_conexiones
+from checador.replicas import lectura_replica
 from empleados.models import Empleado
 from registros.models import RegistroAsistencia
 from permisos.models import SolicitudPermiso
@@ -109,6 +113,7 @@ def logout_view(request):
 
 
 @login_required
+@lectura_replica()
 def dashboard_view(request):
     """Dashboard principal"""
     context = {
@@ -165,31 +170,52 @@ def dashboard_view(request):
 
     # Estadisticas para staff
     if request.user.is_staff:
-        hoy = timezone.now().date()
-        context['total_empleados'] = Empleado.objects.filter(activo=True).count()
-        context['registros_hoy'] = RegistroAsistencia.objects.filter(fecha=hoy).count()
-        context['empleados_sin_rostro'] = Empleado.objects.filter(
-            activo=True,
-            embedding_rostro__isnull=True
-        ).count()
+        context.update(_estadisticas_staff(timezone.now().date()))
 
-        # Permisos pendientes de aprobar
-        context['permisos_por_aprobar'] = SolicitudPermiso.objects.filter(
-            estado='pendiente'
-        ).count()
+    return render(request, 'dashboard.html', context)
 
+
+@cacheado('dashboard', ttl=60)
+def _estadisticas_staff(hoy):
+    """
+    Conteos globales del dashboard de staff. Se cachean en el espacio
+    'dashboard', que se invalida al cambiar empleados, registros,
+    permisos o visitas.
+    """
+    visitas = Visita.objects.filter(fecha_programada=hoy).aggregate(
+        total=Count('id'),
+        pendientes=Count('id', filter=Q(estado='pendiente')),
+        en_sitio=Count('id', filter=Q(estado='en_sitio')),
+    )
+    empleados = Empleado.objects.filter(activo=True).aggregate(
+        total=Count('id'),
+        sin_rostro=Count('id', filter=Q(embedding_rostro__isnull=True)),
+    )
+    return {
+        'total_empleados': empleados['total'],
+        'registros_hoy': RegistroAsistencia.objects.filter(fecha=hoy).count(),
+        'empleados_sin_rostro': empleados['sin_rostro'],
+        # Permisos pendientes de aprobar
+        'permisos_por_aprobar': SolicitudPermiso.objects.filter(estado='pendiente').count(),
         # Visitas del dia
-        context['visitas_hoy'] = Visita.objects.filter(fecha_programada=hoy).count()
-        context['visitas_pendientes'] = Visita.objects.filter(
-            fecha_programada=hoy,
-            estado='pendiente'
-        ).count()
-        context['visitas_en_sitio'] = Visita.objects.filter(
-            fecha_programada=hoy,
-            estado='en_sitio'
-        ).count()
+        'visitas_hoy': visitas['total'],
+        'visitas_pendientes': visitas['pendientes'],
+        'visitas_en_sitio': visitas['en_sitio'],
+    }
 
-    return render(request, 'dashboard.html', context)
+
+@login_required
+@user_passes_test(lambda u: u.is_staff)
+def estadisticas_cache_view(request):
+    """Aciertos y fallos del cache por espacio (solo staff)"""
+    return JsonResponse({'espacios': estadisticas_cache()})
+
+
+@login_required
+@user_passes_test(lambda u: u.is_staff)
+def estadisticas_conexiones_view(request):
+    """Pool de conexiones del worker que atiende la petición (solo staff)"""
+    return JsonResponse({'bases_de_datos': estadisticas_conexiones()})
 
 
 @login_required
@@ -0,0 +1,40 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import AdjuntoCorreo, CorreoSaliente, EstadoCorreo
+
+
+class AdjuntoCorreoInline(admin.TabularInline):
+    model = AdjuntoCorreo
+    extra = 0
+    fields = ('nombre', 'tipo_mime')
+    readonly_fields = ('nombre', 'tipo_mime')
+    can_delete = False
+
+
+@admin.register(CorreoSaliente)
+class CorreoSalienteAdmin(admin.ModelAdmin):
+    list_display = ('asunto', 'categoria', 'estado', 'intentos', 'proximo_intento', 'fecha_creacion', 'fecha_envio')
+    list_filter = ('estado', 'categoria')
+    search_fields = ('asunto', 'destinatarios')
+    readonly_fields = (
+        'categoria', 'asunto', 'cuerpo', 'cuerpo_html', 'remitente', 'destinatarios',
+        'estado', 'intentos', 'proximo_intento', 'lote', 'ultimo_error',
+        'fecha_creacion', 'fecha_envio',
+    )
+    inlines = [AdjuntoCorreoInline]
+    date_hierarchy = 'fecha_creacion'
+    actions = ['reintentar_correos']
+
+    def has_add_permission(self, request):
+        return False
+
+    def reintentar_correos(self, request, queryset):
+        count = queryset.exclude(estado=EstadoCorreo.ENVIADO).update(
+            estado=EstadoCorreo.PENDIENTE,
+            intentos=0,
+            proximo_intento=timezone.now(),
+            lote='',
+        )
+        self.message_user(request, f'{count} correo(s) reprogramado(s).')
+    reintentar_correos.short_description = 'Reintentar envio de correos seleccionados'
@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class CorreosConfig(AppConfig):
+    name = 'correos'
+    default_auto_field = 'django.db.models.BigAutoField'
+    verbose_name = 'Bandeja de Salida de Correos'
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from correos.services import despachar_correos
+
+
+class Command(BaseCommand):
+    help = 'Envia los correos pendientes de la bandeja de salida'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limite',
+            type=int,
+            default=None,
+            help='Maximo de correos por lote (por defecto CORREOS_LOTE)',
+        )
+        parser.add_argument(
+            '--continuo',
+            action='store_true',
+            help='Seguir despachando cada --intervalo segundos',
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=int,
+            default=30,
+            help='Segundos entre lotes en modo continuo',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            resultado = despachar_correos(limite=options['limite'])
+            if resultado['enviados'] or resultado['fallidos']:
+                self.stdout.write(
+                    f"Enviados: {resultado['enviados']} | Con error: {resultado['fallidos']}"
+                )
+            if not options['continuo']:
+                break
+            time.sleep(options['intervalo'])
+
+        self.stdout.write(self.style.SUCCESS('Despacho de correos terminado'))
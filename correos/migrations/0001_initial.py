@@ -0,0 +1,55 @@
+# Generated by Django 6.0 on 2026-10-19 07:30
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CorreoSaliente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('categoria', models.CharField(default='general', help_text='ticket, permiso, visita, reporte, general...', max_length=30, verbose_name='Categoria')),
+                ('asunto', models.CharField(max_length=255, verbose_name='Asunto')),
+                ('cuerpo', models.TextField(verbose_name='Cuerpo (texto)')),
+                ('cuerpo_html', models.TextField(blank=True, verbose_name='Cuerpo (HTML)')),
+                ('remitente', models.CharField(blank=True, max_length=255, verbose_name='Remitente')),
+                ('destinatarios', models.JSONField(default=list, verbose_name='Destinatarios')),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('enviando', 'Enviando'), ('enviado', 'Enviado'), ('fallido', 'Fallido')], default='pendiente', max_length=20, verbose_name='Estado')),
+                ('intentos', models.PositiveIntegerField(default=0, verbose_name='Intentos')),
+                ('proximo_intento', models.DateTimeField(default=django.utils.timezone.now, help_text='Mientras esta en envio, vencimiento del bloqueo del despachador', verbose_name='Proximo Intento')),
+                ('lote', models.CharField(blank=True, max_length=32, verbose_name='Lote')),
+                ('ultimo_error', models.TextField(blank=True, verbose_name='Ultimo Error')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_envio', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de Envio')),
+            ],
+            options={
+                'verbose_name': 'Correo Saliente',
+                'verbose_name_plural': 'Correos Salientes',
+                'ordering': ['-fecha_creacion'],
+                'indexes': [models.Index(fields=['estado', 'proximo_intento'], name='correos_cola_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='AdjuntoCorreo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=255, verbose_name='Nombre')),
+                ('contenido', models.BinaryField(verbose_name='Contenido')),
+                ('tipo_mime', models.CharField(default='application/octet-stream', max_length=150, verbose_name='Tipo MIME')),
+                ('correo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='adjuntos', to='correos.correosaliente', verbose_name='Correo')),
+            ],
+            options={
+                'verbose_name': 'Adjunto de Correo',
+                'verbose_name_plural': 'Adjuntos de Correo',
+            },
+        ),
+    ]
@@ -0,0 +1,87 @@
+"""
+Bandeja de salida persistente para correos.
+
+Los productores (notificaciones de tickets, reportes, etc.) solo insertan
+filas en CorreoSaliente; el despachador (correos.services.despachar_correos)
+las envia en lotes reutilizando una sola conexion SMTP y reintenta con
+backoff exponencial las que fallan.
+"""
+from django.db import models
+from django.utils import timezone
+
+
+class EstadoCorreo(models.TextChoices):
+    PENDIENTE = 'pendiente', 'Pendiente'
+    ENVIANDO = 'enviando', 'Enviando'
+    ENVIADO = 'enviado', 'Enviado'
+    FALLIDO = 'fallido', 'Fallido'
+
+
+class CorreoSaliente(models.Model):
+    """Correo en cola de envio"""
+
+    categoria = models.CharField(
+        max_length=30,
+        default='general',
+        verbose_name='Categoria',
+        help_text='ticket, permiso, visita, reporte, general...'
+    )
+    asunto = models.CharField(max_length=255, verbose_name='Asunto')
+    cuerpo = models.TextField(verbose_name='Cuerpo (texto)')
+    cuerpo_html = models.TextField(blank=True, verbose_name='Cuerpo (HTML)')
+    remitente = models.CharField(max_length=255, blank=True, verbose_name='Remitente')
+    destinatarios = models.JSONField(default=list, verbose_name='Destinatarios')
+
+    estado = models.CharField(
+        max_length=20,
+        choices=EstadoCorreo.choices,
+        default=EstadoCorreo.PENDIENTE,
+        verbose_name='Estado'
+    )
+    intentos = models.PositiveIntegerField(default=0, verbose_name='Intentos')
+    proximo_intento = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Proximo Intento',
+        help_text='Mientras esta en envio, vencimiento del bloqueo del despachador'
+    )
+    lote = models.CharField(max_length=32, blank=True, verbose_name='Lote')
+    ultimo_error = models.TextField(blank=True, verbose_name='Ultimo Error')
+
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_envio = models.DateTimeField(null=True, blank=True, verbose_name='Fecha de Envio')
+
+    class Meta:
+        verbose_name = 'Correo Saliente'
+        verbose_name_plural = 'Correos Salientes'
+        ordering = ['-fecha_creacion']
+        indexes = [
+            models.Index(fields=['estado', 'proximo_intento'], name='correos_cola_idx'),
+        ]
+
+    def __str__(self):
+        return f"[{self.get_estado_display()}] {self.asunto}"
+
+
+class AdjuntoCorreo(models.Model):
+    """Archivo adjunto de un correo en cola"""
+
+    correo = models.ForeignKey(
+        CorreoSaliente,
+        on_delete=models.CASCADE,
+        related_name='adjuntos',
+        verbose_name='Correo'
+    )
+    nombre = models.CharField(max_length=255, verbose_name='Nombre')
+    contenido = models.BinaryField(verbose_name='Contenido')
+    tipo_mime = models.CharField(
+        max_length=150,
+        default='application/octet-stream',
+        verbose_name='Tipo MIME'
+    )
+
+    class Meta:
+        verbose_name = 'Adjunto de Correo'
+        verbose_name_plural = 'Adjuntos de Correo'
+
+    def __str__(self):
+        return self.nombre
@@ -0,0 +1,226 @@
+"""
+Servicio de la bandeja de salida de correos.
+
+- encolar_correo(): lo usan los productores; solo inserta en la base de datos.
+- despachar_correos(): lo ejecuta el scheduler (o el comando
+  despachar_correos); envia los pendientes con una sola conexion SMTP.
+
+En pruebas basta con EMAIL_BACKEND=django.core.mail.backends.locmem.EmailBackend
+(o filebased) para revisar lo enviado sin tocar SendGrid.
+"""
+import logging
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import AdjuntoCorreo, CorreoSaliente, EstadoCorreo
+
+logger = logging.getLogger(__name__)
+
+# Valores por defecto; se pueden sobreescribir en settings
+LOTE_DEFAULT = 50
+MAX_INTENTOS_DEFAULT = 5
+BACKOFF_BASE_SEGUNDOS = 60
+BACKOFF_MAXIMO_SEGUNDOS = 3600
+# Tiempo que un lote queda reservado por un despachador antes de poder
+# ser retomado por otro (p.ej. si el proceso murio a la mitad)
+BLOQUEO_LOTE = timedelta(minutes=10)
+
+
+def _config(nombre, default):
+    return getattr(settings, nombre, default)
+
+
+def encolar_correo(asunto, cuerpo, destinatarios, cuerpo_html='', adjuntos=None,
+                   categoria='general', remitente=None):
+    """
+    Agrega un correo a la bandeja de salida.
+
+    Args:
+        asunto, cuerpo: texto plano del correo
+        destinatarios: lista de direcciones
+        cuerpo_html: alternativa HTML (opcional)
+        adjuntos: lista de tuplas (nombre, bytes, tipo_mime) (opcional)
+        categoria: etiqueta libre para filtrar en el admin
+        remitente: por defecto DEFAULT_FROM_EMAIL
+
+    Retorna el CorreoSaliente creado o None si no hay destinatarios.
+    """
+    destinatarios = [d for d in destinatarios if d]
+    if not destinatarios:
+        logger.warning(f"Correo '{asunto}' sin destinatarios; no se encola")
+        return None
+
+    with transaction.atomic():
+        correo = CorreoSaliente.objects.create(
+            categoria=categoria,
+            asunto=asunto[:255],
+            cuerpo=cuerpo,
+            cuerpo_html=cuerpo_html,
+            remitente=remitente or settings.DEFAULT_FROM_EMAIL,
+            destinatarios=destinatarios,
+        )
+        if adjuntos:
+            AdjuntoCorreo.objects.bulk_create([
+                AdjuntoCorreo(correo=correo, nombre=nombre, contenido=contenido, tipo_mime=tipo_mime)
+                for nombre, contenido, tipo_mime in adjuntos
+            ])
+    logger.info(f"Correo encolado ({categoria}): {asunto} -> {len(destinatarios)} destinatario(s)")
+    return correo
+
+
+def encolar_al_confirmar(funcion, *args, **kwargs):
+    """
+    Ejecuta un productor de correos cuando la transaccion actual se confirma,
+    para no notificar cambios que terminen revirtiendose. Fuera de una
+    transaccion se ejecuta de inmediato. Los errores solo se registran.
+    """
+    def _ejecutar():
+        try:
+            funcion(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Error encolando correo ({funcion.__name__}): {e}")
+
+    transaction.on_commit(_ejecutar)
+
+
+def _reservar_lote(limite):
+    """
+    Marca como 'enviando' hasta `limite` correos listos para envio con un
+    solo UPDATE y retorna los reservados. Un token de lote evita que dos
+    despachadores tomen los mismos correos.
+    """
+    ahora = timezone.now()
+    token = uuid.uuid4().hex
+    listos = list(CorreoSaliente.objects.filter(
+        Q(estado=EstadoCorreo.PENDIENTE) | Q(estado=EstadoCorreo.ENVIANDO),
+        proximo_intento__lte=ahora,
+    ).order_by('proximo_intento').values_list('pk', flat=True)[:limite])
+    if not listos:
+        return []
+
+    # Repetir la condicion en el UPDATE: si otro despachador ya los tomo,
+    # no se vuelven a reservar
+    reservados = CorreoSaliente.objects.filter(pk__in=listos).filter(
+        Q(estado=EstadoCorreo.PENDIENTE) | Q(estado=EstadoCorreo.ENVIANDO),
+        proximo_intento__lte=ahora,
+    ).update(
+        estado=EstadoCorreo.ENVIANDO,
+        lote=token,
+        proximo_intento=ahora + BLOQUEO_LOTE,
+    )
+    if not reservados:
+        return []
+    return list(
+        CorreoSaliente.objects.filter(lote=token, estado=EstadoCorreo.ENVIANDO)
+        .prefetch_related('adjuntos')
+        .order_by('pk')
+    )
+
+
+def _construir_mensaje(correo, conexion):
+    mensaje = EmailMultiAlternatives(
+        subject=correo.asunto,
+        body=correo.cuerpo,
+        from_email=correo.remitente or settings.DEFAULT_FROM_EMAIL,
+        to=correo.destinatarios,
+        connection=conexion,
+    )
+    if correo.cuerpo_html:
+        mensaje.attach_alternative(correo.cuerpo_html, 'text/html')
+    for adjunto in correo.adjuntos.all():
+        mensaje.attach(adjunto.nombre, bytes(adjunto.contenido), adjunto.tipo_mime)
+    return mensaje
+
+
+def _programar_reintento(correo, error, ahora):
+    """Registra el fallo y calcula el siguiente intento (backoff exponencial)"""
+    correo.intentos += 1
+    correo.ultimo_error = str(error)[:2000]
+    correo.lote = ''
+    if correo.intentos >= _config('CORREOS_MAX_INTENTOS', MAX_INTENTOS_DEFAULT):
+        correo.estado = EstadoCorreo.FALLIDO
+        logger.error(f"Correo {correo.pk} descartado tras {correo.intentos} intentos: {error}")
+    else:
+        espera = min(
+            BACKOFF_BASE_SEGUNDOS * (2 ** (correo.intentos - 1)),
+            BACKOFF_MAXIMO_SEGUNDOS,
+        )
+        correo.estado = EstadoCorreo.PENDIENTE
+        correo.proximo_intento = ahora + timedelta(seconds=espera)
+        logger.warning(
+            f"Correo {correo.pk} fallo (intento {correo.intentos}), "
+            f"reintento en {espera}s: {error}"
+        )
+
+
+def despachar_correos(limite=None):
+    """
+    Envia los correos pendientes cuyo proximo_intento ya llego.
+
+    Abre una sola conexion (get_connection) para todo el lote y envia con
+    send_messages. Cada correo se envia por separado sobre esa conexion para
+    poder registrar su resultado y reintentar solo los que fallan.
+
+    Retorna dict con enviados y fallidos.
+    """
+    limite = limite or _config('CORREOS_LOTE', LOTE_DEFAULT)
+    correos = _reservar_lote(limite)
+    resultado = {'enviados': 0, 'fallidos': 0}
+    if not correos:
+        return resultado
+
+    conexion = get_connection(fail_silently=False)
+    try:
+        conexion.open()
+    except Exception as e:
+        # Sin conexion no se intenta ninguno; todo el lote se reprograma
+        ahora = timezone.now()
+        for correo in correos:
+            _programar_reintento(correo, e, ahora)
+        CorreoSaliente.objects.bulk_update(
+            correos, ['estado', 'intentos', 'proximo_intento', 'lote', 'ultimo_error']
+        )
+        resultado['fallidos'] = len(correos)
+        return resultado
+
+    try:
+        for correo in correos:
+            ahora = timezone.now()
+            try:
+                conexion.send_messages([_construir_mensaje(correo, conexion)])
+                correo.estado = EstadoCorreo.ENVIADO
+                correo.intentos += 1
+                correo.fecha_envio = ahora
+                correo.lote = ''
+                correo.ultimo_error = ''
+                resultado['enviados'] += 1
+            except Exception as e:
+                _programar_reintento(correo, e, ahora)
+                resultado['fallidos'] += 1
+    finally:
+        conexion.close()
+
+    CorreoSaliente.objects.bulk_update(
+        correos,
+        ['estado', 'intentos', 'proximo_intento', 'lote', 'ultimo_error', 'fecha_envio']
+    )
+    logger.info(
+        f"Despacho de correos: {resultado['enviados']} enviado(s), "
+        f"{resultado['fallidos']} con error"
+    )
+    return resultado
+
+
+def purgar_correos_enviados(dias=30):
+    """Elimina correos enviados hace mas de `dias` dias"""
+    limite = timezone.now() - timedelta(days=dias)
+    eliminados, _ = CorreoSaliente.objects.filter(
+        estado=EstadoCorreo.ENVIADO, fecha_envio__lt=limite
+    ).delete()
+    return eliminados
@@ -0,0 +1,65 @@
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import CorreoSaliente, EstadoCorreo
+from .services import despachar_correos, encolar_correo
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class BandejaSalidaTests(TestCase):
+
+    def test_encolar_no_envia(self):
+        encolar_correo('Asunto', 'Cuerpo', ['a@loginco.com.mx'])
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(CorreoSaliente.objects.filter(estado=EstadoCorreo.PENDIENTE).count(), 1)
+
+    def test_sin_destinatarios_no_encola(self):
+        self.assertIsNone(encolar_correo('Asunto', 'Cuerpo', ['', None]))
+        self.assertFalse(CorreoSaliente.objects.exists())
+
+    def test_despachar_envia_lote_con_adjuntos(self):
+        encolar_correo('Uno', 'Cuerpo', ['a@loginco.com.mx'])
+        encolar_correo(
+            'Dos', 'Cuerpo', ['b@loginco.com.mx'], cuerpo_html='<p>Cuerpo</p>',
+            adjuntos=[('reporte.xlsx', b'datos', 'application/octet-stream')]
+        )
+
+        resultado = despachar_correos()
+
+        self.assertEqual(resultado, {'enviados': 2, 'fallidos': 0})
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(mail.outbox[1].attachments[0][0], 'reporte.xlsx')
+        self.assertFalse(CorreoSaliente.objects.exclude(estado=EstadoCorreo.ENVIADO).exists())
+
+    def test_fallo_reprograma_con_backoff(self):
+        correo = encolar_correo('Asunto', 'Cuerpo', ['a@loginco.com.mx'])
+
+        with mock.patch(
+            'django.core.mail.backends.locmem.EmailBackend.send_messages',
+            side_effect=OSError('SMTP caido')
+        ):
+            resultado = despachar_correos()
+
+        correo.refresh_from_db()
+        self.assertEqual(resultado['fallidos'], 1)
+        self.assertEqual(correo.estado, EstadoCorreo.PENDIENTE)
+        self.assertEqual(correo.intentos, 1)
+        self.assertGreater(correo.proximo_intento, timezone.now())
+        # Aun no toca reintentar
+        self.assertEqual(despachar_correos(), {'enviados': 0, 'fallidos': 0})
+
+    @override_settings(CORREOS_MAX_INTENTOS=1)
+    def test_fallido_tras_max_intentos(self):
+        correo = encolar_correo('Asunto', 'Cuerpo', ['a@loginco.com.mx'])
+
+        with mock.patch(
+            'django.core.mail.backends.locmem.EmailBackend.send_messages',
+            side_effect=OSError('SMTP caido')
+        ):
+            despachar_correos()
+
+        correo.refresh_from_db()
+        self.assertEqual(correo.estado, EstadoCorreo.FALLIDO)
@@ -1,13 +1,19 @@
 from django.db import models
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from django.contrib.auth.models import User
 import pickle
 import numpy as np
 
+from checador.cache import invalidar_con_senales
+from checador.rastreo import RastreoCambiosMixin
 from checador.storage_backends import MediaStorage
 
-class Empleado(models.Model):
+class Empleado(RastreoCambiosMixin, models.Model):
     """Modelo para representar a un empleado del sistema"""
 
+    campos_rastreados = ('supervisor_directo', 'departamento_obj', 'foto_rostro')
+
     user = models.OneToOneField(
         User,
         on_delete=models.CASCADE,
@@ -156,28 +162,33 @@ class Empleado(models.Model):
         self.save()
 
     def get_supervisores(self):
-        """Retorna lista de supervisores que pueden aprobar permisos"""
-        from organizacion.models import RelacionSupervision
-        supervisores = []
-
-        # Supervisor directo
-        if self.supervisor_directo:
-            supervisores.append(self.supervisor_directo)
-
-        # Supervisores de relaciones de supervision
-        relaciones = RelacionSupervision.objects.filter(
-            subordinado=self,
-            puede_autorizar_permisos=True,
-            activo=True
-        ).select_related('supervisor')
-
-        for relacion in relaciones:
-            if relacion.esta_vigente() and relacion.supervisor not in supervisores:
-                supervisores.append(relacion.supervisor)
-
-        # Responsable del departamento
-        if self.departamento_obj and self.departamento_obj.responsable:
-            if self.departamento_obj.responsable not in supervisores:
-                supervisores.append(self.departamento_obj.responsable)
-
-        return supervisores
+        """
+        Retorna los supervisores vigentes que pueden aprobar permisos, leidos
+        del indice precalculado AprobadorPermiso (una sola consulta).
+        """
+        from organizacion.models import AprobadorPermiso
+        return list(Empleado.objects.filter(
+            pk__in=AprobadorPermiso.vigentes().filter(
+                subordinado=self
+            ).values('aprobador_id')
+        ).select_related('user'))
+
+
+@receiver(post_save, sender=Empleado)
+def actualizar_aprobadores_empleado(sender, instance, created, **kwargs):
+    """
+    Mantiene el indice de aprobadores cuando cambia el supervisor directo o
+    el departamento del empleado. Los guardados que no cambian esos campos
+    no recalculan nada.
+    """
+    if not created and not (
+        instance.has_changed('supervisor_directo') or instance.has_changed('departamento_obj')
+    ):
+        return
+    from organizacion.services import reconstruir_aprobadores
+    reconstruir_aprobadores([instance.pk])
+
+
+# Organigrama (conteos, responsables) y estadisticas del dashboard
+invalidar_con_senales('organigrama', Empleado)
+invalidar_con_senales('dashboard', Empleado)
@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from .models import SecuenciaFolio
+
+
+@admin.register(SecuenciaFolio)
+class SecuenciaFolioAdmin(admin.ModelAdmin):
+    list_display = ['prefijo', 'ultimo', 'fecha_actualizacion']
+    search_fields = ['prefijo']
+    readonly_fields = ['prefijo', 'fecha_actualizacion']
@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class FoliosConfig(AppConfig):
+    name = 'folios'
+    default_auto_field = 'django.db.models.BigAutoField'
+    verbose_name = 'Secuencias de Folios'
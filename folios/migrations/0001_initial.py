@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-19 07:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SecuenciaFolio',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefijo', models.CharField(max_length=50, unique=True, verbose_name='Prefijo')),
+                ('ultimo', models.PositiveIntegerField(default=0, verbose_name='Ultimo Consecutivo')),
+                ('fecha_actualizacion', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Secuencia de Folio',
+                'verbose_name_plural': 'Secuencias de Folios',
+                'ordering': ['-prefijo'],
+            },
+        ),
+    ]
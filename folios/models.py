@@ -0,0 +1,30 @@
+from django.db import models
+
+
+class SecuenciaFolio(models.Model):
+    """
+    Contador por prefijo para folios legibles (p.ej. TKT-20261019).
+
+    Cada prefijo tiene una sola fila; el consecutivo se incrementa con un
+    UPDATE atomico (ver folios.services.siguiente_consecutivo), asi que no
+    hace falta recorrer los folios ya emitidos.
+    """
+
+    prefijo = models.CharField(
+        max_length=50,
+        unique=True,
+        verbose_name='Prefijo'
+    )
+    ultimo = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Ultimo Consecutivo'
+    )
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Secuencia de Folio'
+        verbose_name_plural = 'Secuencias de Folios'
+        ordering = ['-prefijo']
+
+    def __str__(self):
+        return f"{self.prefijo}: {self.ultimo}"
@@ -0,0 +1,52 @@
+"""
+Generacion de folios legibles sin colisiones.
+
+siguiente_consecutivo() incrementa el contador del prefijo con un solo
+UPDATE ... SET ultimo = ultimo + 1. El UPDATE bloquea la fila hasta que
+termina la transaccion, de modo que dos workers nunca obtienen el mismo
+numero. Si se llama dentro de la transaccion que guarda el registro
+(p.ej. Ticket.save), un rollback devuelve tambien el consecutivo.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import SecuenciaFolio
+
+
+def siguiente_consecutivo(prefijo, inicial=None):
+    """
+    Retorna el siguiente consecutivo del prefijo (1, 2, 3...).
+
+    Args:
+        prefijo: clave de la secuencia, p.ej. 'TKT-20261019'
+        inicial: funcion opcional que retorna el ultimo consecutivo ya
+            emitido; solo se llama cuando la secuencia aun no existe (util
+            para arrancar sobre folios creados antes de tener la tabla)
+    """
+    with transaction.atomic():
+        if not _incrementar(prefijo):
+            try:
+                with transaction.atomic():
+                    SecuenciaFolio.objects.create(
+                        prefijo=prefijo,
+                        ultimo=(inicial() if inicial else 0) + 1,
+                    )
+            except IntegrityError:
+                # Otro worker creo la secuencia al mismo tiempo
+                _incrementar(prefijo)
+        return SecuenciaFolio.objects.filter(prefijo=prefijo).values_list(
+            'ultimo', flat=True
+        ).get()
+
+
+def _incrementar(prefijo):
+    return SecuenciaFolio.objects.filter(prefijo=prefijo).update(
+        ultimo=F('ultimo') + 1,
+        fecha_actualizacion=timezone.now(),
+    )
+
+
+def generar_folio(prefijo, digitos=3, separador='-', inicial=None):
+    """Folio con el formato <prefijo><separador><consecutivo con ceros>."""
+    return f"{prefijo}{separador}{siguiente_consecutivo(prefijo, inicial):0{digitos}d}"
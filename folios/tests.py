@@ -0,0 +1,69 @@
+import threading
+
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase
+
+from .models import SecuenciaFolio
+from .services import generar_folio, siguiente_consecutivo
+
+
+class SecuenciaFolioTests(TestCase):
+
+    def test_consecutivos_por_prefijo(self):
+        self.assertEqual(siguiente_consecutivo('A'), 1)
+        self.assertEqual(siguiente_consecutivo('A'), 2)
+        self.assertEqual(siguiente_consecutivo('B'), 1)
+        self.assertEqual(SecuenciaFolio.objects.get(prefijo='A').ultimo, 2)
+
+    def test_inicial_solo_al_crear(self):
+        llamadas = []
+
+        def inicial():
+            llamadas.append(1)
+            return 41
+
+        self.assertEqual(generar_folio('TKT-20261019', inicial=inicial), 'TKT-20261019-042')
+        self.assertEqual(generar_folio('TKT-20261019', inicial=inicial), 'TKT-20261019-043')
+        self.assertEqual(len(llamadas), 1)
+
+
+class SecuenciaFolioConcurrenciaTests(TransactionTestCase):
+
+    HILOS = 8
+    FOLIOS_POR_HILO = 10
+
+    def test_hilos_no_repiten_folio(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            # SQLite en memoria con cache compartido no espera por los
+            # bloqueos (falla con "table is locked"); settings usa un archivo
+            # para las pruebas (PRUEBAS_SQLITE), esto solo cubre overrides
+            self.skipTest('Requiere una base de datos con bloqueo entre conexiones')
+
+        SecuenciaFolio.objects.create(prefijo='CONC', ultimo=0)
+        folios = []
+        errores = []
+        candado = threading.Lock()
+        barrera = threading.Barrier(self.HILOS)
+
+        def trabajador():
+            try:
+                barrera.wait()
+                for _ in range(self.FOLIOS_POR_HILO):
+                    folio = generar_folio('CONC')
+                    with candado:
+                        folios.append(folio)
+            except Exception as e:
+                errores.append(e)
+            finally:
+                connections.close_all()
+
+        hilos = [threading.Thread(target=trabajador) for _ in range(self.HILOS)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        total = self.HILOS * self.FOLIOS_POR_HILO
+        self.assertEqual(errores, [])
+        self.assertEqual(len(set(folios)), total)
+        self.assertEqual(SecuenciaFolio.objects.get(prefijo='CONC').ultimo, total)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import TipoHorario, AsignacionHorario, Horario
+from .models import TipoHorario, AsignacionHorario, Horario, DiaFestivo
 
 
 @admin.register(TipoHorario)
@@ -60,3 +60,12 @@ class HorarioAdmin(admin.ModelAdmin):
     def get_dia(self, obj):
         return obj.get_dia_semana_display()
     get_dia.short_description = 'Dia'
+
+
+@admin.register(DiaFestivo)
+class DiaFestivoAdmin(admin.ModelAdmin):
+    list_display = ('fecha', 'nombre', 'activo')
+    list_filter = ('activo',)
+    search_fields = ('nombre',)
+    readonly_fields = ('fecha_creacion', 'fecha_actualizacion')
+    date_hierarchy = 'fecha'
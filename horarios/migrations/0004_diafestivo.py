@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-10-19 07:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('horarios', '0003_tipohorario_asignacionhorario'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DiaFestivo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField(unique=True, verbose_name='Fecha')),
+                ('nombre', models.CharField(max_length=100, verbose_name='Nombre')),
+                ('activo', models.BooleanField(default=True, verbose_name='Activo')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_actualizacion', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Dia Festivo',
+                'verbose_name_plural': 'Dias Festivos',
+                'ordering': ['fecha'],
+            },
+        ),
+    ]
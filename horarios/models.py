@@ -1,5 +1,7 @@
 from django.db import models
 from django.core.exceptions import ValidationError
+
+from checador.cache import invalidar_con_senales
 from empleados.models import Empleado
 
 
@@ -188,3 +190,23 @@ class Horario(models.Model):
             diferencia -= tiempo_comida
 
         return diferencia.total_seconds() / 3600
+
+
+class DiaFestivo(models.Model):
+    """Dia no laborable para toda la empresa (festivo oficial o asueto)"""
+    fecha = models.DateField(unique=True, verbose_name='Fecha')
+    nombre = models.CharField(max_length=100, verbose_name='Nombre')
+    activo = models.BooleanField(default=True, verbose_name='Activo')
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Dia Festivo'
+        verbose_name_plural = 'Dias Festivos'
+        ordering = ['fecha']
+
+    def __str__(self):
+        return f"{self.fecha} - {self.nombre}"
+
+
+invalidar_con_senales('horarios', TipoHorario)
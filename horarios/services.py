@@ -1,4 +1,11 @@
-from .models import AsignacionHorario
+from datetime import timedelta
+
+import numpy as np
+
+from .models import AsignacionHorario, DiaFestivo, Horario
+
+# Lunes a viernes; sabado y domingo se agregan segun el empleado
+WEEKMASK_BASE = '1111100'
 
 
 def obtener_horario_del_dia(empleado, fecha):
@@ -96,3 +103,149 @@ def obtener_horario_del_dia(empleado, fecha):
             }
 
     return None
+
+
+def obtener_festivos(fecha_inicio, fecha_fin):
+    """Dias festivos activos del rango como arreglo numpy datetime64[D]"""
+    fechas = DiaFestivo.objects.filter(
+        fecha__range=[fecha_inicio, fecha_fin], activo=True
+    ).values_list('fecha', flat=True)
+    return np.array(list(fechas), dtype='datetime64[D]')
+
+
+def contar_dias_habiles(fecha_inicio, fecha_fin, weekmask=WEEKMASK_BASE, festivos=None):
+    """
+    Cuenta dias habiles en [fecha_inicio, fecha_fin] con np.busday_count.
+    Si no se pasan festivos se consultan de la tabla DiaFestivo.
+    """
+    if fecha_fin < fecha_inicio:
+        return 0
+    if festivos is None:
+        festivos = obtener_festivos(fecha_inicio, fecha_fin)
+    return int(np.busday_count(
+        fecha_inicio, fecha_fin + timedelta(days=1),
+        weekmask=weekmask, holidays=festivos
+    ))
+
+
+def construir_calendario_laboral(empleados, fecha_inicio, fecha_fin):
+    """
+    Prepara el calendario laboral de varios empleados con tres consultas
+    (festivos, horarios semanales y asignaciones del rango), sin importar
+    el numero de dias.
+
+    El dia de la semana es laborable para el empleado si:
+      - es de lunes a viernes, o
+      - tiene un Horario semanal activo para ese dia, o
+      - es sabado/domingo, no descansa ese dia y tiene horario asignado.
+    Una AsignacionHorario vuelve laborable su fecha aunque caiga en descanso
+    o festivo. Para quien ingreso a mitad del rango solo cuentan los dias a
+    partir de su fecha_ingreso.
+
+    Retorna dict con:
+      - festivos: np.array datetime64[D]
+      - weekmasks: {empleado_id: 'LMMJVSD' como cadena de 0/1}
+      - asignaciones: {empleado_id: np.array de fechas asignadas}
+      - ingresos: {empleado_id: fecha_ingreso} de los contratados dentro del rango
+    """
+    empleados = list(empleados)
+    ids = [e.pk for e in empleados]
+
+    dias_semanales = {}
+    for empleado_id, dia_semana in Horario.objects.filter(
+        empleado_id__in=ids, activo=True
+    ).values_list('empleado_id', 'dia_semana'):
+        dias_semanales.setdefault(empleado_id, set()).add(dia_semana)
+
+    weekmasks = {}
+    for empleado in empleados:
+        mascara = list(WEEKMASK_BASE)
+        semanales = dias_semanales.get(empleado.pk, set())
+        if 6 in semanales or (not empleado.descansa_sabado and empleado.horario_sabado_id):
+            mascara[5] = '1'
+        if 7 in semanales or (not empleado.descansa_domingo and empleado.horario_domingo_id):
+            mascara[6] = '1'
+        weekmasks[empleado.pk] = ''.join(mascara)
+
+    asignaciones = {}
+    for empleado_id, fecha in AsignacionHorario.objects.filter(
+        empleado_id__in=ids, fecha__range=[fecha_inicio, fecha_fin]
+    ).values_list('empleado_id', 'fecha'):
+        asignaciones.setdefault(empleado_id, []).append(fecha)
+
+    return {
+        'festivos': obtener_festivos(fecha_inicio, fecha_fin),
+        'weekmasks': weekmasks,
+        'asignaciones': {
+            empleado_id: np.array(fechas, dtype='datetime64[D]')
+            for empleado_id, fechas in asignaciones.items()
+        },
+        'ingresos': {
+            e.pk: e.fecha_ingreso for e in empleados
+            if e.fecha_ingreso and e.fecha_ingreso > fecha_inicio
+        },
+    }
+
+
+def contar_fechas_laborables(calendario, empleado_id, fechas):
+    """
+    Cuantas de las fechas indicadas son laborables para el empleado segun
+    el calendario de construir_calendario_laboral.
+    """
+    fechas = np.array(list(fechas), dtype='datetime64[D]')
+    ingreso = calendario['ingresos'].get(empleado_id)
+    if ingreso:
+        fechas = fechas[fechas >= np.datetime64(ingreso)]
+    if fechas.size == 0:
+        return 0
+    habiles = np.is_busday(
+        fechas,
+        weekmask=calendario['weekmasks'].get(empleado_id, WEEKMASK_BASE),
+        holidays=calendario['festivos']
+    )
+    asignadas = calendario['asignaciones'].get(empleado_id)
+    if asignadas is not None:
+        habiles |= np.isin(fechas, asignadas)
+    return int(habiles.sum())
+
+
+def contar_dias_laborales_empleados(calendario, fecha_inicio, fecha_fin):
+    """
+    Dias laborales de cada empleado del calendario en [fecha_inicio, fecha_fin].
+
+    Se agrupa a los empleados por weekmask y se resuelve cada grupo con una
+    sola llamada a np.busday_count; las asignaciones puntuales que caen en
+    dia no habil se suman despues. Quien ingreso dentro del rango se cuenta
+    aparte desde su fecha_ingreso. Costo O(empleados), no O(empleados x dias).
+    """
+    if fecha_fin < fecha_inicio:
+        return {empleado_id: 0 for empleado_id in calendario['weekmasks']}
+
+    por_mascara = {}
+    for empleado_id, weekmask in calendario['weekmasks'].items():
+        por_mascara.setdefault(weekmask, []).append(empleado_id)
+
+    ingresos = calendario['ingresos']
+    dias = {}
+    for weekmask, ids in por_mascara.items():
+        total = contar_dias_habiles(fecha_inicio, fecha_fin, weekmask, calendario['festivos'])
+        for empleado_id in ids:
+            if empleado_id in ingresos:
+                dias[empleado_id] = contar_dias_habiles(
+                    ingresos[empleado_id], fecha_fin, weekmask, calendario['festivos']
+                )
+            else:
+                dias[empleado_id] = total
+
+    for empleado_id, asignadas in calendario['asignaciones'].items():
+        if empleado_id not in dias:
+            continue
+        if empleado_id in ingresos:
+            asignadas = asignadas[asignadas >= np.datetime64(ingresos[empleado_id])]
+        extra = ~np.is_busday(
+            asignadas,
+            weekmask=calendario['weekmasks'][empleado_id],
+            holidays=calendario['festivos']
+        )
+        dias[empleado_id] += int(extra.sum())
+    return dias
@@ -1,3 +1,77 @@
+from datetime import date, time
+
+from django.contrib.auth.models import User
 from django.test import TestCase
 
-# Create your tests here.
+from empleados.models import Empleado
+
+from .models import AsignacionHorario, DiaFestivo, TipoHorario
+from .services import (
+    construir_calendario_laboral,
+    contar_dias_laborales_empleados,
+    contar_fechas_laborables,
+)
+
+
+class CalendarioLaboralTests(TestCase):
+    # Lunes 2 a domingo 15 de marzo de 2026: 10 dias entre semana, sabados 7 y 14
+    inicio = date(2026, 3, 2)
+    fin = date(2026, 3, 15)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.horario = TipoHorario.objects.create(
+            nombre='Oficina', codigo='OF', hora_entrada=time(9, 0), hora_salida=time(18, 0)
+        )
+        cls.oficina = cls._empleado('OFI', descansa_sabado=True)
+        cls.sabatino = cls._empleado('SAB', descansa_sabado=False, horario_sabado=cls.horario)
+        cls.nuevo = cls._empleado('NUEVO', descansa_sabado=True, fecha_ingreso=date(2026, 3, 9))
+        DiaFestivo.objects.create(fecha=date(2026, 3, 4), nombre='Asueto')
+        DiaFestivo.objects.create(fecha=date(2026, 3, 5), nombre='Inactivo', activo=False)
+
+    @classmethod
+    def _empleado(cls, codigo, **kwargs):
+        user = User.objects.create_user(codigo.lower())
+        return Empleado.objects.create(
+            user=user, codigo_empleado=codigo, horario_predeterminado=cls.horario, **kwargs
+        )
+
+    def _dias(self):
+        empleados = [self.oficina, self.sabatino, self.nuevo]
+        calendario = construir_calendario_laboral(empleados, self.inicio, self.fin)
+        return calendario, contar_dias_laborales_empleados(calendario, self.inicio, self.fin)
+
+    def test_festivo_activo_no_es_laborable(self):
+        _, dias = self._dias()
+        self.assertEqual(dias[self.oficina.pk], 9)
+
+    def test_sabado_trabajado_cuenta(self):
+        calendario, dias = self._dias()
+        self.assertEqual(calendario['weekmasks'][self.sabatino.pk], '1111110')
+        self.assertEqual(dias[self.sabatino.pk], 11)
+
+    def test_ingreso_a_mitad_del_rango_cuenta_desde_su_fecha(self):
+        _, dias = self._dias()
+        self.assertEqual(dias[self.nuevo.pk], 5)
+
+    def test_asignacion_en_dia_de_descanso(self):
+        for empleado in (self.oficina, self.nuevo):
+            # Domingo 8: antes del ingreso de `nuevo`, no le cuenta
+            AsignacionHorario.objects.create(
+                empleado=empleado, fecha=date(2026, 3, 8), tipo_horario=self.horario
+            )
+        _, dias = self._dias()
+        self.assertEqual(dias[self.oficina.pk], 10)
+        self.assertEqual(dias[self.nuevo.pk], 5)
+
+    def test_fechas_laborables_del_empleado(self):
+        calendario, _ = self._dias()
+        fechas = [date(2026, 3, 3), date(2026, 3, 4), date(2026, 3, 7), date(2026, 3, 10)]
+        self.assertEqual(contar_fechas_laborables(calendario, self.oficina.pk, fechas), 2)
+        self.assertEqual(contar_fechas_laborables(calendario, self.sabatino.pk, fechas), 3)
+        self.assertEqual(contar_fechas_laborables(calendario, self.nuevo.pk, fechas), 1)
+
+    def test_rango_invertido(self):
+        calendario, _ = self._dias()
+        dias = contar_dias_laborales_empleados(calendario, self.fin, self.inicio)
+        self.assertEqual(set(dias.values()), {0})
@@ -2,6 +2,8 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+
+from checador.cache import respuesta_cacheada
 from .models import Horario, TipoHorario, AsignacionHorario
 from .serializers import (
     HorarioSerializer,
@@ -70,6 +72,14 @@ class TipoHorarioViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(activo=activo_bool)
         return queryset
 
+    @respuesta_cacheada('horarios', ttl=600)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @respuesta_cacheada('horarios', ttl=600)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
 
 class AsignacionHorarioViewSet(viewsets.ModelViewSet):
     """ViewSet para asignaciones de horario"""
@@ -13,16 +13,15 @@ Opciones:
                  Por defecto los duplicados se omiten.
   --dry-run      Muestra qué se importaría sin guardar en la BD.
   --encoding     Encoding del archivo (default: utf-8-sig para BOM de Excel).
+                 Las líneas que no sean válidas en ese encoding se leen como latin-1.
+  --lote         Filas por bulk_create/bulk_update (default: 500).
 """
-import csv
 import os
+import time
 
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
-from django.utils import timezone
 
-from empleados.models import Empleado
-from it_tickets.models import EquipoComputo, TipoEquipo, EstadoEquipo
+from it_tickets.services.importacion import TAMANO_LOTE, importar_inventario
 
 
 class Command(BaseCommand):
@@ -53,6 +52,12 @@ class Command(BaseCommand):
             default='utf-8-sig',
             help='Encoding del archivo (default: utf-8-sig)'
         )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=TAMANO_LOTE,
+            help=f'Filas por lote (default: {TAMANO_LOTE})'
+        )
 
     def handle(self, *args, **options):
         ruta = options['ruta_csv']
@@ -73,146 +78,19 @@ class Command(BaseCommand):
         self.stdout.write(f"Encoding: {encoding}")
         self.stdout.write(f"Actualizar existentes: {'Sí' if actualizar else 'No'}\n")
 
-        creados = 0
-        actualizados = 0
-        omitidos = 0
-        errores = []
-
-        tipo_map = {
-            'desktop':   TipoEquipo.DESKTOP,
-            'laptop':    TipoEquipo.LAPTOP,
-            'servidor':  TipoEquipo.SERVIDOR,
-            'impresora': TipoEquipo.IMPRESORA,
-            'tablet':    TipoEquipo.TABLET,
-        }
-
-        try:
-            with open(ruta, encoding=encoding, newline='') as f:
-                reader = csv.reader(f)
-                encabezado = next(reader, None)
-                self.stdout.write(f"Encabezado detectado: {encabezado}\n")
-
-                for num_fila, fila in enumerate(reader, start=2):
-                    # Normalizar longitud
-                    while len(fila) < 12:
-                        fila.append('')
-
-                    codigo_empleado = fila[0].strip()
-                    usuario_nombre  = fila[1].strip()
-                    tipo_raw        = fila[2].strip().lower()
-                    numero_serie    = fila[3].strip().upper()
-                    marca           = fila[4].strip()
-                    modelo          = fila[5].strip()
-                    col_r           = fila[6].strip().lower()
-                    col_u           = fila[7].strip().lower()
-                    monitores_raw   = fila[8].strip()
-                    marca_monitor   = fila[9].strip()
-                    telefono_serie  = fila[10].strip()
-                    mac_telefono    = fila[11].strip()
-
-                    # Validación mínima
-                    if not numero_serie:
-                        msg = f"Fila {num_fila}: Número de serie vacío. Omitida."
-                        errores.append(msg)
-                        self.stdout.write(self.style.WARNING(f"  OMITIDA: {msg}"))
-                        omitidos += 1
-                        continue
-
-                    tipo = tipo_map.get(tipo_raw, TipoEquipo.DESKTOP)
-                    tiene_monitor = bool(col_r == 'x' or col_u == 'x')
-
-                    # Buscar empleado
-                    empleado = None
-                    if codigo_empleado:
-                        try:
-                            empleado = Empleado.objects.get(
-                                codigo_empleado=codigo_empleado
-                            )
-                        except Empleado.DoesNotExist:
-                            self.stdout.write(
-                                self.style.WARNING(
-                                    f"  Fila {num_fila}: Empleado '{codigo_empleado}' "
-                                    f"no encontrado. Se guardará solo el nombre."
-                                )
-                            )
-
-                    notas = ''
-                    if monitores_raw and monitores_raw not in ('', ' ', 'x'):
-                        notas = f"Monitores: {monitores_raw}"
-                    if col_r == 'x' and col_u == 'x':
-                        notas += ' (monitor externo + USB)' if notas else '(monitor externo + USB)'
-
-                    datos_str = (
-                        f"  [{numero_serie}] {marca} {modelo} "
-                        f"| {usuario_nombre or codigo_empleado} "
-                        f"| Tipo: {tipo} | Monitor: {'Sí' if tiene_monitor else 'No'}"
-                    )
-
-                    if dry_run:
-                        existe = EquipoComputo.objects.filter(
-                            numero_serie=numero_serie
-                        ).exists()
-                        if existe:
-                            self.stdout.write(
-                                f"  [ACTUALIZAR]{datos_str}" if actualizar
-                                else f"  [OMITIR (duplicado)]{datos_str}"
-                            )
-                        else:
-                            self.stdout.write(f"  [CREAR]{datos_str}")
-                        continue
-
-                    # Guardar en BD
-                    datos = {
-                        'empleado': empleado,
-                        'usuario_nombre': usuario_nombre or codigo_empleado or 'Sin asignar',
-                        'tipo': tipo,
-                        'marca': marca,
-                        'modelo': modelo,
-                        'tiene_monitor': tiene_monitor,
-                        'marca_monitor': marca_monitor,
-                        'telefono_serie': telefono_serie,
-                        'mac_telefono': mac_telefono,
-                        'notas': notas,
-                    }
-
-                    try:
-                        with transaction.atomic():
-                            qs = EquipoComputo.objects.filter(numero_serie=numero_serie)
-                            if qs.exists():
-                                if actualizar:
-                                    qs.update(**datos)
-                                    actualizados += 1
-                                    self.stdout.write(
-                                        self.style.SUCCESS(f"  ACTUALIZADO: {datos_str}")
-                                    )
-                                else:
-                                    omitidos += 1
-                                    self.stdout.write(
-                                        self.style.WARNING(f"  OMITIDO (duplicado): {datos_str}")
-                                    )
-                            else:
-                                EquipoComputo.objects.create(
-                                    numero_serie=numero_serie, **datos
-                                )
-                                creados += 1
-                                self.stdout.write(
-                                    self.style.SUCCESS(f"  CREADO: {datos_str}")
-                                )
-                    except Exception as e:
-                        msg = f"Fila {num_fila} (serie {numero_serie}): {str(e)}"
-                        errores.append(msg)
-                        self.stdout.write(self.style.ERROR(f"  ERROR: {msg}"))
-                        omitidos += 1
-
-        except UnicodeDecodeError:
-            # Reintentar con latin-1
-            self.stdout.write(
-                self.style.WARNING(
-                    f"Error con encoding {encoding}. Reintentando con latin-1..."
-                )
+        inicio = time.monotonic()
+        with open(ruta, 'rb') as f:
+            resultado = importar_inventario(
+                f,
+                actualizar_existentes=actualizar,
+                dry_run=dry_run,
+                encoding=encoding,
+                tamano_lote=options['lote'],
             )
-            options['encoding'] = 'latin-1'
-            return self.handle(*args, **options)
+        duracion = time.monotonic() - inicio
+
+        if dry_run:
+            self._mostrar_cambios(resultado['cambios'])
 
         # Resumen final
         self.stdout.write("\n" + "=" * 60)
@@ -221,20 +99,39 @@ class Command(BaseCommand):
         else:
             self.stdout.write(self.style.SUCCESS("RESUMEN DE IMPORTACIÓN:"))
 
-        self.stdout.write(f"  Creados:     {creados}")
-        self.stdout.write(f"  Actualizados:{actualizados}")
-        self.stdout.write(f"  Omitidos:    {omitidos}")
-        self.stdout.write(f"  Errores:     {len(errores)}")
+        self.stdout.write(f"  Creados:     {resultado['creados']}")
+        self.stdout.write(f"  Actualizados:{resultado['actualizados']}")
+        self.stdout.write(f"  Sin cambios: {resultado['sin_cambios']}")
+        self.stdout.write(f"  Omitidos:    {resultado['omitidos']}")
+        self.stdout.write(f"  Errores:     {len(resultado['errores'])}")
+        self.stdout.write(f"  Tiempo:      {duracion:.2f}s")
 
-        if errores:
+        if resultado['errores']:
             self.stdout.write(self.style.ERROR("\nDETALLE DE ERRORES:"))
-            for err in errores:
+            for err in resultado['errores']:
                 self.stdout.write(self.style.ERROR(f"  - {err}"))
 
-        if not dry_run and (creados > 0 or actualizados > 0):
+        guardados = resultado['creados'] + resultado['actualizados']
+        if not dry_run and guardados > 0:
             self.stdout.write(
                 self.style.SUCCESS(
                     f"\nImportación completada. "
-                    f"{creados + actualizados} equipo(s) en la base de datos."
+                    f"{guardados} equipo(s) en la base de datos."
                 )
             )
+
+    def _mostrar_cambios(self, cambios):
+        for cambio in cambios:
+            prefijo = f"  Fila {cambio['fila']} [{cambio['numero_serie']}]"
+            if cambio['accion'] == 'crear':
+                datos = cambio['datos']
+                self.stdout.write(
+                    f"{prefijo} [CREAR] {datos['marca']} {datos['modelo']} "
+                    f"| {datos['usuario_nombre']} | Tipo: {datos['tipo']}"
+                )
+            elif cambio['accion'] == 'actualizar':
+                self.stdout.write(f"{prefijo} [ACTUALIZAR]")
+                for campo, (antes, despues) in cambio['diferencias'].items():
+                    self.stdout.write(f"      {campo}: {antes!r} -> {despues!r}")
+            else:
+                self.stdout.write(f"{prefijo} [OMITIR (duplicado)]")
@@ -0,0 +1,49 @@
+"""
+Management command: pregenerar_qrs
+
+Genera en paralelo los QR (PNG y SVG) de todo el inventario para que la
+página de impresión y el detalle público los sirvan desde el cache.
+
+Uso:
+  python manage.py pregenerar_qrs --base-url https://checador.loginco.com.mx
+  python manage.py pregenerar_qrs --base-url https://... --incluir-baja --workers 8
+
+La URL base debe coincidir con el host con el que se accede al sistema,
+porque el contenido del QR es la URL absoluta del detalle del equipo.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+
+from checador.qr import pregenerar_qrs
+from it_tickets.models import EquipoComputo, EstadoEquipo
+
+
+class Command(BaseCommand):
+    help = 'Pre-genera los códigos QR del inventario de equipos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', required=True, help='Ej. https://checador.loginco.com.mx')
+        parser.add_argument('--workers', type=int, default=4, help='Hilos en paralelo (default: 4)')
+        parser.add_argument('--incluir-baja', action='store_true', help='Incluir equipos dados de baja')
+
+    def handle(self, *args, **options):
+        base = options['base_url'].rstrip('/')
+        equipos = EquipoComputo.objects.all()
+        if not options['incluir_baja']:
+            equipos = equipos.exclude(estado=EstadoEquipo.BAJA)
+
+        urls = [
+            base + reverse('it_tickets:equipo_detalle_qr', args=[pk])
+            for pk in equipos.values_list('pk', flat=True)
+        ]
+
+        inicio = time.monotonic()
+        for formato in ('png', 'svg'):
+            pregenerar_qrs(urls, formato=formato, max_workers=options['workers'])
+        duracion = time.monotonic() - inicio
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(urls)} equipo(s) con QR en cache ({duracion:.1f}s)'
+        ))
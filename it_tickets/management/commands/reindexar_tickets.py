@@ -0,0 +1,31 @@
+"""
+Management command: reindexar_tickets
+
+Recalcula el texto normalizado y el índice de búsqueda de todos los
+tickets. Necesario después de cargas masivas (bulk_create, update()) que
+no pasan por Ticket.save().
+
+Uso:
+  python manage.py reindexar_tickets
+  python manage.py reindexar_tickets --lote 1000
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from it_tickets.services.busqueda import motor_busqueda, reindexar_todos
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el índice de búsqueda de tickets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=500, help='Tickets por lote (default: 500)')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Motor de búsqueda: {motor_busqueda()}")
+        inicio = time.monotonic()
+        total = reindexar_todos(tamano_lote=options['lote'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} ticket(s) reindexados en {time.monotonic() - inicio:.1f}s"
+        ))
@@ -0,0 +1,98 @@
+# Generated by Django 6.0 on 2026-10-19 07:43
+
+import unicodedata
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+# Copias congeladas de it_tickets.services.busqueda: la migración no debe
+# cambiar si el servicio cambia después
+TABLA_FTS = 'it_tickets_ticket_fts'
+CONFIG_PG = 'spanish'
+
+
+def normalizar_texto(texto):
+    texto = unicodedata.normalize('NFKD', texto or '')
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return ' '.join(texto.lower().split())
+
+
+def crear_indice_busqueda(apps, schema_editor):
+    """
+    Crea el índice según el motor (GIN en PostgreSQL, tabla FTS5 en
+    SQLite) y llena texto_busqueda de los tickets existentes.
+    """
+    Ticket = apps.get_model('it_tickets', 'Ticket')
+    vendor = schema_editor.connection.vendor
+    fts5 = False
+
+    with schema_editor.connection.cursor() as cursor:
+        if vendor == 'postgresql':
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_ticket_vector_busqueda "
+                "ON it_tickets_ticket USING gin (vector_busqueda)"
+            )
+        elif vendor == 'sqlite':
+            try:
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLA_FTS} "
+                    f"USING fts5(texto, tokenize='unicode61 remove_diacritics 2')"
+                )
+                fts5 = True
+            except Exception:
+                # SQLite compilado sin FTS5: la búsqueda usa texto_busqueda
+                pass
+
+    tickets = list(Ticket.objects.only('id', 'folio', 'titulo', 'descripcion'))
+    for ticket in tickets:
+        ticket.texto_busqueda = normalizar_texto(
+            f"{ticket.folio} {ticket.titulo} {ticket.descripcion}"
+        )
+    Ticket.objects.bulk_update(tickets, ['texto_busqueda'], batch_size=500)
+
+    with schema_editor.connection.cursor() as cursor:
+        if vendor == 'postgresql':
+            cursor.executemany(
+                "UPDATE it_tickets_ticket SET vector_busqueda = "
+                f"setweight(to_tsvector('{CONFIG_PG}', %s), 'A') || "
+                f"setweight(to_tsvector('{CONFIG_PG}', %s), 'B') WHERE id = %s",
+                [
+                    (normalizar_texto(f"{t.folio} {t.titulo}"), normalizar_texto(t.descripcion), t.pk)
+                    for t in tickets
+                ],
+            )
+        elif fts5:
+            cursor.executemany(
+                f"INSERT INTO {TABLA_FTS} (rowid, texto) VALUES (%s, %s)",
+                [(t.pk, t.texto_busqueda) for t in tickets],
+            )
+
+
+def eliminar_indice_busqueda(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    with schema_editor.connection.cursor() as cursor:
+        if vendor == 'postgresql':
+            cursor.execute("DROP INDEX IF EXISTS idx_ticket_vector_busqueda")
+        elif vendor == 'sqlite':
+            cursor.execute(f"DROP TABLE IF EXISTS {TABLA_FTS}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('it_tickets', '0002_actividades_mantenimiento'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='texto_busqueda',
+            field=models.TextField(blank=True, editable=False, verbose_name='Texto de Búsqueda'),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='vector_busqueda',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(crear_indice_busqueda, eliminar_indice_busqueda),
+    ]
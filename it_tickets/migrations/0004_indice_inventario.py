@@ -0,0 +1,22 @@
+# Generated by Django 6.0 on 2026-10-19 08:41
+
+from django.db import migrations, models
+
+from checador.migraciones import AgregarIndiceConcurrente
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY en PostgreSQL no puede ir en una transacción
+    atomic = False
+
+    dependencies = [
+        ('empleados', '0004_empleado_descansa_domingo_empleado_descansa_sabado_and_more'),
+        ('it_tickets', '0003_busqueda_tickets'),
+    ]
+
+    operations = [
+        AgregarIndiceConcurrente(
+            model_name='equipocomputo',
+            index=models.Index(fields=['estado', 'marca', 'modelo', 'id'], name='idx_equipo_estado_marca_modelo'),
+        ),
+    ]
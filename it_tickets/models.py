@@ -5,13 +5,19 @@ Gestiona el inventario de equipo de computo y los tickets de soporte IT
 para Loginco. Incluye auditoría de cambios de estado y registro de
 mantenimientos preventivos y correctivos.
 """
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchVectorField
 from django.utils import timezone
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 import logging
 
+from checador.rastreo import RastreoCambiosMixin
+from folios.services import generar_folio
+from .services.busqueda import desindexar_ticket, indexar_tickets, texto_busqueda_ticket
+from .services.mantenimiento import PROXIMO, VENCIDO, clasificar_fecha
+
 logger = logging.getLogger(__name__)
 
 
@@ -170,32 +176,38 @@ class EquipoComputo(models.Model):
         indexes = [
             models.Index(fields=['estado'], name='idx_equipo_estado'),
             models.Index(fields=['empleado', 'estado'], name='idx_equipo_empleado_estado'),
+            # Orden de la paginación por llave del inventario (inventario_view)
+            models.Index(fields=['estado', 'marca', 'modelo', 'id'], name='idx_equipo_estado_marca_modelo'),
         ]
 
     def __str__(self):
         asignado = self.usuario_nombre or (self.empleado.nombre_completo if self.empleado else 'Sin asignar')
         return f"{self.marca} {self.modelo} [{self.numero_serie}] - {asignado}"
 
+    def _estado_mantenimiento(self):
+        """
+        Estado con la anticipación por defecto (DIAS_ANTICIPACION). No usa
+        la anotación `estado_mantenimiento`: pudo calcularse con otros
+        `dias_anticipacion` y las propiedades siempre significan 7 días.
+        """
+        return clasificar_fecha(self.fecha_proximo_mantenimiento)
+
     @property
     def requiere_mantenimiento_pronto(self):
         """Verdadero si el mantenimiento está en los próximos 7 días o ya venció."""
-        if not self.fecha_proximo_mantenimiento:
-            return False
-        return self.fecha_proximo_mantenimiento <= (timezone.now().date() + timezone.timedelta(days=7))
+        return self._estado_mantenimiento() in (PROXIMO, VENCIDO)
 
     @property
     def mantenimiento_vencido(self):
         """Verdadero si la fecha de próximo mantenimiento ya pasó."""
-        if not self.fecha_proximo_mantenimiento:
-            return False
-        return self.fecha_proximo_mantenimiento < timezone.now().date()
+        return self._estado_mantenimiento() == VENCIDO
 
 
 # ---------------------------------------------------------------------------
 # Modelo: Ticket
 # ---------------------------------------------------------------------------
 
-class Ticket(models.Model):
+class Ticket(RastreoCambiosMixin, models.Model):
     """
     Ticket de soporte IT levantado por un empleado.
 
@@ -204,6 +216,8 @@ class Ticket(models.Model):
     patrón TKT-YYYYMMDD-XXX (consistente con el patrón del proyecto).
     """
 
+    campos_rastreados = ('estado', 'prioridad', 'titulo', 'descripcion')
+
     folio = models.CharField(
         max_length=20,
         unique=True,
@@ -283,6 +297,17 @@ class Ticket(models.Model):
         blank=True,
         verbose_name='Fecha de Resolución'
     )
+    # Índice de búsqueda (ver it_tickets.services.busqueda)
+    texto_busqueda = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name='Texto de Búsqueda'
+    )
+    # Solo se llena en PostgreSQL (tsvector con índice GIN)
+    vector_busqueda = SearchVectorField(
+        null=True,
+        editable=False
+    )
 
     class Meta:
         verbose_name = 'Ticket de Soporte IT'
@@ -299,36 +324,43 @@ class Ticket(models.Model):
 
     def save(self, *args, **kwargs):
         """Genera el folio automáticamente en la primera creación."""
-        if not self.folio:
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'titulo', 'descripcion'}.intersection(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'texto_busqueda'}
+        if self.folio:
+            self.texto_busqueda = texto_busqueda_ticket(self)
+            super().save(*args, **kwargs)
+            return
+        # El consecutivo y el INSERT van en la misma transacción: si el
+        # guardado falla, el consecutivo no se pierde
+        with transaction.atomic():
             self.folio = self._generar_folio()
-        super().save(*args, **kwargs)
+            self.texto_busqueda = texto_busqueda_ticket(self)
+            super().save(*args, **kwargs)
 
     def _generar_folio(self):
         """
-        Genera folio con patrón TKT-YYYYMMDD-XXX.
-        Usa select_for_update en un contexto transaccional para evitar
-        colisiones en ambientes con múltiples workers.
+        Genera folio con patrón TKT-YYYYMMDD-XXX usando la secuencia del
+        día (folios.SecuenciaFolio), sin recorrer los tickets existentes.
         """
-        from django.db import transaction
         hoy = timezone.now().date()
         prefijo = f"TKT-{hoy.strftime('%Y%m%d')}"
-        with transaction.atomic():
-            ultimo = (
-                Ticket.objects
-                .filter(folio__startswith=prefijo)
-                .select_for_update()
-                .order_by('-folio')
-                .first()
-            )
-            if ultimo:
-                try:
-                    ultimo_consecutivo = int(ultimo.folio.split('-')[-1])
-                except (ValueError, IndexError):
-                    ultimo_consecutivo = 0
-                consecutivo = ultimo_consecutivo + 1
-            else:
-                consecutivo = 1
-        return f"{prefijo}-{consecutivo:03d}"
+        return generar_folio(prefijo, inicial=lambda: self._ultimo_consecutivo(prefijo))
+
+    @staticmethod
+    def _ultimo_consecutivo(prefijo):
+        """
+        Último consecutivo ya emitido para el prefijo. Solo se usa al crear
+        la secuencia del día (p.ej. el día en que se introdujo la tabla).
+        """
+        folios = Ticket.objects.filter(folio__startswith=f"{prefijo}-").values_list('folio', flat=True)
+        consecutivos = [0]
+        for folio in folios:
+            try:
+                consecutivos.append(int(folio.split('-')[-1]))
+            except (ValueError, IndexError):
+                pass
+        return max(consecutivos)
 
     @property
     def tiempo_resolucion_horas(self):
@@ -557,21 +589,6 @@ class MantenimientoEquipo(models.Model):
 # Señales
 # ---------------------------------------------------------------------------
 
-@receiver(pre_save, sender=Ticket)
-def capturar_estado_anterior(sender, instance, **kwargs):
-    """
-    Almacena en el objeto el estado anterior antes de guardarlo,
-    para que la señal post_save pueda comparar y disparar notificaciones.
-    """
-    if instance.pk:
-        try:
-            instance._estado_anterior = Ticket.objects.get(pk=instance.pk).estado
-        except Ticket.DoesNotExist:
-            instance._estado_anterior = None
-    else:
-        instance._estado_anterior = None
-
-
 @receiver(post_save, sender=Ticket)
 def manejar_cambio_estado_ticket(sender, instance, created, **kwargs):
     """
@@ -580,37 +597,56 @@ def manejar_cambio_estado_ticket(sender, instance, created, **kwargs):
     - Si cambió a 'espera': notifica al empleado.
     - Si cambió a 'concluido': notifica al empleado.
 
-    Las notificaciones se envían en segundo plano para no bloquear
-    la petición HTTP. Si falla el envío de email, se registra en el log
-    pero no se propaga la excepción.
+    Las notificaciones solo se encolan en la bandeja de salida (app correos)
+    cuando la transacción se confirma; el despachador las envía en segundo
+    plano sin bloquear la petición HTTP. Si falla el encolado se registra en
+    el log pero no se propaga la excepción.
     """
+    from correos.services import encolar_al_confirmar
     from it_tickets.services.notificaciones import (
         notificar_nuevo_ticket,
         notificar_ticket_en_espera,
         notificar_ticket_concluido,
     )
 
-    estado_anterior = getattr(instance, '_estado_anterior', None)
-
     if created:
-        try:
-            notificar_nuevo_ticket(instance)
-        except Exception as e:
-            logger.error(f"Error notificando nuevo ticket {instance.folio}: {e}")
+        encolar_al_confirmar(notificar_nuevo_ticket, instance)
         return
 
-    # Solo actuar si el estado cambió
-    if estado_anterior == instance.estado:
+    # Solo actuar si el estado cambió (valor cargado de la BD, sin consulta)
+    if not instance.has_changed('estado'):
         return
 
     if instance.estado == EstadoTicket.ESPERA:
-        try:
-            notificar_ticket_en_espera(instance)
-        except Exception as e:
-            logger.error(f"Error notificando ticket en espera {instance.folio}: {e}")
+        encolar_al_confirmar(notificar_ticket_en_espera, instance)
 
     elif instance.estado == EstadoTicket.CONCLUIDO:
-        try:
-            notificar_ticket_concluido(instance)
-        except Exception as e:
-            logger.error(f"Error notificando ticket concluido {instance.folio}: {e}")
+        encolar_al_confirmar(notificar_ticket_concluido, instance)
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+def invalidar_metricas_ticket(sender, instance, created=False, **kwargs):
+    """
+    Invalida el cache de métricas globales cuando cambia algún conteo:
+    ticket nuevo o eliminado, o cambio de estado/prioridad.
+    """
+    from it_tickets.services.metricas import invalidar_metricas
+
+    if kwargs.get('signal') is post_save and not created and not (
+        instance.has_changed('estado') or instance.has_changed('prioridad')
+    ):
+        return
+    transaction.on_commit(invalidar_metricas)
+
+
+@receiver(post_save, sender=Ticket)
+def indexar_ticket_busqueda(sender, instance, created, **kwargs):
+    """Mantiene el índice de búsqueda cuando cambia el texto del ticket."""
+    if created or instance.has_changed('titulo') or instance.has_changed('descripcion'):
+        indexar_tickets([instance])
+
+
+@receiver(post_delete, sender=Ticket)
+def desindexar_ticket_busqueda(sender, instance, **kwargs):
+    desindexar_ticket(instance.pk)
@@ -15,12 +15,20 @@ GRUPO_IT = 'IT'
 
 
 def usuario_es_it(user):
-    """Función helper reutilizable para verificar membresía en el grupo IT."""
+    """
+    Función helper reutilizable para verificar membresía en el grupo IT.
+
+    El resultado se guarda en el propio objeto user, que vive lo que dura
+    la petición; así los distintos permisos y vistas de una misma petición
+    consultan los grupos una sola vez.
+    """
     if not user or not user.is_authenticated:
         return False
     if user.is_superuser:
         return True
-    return user.groups.filter(name=GRUPO_IT).exists()
+    if not hasattr(user, '_es_grupo_it'):
+        user._es_grupo_it = user.groups.filter(name=GRUPO_IT).exists()
+    return user._es_grupo_it
 
 
 class EsGrupoIT(BasePermission):
@@ -6,15 +6,13 @@ Jobs programados:
   - reporte_semanal_it    : Lunes a las 9:00am -> reporte semanal de equipos y tickets
   - reporte_mensual_it    : Día 1 de cada mes a las 9:00am -> reporte mensual
 
-Usa APScheduler con DjangoJobStore (misma infraestructura que reportes/).
+Los jobs se registran en el mismo scheduler que los de reportes/
+(reportes.scheduler.crear_scheduler) y corren en el proceso dedicado
+`python manage.py run_scheduler`.
 """
 import logging
 
-from django.conf import settings
-from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
-from django_apscheduler.jobstores import DjangoJobStore
-from django_apscheduler.models import DjangoJobExecution
 from django_apscheduler import util
 
 logger = logging.getLogger(__name__)
@@ -59,18 +57,11 @@ def job_reporte_mensual_it():
         logger.error(f"Error en job_reporte_mensual_it: {e}")
 
 
-def start_scheduler_it():
+def registrar_jobs_it(scheduler):
     """
-    Inicializa el scheduler de IT y registra los jobs.
-    Se llama desde ItTicketsConfig.ready().
-
-    Reutiliza el DjangoJobStore ya configurado por django_apscheduler.
-    Si el scheduler de reportes ya está corriendo, los jobs de IT
-    se añaden al mismo store sin conflicto (los IDs son únicos).
+    Registra los jobs de IT en el scheduler del proyecto
+    (reportes.scheduler.crear_scheduler, usado por run_scheduler).
     """
-    scheduler = BackgroundScheduler(timezone=settings.TIME_ZONE)
-    scheduler.add_jobstore(DjangoJobStore(), "default")
-
     # Alertas de mantenimiento: Lunes y Jueves a las 8:00am
     scheduler.add_job(
         job_alertas_mantenimiento,
@@ -103,15 +94,3 @@ def start_scheduler_it():
         name="IT: Reporte Mensual de Tickets"
     )
     logger.info("Job programado: Reporte mensual IT (Día 1 de cada mes 9:00am)")
-
-    try:
-        logger.info("Iniciando scheduler de IT...")
-        scheduler.start()
-        logger.info("Scheduler de IT iniciado exitosamente")
-    except KeyboardInterrupt:
-        logger.info("Deteniendo scheduler de IT...")
-        scheduler.shutdown()
-    except Exception as e:
-        # Si ya hay un scheduler corriendo (puede ocurrir con runserver en
-        # modo debug con auto-reload), solo registramos el error y continuamos.
-        logger.warning(f"No se pudo iniciar el scheduler de IT: {e}")
@@ -477,6 +477,10 @@ class ImportarCSVSerializer(serializers.Serializer):
             "Si es False (default), omite duplicados."
         )
     )
+    dry_run = serializers.BooleanField(
+        default=False,
+        help_text="Si es True, no guarda nada y retorna los cambios que se aplicarían."
+    )
 
     def validate_archivo(self, value):
         nombre = value.name.lower()
@@ -0,0 +1,181 @@
+"""
+Búsqueda de texto completo en tickets.
+
+Cada ticket guarda su texto normalizado (minúsculas, sin acentos) en
+Ticket.texto_busqueda. Sobre ese texto se mantiene un índice según el
+motor de base de datos:
+
+- PostgreSQL: columna tsvector (Ticket.vector_busqueda) con índice GIN;
+  el folio y el título pesan más que la descripción.
+- SQLite: tabla virtual FTS5 (it_tickets_ticket_fts) con rowid = id del
+  ticket, para desarrollo local.
+- Cualquier otro caso (o SQLite sin FTS5): búsqueda por palabras sobre
+  texto_busqueda, sin ranking.
+
+El índice se actualiza al guardar o eliminar un ticket (señales en
+it_tickets/models.py). Los cambios hechos con queryset.update() o
+bulk_create no pasan por ahí; después de una carga masiva hay que correr
+`python manage.py reindexar_tickets`.
+"""
+import logging
+import re
+import unicodedata
+
+from django.db import connection
+from django.db.models import FloatField, Value
+from django.db.models.expressions import RawSQL
+
+logger = logging.getLogger(__name__)
+
+TABLA_FTS = 'it_tickets_ticket_fts'
+CONFIG_PG = 'spanish'
+
+_fts_disponible = {}
+
+
+def normalizar_texto(texto):
+    """Minúsculas, sin acentos y con espacios simples."""
+    texto = unicodedata.normalize('NFKD', texto or '')
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return ' '.join(texto.lower().split())
+
+
+def texto_busqueda_ticket(ticket):
+    return normalizar_texto(f"{ticket.folio} {ticket.titulo} {ticket.descripcion}")
+
+
+def _terminos(consulta):
+    return re.findall(r'\w+', normalizar_texto(consulta))
+
+
+def motor_busqueda():
+    """'postgresql', 'fts5' o 'basico' según la conexión actual."""
+    if connection.vendor == 'postgresql':
+        return 'postgresql'
+    if connection.vendor == 'sqlite':
+        alias = connection.alias
+        if alias not in _fts_disponible:
+            _fts_disponible[alias] = TABLA_FTS in connection.introspection.table_names()
+        if _fts_disponible[alias]:
+            return 'fts5'
+    return 'basico'
+
+
+def buscar_tickets(qs, consulta):
+    """
+    Filtra `qs` a los tickets que contienen todas las palabras de
+    `consulta` (también como prefijo) y los anota con `rango` (mayor es
+    más relevante). Ordena por rango y luego por fecha de creación.
+    """
+    terminos = _terminos(consulta)
+    if not terminos:
+        return qs
+
+    motor = motor_busqueda()
+    if motor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        query = SearchQuery(
+            ' & '.join(f"{t}:*" for t in terminos),
+            config=CONFIG_PG,
+            search_type='raw',
+        )
+        qs = qs.filter(vector_busqueda=query).annotate(
+            rango=SearchRank('vector_busqueda', query)
+        )
+    elif motor == 'fts5':
+        match = ' '.join(f'"{t}"*' for t in terminos)
+        tabla = qs.model._meta.db_table
+        qs = qs.filter(
+            pk__in=RawSQL(f"SELECT rowid FROM {TABLA_FTS} WHERE {TABLA_FTS} MATCH %s", [match])
+        ).annotate(
+            # bm25 es menor mientras más relevante; se invierte el signo
+            rango=RawSQL(
+                f"SELECT -bm25({TABLA_FTS}) FROM {TABLA_FTS} "
+                f"WHERE {TABLA_FTS} MATCH %s AND rowid = {tabla}.id",
+                [match],
+                output_field=FloatField(),
+            )
+        )
+    else:
+        for termino in terminos:
+            qs = qs.filter(texto_busqueda__contains=termino)
+        qs = qs.annotate(rango=Value(0.0, output_field=FloatField()))
+
+    return qs.order_by('-rango', '-fecha_creacion')
+
+
+def indexar_tickets(tickets):
+    """
+    Actualiza el índice de búsqueda de los tickets dados (ya guardados,
+    con texto_busqueda calculado).
+    """
+    tickets = list(tickets)
+    if not tickets:
+        return
+    motor = motor_busqueda()
+    if motor == 'postgresql':
+        from django.contrib.postgres.search import SearchVector
+        from it_tickets.models import Ticket
+
+        for ticket in tickets:
+            Ticket.objects.filter(pk=ticket.pk).update(
+                vector_busqueda=(
+                    SearchVector(
+                        Value(normalizar_texto(f"{ticket.folio} {ticket.titulo}")),
+                        weight='A', config=CONFIG_PG,
+                    )
+                    + SearchVector(
+                        Value(normalizar_texto(ticket.descripcion)),
+                        weight='B', config=CONFIG_PG,
+                    )
+                )
+            )
+    elif motor == 'fts5':
+        ids = [ticket.pk for ticket in tickets]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {TABLA_FTS} WHERE rowid IN ({', '.join(['%s'] * len(ids))})", ids
+            )
+            cursor.executemany(
+                f"INSERT INTO {TABLA_FTS} (rowid, texto) VALUES (%s, %s)",
+                [(ticket.pk, ticket.texto_busqueda) for ticket in tickets],
+            )
+
+
+def desindexar_ticket(ticket_id):
+    if motor_busqueda() == 'fts5':
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {TABLA_FTS} WHERE rowid = %s", [ticket_id])
+
+
+def reindexar_todos(tamano_lote=500):
+    """Recalcula texto_busqueda e índice de todos los tickets. Retorna el total."""
+    from it_tickets.models import Ticket
+
+    if motor_busqueda() == 'fts5':
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {TABLA_FTS}")
+
+    total = 0
+    lote = []
+    qs = Ticket.objects.only('id', 'folio', 'titulo', 'descripcion', 'texto_busqueda').order_by('pk')
+    for ticket in qs.iterator(chunk_size=tamano_lote):
+        ticket.texto_busqueda = texto_busqueda_ticket(ticket)
+        lote.append(ticket)
+        if len(lote) >= tamano_lote:
+            total += _guardar_lote_indice(lote)
+            lote = []
+    total += _guardar_lote_indice(lote)
+    logger.info(f"Índice de búsqueda de tickets reconstruido ({total} tickets)")
+    return total
+
+
+def _guardar_lote_indice(lote):
+    from it_tickets.models import Ticket
+
+    if not lote:
+        return 0
+    Ticket.objects.bulk_update(lote, ['texto_busqueda'])
+    indexar_tickets(lote)
+    return len(lote)
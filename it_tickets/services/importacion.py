@@ -0,0 +1,346 @@
+"""
+Importación del inventario de equipos desde CSV.
+
+La usan el endpoint POST /api/it/equipos/importar-csv/ y el comando
+importar_inventario_csv. El archivo se procesa en streaming:
+
+- Se decodifica línea por línea (utf-8 con BOM y, si una línea no es
+  utf-8 válido, latin-1), sin cargar todo el archivo en memoria.
+- Los códigos de empleado y los números de serie existentes se cargan una
+  sola vez al inicio.
+- Las filas se acumulan en lotes; cada lote se guarda con bulk_create /
+  bulk_update dentro de su propia transacción.
+- Los errores se reportan por fila y no detienen la importación.
+- En modo dry_run no se escribe nada y se regresan las diferencias que
+  se aplicarían.
+
+Mapeo de columnas del CSV original:
+[0] Codigo Empleado  -> empleado (FK por codigo_empleado)
+[1] Usuario          -> usuario_nombre
+[2] Tipo             -> tipo
+[3] Numero Serie     -> numero_serie
+[4] Marca            -> marca
+[5] Modelo           -> modelo
+[6] R                -> 'x' = tiene monitor externo
+[7] U                -> 'x' = tiene monitor USB
+[8] Monitores        -> (guardado en notas)
+[9] Marca (monitor)  -> marca_monitor
+[10] TELEFONO        -> telefono_serie
+[11] TEF MAC         -> mac_telefono
+"""
+import csv
+import logging
+
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from empleados.models import Empleado
+from it_tickets.models import EquipoComputo, TipoEquipo
+
+logger = logging.getLogger(__name__)
+
+TAMANO_LOTE = 500
+NUM_COLUMNAS = 12
+
+TIPO_MAP = {
+    'desktop': TipoEquipo.DESKTOP,
+    'laptop': TipoEquipo.LAPTOP,
+    'servidor': TipoEquipo.SERVIDOR,
+    'impresora': TipoEquipo.IMPRESORA,
+    'tablet': TipoEquipo.TABLET,
+}
+
+# Campos que escribe la importación (además de numero_serie)
+CAMPOS_IMPORTADOS = [
+    'empleado_id', 'usuario_nombre', 'tipo', 'marca', 'modelo',
+    'tiene_monitor', 'marca_monitor', 'telefono_serie', 'mac_telefono', 'notas',
+]
+
+
+def decodificar_lineas(lineas, encoding='utf-8-sig'):
+    """
+    Convierte un iterable de líneas en bytes (archivo abierto en modo 'rb' o
+    UploadedFile) en líneas de texto. Si una línea no se puede decodificar
+    con `encoding` se usa latin-1 para esa línea.
+    """
+    for linea in lineas:
+        if isinstance(linea, str):
+            yield linea
+            continue
+        try:
+            yield linea.decode(encoding)
+        except UnicodeDecodeError:
+            yield linea.decode('latin-1')
+
+
+def _longitudes_maximas():
+    return {
+        campo.attname: campo.max_length
+        for campo in EquipoComputo._meta.concrete_fields
+        if getattr(campo, 'max_length', None)
+    }
+
+
+def parsear_fila(fila, empleados_por_codigo):
+    """
+    Convierte una fila del CSV en (numero_serie, datos).
+    Lanza ValueError si la fila no es válida.
+    """
+    fila = list(fila) + [''] * (NUM_COLUMNAS - len(fila))
+
+    codigo_empleado = fila[0].strip()
+    usuario_nombre  = fila[1].strip()
+    tipo_raw        = fila[2].strip().lower()
+    numero_serie    = fila[3].strip().upper()
+    marca           = fila[4].strip()
+    modelo          = fila[5].strip()
+    col_r           = fila[6].strip().lower()
+    col_u           = fila[7].strip().lower()
+    monitores_raw   = fila[8].strip()
+    marca_monitor   = fila[9].strip()
+    telefono_serie  = fila[10].strip()
+    mac_telefono    = fila[11].strip()
+
+    if not numero_serie:
+        raise ValueError("Número de serie vacío. Omitida.")
+
+    notas = ''
+    if monitores_raw and monitores_raw not in ('', ' ', 'x'):
+        notas = f"Monitores: {monitores_raw}"
+    if col_r == 'x' and col_u == 'x':
+        notas += ' (monitor externo + USB)' if notas else '(monitor externo + USB)'
+
+    datos = {
+        # Si el código no existe no se bloquea la importación; el nombre
+        # queda en usuario_nombre
+        'empleado_id': empleados_por_codigo.get(codigo_empleado) if codigo_empleado else None,
+        'usuario_nombre': usuario_nombre or codigo_empleado or 'Sin asignar',
+        'tipo': TIPO_MAP.get(tipo_raw, TipoEquipo.DESKTOP),
+        'marca': marca,
+        'modelo': modelo,
+        'tiene_monitor': col_r == 'x' or col_u == 'x',
+        'marca_monitor': marca_monitor,
+        'telefono_serie': telefono_serie,
+        'mac_telefono': mac_telefono,
+        'notas': notas,
+    }
+    return numero_serie, datos
+
+
+def _validar_longitudes(numero_serie, datos, longitudes):
+    for campo, valor in [('numero_serie', numero_serie), *datos.items()]:
+        maximo = longitudes.get(campo)
+        if maximo and isinstance(valor, str) and len(valor) > maximo:
+            raise ValueError(f"'{campo}' excede {maximo} caracteres.")
+
+
+def _diferencias(equipo, datos):
+    """Campos que cambiarían: {campo: [antes, despues]}"""
+    return {
+        campo: [getattr(equipo, campo), valor]
+        for campo, valor in datos.items()
+        if getattr(equipo, campo) != valor
+    }
+
+
+class _Importacion:
+    """Estado de una importación en curso (contadores, lote pendiente)."""
+
+    def __init__(self, actualizar, dry_run, tamano_lote):
+        self.actualizar = actualizar
+        self.dry_run = dry_run
+        self.tamano_lote = tamano_lote
+        self.creados = 0
+        self.actualizados = 0
+        self.sin_cambios = 0
+        self.omitidos = 0
+        self.errores = []
+        self.cambios = []
+        self.lote = []
+
+        self.longitudes = _longitudes_maximas()
+        self.empleados_por_codigo = dict(
+            Empleado.objects.values_list('codigo_empleado', 'pk')
+        )
+        self.existentes = dict(
+            EquipoComputo.objects.values_list('numero_serie', 'pk')
+        )
+        # Primera fila en la que apareció cada número de serie del archivo
+        self.vistos = {}
+
+    def error(self, num_fila, mensaje, numero_serie=None):
+        if numero_serie:
+            self.errores.append(f"Fila {num_fila} (serie {numero_serie}): {mensaje}")
+        else:
+            self.errores.append(f"Fila {num_fila}: {mensaje}")
+        self.omitidos += 1
+
+    def agregar(self, num_fila, fila):
+        try:
+            numero_serie, datos = parsear_fila(fila, self.empleados_por_codigo)
+            _validar_longitudes(numero_serie, datos, self.longitudes)
+        except ValueError as e:
+            self.error(num_fila, str(e))
+            return
+
+        if numero_serie in self.vistos:
+            self.error(
+                num_fila,
+                f"Número de serie repetido en el archivo (fila {self.vistos[numero_serie]}).",
+                numero_serie,
+            )
+            return
+        self.vistos[numero_serie] = num_fila
+
+        if numero_serie in self.existentes and not self.actualizar:
+            self.omitidos += 1
+            if self.dry_run:
+                self.cambios.append({
+                    'fila': num_fila, 'numero_serie': numero_serie, 'accion': 'omitir',
+                })
+            return
+
+        self.lote.append((num_fila, numero_serie, datos))
+        if len(self.lote) >= self.tamano_lote:
+            self.guardar_lote()
+
+    def guardar_lote(self):
+        lote, self.lote = self.lote, []
+        if not lote:
+            return
+
+        actuales = {}
+        series_existentes = [s for _, s, _ in lote if s in self.existentes]
+        if series_existentes:
+            actuales = {
+                equipo.numero_serie: equipo
+                for equipo in EquipoComputo.objects.filter(
+                    numero_serie__in=series_existentes
+                ).only('numero_serie', *CAMPOS_IMPORTADOS)
+            }
+
+        nuevos = []
+        modificados = []
+        for num_fila, numero_serie, datos in lote:
+            equipo = actuales.get(numero_serie)
+            if equipo is None:
+                nuevos.append((num_fila, EquipoComputo(numero_serie=numero_serie, **datos)))
+                if self.dry_run:
+                    self.cambios.append({
+                        'fila': num_fila, 'numero_serie': numero_serie,
+                        'accion': 'crear', 'datos': datos,
+                    })
+                continue
+
+            diferencias = _diferencias(equipo, datos)
+            if not diferencias:
+                self.sin_cambios += 1
+                continue
+            if self.dry_run:
+                self.cambios.append({
+                    'fila': num_fila, 'numero_serie': numero_serie,
+                    'accion': 'actualizar', 'diferencias': diferencias,
+                })
+            for campo, valor in datos.items():
+                setattr(equipo, campo, valor)
+            modificados.append((num_fila, equipo))
+
+        if self.dry_run:
+            self.creados += len(nuevos)
+            self.actualizados += len(modificados)
+            return
+
+        try:
+            with transaction.atomic():
+                self._escribir(nuevos, modificados)
+        except DatabaseError as e:
+            # Algún registro del lote falló: se reintenta fila por fila
+            # para reportar solo las filas con error
+            logger.warning(f"Lote de importación falló ({e}); reintentando fila por fila")
+            for num_fila, equipo in nuevos:
+                self._escribir_fila(num_fila, equipo, nuevo=True)
+            for num_fila, equipo in modificados:
+                self._escribir_fila(num_fila, equipo, nuevo=False)
+            return
+
+        self.creados += len(nuevos)
+        self.actualizados += len(modificados)
+        for _, equipo in nuevos:
+            self.existentes[equipo.numero_serie] = equipo.pk
+
+    def _escribir(self, nuevos, modificados):
+        if nuevos:
+            EquipoComputo.objects.bulk_create([equipo for _, equipo in nuevos])
+        if modificados:
+            # bulk_update no aplica auto_now
+            ahora = timezone.now()
+            for _, equipo in modificados:
+                equipo.fecha_actualizacion = ahora
+            EquipoComputo.objects.bulk_update(
+                [equipo for _, equipo in modificados],
+                CAMPOS_IMPORTADOS + ['fecha_actualizacion'],
+            )
+
+    def _escribir_fila(self, num_fila, equipo, nuevo):
+        try:
+            with transaction.atomic():
+                if nuevo:
+                    self._escribir([(num_fila, equipo)], [])
+                else:
+                    self._escribir([], [(num_fila, equipo)])
+        except DatabaseError as e:
+            self.error(num_fila, str(e), equipo.numero_serie)
+            return
+        if nuevo:
+            self.creados += 1
+            self.existentes[equipo.numero_serie] = equipo.pk
+        else:
+            self.actualizados += 1
+
+    def resultado(self):
+        resultado = {
+            'creados': self.creados,
+            'actualizados': self.actualizados,
+            'sin_cambios': self.sin_cambios,
+            'omitidos': self.omitidos,
+            'errores': self.errores,
+            'total_procesado': self.creados + self.actualizados + self.sin_cambios + self.omitidos,
+            'dry_run': self.dry_run,
+        }
+        if self.dry_run:
+            resultado['cambios'] = self.cambios
+        return resultado
+
+
+def importar_inventario(lineas, actualizar_existentes=False, dry_run=False,
+                        encoding='utf-8-sig', tamano_lote=TAMANO_LOTE):
+    """
+    Importa el inventario desde un iterable de líneas del CSV (bytes o
+    texto). La primera línea es el encabezado y se ignora.
+
+    Args:
+        lineas: archivo abierto en modo binario, UploadedFile o lista de líneas
+        actualizar_existentes: actualizar los equipos cuyo número de serie
+            ya existe; por defecto se omiten
+        dry_run: no guardar nada y regresar en 'cambios' lo que se haría
+        encoding: encoding principal del archivo (latin-1 como respaldo)
+        tamano_lote: filas por bulk_create/bulk_update
+
+    Retorna dict con creados, actualizados, sin_cambios, omitidos, errores,
+    total_procesado y, en dry_run, cambios.
+    """
+    importacion = _Importacion(actualizar_existentes, dry_run, tamano_lote)
+    reader = csv.reader(decodificar_lineas(lineas, encoding))
+    next(reader, None)  # Saltar la fila de encabezado
+
+    for num_fila, fila in enumerate(reader, start=2):
+        importacion.agregar(num_fila, fila)
+    importacion.guardar_lote()
+
+    resultado = importacion.resultado()
+    logger.info(
+        f"Importación de inventario{' (dry-run)' if dry_run else ''}: "
+        f"{resultado['creados']} creado(s), {resultado['actualizados']} actualizado(s), "
+        f"{resultado['omitidos']} omitido(s), {len(resultado['errores'])} error(es)"
+    )
+    return resultado
@@ -0,0 +1,109 @@
+"""
+Estado de mantenimiento de los equipos.
+
+Clasifica cada equipo según fecha_proximo_mantenimiento con un solo
+Case/When en la consulta:
+
+- vencido:       la fecha ya pasó
+- proximo:       dentro de los próximos `dias_anticipacion` días (7 por defecto)
+- al_dia:        programado más adelante
+- sin_programar: sin fecha
+
+Lo usan las alertas por correo, el reporte de inventario, el dashboard,
+el inventario y el calendario de mantenimientos, para que todos cuenten
+igual. La fecha de hoy se calcula una sola vez por consulta.
+"""
+from datetime import timedelta
+
+from django.db.models import Case, CharField, Count, Q, Value, When
+from django.utils import timezone
+
+VENCIDO = 'vencido'
+PROXIMO = 'proximo'
+AL_DIA = 'al_dia'
+SIN_PROGRAMAR = 'sin_programar'
+
+ESTADOS_MANTENIMIENTO = (VENCIDO, PROXIMO, AL_DIA, SIN_PROGRAMAR)
+DIAS_ANTICIPACION = 7
+
+
+def clasificar_fecha(fecha, hoy=None, dias_anticipacion=DIAS_ANTICIPACION):
+    """Misma clasificación que la anotación, para una fecha suelta."""
+    if fecha is None:
+        return SIN_PROGRAMAR
+    hoy = hoy or timezone.now().date()
+    if fecha < hoy:
+        return VENCIDO
+    if fecha <= hoy + timedelta(days=dias_anticipacion):
+        return PROXIMO
+    return AL_DIA
+
+
+def anotar_estado_mantenimiento(qs=None, hoy=None, dias_anticipacion=DIAS_ANTICIPACION):
+    """
+    Anota `estado_mantenimiento` en el queryset de EquipoComputo.
+    EquipoComputo.mantenimiento_vencido / requiere_mantenimiento_pronto
+    no la leen: siempre clasifican con DIAS_ANTICIPACION.
+    """
+    from it_tickets.models import EquipoComputo
+
+    if qs is None:
+        qs = EquipoComputo.objects.all()
+    hoy = hoy or timezone.now().date()
+    return qs.annotate(
+        estado_mantenimiento=Case(
+            When(fecha_proximo_mantenimiento__isnull=True, then=Value(SIN_PROGRAMAR)),
+            When(fecha_proximo_mantenimiento__lt=hoy, then=Value(VENCIDO)),
+            When(
+                fecha_proximo_mantenimiento__lte=hoy + timedelta(days=dias_anticipacion),
+                then=Value(PROXIMO),
+            ),
+            default=Value(AL_DIA),
+            output_field=CharField(),
+        )
+    )
+
+
+def filtro_requiere_atencion(hoy=None, dias_anticipacion=DIAS_ANTICIPACION):
+    """Q de los equipos vencidos o próximos (usa el índice de la fecha)."""
+    hoy = hoy or timezone.now().date()
+    return Q(fecha_proximo_mantenimiento__lte=hoy + timedelta(days=dias_anticipacion))
+
+
+def clasificar_equipos(qs=None, hoy=None, dias_anticipacion=DIAS_ANTICIPACION,
+                       solo_atencion=False):
+    """
+    Ejecuta una sola consulta y reparte los equipos por estado de
+    mantenimiento. Cada equipo recibe `dias_para_mantenimiento` (negativo
+    si ya venció).
+
+    Con solo_atencion=True solo se consultan los vencidos y próximos.
+
+    Retorna dict {estado: [equipos]} con las cuatro llaves, ordenados por
+    fecha de próximo mantenimiento.
+    """
+    hoy = hoy or timezone.now().date()
+    qs = anotar_estado_mantenimiento(qs, hoy, dias_anticipacion)
+    if solo_atencion:
+        qs = qs.filter(filtro_requiere_atencion(hoy, dias_anticipacion))
+
+    grupos = {estado: [] for estado in ESTADOS_MANTENIMIENTO}
+    for equipo in qs.order_by('fecha_proximo_mantenimiento'):
+        fecha = equipo.fecha_proximo_mantenimiento
+        equipo.dias_para_mantenimiento = (fecha - hoy).days if fecha else None
+        grupos[equipo.estado_mantenimiento].append(equipo)
+    return grupos
+
+
+def contar_estados_mantenimiento(qs=None, hoy=None, dias_anticipacion=DIAS_ANTICIPACION):
+    """Conteo por estado de mantenimiento en una consulta agrupada."""
+    conteos = {estado: 0 for estado in ESTADOS_MANTENIMIENTO}
+    filas = (
+        anotar_estado_mantenimiento(qs, hoy, dias_anticipacion)
+        .order_by()
+        .values('estado_mantenimiento')
+        .annotate(total=Count('id'))
+    )
+    for fila in filas:
+        conteos[fila['estado_mantenimiento']] = fila['total']
+    return conteos
@@ -0,0 +1,76 @@
+"""
+Métricas de tickets para el endpoint /api/it/tickets/metricas/ y el
+dashboard de IT.
+
+Todos los conteos salen de una sola consulta agrupada por estado y
+prioridad que se pivotea en Python. Las métricas globales (vista de IT)
+se guardan unos segundos en el espacio de cache 'it_metricas' y se
+invalidan cuando un ticket se crea, cambia de estado/prioridad o se
+elimina (ver señales en it_tickets/models.py).
+"""
+from datetime import timedelta
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from checador.cache import invalidar_espacio, obtener_o_calcular
+from it_tickets.models import EstadoTicket, PrioridadTicket, Ticket
+
+ESPACIO_METRICAS = 'it_metricas'
+TTL_METRICAS = 60  # segundos
+
+
+def calcular_metricas(qs=None):
+    """
+    Calcula las métricas de tickets del queryset con una sola consulta.
+
+    Retorna dict con por_estado, por_prioridad, abiertos_total y
+    concluidos_ultimos_7_dias.
+    """
+    if qs is None:
+        qs = Ticket.objects.all()
+    hace_7_dias = timezone.now() - timedelta(days=7)
+
+    filas = (
+        qs.order_by()
+        .values('estado', 'prioridad')
+        .annotate(
+            total=Count('id'),
+            concluidos_recientes=Count(
+                'id',
+                filter=Q(
+                    estado=EstadoTicket.CONCLUIDO,
+                    fecha_resolucion__gte=hace_7_dias,
+                ),
+            ),
+        )
+    )
+
+    por_estado = {estado: 0 for estado in EstadoTicket.values}
+    por_prioridad = {prioridad: 0 for prioridad in PrioridadTicket.values}
+    concluidos_recientes = 0
+    for fila in filas:
+        if fila['estado'] in por_estado:
+            por_estado[fila['estado']] += fila['total']
+        if fila['prioridad'] in por_prioridad:
+            por_prioridad[fila['prioridad']] += fila['total']
+        concluidos_recientes += fila['concluidos_recientes']
+
+    return {
+        'por_estado': por_estado,
+        'por_prioridad': por_prioridad,
+        'abiertos_total': sum(
+            total for estado, total in por_estado.items()
+            if estado != EstadoTicket.CONCLUIDO
+        ),
+        'concluidos_ultimos_7_dias': concluidos_recientes,
+    }
+
+
+def obtener_metricas_globales():
+    """Métricas de todos los tickets (vista de IT), con cache de TTL corto."""
+    return obtener_o_calcular(ESPACIO_METRICAS, ('global',), calcular_metricas, TTL_METRICAS)
+
+
+def invalidar_metricas():
+    invalidar_espacio(ESPACIO_METRICAS)
@@ -6,14 +6,17 @@ Centraliza toda la lógica de envío de correos para:
 - Ticket en espera   -> empleado que lo levantó
 - Ticket concluido   -> empleado que lo levantó
 - Mantenimiento próximo -> grupo IT (llamado desde el scheduler)
+
+Los correos no se envían aquí: se agregan a la bandeja de salida (app
+correos) y el despachador los manda en segundo plano.
 """
 import logging
-from django.core.mail import send_mail
-from django.conf import settings
 from django.contrib.auth.models import Group
 from django.template.loader import render_to_string
 from django.utils import timezone
 
+from correos.services import encolar_correo
+
 logger = logging.getLogger(__name__)
 
 # Nombre del grupo Django que representa al equipo de IT.
@@ -72,20 +75,19 @@ def notificar_nuevo_ticket(ticket):
     )
 
     try:
-        send_mail(
-            subject=asunto,
-            message=cuerpo,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=destinatarios,
-            fail_silently=False,
+        encolar_correo(
+            asunto=asunto,
+            cuerpo=cuerpo,
+            destinatarios=destinatarios,
+            categoria='ticket',
         )
         logger.info(
             f"Notificación de nuevo ticket {ticket.folio} "
-            f"enviada a {len(destinatarios)} destinatarios IT."
+            f"encolada para {len(destinatarios)} destinatarios IT."
         )
     except Exception as e:
         logger.error(
-            f"Error enviando notificación de nuevo ticket {ticket.folio}: {e}"
+            f"Error encolando notificación de nuevo ticket {ticket.folio}: {e}"
         )
         raise
 
@@ -115,20 +117,19 @@ def notificar_ticket_en_espera(ticket):
     )
 
     try:
-        send_mail(
-            subject=asunto,
-            message=cuerpo,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[email_empleado],
-            fail_silently=False,
+        encolar_correo(
+            asunto=asunto,
+            cuerpo=cuerpo,
+            destinatarios=[email_empleado],
+            categoria='ticket',
         )
         logger.info(
             f"Notificación de espera del ticket {ticket.folio} "
-            f"enviada a {email_empleado}."
+            f"encolada para {email_empleado}."
         )
     except Exception as e:
         logger.error(
-            f"Error enviando notificación de espera {ticket.folio}: {e}"
+            f"Error encolando notificación de espera {ticket.folio}: {e}"
         )
         raise
 
@@ -160,20 +161,19 @@ def notificar_ticket_concluido(ticket):
     )
 
     try:
-        send_mail(
-            subject=asunto,
-            message=cuerpo,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[email_empleado],
-            fail_silently=False,
+        encolar_correo(
+            asunto=asunto,
+            cuerpo=cuerpo,
+            destinatarios=[email_empleado],
+            categoria='ticket',
         )
         logger.info(
             f"Notificación de cierre del ticket {ticket.folio} "
-            f"enviada a {email_empleado}."
+            f"encolada para {email_empleado}."
         )
     except Exception as e:
         logger.error(
-            f"Error enviando notificación de cierre {ticket.folio}: {e}"
+            f"Error encolando notificación de cierre {ticket.folio}: {e}"
         )
         raise
 
@@ -188,6 +188,7 @@ def notificar_mantenimientos_proximos(dias_anticipacion=7):
     Llamada desde el scheduler de la app.
     """
     from it_tickets.models import EquipoComputo, EstadoEquipo
+    from it_tickets.services.mantenimiento import PROXIMO, VENCIDO, clasificar_equipos
 
     destinatarios = _obtener_emails_grupo_it()
     if not destinatarios:
@@ -197,20 +198,20 @@ def notificar_mantenimientos_proximos(dias_anticipacion=7):
         return 0
 
     hoy = timezone.now().date()
-    fecha_limite = hoy + timezone.timedelta(days=dias_anticipacion)
-
-    equipos_proximos = EquipoComputo.objects.filter(
-        fecha_proximo_mantenimiento__lte=fecha_limite,
-        fecha_proximo_mantenimiento__gte=hoy,
-        estado__in=[EstadoEquipo.ACTIVO, EstadoEquipo.MANTENIMIENTO]
-    ).order_by('fecha_proximo_mantenimiento')
 
-    equipos_vencidos = EquipoComputo.objects.filter(
-        fecha_proximo_mantenimiento__lt=hoy,
-        estado__in=[EstadoEquipo.ACTIVO, EstadoEquipo.MANTENIMIENTO]
-    ).order_by('fecha_proximo_mantenimiento')
+    # Una sola consulta para vencidos y próximos
+    grupos = clasificar_equipos(
+        EquipoComputo.objects.filter(
+            estado__in=[EstadoEquipo.ACTIVO, EstadoEquipo.MANTENIMIENTO]
+        ),
+        hoy=hoy,
+        dias_anticipacion=dias_anticipacion,
+        solo_atencion=True,
+    )
+    equipos_vencidos = grupos[VENCIDO]
+    equipos_proximos = grupos[PROXIMO]
 
-    if not equipos_proximos.exists() and not equipos_vencidos.exists():
+    if not equipos_proximos and not equipos_vencidos:
         logger.info("No hay equipos con mantenimiento próximo o vencido.")
         return 0
 
@@ -221,11 +222,11 @@ def notificar_mantenimientos_proximos(dias_anticipacion=7):
         "",
     ]
 
-    if equipos_vencidos.exists():
-        lineas.append(f"MANTENIMIENTOS VENCIDOS ({equipos_vencidos.count()} equipos):")
+    if equipos_vencidos:
+        lineas.append(f"MANTENIMIENTOS VENCIDOS ({len(equipos_vencidos)} equipos):")
         lineas.append("-" * 40)
         for eq in equipos_vencidos:
-            dias_vencido = (hoy - eq.fecha_proximo_mantenimiento).days
+            dias_vencido = -eq.dias_para_mantenimiento
             lineas.append(
                 f"  - {eq.marca} {eq.modelo} [{eq.numero_serie}] "
                 f"| Usuario: {eq.usuario_nombre} "
@@ -234,14 +235,14 @@ def notificar_mantenimientos_proximos(dias_anticipacion=7):
             )
         lineas.append("")
 
-    if equipos_proximos.exists():
+    if equipos_proximos:
         lineas.append(
             f"MANTENIMIENTOS PRÓXIMOS (próximos {dias_anticipacion} días, "
-            f"{equipos_proximos.count()} equipos):"
+            f"{len(equipos_proximos)} equipos):"
         )
         lineas.append("-" * 40)
         for eq in equipos_proximos:
-            dias_restantes = (eq.fecha_proximo_mantenimiento - hoy).days
+            dias_restantes = eq.dias_para_mantenimiento
             lineas.append(
                 f"  - {eq.marca} {eq.modelo} [{eq.numero_serie}] "
                 f"| Usuario: {eq.usuario_nombre} "
@@ -255,26 +256,25 @@ def notificar_mantenimientos_proximos(dias_anticipacion=7):
 
     asunto = (
         f"[IT] Alerta de Mantenimiento: "
-        f"{equipos_vencidos.count()} vencidos, "
-        f"{equipos_proximos.count()} próximos"
+        f"{len(equipos_vencidos)} vencidos, "
+        f"{len(equipos_proximos)} próximos"
     )
 
     try:
-        send_mail(
-            subject=asunto,
-            message=cuerpo,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=destinatarios,
-            fail_silently=False,
+        encolar_correo(
+            asunto=asunto,
+            cuerpo=cuerpo,
+            destinatarios=destinatarios,
+            categoria='mantenimiento',
         )
-        total = equipos_proximos.count() + equipos_vencidos.count()
+        total = len(equipos_proximos) + len(equipos_vencidos)
         logger.info(
-            f"Notificación de mantenimientos enviada: "
+            f"Notificación de mantenimientos encolada: "
             f"{total} equipo(s) a {len(destinatarios)} destinatario(s)."
         )
         return total
     except Exception as e:
-        logger.error(f"Error enviando notificación de mantenimientos: {e}")
+        logger.error(f"Error encolando notificación de mantenimientos: {e}")
         raise
 
 
@@ -288,6 +288,7 @@ def enviar_reporte_semanal_it(email_destino=None):
     Si email_destino es None, envía al grupo IT.
     """
     from it_tickets.models import EquipoComputo, Ticket, EstadoEquipo, EstadoTicket
+    from it_tickets.services.mantenimiento import PROXIMO, VENCIDO, contar_estados_mantenimiento
     from datetime import timedelta
 
     hoy = timezone.now().date()
@@ -347,14 +348,10 @@ def enviar_reporte_semanal_it(email_destino=None):
         "-" * 40,
     ]
 
-    # Mantenimientos vencidos
-    vencidos = EquipoComputo.objects.filter(
-        fecha_proximo_mantenimiento__lt=hoy
-    ).count()
-    proximos_7 = EquipoComputo.objects.filter(
-        fecha_proximo_mantenimiento__gte=hoy,
-        fecha_proximo_mantenimiento__lte=hoy + timedelta(days=7)
-    ).count()
+    # Mantenimientos vencidos y próximos (7 días), una consulta agrupada
+    conteos_mantenimiento = contar_estados_mantenimiento(hoy=hoy)
+    vencidos = conteos_mantenimiento[VENCIDO]
+    proximos_7 = conteos_mantenimiento[PROXIMO]
     lineas += [
         f"  Mantenimientos vencidos: {vencidos}",
         f"  Próximos (7 días):       {proximos_7}",
@@ -366,18 +363,17 @@ def enviar_reporte_semanal_it(email_destino=None):
     asunto = f"[IT] Reporte Semanal - {hoy.strftime('%d/%m/%Y')}"
 
     try:
-        send_mail(
-            subject=asunto,
-            message=cuerpo,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=destinatarios,
-            fail_silently=False,
+        encolar_correo(
+            asunto=asunto,
+            cuerpo=cuerpo,
+            destinatarios=destinatarios,
+            categoria='reporte',
         )
         logger.info(
-            f"Reporte semanal IT enviado a {len(destinatarios)} destinatario(s)."
+            f"Reporte semanal IT encolado para {len(destinatarios)} destinatario(s)."
         )
     except Exception as e:
-        logger.error(f"Error enviando reporte semanal IT: {e}")
+        logger.error(f"Error encolando reporte semanal IT: {e}")
         raise
 
 
@@ -462,16 +458,15 @@ def enviar_reporte_mensual_it(email_destino=None):
     )
 
     try:
-        send_mail(
-            subject=asunto,
-            message=cuerpo,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=destinatarios,
-            fail_silently=False,
+        encolar_correo(
+            asunto=asunto,
+            cuerpo=cuerpo,
+            destinatarios=destinatarios,
+            categoria='reporte',
         )
         logger.info(
-            f"Reporte mensual IT enviado a {len(destinatarios)} destinatario(s)."
+            f"Reporte mensual IT encolado para {len(destinatarios)} destinatario(s)."
         )
     except Exception as e:
-        logger.error(f"Error enviando reporte mensual IT: {e}")
+        logger.error(f"Error encolando reporte mensual IT: {e}")
         raise
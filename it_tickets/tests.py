@@ -0,0 +1,189 @@
+import importlib
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from empleados.models import Empleado
+
+from .models import EquipoComputo, EstadoEquipo, Ticket
+from .services import busqueda, mantenimiento
+from .services.importacion import importar_inventario
+
+ENCABEZADO = 'Codigo,Usuario,Tipo,Serie,Marca,Modelo,R,U,Monitores,Marca monitor,Telefono,MAC\n'
+
+
+def fila(serie, marca='Dell'):
+    return f',Usuario {serie},laptop,{serie},{marca},Latitude,,,,,,\n'
+
+
+class ImportacionCsvTests(TestCase):
+
+    def test_fila_invalida_a_mitad_del_lote(self):
+        lineas = [ENCABEZADO, fila('S1'), fila(''), fila('S3'), fila('S4', marca='x' * 500), fila('S5')]
+
+        resultado = importar_inventario(lineas, tamano_lote=10)
+
+        self.assertEqual(resultado['creados'], 3)
+        self.assertEqual(resultado['omitidos'], 2)
+        self.assertEqual(len(resultado['errores']), 2)
+        self.assertTrue(resultado['errores'][0].startswith('Fila 3:'))
+        self.assertTrue(resultado['errores'][1].startswith('Fila 5:'))
+        self.assertEqual(
+            set(EquipoComputo.objects.values_list('numero_serie', flat=True)), {'S1', 'S3', 'S5'}
+        )
+
+    def test_error_de_base_de_datos_en_el_lote_conserva_las_demas_filas(self):
+        def lineas():
+            yield ENCABEZADO
+            yield fila('S1')
+            yield fila('S2')
+            # Otro proceso da de alta S3 después de que la importación cargó
+            # los números de serie existentes: el bulk_create del lote falla
+            EquipoComputo.objects.create(numero_serie='S3', marca='HP')
+            yield fila('S3')
+            yield fila('S4')
+
+        resultado = importar_inventario(lineas(), tamano_lote=10)
+
+        self.assertEqual(resultado['creados'], 3)
+        self.assertEqual(resultado['omitidos'], 1)
+        self.assertEqual(len(resultado['errores']), 1)
+        self.assertTrue(resultado['errores'][0].startswith('Fila 4 (serie S3):'))
+        self.assertEqual(EquipoComputo.objects.get(numero_serie='S3').marca, 'HP')
+        self.assertEqual(EquipoComputo.objects.filter(numero_serie__in=['S1', 'S2', 'S4']).count(), 3)
+
+    def test_dry_run_no_escribe(self):
+        resultado = importar_inventario([ENCABEZADO, fila('S1'), fila('')], dry_run=True)
+
+        self.assertEqual(resultado['creados'], 1)
+        self.assertEqual([c['accion'] for c in resultado['cambios']], ['crear'])
+        self.assertFalse(EquipoComputo.objects.exists())
+
+
+class BusquedaTicketsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        empleado = Empleado.objects.create(user=User.objects.create_user('reporta'), codigo_empleado='REP')
+        cls.impresora = Ticket.objects.create(
+            empleado=empleado, titulo='Impresora atascada',
+            descripcion='La impresión sale con manchas en el área de Compras',
+        )
+        cls.red = Ticket.objects.create(
+            empleado=empleado, titulo='Sin conexión a la red',
+            descripcion='El equipo no obtiene dirección IP',
+        )
+
+    def _buscar(self, consulta):
+        return list(busqueda.buscar_tickets(Ticket.objects.all(), consulta))
+
+    def test_normalizar_texto(self):
+        self.assertEqual(busqueda.normalizar_texto('  Conexión   ÁREA\tÑandú '), 'conexion area nandu')
+        self.assertEqual(busqueda.normalizar_texto(None), '')
+
+    def test_migracion_usa_una_copia_fiel_de_la_normalizacion(self):
+        migracion = importlib.import_module('it_tickets.migrations.0003_busqueda_tickets')
+        texto = 'Impresión  CAÍDA en Área de Compras'
+        self.assertEqual(migracion.normalizar_texto(texto), busqueda.normalizar_texto(texto))
+        self.assertEqual(migracion.TABLA_FTS, busqueda.TABLA_FTS)
+        self.assertEqual(migracion.CONFIG_PG, busqueda.CONFIG_PG)
+
+    def test_sin_acentos_por_prefijo_y_con_todas_las_palabras(self):
+        self.assertEqual(self._buscar('AREA compr'), [self.impresora])
+        self.assertEqual(self._buscar('conexión'), [self.red])
+        self.assertEqual(self._buscar('impresora red'), [])
+        self.assertEqual(self._buscar(self.red.folio), [self.red])
+
+    def test_consulta_vacia_no_filtra(self):
+        qs = Ticket.objects.all()
+        self.assertIs(busqueda.buscar_tickets(qs, ' ¿? '), qs)
+
+    def test_el_indice_sigue_al_guardar_y_eliminar(self):
+        self.red.titulo = 'Monitor parpadea'
+        self.red.save()
+        self.assertEqual(self._buscar('monitor'), [self.red])
+        self.assertEqual(self._buscar('conexion'), [])
+
+        pk = self.red.pk
+        self.red.delete()
+        self.assertEqual(self._buscar('monitor'), [])
+        self.assertFalse(Ticket.objects.filter(pk=pk).exists())
+
+    def test_reindexar_despues_de_update_masivo(self):
+        Ticket.objects.filter(pk=self.impresora.pk).update(titulo='Escáner dañado')
+        self.assertEqual(self._buscar('escaner'), [])
+
+        self.assertEqual(busqueda.reindexar_todos(tamano_lote=1), 2)
+
+        self.assertEqual(self._buscar('escaner'), [self.impresora])
+
+    def test_motor_basico(self):
+        with mock.patch.object(busqueda, 'motor_busqueda', return_value='basico'):
+            self.assertEqual(self._buscar('AREA compr'), [self.impresora])
+            self.assertEqual(self._buscar('impresora red'), [])
+
+
+class EstadoMantenimientoTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.hoy = timezone.now().date()
+        cls.fechas = {
+            'ayer': cls.hoy - timedelta(days=1),
+            'hoy': cls.hoy,
+            'limite': cls.hoy + timedelta(days=7),
+            'despues': cls.hoy + timedelta(days=8),
+            'sin_fecha': None,
+        }
+        cls.equipos = {
+            nombre: EquipoComputo.objects.create(numero_serie=nombre, fecha_proximo_mantenimiento=fecha)
+            for nombre, fecha in cls.fechas.items()
+        }
+
+    def test_limites_de_la_clasificacion(self):
+        esperado = {
+            'ayer': mantenimiento.VENCIDO,
+            'hoy': mantenimiento.PROXIMO,
+            'limite': mantenimiento.PROXIMO,
+            'despues': mantenimiento.AL_DIA,
+            'sin_fecha': mantenimiento.SIN_PROGRAMAR,
+        }
+        for nombre, fecha in self.fechas.items():
+            self.assertEqual(mantenimiento.clasificar_fecha(fecha, self.hoy), esperado[nombre], nombre)
+
+        anotados = mantenimiento.anotar_estado_mantenimiento(hoy=self.hoy)
+        self.assertEqual(
+            dict(anotados.values_list('numero_serie', 'estado_mantenimiento')), esperado
+        )
+        self.assertEqual(
+            mantenimiento.contar_estados_mantenimiento(hoy=self.hoy),
+            {mantenimiento.VENCIDO: 1, mantenimiento.PROXIMO: 2,
+             mantenimiento.AL_DIA: 1, mantenimiento.SIN_PROGRAMAR: 1},
+        )
+
+    def test_propiedades_ignoran_una_anotacion_con_otra_anticipacion(self):
+        equipo = mantenimiento.anotar_estado_mantenimiento(dias_anticipacion=30).get(numero_serie='despues')
+        self.assertEqual(equipo.estado_mantenimiento, mantenimiento.PROXIMO)
+        self.assertFalse(equipo.requiere_mantenimiento_pronto)
+        self.assertTrue(self.equipos['ayer'].mantenimiento_vencido)
+
+    def test_calendario_une_proximos_y_al_dia(self):
+        EquipoComputo.objects.filter(numero_serie='ayer').update(estado=EstadoEquipo.BAJA)
+        EquipoComputo.objects.create(
+            numero_serie='vencido_activo', fecha_proximo_mantenimiento=self.hoy - timedelta(days=3)
+        )
+        EquipoComputo.objects.create(
+            numero_serie='fuera_de_rango', fecha_proximo_mantenimiento=self.hoy + timedelta(days=61)
+        )
+        self.client.force_login(User.objects.create_user('it', is_superuser=True))
+
+        respuesta = self.client.get(reverse('it_tickets:calendario_mantenimiento'))
+
+        self.assertEqual(
+            [e.numero_serie for e in respuesta.context['proximos']], ['hoy', 'limite', 'despues']
+        )
+        self.assertEqual([e.numero_serie for e in respuesta.context['vencidos']], ['vencido_activo'])
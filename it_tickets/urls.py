@@ -23,6 +23,7 @@ Rutas resultantes:
     GET  /it/mantenimiento/calendario/     -> Calendario de mantenimientos
     GET  /it/equipos/{id}/detalle/         -> Detalle público del equipo (QR)
     GET  /it/equipos/imprimir-qrs/         -> Impresión A4 de todos los QRs
+    GET  /it/equipos/{id}/qr/              -> Imagen QR cacheada (PNG/SVG, ETag)
 """
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
@@ -37,6 +38,7 @@ from .views import (
     inventario_view,
     calendario_mantenimiento_view,
     equipo_detalle_qr_view,
+    equipo_qr_view,
     imprimir_qrs_view,
 )
 
@@ -61,4 +63,5 @@ urlpatterns = [
     # QR: imprimir antes que el detalle para evitar conflicto con int
     path('it/equipos/imprimir-qrs/', imprimir_qrs_view, name='imprimir_qrs'),
     path('it/equipos/<int:equipo_id>/detalle/', equipo_detalle_qr_view, name='equipo_detalle_qr'),
+    path('it/equipos/<int:equipo_id>/qr/', equipo_qr_view, name='equipo_qr'),
 ]
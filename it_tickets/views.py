@@ -13,19 +13,20 @@ Vistas web (función-based, requieren login de sesión):
   inventario_view        -> Gestión de inventario
   calendario_mantenimiento_view -> Vista de calendario
 """
-import csv
-import io
 import logging
 from datetime import timedelta
 
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth.models import Group
-from django.db import transaction
+from django.core.paginator import Paginator
 from django.db.models import Count, Q, Avg
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, get_object_or_404, redirect
+from django.template.loader import render_to_string
+from django.urls import reverse
 from django.utils import timezone
-from django.views.decorators.http import require_POST
+from django.utils.safestring import mark_safe
+from django.views.decorators.http import condition, require_POST
 
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
@@ -33,6 +34,9 @@ from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from checador.paginacion import SIGUIENTE, paginar_por_llave
+from checador.qr import FORMATOS, clave_qr, obtener_qr, obtener_qr_svg, pregenerar_qrs
+from checador.replicas import lectura_replica
 from empleados.models import Empleado
 from .models import (
     EquipoComputo, Ticket, HistorialTicket, MantenimientoEquipo,
@@ -46,9 +50,18 @@ from .serializers import (
     HistorialTicketSerializer, MantenimientoEquipoSerializer,
     ImportarCSVSerializer,
 )
+from .services.busqueda import buscar_tickets
+from .services.importacion import importar_inventario
+from .services.mantenimiento import (
+    AL_DIA, PROXIMO, VENCIDO, anotar_estado_mantenimiento, clasificar_equipos,
+    contar_estados_mantenimiento, filtro_requiere_atencion,
+)
+from .services.metricas import calcular_metricas, obtener_metricas_globales
 
 logger = logging.getLogger(__name__)
 
+TICKETS_POR_PAGINA = 25
+
 
 # ===========================================================================
 # API: EquipoComputo
@@ -116,14 +129,16 @@ class EquipoComputoViewSet(viewsets.ModelViewSet):
 
         archivo = serializer.validated_data['archivo']
         actualizar_existentes = serializer.validated_data['actualizar_existentes']
+        dry_run = serializer.validated_data['dry_run']
 
-        resultado = _procesar_csv_inventario(archivo, actualizar_existentes)
+        resultado = _procesar_csv_inventario(archivo, actualizar_existentes, dry_run)
         return Response(resultado, status=status.HTTP_200_OK)
 
     @action(detail=False, methods=['get'], url_path='resumen')
+    @lectura_replica()
     def resumen(self, request):
         """Métricas rápidas del inventario para el dashboard."""
-        hoy = timezone.now().date()
+        conteos_mantenimiento = contar_estados_mantenimiento()
         data = {
             'total': EquipoComputo.objects.count(),
             'activos': EquipoComputo.objects.filter(estado=EstadoEquipo.ACTIVO).count(),
@@ -131,136 +146,22 @@ class EquipoComputoViewSet(viewsets.ModelViewSet):
                 estado=EstadoEquipo.MANTENIMIENTO
             ).count(),
             'de_baja': EquipoComputo.objects.filter(estado=EstadoEquipo.BAJA).count(),
-            'mantenimiento_vencido': EquipoComputo.objects.filter(
-                fecha_proximo_mantenimiento__lt=hoy
-            ).count(),
-            'mantenimiento_proximo_7_dias': EquipoComputo.objects.filter(
-                fecha_proximo_mantenimiento__gte=hoy,
-                fecha_proximo_mantenimiento__lte=hoy + timedelta(days=7)
-            ).count(),
+            'mantenimiento_vencido': conteos_mantenimiento[VENCIDO],
+            'mantenimiento_proximo_7_dias': conteos_mantenimiento[PROXIMO],
         }
         return Response(data)
 
 
-def _procesar_csv_inventario(archivo, actualizar_existentes=False):
+def _procesar_csv_inventario(archivo, actualizar_existentes=False, dry_run=False):
     """
-    Procesa el CSV del inventario y crea/actualiza registros en la BD.
-
-    Mapeo de columnas del CSV original:
-    [0] Codigo Empleado  -> empleado (FK por codigo_empleado)
-    [1] Usuario          -> usuario_nombre
-    [2] Tipo             -> tipo
-    [3] Numero Serie     -> numero_serie
-    [4] Marca            -> marca
-    [5] Modelo           -> modelo
-    [6] R                -> (ignorado, columna interna)
-    [7] U                -> tiene_monitor (presencia de 'x')
-    [8] Monitores        -> (número - guardado en notas si > 1)
-    [9] Marca (monitor)  -> marca_monitor
-    [10] TELEFONO        -> telefono_serie
-    [11] TEF MAC         -> mac_telefono
+    Procesa el CSV del inventario subido y crea/actualiza registros en la BD.
+    El archivo se lee en streaming; ver it_tickets.services.importacion.
     """
-    creados = 0
-    actualizados = 0
-    omitidos = 0
-    errores = []
-
-    try:
-        contenido = archivo.read().decode('utf-8-sig')
-    except UnicodeDecodeError:
-        contenido = archivo.read().decode('latin-1')
-
-    reader = csv.reader(io.StringIO(contenido))
-    encabezado = next(reader, None)  # Saltar la fila de encabezado
-
-    for num_fila, fila in enumerate(reader, start=2):
-        # Normalizar fila para que siempre tenga 12 columnas
-        while len(fila) < 12:
-            fila.append('')
-
-        codigo_empleado = fila[0].strip()
-        usuario_nombre  = fila[1].strip()
-        tipo_raw        = fila[2].strip().lower()
-        numero_serie    = fila[3].strip().upper()
-        marca           = fila[4].strip()
-        modelo          = fila[5].strip()
-        col_r           = fila[6].strip().lower()   # 'x' = tiene monitor externo (R)
-        col_u           = fila[7].strip().lower()   # 'x' = tiene monitor USB
-        monitores_raw   = fila[8].strip()
-        marca_monitor   = fila[9].strip()
-        telefono_serie  = fila[10].strip()
-        mac_telefono    = fila[11].strip()
-
-        if not numero_serie:
-            errores.append(f"Fila {num_fila}: Número de serie vacío. Omitida.")
-            omitidos += 1
-            continue
-
-        # Mapear tipo
-        tipo_map = {
-            'desktop': TipoEquipo.DESKTOP,
-            'laptop': TipoEquipo.LAPTOP,
-            'servidor': TipoEquipo.SERVIDOR,
-            'impresora': TipoEquipo.IMPRESORA,
-            'tablet': TipoEquipo.TABLET,
-        }
-        tipo = tipo_map.get(tipo_raw, TipoEquipo.DESKTOP)
-
-        # Tiene monitor si cualquiera de las columnas R o U tiene 'x'
-        tiene_monitor = bool(col_r == 'x' or col_u == 'x')
-
-        # Buscar empleado por código
-        empleado = None
-        if codigo_empleado:
-            try:
-                empleado = Empleado.objects.get(codigo_empleado=codigo_empleado)
-            except Empleado.DoesNotExist:
-                # No bloqueamos la importación; guardamos el nombre en usuario_nombre
-                pass
-
-        # Notas adicionales
-        notas = ''
-        if monitores_raw and monitores_raw not in ('', ' ', 'x'):
-            notas = f"Monitores: {monitores_raw}"
-        if col_r == 'x' and col_u == 'x':
-            notas += ' (monitor externo + USB)' if notas else '(monitor externo + USB)'
-
-        datos = {
-            'empleado': empleado,
-            'usuario_nombre': usuario_nombre or codigo_empleado or 'Sin asignar',
-            'tipo': tipo,
-            'marca': marca,
-            'modelo': modelo,
-            'tiene_monitor': tiene_monitor,
-            'marca_monitor': marca_monitor,
-            'telefono_serie': telefono_serie,
-            'mac_telefono': mac_telefono,
-            'notas': notas,
-        }
-
-        try:
-            with transaction.atomic():
-                equipo_qs = EquipoComputo.objects.filter(numero_serie=numero_serie)
-                if equipo_qs.exists():
-                    if actualizar_existentes:
-                        equipo_qs.update(**datos)
-                        actualizados += 1
-                    else:
-                        omitidos += 1
-                else:
-                    EquipoComputo.objects.create(numero_serie=numero_serie, **datos)
-                    creados += 1
-        except Exception as e:
-            errores.append(f"Fila {num_fila} (serie {numero_serie}): {str(e)}")
-            omitidos += 1
-
-    return {
-        'creados': creados,
-        'actualizados': actualizados,
-        'omitidos': omitidos,
-        'errores': errores,
-        'total_procesado': creados + actualizados + omitidos,
-    }
+    return importar_inventario(
+        archivo,
+        actualizar_existentes=actualizar_existentes,
+        dry_run=dry_run,
+    )
 
 
 # ===========================================================================
@@ -426,38 +327,22 @@ class TicketViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'], url_path='metricas')
+    @lectura_replica()
     def metricas(self, request):
         """
         Dashboard de métricas para IT.
         Retorna conteos por estado, prioridad y categoría.
         Solo IT puede acceder al resumen completo; empleados ven solo sus propias métricas.
+        Una sola consulta agrupada; las métricas de IT se sirven del cache.
         """
         if usuario_es_it(request.user):
-            qs_base = Ticket.objects.all()
+            data = obtener_metricas_globales()
         else:
             try:
                 qs_base = Ticket.objects.filter(empleado=request.user.empleado)
             except AttributeError:
                 return Response({'error': 'Sin perfil de empleado.'}, status=400)
-
-        data = {
-            'por_estado': {
-                estado: qs_base.filter(estado=estado).count()
-                for estado, _ in EstadoTicket.choices
-            },
-            'por_prioridad': {
-                prioridad: qs_base.filter(prioridad=prioridad).count()
-                for prioridad, _ in [
-                    ('critica', 'Crítica'), ('alta', 'Alta'),
-                    ('media', 'Media'), ('baja', 'Baja')
-                ]
-            },
-            'abiertos_total': qs_base.exclude(estado=EstadoTicket.CONCLUIDO).count(),
-            'concluidos_ultimos_7_dias': qs_base.filter(
-                estado=EstadoTicket.CONCLUIDO,
-                fecha_resolucion__gte=timezone.now() - timedelta(days=7)
-            ).count(),
-        }
+            data = calcular_metricas(qs_base)
         return Response(data)
 
 
@@ -501,6 +386,7 @@ def _requiere_it(user):
 
 
 @login_required
+@lectura_replica()
 def dashboard_it_view(request):
     """
     Dashboard principal de IT con métricas de tickets e inventario.
@@ -514,13 +400,9 @@ def dashboard_it_view(request):
             estado=EstadoTicket.CONCLUIDO
         ).select_related('empleado__user', 'asignado_a').order_by('prioridad', '-fecha_creacion')[:10]
 
-        metricas = {
-            estado_val: Ticket.objects.filter(estado=estado_val).count()
-            for estado_val, _ in EstadoTicket.choices
-        }
-        equipos_alerta = EquipoComputo.objects.filter(
-            Q(fecha_proximo_mantenimiento__lt=hoy) |
-            Q(fecha_proximo_mantenimiento__lte=hoy + timedelta(days=7))
+        metricas = obtener_metricas_globales()['por_estado']
+        equipos_alerta = anotar_estado_mantenimiento(hoy=hoy).filter(
+            filtro_requiere_atencion(hoy)
         ).order_by('fecha_proximo_mantenimiento')[:5]
     else:
         try:
@@ -574,13 +456,13 @@ def lista_tickets_view(request):
     if categoria:
         qs = qs.filter(categoria=categoria)
     if buscar:
-        qs = qs.filter(
-            Q(folio__icontains=buscar) |
-            Q(titulo__icontains=buscar) |
-            Q(descripcion__icontains=buscar)
-        )
+        # Índice de texto completo, ordenado por relevancia
+        qs = buscar_tickets(qs, buscar)
+    else:
+        qs = qs.order_by('-fecha_creacion')
 
-    qs = qs.order_by('-fecha_creacion')
+    paginador = Paginator(qs, TICKETS_POR_PAGINA)
+    pagina = paginador.get_page(request.GET.get('page'))
 
     # Equipos asignados al empleado para el modal de nuevo ticket
     equipos_empleado = []
@@ -603,7 +485,9 @@ def lista_tickets_view(request):
 
     import json
     contexto = {
-        'tickets': qs,
+        'tickets': pagina,
+        'page_obj': pagina,
+        'total_tickets': paginador.count,
         'es_it': es_it,
         'estados': EstadoTicket.choices,
         'filtro_estado': estado,
@@ -657,22 +541,51 @@ def inventario_view(request):
     Gestión de inventario de equipos. Solo para IT.
     """
     hoy = timezone.now().date()
-    equipos = EquipoComputo.objects.select_related('empleado__user').order_by(
-        'estado', 'marca', 'modelo'
+    equipos = anotar_estado_mantenimiento(
+        EquipoComputo.objects.select_related('empleado__user'), hoy=hoy
     )
 
     estado_filtro = request.GET.get('estado', '')
+    tipo_filtro = request.GET.get('tipo', '')
+    buscar = request.GET.get('q', '').strip()
     if estado_filtro:
         equipos = equipos.filter(estado=estado_filtro)
+    if tipo_filtro:
+        equipos = equipos.filter(tipo=tipo_filtro)
+    if buscar:
+        equipos = equipos.filter(
+            Q(numero_serie__icontains=buscar) |
+            Q(usuario_nombre__icontains=buscar) |
+            Q(marca__icontains=buscar) |
+            Q(modelo__icontains=buscar)
+        )
+
+    # Paginación por llave: el costo no crece con el número de página
+    pagina = paginar_por_llave(
+        equipos,
+        orden=('estado', 'marca', 'modelo', 'id'),
+        cursor=request.GET.get('cursor'),
+        direccion=request.GET.get('dir', SIGUIENTE),
+        tamano=50,
+    )
+
+    # Totales del inventario completo en una consulta agrupada
+    por_estado = {estado: 0 for estado in EstadoEquipo.values}
+    for fila in EquipoComputo.objects.order_by().values('estado').annotate(total=Count('id')):
+        por_estado[fila['estado']] = fila['total']
 
     contexto = {
-        'equipos': equipos,
+        'equipos': pagina.objetos,
+        'pagina': pagina,
         'estados': EstadoEquipo.choices,
+        'tipos': TipoEquipo.choices,
         'filtro_estado': estado_filtro,
-        'total_activos': EquipoComputo.objects.filter(estado=EstadoEquipo.ACTIVO).count(),
-        'total_mantenimiento_vencido': EquipoComputo.objects.filter(
-            fecha_proximo_mantenimiento__lt=hoy
-        ).count(),
+        'filtro_tipo': tipo_filtro,
+        'buscar': buscar,
+        'total_equipos': sum(por_estado.values()),
+        'total_activos': por_estado[EstadoEquipo.ACTIVO],
+        'total_en_mantenimiento': por_estado[EstadoEquipo.MANTENIMIENTO],
+        'total_mantenimiento_vencido': contar_estados_mantenimiento(hoy=hoy)[VENCIDO],
     }
     return render(request, 'it_tickets/inventario.html', contexto)
 
@@ -691,15 +604,17 @@ def calendario_mantenimiento_view(request):
         fecha_realizado__gte=inicio
     ).select_related('equipo', 'registrado_por').order_by('fecha_realizado')
 
-    proximos = EquipoComputo.objects.filter(
-        fecha_proximo_mantenimiento__gte=hoy,
-        fecha_proximo_mantenimiento__lte=fin,
-    ).order_by('fecha_proximo_mantenimiento')
-
-    vencidos = EquipoComputo.objects.filter(
-        fecha_proximo_mantenimiento__lt=hoy,
-        estado__in=[EstadoEquipo.ACTIVO, EstadoEquipo.MANTENIMIENTO]
-    ).order_by('fecha_proximo_mantenimiento')
+    # Una sola consulta: vencidos (equipos en uso) y programados hasta `fin`
+    grupos = clasificar_equipos(
+        EquipoComputo.objects.filter(fecha_proximo_mantenimiento__lte=fin).exclude(
+            Q(fecha_proximo_mantenimiento__lt=hoy) & ~Q(
+                estado__in=[EstadoEquipo.ACTIVO, EstadoEquipo.MANTENIMIENTO]
+            )
+        ),
+        hoy=hoy,
+    )
+    vencidos = grupos[VENCIDO]
+    proximos = grupos[PROXIMO] + grupos[AL_DIA]
 
     contexto = {
         'mantenimientos_recientes': mantenimientos,
@@ -714,19 +629,43 @@ def calendario_mantenimiento_view(request):
 # Helpers QR
 # ---------------------------------------------------------------------------
 
-def _generar_qr_base64(url):
-    """Genera un QR code como data URI base64 PNG a partir de una URL."""
-    import base64
-    from io import BytesIO
-    import qrcode
+# Marcador en imprimir_qrs.html donde se insertan las etiquetas en streaming
+_MARCADOR_ETIQUETAS = '<!--ETIQUETAS-->'
 
-    qr = qrcode.QRCode(version=1, box_size=8, border=2)
-    qr.add_data(url)
-    qr.make(fit=True)
-    img = qr.make_image(fill_color='black', back_color='white')
-    buf = BytesIO()
-    img.save(buf, format='PNG')
-    return base64.b64encode(buf.getvalue()).decode('utf-8')
+
+def _url_detalle_equipo(request, equipo_id):
+    """URL absoluta y canónica que se codifica en el QR del equipo."""
+    return request.build_absolute_uri(
+        reverse('it_tickets:equipo_detalle_qr', args=[equipo_id])
+    )
+
+
+def _etag_qr_equipo(request, equipo_id):
+    # Sin equipo no hay ETag: la vista responde 404 sin generar nada
+    if not EquipoComputo.objects.filter(pk=equipo_id).exists():
+        return None
+    formato = 'svg' if request.GET.get('formato') == 'svg' else 'png'
+    return clave_qr(_url_detalle_equipo(request, equipo_id), formato=formato)
+
+
+# ---------------------------------------------------------------------------
+# Vista pública: imagen QR de un equipo (cacheada)
+# ---------------------------------------------------------------------------
+
+@condition(etag_func=_etag_qr_equipo)
+def equipo_qr_view(request, equipo_id):
+    """
+    Imagen QR del equipo (?formato=svg|png, PNG por defecto).
+    Se genera una vez y se sirve desde el cache; con If-None-Match el
+    navegador recibe 304 sin que se lea el archivo.
+    Solo equipos existentes: la vista es pública y cada QR nuevo ocupa disco.
+    """
+    get_object_or_404(EquipoComputo.objects.only('pk'), pk=equipo_id)
+    formato = 'svg' if request.GET.get('formato') == 'svg' else 'png'
+    datos, _ = obtener_qr(_url_detalle_equipo(request, equipo_id), formato=formato)
+    response = HttpResponse(datos, content_type=FORMATOS[formato])
+    response['Cache-Control'] = 'public, max-age=86400'
+    return response
 
 
 # ---------------------------------------------------------------------------
@@ -744,9 +683,6 @@ def equipo_detalle_qr_view(request, equipo_id):
         pk=equipo_id,
     )
 
-    url_detalle = request.build_absolute_uri()
-    qr_base64 = _generar_qr_base64(url_detalle)
-
     ultimos_mantenimientos = MantenimientoEquipo.objects.filter(
         equipo=equipo
     ).order_by('-fecha_realizado')[:5]
@@ -755,7 +691,6 @@ def equipo_detalle_qr_view(request, equipo_id):
 
     return render(request, 'it_tickets/equipo_detalle_qr.html', {
         'equipo': equipo,
-        'qr_base64': qr_base64,
         'ultimos_mantenimientos': ultimos_mantenimientos,
         'user_is_it': user_is_it,
     })
@@ -771,6 +706,9 @@ def imprimir_qrs_view(request):
     Genera una página optimizada para impresión A4 con los QR codes de todos
     los equipos (excluyendo los dados de baja por defecto).
     El parámetro ?estado=activo|mantenimiento|baja filtra el listado.
+
+    Los QR se insertan como SVG en línea (unos pocos KB cada uno, tomados del
+    cache) y la página se envía en streaming etiqueta por etiqueta.
     """
     estado_filtro = request.GET.get('estado', '')
 
@@ -780,17 +718,28 @@ def imprimir_qrs_view(request):
     else:
         qs = qs.exclude(estado=EstadoEquipo.BAJA)
 
-    equipos_con_qr = []
-    for equipo in qs:
-        url_detalle = request.build_absolute_uri(
-            f'/it/equipos/{equipo.pk}/detalle/'
-        )
-        equipos_con_qr.append({
-            'equipo': equipo,
-            'qr_base64': _generar_qr_base64(url_detalle),
-        })
-
-    return render(request, 'it_tickets/imprimir_qrs.html', {
-        'equipos_con_qr': equipos_con_qr,
-        'total': len(equipos_con_qr),
-    })
+    equipos = list(qs)
+    urls = [_url_detalle_equipo(request, equipo.pk) for equipo in equipos]
+    # Los que falten en el cache se generan en paralelo antes de empezar
+    pregenerar_qrs(urls, formato='svg')
+
+    pagina = render_to_string('it_tickets/imprimir_qrs.html', {
+        'total': len(equipos),
+    }, request=request)
+    inicio, fin = pagina.split(_MARCADOR_ETIQUETAS, 1)
+
+    def _generar():
+        yield inicio
+        if not equipos:
+            yield (
+                '<div style="grid-column:span 2;text-align:center;padding:40px;color:#9ca3af;">'
+                'No hay equipos para mostrar.</div>'
+            )
+        for equipo, url in zip(equipos, urls):
+            yield render_to_string('it_tickets/_etiqueta_qr.html', {
+                'equipo': equipo,
+                'qr_svg': mark_safe(obtener_qr_svg(url)),
+            })
+        yield fin
+
+    return StreamingHttpResponse(_generar(), content_type='text/html; charset=utf-8')
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Departamento, RelacionSupervision
+from .models import AprobadorPermiso, Departamento, RelacionSupervision
 
 
 @admin.register(Departamento)
@@ -50,3 +50,18 @@ class RelacionSupervisionAdmin(admin.ModelAdmin):
         return obj.esta_vigente()
     esta_vigente.boolean = True
     esta_vigente.short_description = 'Vigente'
+
+
+@admin.register(AprobadorPermiso)
+class AprobadorPermisoAdmin(admin.ModelAdmin):
+    """Indice calculado: solo lectura"""
+    list_display = ('subordinado', 'aprobador', 'origen', 'fecha_inicio', 'fecha_fin')
+    list_filter = ('origen',)
+    search_fields = ('aprobador__user__username', 'subordinado__user__username')
+    list_select_related = ('subordinado__user', 'aprobador__user')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
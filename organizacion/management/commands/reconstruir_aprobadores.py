@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from organizacion.models import Departamento
+from organizacion.services import reconstruir_aprobadores
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el indice de aprobadores de permisos (y opcionalmente la jerarquia de departamentos)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--jerarquia',
+            action='store_true',
+            help='Reconstruir tambien ruta_jerarquia/nivel de los departamentos',
+        )
+
+    def handle(self, *args, **options):
+        if options['jerarquia']:
+            Departamento.reconstruir_jerarquia()
+            self.stdout.write(self.style.SUCCESS('Jerarquia de departamentos reconstruida'))
+
+        total = reconstruir_aprobadores()
+        self.stdout.write(self.style.SUCCESS(f'Indice de aprobadores reconstruido: {total} filas'))
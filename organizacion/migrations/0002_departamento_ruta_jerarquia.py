@@ -0,0 +1,46 @@
+# Generated by Django 6.0 on 2026-10-19 07:19
+
+from django.db import migrations, models
+
+
+def poblar_ruta_jerarquia(apps, schema_editor):
+    Departamento = apps.get_model('organizacion', 'Departamento')
+    padres = dict(Departamento.objects.values_list('pk', 'departamento_padre_id'))
+    rutas = {}
+
+    def ruta_de(pk, visitados=()):
+        if pk in rutas:
+            return rutas[pk]
+        padre = padres.get(pk)
+        if padre is None or padre in visitados or padre not in padres:
+            rutas[pk] = f"/{pk}/"
+        else:
+            rutas[pk] = f"{ruta_de(padre, visitados + (pk,))}{pk}/"
+        return rutas[pk]
+
+    departamentos = list(Departamento.objects.only('pk', 'departamento_padre_id'))
+    for dept in departamentos:
+        dept.ruta_jerarquia = ruta_de(dept.pk)
+        dept.nivel = dept.ruta_jerarquia.count('/') - 2
+    Departamento.objects.bulk_update(departamentos, ['ruta_jerarquia', 'nivel'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizacion', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='departamento',
+            name='nivel',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Nivel'),
+        ),
+        migrations.AddField(
+            model_name='departamento',
+            name='ruta_jerarquia',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=255, verbose_name='Ruta Jerarquica'),
+        ),
+        migrations.RunPython(poblar_ruta_jerarquia, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 6.0 on 2026-10-19 07:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def poblar_aprobadores(apps, schema_editor):
+    Empleado = apps.get_model('empleados', 'Empleado')
+    RelacionSupervision = apps.get_model('organizacion', 'RelacionSupervision')
+    AprobadorPermiso = apps.get_model('organizacion', 'AprobadorPermiso')
+
+    filas = []
+    for empleado_id, supervisor_id, responsable_id in Empleado.objects.values_list(
+        'pk', 'supervisor_directo_id', 'departamento_obj__responsable_id'
+    ):
+        if supervisor_id and supervisor_id != empleado_id:
+            filas.append(AprobadorPermiso(
+                subordinado_id=empleado_id, aprobador_id=supervisor_id,
+                origen='supervisor_directo'
+            ))
+        if responsable_id and responsable_id != empleado_id:
+            filas.append(AprobadorPermiso(
+                subordinado_id=empleado_id, aprobador_id=responsable_id,
+                origen='responsable_departamento'
+            ))
+    for subordinado_id, supervisor_id, fecha_inicio, fecha_fin in RelacionSupervision.objects.filter(
+        puede_autorizar_permisos=True, activo=True
+    ).values_list('subordinado_id', 'supervisor_id', 'fecha_inicio', 'fecha_fin'):
+        if supervisor_id != subordinado_id:
+            filas.append(AprobadorPermiso(
+                subordinado_id=subordinado_id, aprobador_id=supervisor_id,
+                origen='relacion', fecha_inicio=fecha_inicio, fecha_fin=fecha_fin
+            ))
+    AprobadorPermiso.objects.bulk_create(filas, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empleados', '0004_empleado_descansa_domingo_empleado_descansa_sabado_and_more'),
+        ('organizacion', '0002_departamento_ruta_jerarquia'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AprobadorPermiso',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('origen', models.CharField(choices=[('supervisor_directo', 'Supervisor Directo'), ('relacion', 'Relacion de Supervision'), ('responsable_departamento', 'Responsable de Departamento')], max_length=30, verbose_name='Origen')),
+                ('fecha_inicio', models.DateField(blank=True, null=True, verbose_name='Vigente Desde')),
+                ('fecha_fin', models.DateField(blank=True, null=True, verbose_name='Vigente Hasta')),
+                ('aprobador', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aprobaciones_permiso', to='empleados.empleado', verbose_name='Aprobador')),
+                ('subordinado', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aprobadores_permiso', to='empleados.empleado', verbose_name='Subordinado')),
+            ],
+            options={
+                'verbose_name': 'Aprobador de Permisos',
+                'verbose_name_plural': 'Aprobadores de Permisos',
+                'indexes': [models.Index(fields=['aprobador', 'subordinado'], name='org_aprobador_subord_idx')],
+            },
+        ),
+        migrations.RunPython(poblar_aprobadores, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,11 @@
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Substr
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from checador.cache import invalidar_con_senales
 
 
 class Departamento(models.Model):
@@ -38,6 +45,21 @@ class Departamento(models.Model):
         default=True,
         verbose_name='Activo'
     )
+    # Indice jerarquico materializado: ids desde la raiz, p. ej. "/1/5/12/".
+    # Se mantiene en save() y en la señal post_delete; no editar a mano.
+    ruta_jerarquia = models.CharField(
+        max_length=255,
+        blank=True,
+        default='',
+        editable=False,
+        db_index=True,
+        verbose_name='Ruta Jerarquica'
+    )
+    nivel = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Nivel'
+    )
     fecha_creacion = models.DateTimeField(auto_now_add=True)
     fecha_actualizacion = models.DateTimeField(auto_now=True)
 
@@ -49,34 +71,178 @@ class Departamento(models.Model):
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
 
+    def clean(self):
+        self._validar_padre()
+
+    def _validar_padre(self):
+        """Evita ciclos: el padre no puede ser el mismo departamento ni un subordinado."""
+        if not (self.pk and self.departamento_padre_id):
+            return
+        if self.departamento_padre_id == self.pk:
+            raise ValidationError('Un departamento no puede ser su propio padre.')
+        ruta_padre = Departamento.objects.filter(
+            pk=self.departamento_padre_id
+        ).values_list('ruta_jerarquia', flat=True).first() or ''
+        if f"/{self.pk}/" in ruta_padre:
+            raise ValidationError(
+                'El departamento padre no puede ser un subordinado de este departamento.'
+            )
+
+    def save(self, *args, **kwargs):
+        """
+        Guarda y mantiene sincronizados el indice jerarquico del subarbol y,
+        si cambio el responsable, el indice de aprobadores de sus empleados.
+        """
+        responsable_anterior = None
+        if self.pk:
+            # Partir de la ruta persistida: la instancia en memoria puede estar
+            # desfasada si un ancestro se movio despues de cargarla.
+            actual = Departamento.objects.filter(pk=self.pk).values_list(
+                'ruta_jerarquia', 'nivel', 'responsable_id'
+            ).first()
+            if actual:
+                self.ruta_jerarquia, self.nivel, responsable_anterior = actual
+            self._validar_padre()
+        super().save(*args, **kwargs)
+        self._actualizar_jerarquia()
+
+        if responsable_anterior != self.responsable_id:
+            from .services import reconstruir_aprobadores
+            reconstruir_aprobadores(
+                list(self.empleados.values_list('pk', flat=True))
+            )
+
+    def _actualizar_jerarquia(self):
+        """
+        Recalcula ruta_jerarquia/nivel de este departamento y, si cambio de
+        padre, reescribe las rutas de todo su subarbol con un solo UPDATE.
+        """
+        if self.departamento_padre_id:
+            ruta_padre, nivel_padre = Departamento.objects.filter(
+                pk=self.departamento_padre_id
+            ).values_list('ruta_jerarquia', 'nivel').get()
+            nueva_ruta = f"{ruta_padre}{self.pk}/"
+            nuevo_nivel = nivel_padre + 1
+        else:
+            nueva_ruta = f"/{self.pk}/"
+            nuevo_nivel = 0
+
+        ruta_anterior, nivel_anterior = self.ruta_jerarquia, self.nivel
+        if ruta_anterior == nueva_ruta and nivel_anterior == nuevo_nivel:
+            return
+
+        Departamento.objects.filter(pk=self.pk).update(
+            ruta_jerarquia=nueva_ruta, nivel=nuevo_nivel
+        )
+        if ruta_anterior:
+            _reubicar_subarbol(ruta_anterior, nueva_ruta, nuevo_nivel - nivel_anterior)
+        self.ruta_jerarquia, self.nivel = nueva_ruta, nuevo_nivel
+
+    @classmethod
+    def reconstruir_jerarquia(cls):
+        """
+        Reconstruye ruta_jerarquia y nivel de todos los departamentos.
+        Util despues de cargas masivas que no pasan por save().
+        """
+        padres = dict(cls.objects.values_list('pk', 'departamento_padre_id'))
+        rutas = {}
+
+        def ruta_de(pk, visitados=()):
+            if pk in rutas:
+                return rutas[pk]
+            padre = padres.get(pk)
+            if padre is None or padre in visitados or padre not in padres:
+                rutas[pk] = f"/{pk}/"
+            else:
+                rutas[pk] = f"{ruta_de(padre, visitados + (pk,))}{pk}/"
+            return rutas[pk]
+
+        departamentos = list(cls.objects.only('pk', 'departamento_padre_id'))
+        for dept in departamentos:
+            dept.ruta_jerarquia = ruta_de(dept.pk)
+            dept.nivel = dept.ruta_jerarquia.count('/') - 2
+        cls.objects.bulk_update(departamentos, ['ruta_jerarquia', 'nivel'], batch_size=500)
+        return len(departamentos)
+
+    @property
+    def ids_ruta(self):
+        """Ids desde la raiz hasta este departamento, segun el indice jerarquico"""
+        return [int(pk) for pk in self.ruta_jerarquia.strip('/').split('/') if pk]
+
     def get_nivel(self):
         """Retorna el nivel de jerarquia del departamento"""
-        nivel = 0
-        dept = self
-        while dept.departamento_padre:
-            nivel += 1
-            dept = dept.departamento_padre
-        return nivel
+        return self.nivel
+
+    def get_ancestros(self):
+        """Retorna los departamentos ancestros, de la raiz al padre, en una sola consulta"""
+        ids = self.ids_ruta[:-1]
+        if not ids:
+            return []
+        por_id = Departamento.objects.in_bulk(ids)
+        return [por_id[pk] for pk in ids if pk in por_id]
 
     def get_ruta(self):
         """Retorna la ruta completa desde la raiz hasta este departamento"""
-        ruta = [self]
-        dept = self
-        while dept.departamento_padre:
-            ruta.insert(0, dept.departamento_padre)
-            dept = dept.departamento_padre
-        return ruta
+        return self.get_ancestros() + [self]
 
     def get_subordinados_directos(self):
         """Retorna los departamentos que dependen directamente de este"""
         return self.subdepartamentos.filter(activo=True)
 
+    def get_subarbol(self, incluir_propio=True):
+        """Queryset con todos los departamentos del subarbol (una consulta indexada)"""
+        qs = Departamento.objects.filter(ruta_jerarquia__startswith=self.ruta_jerarquia)
+        if not incluir_propio:
+            qs = qs.exclude(pk=self.pk)
+        return qs
+
     def get_todos_subordinados(self):
-        """Retorna todos los departamentos subordinados recursivamente"""
-        subordinados = list(self.get_subordinados_directos())
-        for sub in self.get_subordinados_directos():
-            subordinados.extend(sub.get_todos_subordinados())
-        return subordinados
+        """
+        Retorna todos los departamentos subordinados activos.
+        Un subordinado se omite si algun departamento intermedio esta inactivo.
+        """
+        subarbol = list(
+            self.get_subarbol(incluir_propio=False).order_by('nivel', 'nombre')
+        )
+        inactivos = {d.pk for d in subarbol if not d.activo}
+        return [
+            d for d in subarbol
+            if d.activo and not inactivos.intersection(d.ids_ruta)
+        ]
+
+    def get_empleados_subarbol(self, solo_activos=True):
+        """Empleados de este departamento y de todos sus subordinados"""
+        from empleados.models import Empleado
+        qs = Empleado.objects.filter(
+            departamento_obj__ruta_jerarquia__startswith=self.ruta_jerarquia
+        )
+        if solo_activos:
+            qs = qs.filter(activo=True)
+        return qs
+
+
+def _reubicar_subarbol(ruta_anterior, ruta_nueva, delta_nivel):
+    """Reescribe el prefijo de ruta de los descendientes de ruta_anterior."""
+    Departamento.objects.filter(
+        ruta_jerarquia__startswith=ruta_anterior
+    ).update(
+        ruta_jerarquia=Concat(
+            Value(ruta_nueva),
+            Substr('ruta_jerarquia', len(ruta_anterior) + 1),
+            output_field=models.CharField(),
+        ),
+        nivel=F('nivel') + delta_nivel,
+    )
+
+
+@receiver(post_delete, sender=Departamento)
+def reubicar_subdepartamentos_huerfanos(sender, instance, **kwargs):
+    """
+    Al eliminar un departamento sus hijos quedan sin padre (SET_NULL), asi que
+    su subarbol pasa a colgar de la raiz.
+    """
+    if instance.ruta_jerarquia:
+        _reubicar_subarbol(instance.ruta_jerarquia, '/', -(instance.nivel + 1))
 
 
 class RelacionSupervision(models.Model):
@@ -143,3 +309,90 @@ class RelacionSupervision(models.Model):
         if self.fecha_fin and self.fecha_fin < hoy:
             return False
         return self.fecha_inicio <= hoy
+
+
+class AprobadorPermiso(models.Model):
+    """
+    Indice precalculado subordinado -> aprobadores de permisos.
+
+    Se reconstruye desde organizacion.services.reconstruir_aprobadores cuando
+    cambian RelacionSupervision, Departamento.responsable o
+    Empleado.supervisor_directo / departamento_obj. La vigencia de las
+    relaciones se guarda como rango de fechas para evaluarla en SQL.
+    """
+
+    ORIGEN_CHOICES = [
+        ('supervisor_directo', 'Supervisor Directo'),
+        ('relacion', 'Relacion de Supervision'),
+        ('responsable_departamento', 'Responsable de Departamento'),
+    ]
+
+    subordinado = models.ForeignKey(
+        'empleados.Empleado',
+        on_delete=models.CASCADE,
+        related_name='aprobadores_permiso',
+        verbose_name='Subordinado'
+    )
+    aprobador = models.ForeignKey(
+        'empleados.Empleado',
+        on_delete=models.CASCADE,
+        related_name='aprobaciones_permiso',
+        verbose_name='Aprobador'
+    )
+    origen = models.CharField(
+        max_length=30,
+        choices=ORIGEN_CHOICES,
+        verbose_name='Origen'
+    )
+    fecha_inicio = models.DateField(
+        null=True,
+        blank=True,
+        verbose_name='Vigente Desde'
+    )
+    fecha_fin = models.DateField(
+        null=True,
+        blank=True,
+        verbose_name='Vigente Hasta'
+    )
+
+    class Meta:
+        verbose_name = 'Aprobador de Permisos'
+        verbose_name_plural = 'Aprobadores de Permisos'
+        indexes = [
+            models.Index(fields=['aprobador', 'subordinado'], name='org_aprobador_subord_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.aprobador} aprueba a {self.subordinado} ({self.get_origen_display()})"
+
+    @classmethod
+    def vigentes(cls, fecha=None):
+        """Filas del indice vigentes en la fecha indicada (hoy por defecto)"""
+        from django.utils import timezone
+        fecha = fecha or timezone.now().date()
+        return cls.objects.filter(
+            models.Q(fecha_inicio__isnull=True) | models.Q(fecha_inicio__lte=fecha),
+            models.Q(fecha_fin__isnull=True) | models.Q(fecha_fin__gte=fecha),
+        )
+
+
+@receiver([post_save, post_delete], sender=RelacionSupervision)
+def actualizar_aprobadores_por_relacion(sender, instance, **kwargs):
+    """Recalcula los aprobadores del subordinado afectado por la relacion"""
+    from .services import reconstruir_aprobadores
+    reconstruir_aprobadores([instance.subordinado_id])
+
+
+@receiver(pre_delete, sender=Departamento)
+def limpiar_aprobadores_por_departamento(sender, instance, **kwargs):
+    """
+    Los empleados del departamento quedan sin departamento (SET_NULL con un
+    UPDATE que no dispara senales), asi que su responsable deja de aprobarles.
+    """
+    AprobadorPermiso.objects.filter(
+        origen='responsable_departamento',
+        subordinado__departamento_obj=instance
+    ).delete()
+
+
+invalidar_con_senales('organigrama', Departamento)
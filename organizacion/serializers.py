@@ -59,6 +59,15 @@ class DepartamentoCreateUpdateSerializer(serializers.ModelSerializer):
             'responsable', 'activo'
         )
 
+    def validate_departamento_padre(self, value):
+        instance = self.instance
+        if instance and value:
+            if value.pk == instance.pk or f"/{instance.pk}/" in value.ruta_jerarquia:
+                raise serializers.ValidationError(
+                    "El departamento padre no puede ser este departamento ni uno de sus subordinados."
+                )
+        return value
+
 
 class DepartamentoOrganigramaSerializer(serializers.ModelSerializer):
     """Serializer para el organigrama"""
@@ -83,10 +92,15 @@ class DepartamentoOrganigramaSerializer(serializers.ModelSerializer):
         return None
 
     def get_subdepartamentos(self, obj):
-        subdepts = obj.get_subordinados_directos()
+        # Los nodos armados por obtener_arbol_organigrama ya traen sus hijos
+        subdepts = getattr(obj, 'hijos', None)
+        if subdepts is None:
+            subdepts = obj.get_subordinados_directos()
         return DepartamentoOrganigramaSerializer(subdepts, many=True).data
 
     def get_empleados_count(self, obj):
+        if hasattr(obj, 'total_empleados'):
+            return obj.total_empleados
         from empleados.models import Empleado
         return Empleado.objects.filter(departamento_obj=obj, activo=True).count()
 
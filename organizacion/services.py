@@ -0,0 +1,117 @@
+from django.db import transaction
+from django.db.models import Count
+
+from checador.cache import cacheado
+
+from .models import AprobadorPermiso, Departamento, RelacionSupervision
+
+
+@cacheado('organigrama', ttl=600)
+def obtener_arbol_organigrama():
+    """
+    Construye el arbol de departamentos activos con dos consultas en total.
+
+    Usa el indice jerarquico (ruta_jerarquia/nivel) para cargar todos los
+    departamentos de una vez y los enlaza en memoria. Cada nodo recibe:
+      - hijos: lista de subdepartamentos activos
+      - total_empleados: empleados activos asignados directamente
+
+    Un departamento activo que cuelga de uno inactivo no se muestra, igual
+    que en el recorrido recursivo original.
+
+    El arbol se cachea en el espacio 'organigrama', que se invalida al
+    cambiar un Departamento o un Empleado.
+
+    Retorna la lista de departamentos raiz.
+    """
+    from empleados.models import Empleado
+
+    departamentos = list(
+        Departamento.objects.filter(activo=True)
+        .select_related('responsable', 'responsable__user')
+        .order_by('nivel', 'nombre')
+    )
+    conteos = dict(
+        Empleado.objects.filter(activo=True, departamento_obj__isnull=False)
+        .values('departamento_obj')
+        .annotate(total=Count('id'))
+        .values_list('departamento_obj', 'total')
+    )
+
+    por_id = {}
+    raices = []
+    for dept in departamentos:
+        dept.hijos = []
+        dept.total_empleados = conteos.get(dept.pk, 0)
+        por_id[dept.pk] = dept
+        if dept.departamento_padre_id is None:
+            raices.append(dept)
+        elif dept.departamento_padre_id in por_id:
+            # Ordenados por nivel: el padre activo ya fue procesado
+            por_id[dept.departamento_padre_id].hijos.append(dept)
+    return raices
+
+
+def reconstruir_aprobadores(empleado_ids=None):
+    """
+    Recalcula el indice AprobadorPermiso para los empleados indicados
+    (o para todos si empleado_ids es None).
+
+    Fuentes, igual que Empleado.get_supervisores:
+      - supervisor_directo del empleado
+      - RelacionSupervision activas con puede_autorizar_permisos
+      - responsable del departamento del empleado
+
+    Retorna el numero de filas creadas.
+    """
+    from empleados.models import Empleado
+
+    if empleado_ids is not None:
+        empleado_ids = [pk for pk in empleado_ids if pk is not None]
+        if not empleado_ids:
+            return 0
+
+    empleados = Empleado.objects.all()
+    relaciones = RelacionSupervision.objects.filter(
+        puede_autorizar_permisos=True,
+        activo=True
+    )
+    existentes = AprobadorPermiso.objects.all()
+    if empleado_ids is not None:
+        empleados = empleados.filter(pk__in=empleado_ids)
+        relaciones = relaciones.filter(subordinado_id__in=empleado_ids)
+        existentes = existentes.filter(subordinado_id__in=empleado_ids)
+
+    filas = []
+    for empleado_id, supervisor_id, responsable_id in empleados.values_list(
+        'pk', 'supervisor_directo_id', 'departamento_obj__responsable_id'
+    ):
+        if supervisor_id and supervisor_id != empleado_id:
+            filas.append(AprobadorPermiso(
+                subordinado_id=empleado_id,
+                aprobador_id=supervisor_id,
+                origen='supervisor_directo'
+            ))
+        if responsable_id and responsable_id != empleado_id:
+            filas.append(AprobadorPermiso(
+                subordinado_id=empleado_id,
+                aprobador_id=responsable_id,
+                origen='responsable_departamento'
+            ))
+
+    for subordinado_id, supervisor_id, fecha_inicio, fecha_fin in relaciones.values_list(
+        'subordinado_id', 'supervisor_id', 'fecha_inicio', 'fecha_fin'
+    ):
+        if supervisor_id != subordinado_id:
+            filas.append(AprobadorPermiso(
+                subordinado_id=subordinado_id,
+                aprobador_id=supervisor_id,
+                origen='relacion',
+                fecha_inicio=fecha_inicio,
+                fecha_fin=fecha_fin
+            ))
+
+    with transaction.atomic():
+        existentes.delete()
+        AprobadorPermiso.objects.bulk_create(filas, batch_size=500)
+    return len(filas)
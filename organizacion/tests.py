@@ -1,3 +1,227 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from checador.pruebas import PresupuestoConsultasMixin
+from empleados.models import Empleado
+
+from .models import AprobadorPermiso, Departamento, RelacionSupervision
+from .services import reconstruir_aprobadores
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}})
+class OrganigramaConsultasTests(PresupuestoConsultasMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('organigrama')
+        for i in range(3):
+            raiz = Departamento.objects.create(codigo=f'R{i}', nombre=f'Raiz {i}')
+            for j in range(3):
+                Departamento.objects.create(
+                    codigo=f'R{i}H{j}', nombre=f'Hijo {i}.{j}', departamento_padre=raiz
+                )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_api_organigrama(self):
+        # sesion + usuario + departamentos + conteo de empleados
+        with self.assertPresupuestoConsultas(4, max_repetidas=1):
+            response = self.client.get('/api/organizacion/api/departamentos/organigrama/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 3)
+
+
+class JerarquiaDepartamentosTests(TestCase):
+
+    def setUp(self):
+        # A -> B -> C -> D, y una segunda raiz X
+        self.a = Departamento.objects.create(codigo='A', nombre='A')
+        self.b = Departamento.objects.create(codigo='B', nombre='B', departamento_padre=self.a)
+        self.c = Departamento.objects.create(codigo='C', nombre='C', departamento_padre=self.b)
+        self.d = Departamento.objects.create(codigo='D', nombre='D', departamento_padre=self.c)
+        self.x = Departamento.objects.create(codigo='X', nombre='X')
+
+    def _ruta(self, *departamentos):
+        return '/' + ''.join(f'{d.pk}/' for d in departamentos)
+
+    def _assert_jerarquia(self, departamento, *ruta):
+        departamento.refresh_from_db()
+        self.assertEqual(departamento.ruta_jerarquia, self._ruta(*ruta))
+        self.assertEqual(departamento.nivel, len(ruta) - 1)
+
+    def test_rutas_al_crear(self):
+        self._assert_jerarquia(self.a, self.a)
+        self._assert_jerarquia(self.d, self.a, self.b, self.c, self.d)
+        self.assertEqual(self.d.get_ancestros(), [self.a, self.b, self.c])
+
+    def test_mover_subarbol_reescribe_sus_descendientes(self):
+        self.b.departamento_padre = self.x
+        self.b.save()
+
+        self._assert_jerarquia(self.b, self.x, self.b)
+        self._assert_jerarquia(self.c, self.x, self.b, self.c)
+        self._assert_jerarquia(self.d, self.x, self.b, self.c, self.d)
+        self._assert_jerarquia(self.a, self.a)
+        self.assertEqual(set(self.x.get_subarbol(incluir_propio=False)), {self.b, self.c, self.d})
+
+    def test_mover_a_la_raiz(self):
+        self.c.departamento_padre = None
+        self.c.save()
+
+        self._assert_jerarquia(self.c, self.c)
+        self._assert_jerarquia(self.d, self.c, self.d)
+
+    def test_guardar_instancia_desfasada_usa_la_ruta_persistida(self):
+        # `d` se cargo antes de que su abuelo cambiara de padre
+        d = Departamento.objects.get(pk=self.d.pk)
+        self.b.departamento_padre = self.x
+        self.b.save()
+
+        d.nombre = 'D renombrado'
+        d.save()
+
+        self._assert_jerarquia(d, self.x, self.b, self.c, self.d)
+
+    def test_evita_ciclos(self):
+        self.b.departamento_padre = self.d
+        with self.assertRaises(ValidationError):
+            self.b.save()
+        self.a.departamento_padre = self.a
+        with self.assertRaises(ValidationError):
+            self.a.save()
+        self._assert_jerarquia(self.d, self.a, self.b, self.c, self.d)
+
+    def test_eliminar_reubica_el_subarbol_en_la_raiz(self):
+        self.b.delete()
+
+        self._assert_jerarquia(self.c, self.c)
+        self._assert_jerarquia(self.d, self.c, self.d)
+        self._assert_jerarquia(self.a, self.a)
+
+    def test_api_filtra_por_subarbol(self):
+        self.client.force_login(User.objects.create_user('lector'))
+        url = '/api/organizacion/api/departamentos/'
+
+        def codigos(subarbol):
+            datos = self.client.get(url, {'subarbol': subarbol}).json()
+            return sorted(d['codigo'] for d in datos['results'])
+
+        self.assertEqual(codigos(self.b.pk), ['B', 'C', 'D'])
+        self.assertEqual(codigos(999999), [])
+        self.assertEqual(codigos('abc'), [])
+
+    def test_reconstruir_jerarquia_corrige_rutas(self):
+        Departamento.objects.update(ruta_jerarquia='', nivel=0)
+
+        self.assertEqual(Departamento.reconstruir_jerarquia(), 5)
+
+        self._assert_jerarquia(self.d, self.a, self.b, self.c, self.d)
+        self._assert_jerarquia(self.x, self.x)
+
+
+class IndiceAprobadoresTests(TestCase):
+    """El indice AprobadorPermiso refleja las fuentes tras cada cambio."""
+
+    def setUp(self):
+        self.empleado = self._empleado('EMP')
+        self.jefe = self._empleado('JEFE')
+        self.otro_jefe = self._empleado('JEFE2')
+        self.funcional = self._empleado('FUNC')
+        self.responsable = self._empleado('RESP')
+        self.departamento = Departamento.objects.create(codigo='DEP', nombre='Departamento')
+
+    def _empleado(self, codigo, **kwargs):
+        user = User.objects.create_user(codigo.lower())
+        return Empleado.objects.create(user=user, codigo_empleado=codigo, **kwargs)
+
+    def _aprobadores_esperados(self, empleado):
+        """Supervisores calculados directamente de las fuentes, sin el indice"""
+        empleado = Empleado.objects.select_related('departamento_obj').get(pk=empleado.pk)
+        esperados = {empleado.supervisor_directo_id}
+        if empleado.departamento_obj:
+            esperados.add(empleado.departamento_obj.responsable_id)
+        esperados.update(
+            r.supervisor_id
+            for r in RelacionSupervision.objects.filter(
+                subordinado=empleado, puede_autorizar_permisos=True
+            )
+            if r.esta_vigente()
+        )
+        return esperados - {None, empleado.pk}
+
+    def _assert_indice_consistente(self):
+        actual = {s.pk for s in self.empleado.get_supervisores()}
+        self.assertEqual(actual, self._aprobadores_esperados(self.empleado))
+        # Mantenimiento incremental == reconstruccion completa
+        filas = set(AprobadorPermiso.objects.values_list('subordinado_id', 'aprobador_id', 'origen'))
+        reconstruir_aprobadores()
+        self.assertEqual(
+            filas,
+            set(AprobadorPermiso.objects.values_list('subordinado_id', 'aprobador_id', 'origen')),
+        )
+        return actual
+
+    def test_cambio_de_supervisor_directo(self):
+        self.empleado.supervisor_directo = self.jefe
+        self.empleado.save()
+        self.assertEqual(self._assert_indice_consistente(), {self.jefe.pk})
+
+        self.empleado.supervisor_directo = self.otro_jefe
+        self.empleado.save()
+        self.assertEqual(self._assert_indice_consistente(), {self.otro_jefe.pk})
+
+        self.empleado.supervisor_directo = None
+        self.empleado.save()
+        self.assertEqual(self._assert_indice_consistente(), set())
+
+    def test_relacion_de_supervision(self):
+        hoy = timezone.now().date()
+        relacion = RelacionSupervision.objects.create(
+            supervisor=self.funcional, subordinado=self.empleado,
+            tipo_relacion='funcional', fecha_inicio=hoy - timedelta(days=1),
+        )
+        self.assertEqual(self._assert_indice_consistente(), {self.funcional.pk})
+
+        # Vencida: queda en el indice con su rango pero no es vigente
+        relacion.fecha_fin = hoy - timedelta(days=1)
+        relacion.fecha_inicio = hoy - timedelta(days=10)
+        relacion.save()
+        self.assertEqual(self._assert_indice_consistente(), set())
+
+        relacion.fecha_fin = None
+        relacion.puede_autorizar_permisos = False
+        relacion.save()
+        self.assertEqual(self._assert_indice_consistente(), set())
+
+        relacion.puede_autorizar_permisos = True
+        relacion.save()
+        relacion.delete()
+        self.assertEqual(self._assert_indice_consistente(), set())
+
+    def test_responsable_del_departamento(self):
+        self.empleado.departamento_obj = self.departamento
+        self.empleado.save()
+        self.assertEqual(self._assert_indice_consistente(), set())
+
+        self.departamento.responsable = self.responsable
+        self.departamento.save()
+        self.assertEqual(self._assert_indice_consistente(), {self.responsable.pk})
+
+        self.departamento.responsable = self.jefe
+        self.departamento.save()
+        self.assertEqual(self._assert_indice_consistente(), {self.jefe.pk})
+
+        self.departamento.delete()
+        self.assertEqual(self._assert_indice_consistente(), set())
+
+    def test_el_responsable_no_se_aprueba_a_si_mismo(self):
+        self.responsable.departamento_obj = self.departamento
+        self.responsable.save()
+        self.departamento.responsable = self.responsable
+        self.departamento.save()
+        self.assertEqual(self.responsable.get_supervisores(), [])
@@ -6,7 +6,10 @@ from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
 from django.db import models
 
+from checador.cache import respuesta_cacheada
+
 from .models import Departamento, RelacionSupervision
+from .services import obtener_arbol_organigrama
 from .serializers import (
     DepartamentoListSerializer,
     DepartamentoDetailSerializer,
@@ -48,6 +51,18 @@ class DepartamentoViewSet(viewsets.ModelViewSet):
         if solo_raiz is not None and solo_raiz.lower() in ['true', '1', 'yes']:
             queryset = queryset.filter(departamento_padre__isnull=True)
 
+        # Filtrar por subarbol (el departamento indicado y todos sus subordinados)
+        subarbol = self.request.query_params.get('subarbol', None)
+        if subarbol:
+            if not subarbol.isdigit():
+                return queryset.none()
+            ruta = Departamento.objects.filter(pk=subarbol).values_list(
+                'ruta_jerarquia', flat=True
+            ).first()
+            if ruta is None:
+                return queryset.none()
+            queryset = queryset.filter(ruta_jerarquia__startswith=ruta)
+
         # Buscar
         search = self.request.query_params.get('search', None)
         if search:
@@ -59,12 +74,10 @@ class DepartamentoViewSet(viewsets.ModelViewSet):
         return queryset
 
     @action(detail=False, methods=['get'])
+    @respuesta_cacheada('organigrama', ttl=600)
     def organigrama(self, request):
         """Retorna la estructura del organigrama"""
-        raices = Departamento.objects.filter(
-            departamento_padre__isnull=True,
-            activo=True
-        ).select_related('responsable')
+        raices = obtener_arbol_organigrama()
         serializer = DepartamentoOrganigramaSerializer(raices, many=True)
         return Response(serializer.data)
 
@@ -115,11 +128,6 @@ class RelacionSupervisionViewSet(viewsets.ModelViewSet):
 @login_required
 def organigrama_view(request):
     """Vista para el organigrama organizacional"""
-    departamentos_raiz = Departamento.objects.filter(
-        departamento_padre__isnull=True,
-        activo=True
-    ).select_related('responsable').prefetch_related('subdepartamentos')
-
     return render(request, 'organizacion/organigrama.html', {
-        'departamentos': departamentos_raiz
+        'departamentos': obtener_arbol_organigrama()
     })
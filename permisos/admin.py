@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import TipoPermiso, SolicitudPermiso, HistorialPermiso
+from .models import TipoPermiso, SolicitudPermiso, HistorialPermiso, DiaPermiso
 
 
 @admin.register(TipoPermiso)
@@ -62,6 +62,11 @@ class SolicitudPermisoAdmin(admin.ModelAdmin):
 
     actions = ['aprobar_permisos', 'rechazar_permisos']
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # Desde el admin se puede editar estado y periodo directamente
+        DiaPermiso.sincronizar([obj])
+
     def aprobar_permisos(self, request, queryset):
         from empleados.models import Empleado
         try:
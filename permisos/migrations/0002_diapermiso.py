@@ -0,0 +1,52 @@
+# Generated by Django 6.0 on 2026-10-19 07:26
+
+import django.db.models.deletion
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def expandir_permisos_aprobados(apps, schema_editor):
+    SolicitudPermiso = apps.get_model('permisos', 'SolicitudPermiso')
+    DiaPermiso = apps.get_model('permisos', 'DiaPermiso')
+    dias = []
+    for solicitud in SolicitudPermiso.objects.filter(estado='aprobado').iterator():
+        dia_completo = solicitud.hora_inicio is None or solicitud.hora_fin is None
+        fecha = solicitud.fecha_inicio
+        while fecha <= solicitud.fecha_fin:
+            dias.append(DiaPermiso(
+                solicitud_id=solicitud.pk,
+                empleado_id=solicitud.empleado_id,
+                fecha=fecha,
+                dia_completo=dia_completo
+            ))
+            fecha += timedelta(days=1)
+    DiaPermiso.objects.bulk_create(dias, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empleados', '0004_empleado_descansa_domingo_empleado_descansa_sabado_and_more'),
+        ('permisos', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DiaPermiso',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField(verbose_name='Fecha')),
+                ('dia_completo', models.BooleanField(default=True, help_text='Falso para permisos por horas', verbose_name='Dia Completo')),
+                ('empleado', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dias_permiso', to='empleados.empleado', verbose_name='Empleado')),
+                ('solicitud', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dias_cubiertos', to='permisos.solicitudpermiso', verbose_name='Solicitud')),
+            ],
+            options={
+                'verbose_name': 'Dia Cubierto por Permiso',
+                'verbose_name_plural': 'Dias Cubiertos por Permiso',
+                'indexes': [models.Index(fields=['empleado', 'fecha'], name='permisos_dia_emp_fecha_idx')],
+                'unique_together': {('solicitud', 'fecha')},
+            },
+        ),
+        migrations.RunPython(expandir_permisos_aprobados, migrations.RunPython.noop),
+    ]
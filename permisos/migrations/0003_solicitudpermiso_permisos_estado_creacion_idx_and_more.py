@@ -0,0 +1,26 @@
+# Generated by Django 6.0 on 2026-10-19 08:23
+
+from django.db import migrations, models
+
+from checador.migraciones import AgregarIndiceConcurrente
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY en PostgreSQL no puede ir en una transacción
+    atomic = False
+
+    dependencies = [
+        ('empleados', '0004_empleado_descansa_domingo_empleado_descansa_sabado_and_more'),
+        ('permisos', '0002_diapermiso'),
+    ]
+
+    operations = [
+        AgregarIndiceConcurrente(
+            model_name='solicitudpermiso',
+            index=models.Index(fields=['estado', 'fecha_creacion'], name='permisos_estado_creacion_idx'),
+        ),
+        AgregarIndiceConcurrente(
+            model_name='solicitudpermiso',
+            index=models.Index(fields=['fecha_fin', 'fecha_inicio'], name='permisos_periodo_idx'),
+        ),
+    ]
@@ -1,6 +1,10 @@
+from datetime import timedelta
+
 from django.db import models
 from django.utils import timezone
 
+from checador.cache import invalidar_con_senales
+from checador.rastreo import RastreoCambiosMixin
 from checador.storage_backends import MediaStorage
 
 
@@ -58,9 +62,11 @@ class TipoPermiso(models.Model):
         return f"{self.codigo} - {self.nombre}"
 
 
-class SolicitudPermiso(models.Model):
+class SolicitudPermiso(RastreoCambiosMixin, models.Model):
     """Modelo para solicitudes de permiso laboral"""
 
+    campos_rastreados = ('estado', 'evidencia')
+
     ESTADO_CHOICES = [
         ('borrador', 'Borrador'),
         ('pendiente', 'Pendiente'),
@@ -137,6 +143,13 @@ class SolicitudPermiso(models.Model):
         verbose_name = 'Solicitud de Permiso'
         verbose_name_plural = 'Solicitudes de Permiso'
         ordering = ['-fecha_creacion']
+        indexes = [
+            # Bandeja de pendientes (ordenada por antigüedad)
+            models.Index(fields=['estado', 'fecha_creacion'], name='permisos_estado_creacion_idx'),
+            # Traslape con un rango (fecha_inicio <= fin AND fecha_fin >= inicio):
+            # fecha_fin primero, la condición selectiva para rangos recientes
+            models.Index(fields=['fecha_fin', 'fecha_inicio'], name='permisos_periodo_idx'),
+        ]
 
     def __str__(self):
         return f"{self.empleado} - {self.tipo_permiso} ({self.fecha_inicio} - {self.fecha_fin})"
@@ -166,6 +179,7 @@ class SolicitudPermiso(models.Model):
             usuario=aprobador,
             comentarios=comentarios
         )
+        DiaPermiso.sincronizar([self])
 
     def rechazar(self, aprobador, comentarios=''):
         """Rechaza la solicitud de permiso"""
@@ -191,6 +205,7 @@ class SolicitudPermiso(models.Model):
             usuario=usuario,
             comentarios=comentarios
         )
+        DiaPermiso.sincronizar([self])
 
     def enviar(self):
         """Envia la solicitud para aprobacion"""
@@ -205,28 +220,36 @@ class SolicitudPermiso(models.Model):
 
     def puede_ser_aprobado_por(self, empleado):
         """Verifica si un empleado puede aprobar esta solicitud"""
-        from organizacion.models import RelacionSupervision
+        from organizacion.models import AprobadorPermiso
         # El empleado no puede aprobar su propia solicitud
-        if empleado == self.empleado:
+        if empleado.pk == self.empleado_id:
             return False
-        # Verificar si es supervisor directo
-        relacion = RelacionSupervision.objects.filter(
-            supervisor=empleado,
-            subordinado=self.empleado,
-            puede_autorizar_permisos=True,
-            activo=True
-        ).first()
-        if relacion and relacion.esta_vigente():
+        # Supervisor directo, relacion de supervision vigente o responsable
+        # del departamento, segun el indice precalculado
+        if AprobadorPermiso.vigentes().filter(
+            aprobador=empleado,
+            subordinado_id=self.empleado_id
+        ).exists():
             return True
-        # Verificar si es responsable del departamento
-        if hasattr(self.empleado, 'departamento_obj') and self.empleado.departamento_obj:
-            if self.empleado.departamento_obj.responsable == empleado:
-                return True
         # Staff puede aprobar cualquier permiso
         if empleado.user.is_staff:
             return True
         return False
 
+    @classmethod
+    def pendientes_para(cls, aprobador):
+        """
+        Solicitudes pendientes que el empleado puede aprobar, resueltas con
+        una sola consulta contra el indice de aprobadores.
+        """
+        from organizacion.models import AprobadorPermiso
+        return cls.objects.filter(
+            estado='pendiente',
+            empleado_id__in=AprobadorPermiso.vigentes().filter(
+                aprobador=aprobador
+            ).values('subordinado_id')
+        ).exclude(empleado=aprobador)
+
 
 class HistorialPermiso(models.Model):
     """Modelo para auditar cambios en solicitudes de permiso"""
@@ -270,3 +293,74 @@ class HistorialPermiso(models.Model):
 
     def __str__(self):
         return f"{self.solicitud} - {self.get_accion_display()} ({self.fecha})"
+
+
+class DiaPermiso(models.Model):
+    """
+    Indice (empleado, fecha) de dias cubiertos por permisos aprobados.
+
+    Se expande de fecha_inicio a fecha_fin al aprobar una solicitud y se
+    elimina al cancelarla, para que reportes e incidencias crucen contra una
+    tabla en lugar de recorrer intervalos en Python.
+    """
+
+    solicitud = models.ForeignKey(
+        SolicitudPermiso,
+        on_delete=models.CASCADE,
+        related_name='dias_cubiertos',
+        verbose_name='Solicitud'
+    )
+    empleado = models.ForeignKey(
+        'empleados.Empleado',
+        on_delete=models.CASCADE,
+        related_name='dias_permiso',
+        verbose_name='Empleado'
+    )
+    fecha = models.DateField(
+        verbose_name='Fecha'
+    )
+    dia_completo = models.BooleanField(
+        default=True,
+        verbose_name='Dia Completo',
+        help_text='Falso para permisos por horas'
+    )
+
+    class Meta:
+        verbose_name = 'Dia Cubierto por Permiso'
+        verbose_name_plural = 'Dias Cubiertos por Permiso'
+        unique_together = ['solicitud', 'fecha']
+        indexes = [
+            models.Index(fields=['empleado', 'fecha'], name='permisos_dia_emp_fecha_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.empleado_id} - {self.fecha} ({self.solicitud_id})"
+
+    @classmethod
+    def sincronizar(cls, solicitudes):
+        """
+        Regenera los dias cubiertos de las solicitudes indicadas: borra los
+        existentes y expande de nuevo las que estan aprobadas.
+        """
+        solicitudes = list(solicitudes)
+        if not solicitudes:
+            return
+        dias = []
+        for solicitud in solicitudes:
+            if solicitud.estado != 'aprobado':
+                continue
+            fecha = solicitud.fecha_inicio
+            while fecha <= solicitud.fecha_fin:
+                dias.append(cls(
+                    solicitud_id=solicitud.pk,
+                    empleado_id=solicitud.empleado_id,
+                    fecha=fecha,
+                    dia_completo=not solicitud.es_por_horas
+                ))
+                fecha += timedelta(days=1)
+        cls.objects.filter(solicitud__in=[s.pk for s in solicitudes]).delete()
+        cls.objects.bulk_create(dias, batch_size=500)
+
+
+# Estadisticas del dashboard de staff
+invalidar_con_senales('dashboard', SolicitudPermiso)
@@ -141,3 +141,14 @@ class SolicitudPermisoUpdateSerializer(serializers.ModelSerializer):
 class AprobarRechazarSerializer(serializers.Serializer):
     """Serializer para aprobar/rechazar solicitud"""
     comentarios = serializers.CharField(required=False, allow_blank=True, default='')
+
+
+class AccionMasivaSerializer(serializers.Serializer):
+    """Serializer para aprobar/rechazar varias solicitudes a la vez"""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=500
+    )
+    accion = serializers.ChoiceField(choices=['aprobar', 'rechazar'])
+    comentarios = serializers.CharField(required=False, allow_blank=True, default='')
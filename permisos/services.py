@@ -0,0 +1,96 @@
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from checador.cache import invalidar_espacio
+
+from .models import DiaPermiso, HistorialPermiso, SolicitudPermiso
+
+# accion -> (estado resultante, mensaje de exito)
+ACCIONES_MASIVAS = {
+    'aprobar': ('aprobado', 'Solicitud aprobada.'),
+    'rechazar': ('rechazado', 'Solicitud rechazada.'),
+}
+
+
+def resolver_solicitudes_en_lote(aprobador, ids, accion, comentarios=''):
+    """
+    Aprueba o rechaza varias solicitudes en una sola transaccion.
+
+    Los derechos del aprobador se validan para todo el lote en la misma
+    consulta que carga las solicitudes (Exists contra AprobadorPermiso); los
+    cambios se aplican con bulk_update y el historial con bulk_create.
+
+    Retorna una lista con un resultado por id recibido:
+        {'id': 12, 'success': True, 'message': 'Solicitud aprobada.'}
+    """
+    from organizacion.models import AprobadorPermiso
+
+    if accion not in ACCIONES_MASIVAS:
+        raise ValueError(f"Accion no valida: {accion}")
+    nuevo_estado, mensaje_exito = ACCIONES_MASIVAS[accion]
+    es_staff = aprobador.user.is_staff
+
+    # Conservar el orden recibido y descartar ids repetidos
+    ids = list(dict.fromkeys(ids))
+
+    resultados = []
+    with transaction.atomic():
+        solicitudes = SolicitudPermiso.objects.select_for_update().filter(
+            pk__in=ids
+        ).annotate(
+            es_aprobador=Exists(
+                AprobadorPermiso.vigentes().filter(
+                    aprobador=aprobador,
+                    subordinado=OuterRef('empleado_id')
+                )
+            )
+        ).in_bulk()
+
+        ahora = timezone.now()
+        modificadas = []
+        historial = []
+        for pk in ids:
+            solicitud = solicitudes.get(pk)
+            if solicitud is None:
+                resultados.append({'id': pk, 'success': False, 'message': 'Solicitud no encontrada.'})
+                continue
+            if solicitud.estado != 'pendiente':
+                resultados.append({
+                    'id': pk, 'success': False,
+                    'message': f'Solo se pueden {accion} solicitudes pendientes.'
+                })
+                continue
+            if solicitud.empleado_id == aprobador.pk or not (solicitud.es_aprobador or es_staff):
+                resultados.append({
+                    'id': pk, 'success': False,
+                    'message': f'No tienes permisos para {accion} esta solicitud.'
+                })
+                continue
+
+            solicitud.estado = nuevo_estado
+            solicitud.aprobador = aprobador
+            solicitud.fecha_resolucion = ahora
+            solicitud.comentarios_resolucion = comentarios
+            solicitud.fecha_actualizacion = ahora
+            modificadas.append(solicitud)
+            historial.append(HistorialPermiso(
+                solicitud=solicitud,
+                accion=nuevo_estado,
+                usuario=aprobador,
+                comentarios=comentarios
+            ))
+            resultados.append({'id': pk, 'success': True, 'message': mensaje_exito})
+
+        if modificadas:
+            SolicitudPermiso.objects.bulk_update(
+                modificadas,
+                ['estado', 'aprobador', 'fecha_resolucion',
+                 'comentarios_resolucion', 'fecha_actualizacion']
+            )
+            HistorialPermiso.objects.bulk_create(historial)
+            DiaPermiso.sincronizar(modificadas)
+            # bulk_update no emite post_save (ver invalidar_con_senales en models.py)
+            transaction.on_commit(lambda: invalidar_espacio('dashboard'))
+
+    return resultados
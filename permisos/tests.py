@@ -1,3 +1,128 @@
+from datetime import date, time
+from unittest import mock
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
+
+from empleados.models import Empleado
+
+from .models import DiaPermiso, HistorialPermiso, SolicitudPermiso, TipoPermiso
+from .services import resolver_solicitudes_en_lote
+
+
+def crear_empleado(codigo, **kwargs):
+    user = User.objects.create_user(codigo.lower())
+    return Empleado.objects.create(user=user, codigo_empleado=codigo, **kwargs)
+
+
+class ResolverEnLoteTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.supervisor = crear_empleado('SUP')
+        cls.subordinado = crear_empleado('SUB', supervisor_directo=cls.supervisor)
+        cls.ajeno = crear_empleado('AJENO')
+        cls.tipo = TipoPermiso.objects.create(nombre='Personal', codigo='PER')
+
+    def _solicitud(self, empleado, estado='pendiente', **kwargs):
+        datos = {'fecha_inicio': date(2026, 3, 2), 'fecha_fin': date(2026, 3, 4)}
+        datos.update(kwargs)
+        return SolicitudPermiso.objects.create(
+            empleado=empleado, tipo_permiso=self.tipo, motivo='prueba', estado=estado, **datos
+        )
+
+    def test_solo_resuelve_las_que_puede_aprobar(self):
+        propia = self._solicitud(self.subordinado)
+        ajena = self._solicitud(self.ajeno)
+        de_si_mismo = self._solicitud(self.supervisor)
+
+        resultados = resolver_solicitudes_en_lote(
+            self.supervisor, [propia.pk, ajena.pk, de_si_mismo.pk, 999999], 'aprobar'
+        )
+
+        self.assertEqual([r['success'] for r in resultados], [True, False, False, False])
+        self.assertEqual(resultados[3]['message'], 'Solicitud no encontrada.')
+        for solicitud in (ajena, de_si_mismo):
+            solicitud.refresh_from_db()
+            self.assertEqual(solicitud.estado, 'pendiente')
+
+    def test_omite_las_ya_resueltas(self):
+        rechazada = self._solicitud(self.subordinado, estado='rechazado')
+
+        resultados = resolver_solicitudes_en_lote(self.supervisor, [rechazada.pk], 'aprobar')
+
+        self.assertFalse(resultados[0]['success'])
+        rechazada.refresh_from_db()
+        self.assertEqual(rechazada.estado, 'rechazado')
+        self.assertFalse(HistorialPermiso.objects.filter(solicitud=rechazada).exists())
+
+    def test_escribe_historial_y_dias_cubiertos(self):
+        dia_completo = self._solicitud(self.subordinado)
+        por_horas = self._solicitud(
+            self.subordinado, fecha_inicio=date(2026, 3, 9), fecha_fin=date(2026, 3, 9),
+            hora_inicio=time(16, 0), hora_fin=time(18, 0),
+        )
+
+        resolver_solicitudes_en_lote(
+            self.supervisor, [dia_completo.pk, por_horas.pk], 'aprobar', 'ok'
+        )
+
+        dia_completo.refresh_from_db()
+        self.assertEqual(dia_completo.estado, 'aprobado')
+        self.assertEqual(dia_completo.aprobador, self.supervisor)
+        historial = HistorialPermiso.objects.get(solicitud=dia_completo)
+        self.assertEqual((historial.accion, historial.usuario, historial.comentarios),
+                         ('aprobado', self.supervisor, 'ok'))
+        self.assertEqual(
+            sorted(DiaPermiso.objects.filter(solicitud=dia_completo).values_list('fecha', 'dia_completo')),
+            [(date(2026, 3, d), True) for d in (2, 3, 4)],
+        )
+        self.assertEqual(
+            list(DiaPermiso.objects.filter(solicitud=por_horas).values_list('fecha', 'dia_completo')),
+            [(date(2026, 3, 9), False)],
+        )
+
+    def test_invalida_el_dashboard_al_confirmar(self):
+        solicitud = self._solicitud(self.subordinado)
+
+        with mock.patch('permisos.services.invalidar_espacio') as invalidar:
+            with self.captureOnCommitCallbacks(execute=True):
+                resolver_solicitudes_en_lote(self.supervisor, [solicitud.pk], 'aprobar')
+                invalidar.assert_not_called()
+
+        invalidar.assert_called_once_with('dashboard')
+
+    def test_rechazar_no_crea_dias_cubiertos(self):
+        solicitud = self._solicitud(self.subordinado)
+
+        resolver_solicitudes_en_lote(self.supervisor, [solicitud.pk], 'rechazar')
+
+        self.assertTrue(HistorialPermiso.objects.filter(solicitud=solicitud, accion='rechazado').exists())
+        self.assertFalse(DiaPermiso.objects.filter(solicitud=solicitud).exists())
+
+
+class AccionMasivaViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.supervisor = crear_empleado('SUP')
+
+    def setUp(self):
+        self.client.force_login(self.supervisor.user)
+
+    def _post(self, **datos):
+        return self.client.post(reverse('accion_masiva_permisos'), datos).json()
+
+    def test_rechaza_ids_no_enteros(self):
+        respuesta = self._post(accion='aprobar', ids=['1', 'x'])
+        self.assertFalse(respuesta['success'])
+
+    def test_limita_el_tamano_del_lote(self):
+        respuesta = self._post(accion='aprobar', ids=[str(i) for i in range(1, 502)])
+        self.assertFalse(respuesta['success'])
+        self.assertIn('500', respuesta['message'])
 
-# Create your tests here.
+    def test_lote_valido_se_procesa(self):
+        respuesta = self._post(accion='aprobar', ids=['999999'])
+        self.assertEqual(respuesta['resultados'][0]['message'], 'Solicitud no encontrada.')
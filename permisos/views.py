@@ -17,7 +17,9 @@ from .serializers import (
     SolicitudPermisoCreateSerializer,
     SolicitudPermisoUpdateSerializer,
     AprobarRechazarSerializer,
+    AccionMasivaSerializer,
 )
+from .services import resolver_solicitudes_en_lote
 
 
 class TipoPermisoViewSet(viewsets.ModelViewSet):
@@ -58,18 +60,31 @@ class SolicitudPermisoViewSet(viewsets.ModelViewSet):
             return SolicitudPermisoUpdateSerializer
         elif self.action in ['aprobar', 'rechazar']:
             return AprobarRechazarSerializer
+        elif self.action == 'accion_masiva':
+            return AccionMasivaSerializer
         return SolicitudPermisoDetailSerializer
 
     def get_queryset(self):
         queryset = super().get_queryset()
         user = self.request.user
 
-        # Si no es staff, solo ve sus propias solicitudes
+        pendientes = self.request.query_params.get('pendientes_aprobar', None)
+        pendientes = bool(pendientes and pendientes.lower() in ['true', '1', 'yes'])
+
+        # Si no es staff, solo ve sus propias solicitudes o, para supervisores,
+        # las pendientes que puede aprobar
         if not user.is_staff:
-            if hasattr(user, 'empleado'):
-                queryset = queryset.filter(empleado=user.empleado)
-            else:
+            if not hasattr(user, 'empleado'):
                 return queryset.none()
+            if pendientes and self.action == 'list':
+                queryset = queryset.filter(
+                    pk__in=SolicitudPermiso.pendientes_para(user.empleado).values('pk')
+                )
+            else:
+                queryset = queryset.filter(
+                    models.Q(empleado=user.empleado) |
+                    models.Q(pk__in=SolicitudPermiso.pendientes_para(user.empleado).values('pk'))
+                )
 
         # Filtrar por estado
         estado = self.request.query_params.get('estado', None)
@@ -96,8 +111,7 @@ class SolicitudPermisoViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(fecha_fin__lte=fecha_hasta)
 
         # Filtrar pendientes de aprobar (para supervisores)
-        pendientes = self.request.query_params.get('pendientes_aprobar', None)
-        if pendientes and pendientes.lower() in ['true', '1', 'yes']:
+        if pendientes:
             queryset = queryset.filter(estado='pendiente')
 
         return queryset
@@ -176,6 +190,29 @@ class SolicitudPermisoViewSet(viewsets.ModelViewSet):
         solicitud.rechazar(aprobador, serializer.validated_data.get('comentarios', ''))
         return Response(SolicitudPermisoDetailSerializer(solicitud).data)
 
+    @action(detail=False, methods=['post'], url_path='accion-masiva')
+    def accion_masiva(self, request):
+        """Aprobar o rechazar varias solicitudes en una sola transaccion"""
+        if not hasattr(request.user, 'empleado'):
+            return Response(
+                {'error': 'No tienes un perfil de empleado asociado.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = AccionMasivaSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        resultados = resolver_solicitudes_en_lote(
+            request.user.empleado,
+            serializer.validated_data['ids'],
+            serializer.validated_data['accion'],
+            serializer.validated_data.get('comentarios', '')
+        )
+        return Response({
+            'procesadas': sum(1 for r in resultados if r['success']),
+            'resultados': resultados,
+        })
+
     @action(detail=True, methods=['post'])
     def cancelar(self, request, pk=None):
         """Cancelar solicitud"""
@@ -313,20 +350,58 @@ def detalle_permiso_view(request, pk):
 
 @login_required
 def aprobar_permisos_view(request):
-    """Vista para aprobar permisos (staff)"""
-    if not request.user.is_staff:
+    """Vista para aprobar permisos (staff o supervisores con subordinados)"""
+    if request.user.is_staff:
+        solicitudes = SolicitudPermiso.objects.filter(estado='pendiente')
+    elif hasattr(request.user, 'empleado'):
+        solicitudes = SolicitudPermiso.pendientes_para(request.user.empleado)
+    else:
         messages.error(request, 'No tienes permisos para acceder a esta pagina.')
         return redirect('dashboard')
 
-    solicitudes = SolicitudPermiso.objects.filter(
-        estado='pendiente'
-    ).select_related('empleado', 'empleado__user', 'tipo_permiso').order_by('-fecha_creacion')
+    solicitudes = solicitudes.select_related('empleado', 'empleado__user', 'tipo_permiso').order_by('-fecha_creacion')
 
     return render(request, 'permisos/aprobar_permisos.html', {
         'solicitudes': solicitudes
     })
 
 
+@login_required
+@require_POST
+def accion_masiva_permisos_view(request):
+    """Vista para aprobar/rechazar varias solicitudes desde la bandeja"""
+    if not hasattr(request.user, 'empleado'):
+        return JsonResponse({'success': False, 'message': 'No tienes un perfil de empleado asociado.'})
+
+    # Mismas reglas que la API: accion valida, ids enteros, maximo 500 por lote
+    serializer = AccionMasivaSerializer(data={
+        'ids': request.POST.getlist('ids'),
+        'accion': request.POST.get('accion'),
+        'comentarios': request.POST.get('comentarios', ''),
+    })
+    if not serializer.is_valid():
+        if 'accion' in serializer.errors:
+            mensaje = 'Accion no valida.'
+        elif not request.POST.getlist('ids'):
+            mensaje = 'No se seleccionaron solicitudes.'
+        else:
+            mensaje = 'Identificadores no validos (maximo 500 por lote).'
+        return JsonResponse({'success': False, 'message': mensaje})
+
+    resultados = resolver_solicitudes_en_lote(
+        request.user.empleado,
+        serializer.validated_data['ids'],
+        serializer.validated_data['accion'],
+        serializer.validated_data['comentarios'],
+    )
+    procesadas = sum(1 for r in resultados if r['success'])
+    return JsonResponse({
+        'success': procesadas > 0,
+        'message': f'{procesadas} de {len(resultados)} solicitudes procesadas.',
+        'resultados': resultados,
+    })
+
+
 @login_required
 @require_POST
 def accion_permiso_view(request, pk, accion):
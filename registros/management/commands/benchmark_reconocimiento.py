@@ -0,0 +1,104 @@
+"""
+Mide el costo de arranque de un proceso con y sin el motor de
+reconocimiento facial.
+
+Cada medición corre en un proceso nuevo de Python:
+  - arranque: django.setup() + carga de las URLs (lo que hace un worker
+    de gunicorn antes de atender la primera petición)
+  - motor:    lo anterior + carga de face_recognition/dlib/OpenCV
+
+    python manage.py benchmark_reconocimiento --repeticiones 5
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+MODULOS_PESADOS = ('face_recognition', 'dlib', 'cv2')
+
+_SCRIPT = """
+import importlib, json, sys, time
+inicio = time.perf_counter()
+import django
+django.setup()
+from django.conf import settings
+importlib.import_module(settings.ROOT_URLCONF)
+resultado = {'arranque': time.perf_counter() - inicio}
+if %(cargar_motor)r:
+    try:
+        from registros.services.reconocimiento import obtener_motor
+        obtener_motor()
+    except ImportError as e:
+        resultado['error'] = str(e)
+resultado['total'] = time.perf_counter() - inicio
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    resultado['rss_mb'] = rss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+except ImportError:
+    resultado['rss_mb'] = None
+resultado['modulos_pesados'] = [m for m in %(modulos)r if m in sys.modules]
+print(json.dumps(resultado))
+"""
+
+
+class Command(BaseCommand):
+    help = 'Mide tiempo de arranque y memoria con y sin el motor de reconocimiento facial'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeticiones',
+            type=int,
+            default=3,
+            help='Procesos a medir por escenario (default: 3)',
+        )
+
+    def handle(self, *args, **options):
+        repeticiones = max(options['repeticiones'], 1)
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get(
+            'DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE
+        ))
+
+        for escenario, cargar_motor in (('arranque', False), ('motor', True)):
+            mediciones = [self._medir(cargar_motor, env) for _ in range(repeticiones)]
+            mediciones = [m for m in mediciones if m is not None]
+            if not mediciones:
+                continue
+
+            tiempos = [m['total'] for m in mediciones]
+            rss = [m['rss_mb'] for m in mediciones if m['rss_mb'] is not None]
+            self.stdout.write(self.style.HTTP_INFO(f'Escenario: {escenario}'))
+            self.stdout.write(
+                f'  Tiempo: mediana {statistics.median(tiempos):.2f}s '
+                f'(min {min(tiempos):.2f}s, max {max(tiempos):.2f}s)'
+            )
+            if rss:
+                self.stdout.write(f'  Memoria maxima (RSS): {statistics.median(rss):.0f} MB')
+            pesados = mediciones[-1]['modulos_pesados']
+            self.stdout.write(f"  Modulos pesados cargados: {', '.join(pesados) or 'ninguno'}")
+            if 'error' in mediciones[-1]:
+                self.stdout.write(self.style.WARNING(
+                    f"  No se pudo cargar el motor: {mediciones[-1]['error']}"
+                ))
+            if not cargar_motor and pesados:
+                self.stdout.write(self.style.ERROR(
+                    '  El arranque no deberia cargar el motor de reconocimiento'
+                ))
+
+    def _medir(self, cargar_motor, env):
+        script = _SCRIPT % {'cargar_motor': cargar_motor, 'modulos': MODULOS_PESADOS}
+        proceso = subprocess.run(
+            [sys.executable, '-c', script],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if proceso.returncode != 0:
+            self.stdout.write(self.style.ERROR(proceso.stderr.strip().splitlines()[-1]))
+            return None
+        return json.loads(proceso.stdout.strip().splitlines()[-1])
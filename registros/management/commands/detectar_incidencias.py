@@ -1,12 +1,35 @@
 from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef
 from django.utils import timezone
 from datetime import timedelta
 from zoneinfo import ZoneInfo
+from permisos.models import DiaPermiso
 from registros.models import RegistroAsistencia
 
 MEXICO_TZ = ZoneInfo('America/Mexico_City')
 
 
+def inicio_del_hueco(registro):
+    """
+    Hora desde la que falta la checada que origina la incidencia: la última
+    checada registrada antes del hueco, que sigue hasta el fin del día.
+    """
+    if registro.incidencia == 'sin_entrada_comida':
+        return registro.hora_salida_comida
+    if registro.incidencia == 'sin_salida':
+        return registro.hora_entrada_comida or registro.hora_entrada
+    return None
+
+
+def cubierto_por_horas(registro, permisos):
+    """Algún permiso por horas (hora_inicio, hora_fin) se cruza con el hueco."""
+    inicio = inicio_del_hueco(registro)
+    if inicio is None:
+        return False
+    # El hueco va de `inicio` al fin del día: se cruza si el permiso termina después
+    return any(hora_fin > inicio for _, hora_fin in permisos)
+
+
 class Command(BaseCommand):
     help = 'Detecta y marca incidencias en registros de asistencia del día anterior'
 
@@ -29,16 +52,41 @@ class Command(BaseCommand):
 
         self.stdout.write(f"Revisando registros del día: {fecha_revisar}")
 
-        # Obtener todos los registros del día
-        registros = RegistroAsistencia.objects.filter(fecha=fecha_revisar)
+        # Obtener todos los registros del día, marcando los cubiertos por un
+        # permiso aprobado de día completo
+        registros = RegistroAsistencia.objects.filter(
+            fecha=fecha_revisar
+        ).select_related('empleado', 'empleado__user').annotate(
+            cubierto_por_permiso=Exists(DiaPermiso.objects.filter(
+                empleado_id=OuterRef('empleado_id'),
+                fecha=OuterRef('fecha'),
+                dia_completo=True
+            ))
+        )
+        # Los permisos por horas (p.ej. salida anticipada) solo cubren la
+        # incidencia si su horario se cruza con el hueco de checadas
+        permisos_por_horas = {}
+        for empleado_id, hora_inicio, hora_fin in DiaPermiso.objects.filter(
+            fecha=fecha_revisar, dia_completo=False
+        ).values_list('empleado_id', 'solicitud__hora_inicio', 'solicitud__hora_fin'):
+            permisos_por_horas.setdefault(empleado_id, []).append((hora_inicio, hora_fin))
         
         total_registros = registros.count()
         registros_con_incidencia = 0
         registros_completos = 0
 
+        registros_con_permiso = 0
+
         for registro in registros:
             # Calcular incidencias
             registro.calcular_incidencias()
+            if registro.incidencia != 'ninguna' and (
+                registro.cubierto_por_permiso
+                or cubierto_por_horas(registro, permisos_por_horas.get(registro.empleado_id, []))
+            ):
+                registro.incidencia = 'ninguna'
+                registro.descripcion_incidencia = 'Cubierto por permiso aprobado'
+                registros_con_permiso += 1
             registro.save()
 
             if registro.incidencia != 'ninguna':
@@ -56,6 +104,8 @@ class Command(BaseCommand):
         self.stdout.write("\n" + "="*60)
         self.stdout.write(f"Total de registros revisados: {total_registros}")
         self.stdout.write(self.style.SUCCESS(f"✓ Registros completos: {registros_completos}"))
+        if registros_con_permiso:
+            self.stdout.write(f"  (de ellos, {registros_con_permiso} cubiertos por permiso aprobado)")
         
         if registros_con_incidencia > 0:
             self.stdout.write(self.style.ERROR(f"✗ Registros con incidencia: {registros_con_incidencia}"))
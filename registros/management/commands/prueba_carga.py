@@ -0,0 +1,241 @@
+"""
+Prueba de carga de la ráfaga de checadas de las 8:00.
+
+Siembra N empleados de prueba con embedding sintético y horario de 08:00,
+levanta un servidor local con el motor de reconocimiento sintético y
+reproduce en paralelo el flujo del kiosco (verificar_rostro + marcar_entrada)
+mientras usuarios staff navegan dashboard y tickets. Reporta throughput,
+tasa de error y percentiles de latencia por operación.
+
+Funciona sin red contra la base configurada (SQLite o PostgreSQL local):
+
+    python manage.py prueba_carga --empleados 80 --concurrencia 20
+    python manage.py prueba_carga --servidor gunicorn --workers 3 --ventana 60
+    python manage.py prueba_carga --limpiar
+
+El servidor guarda las fotos en tmp/prueba_carga/media en lugar de Spaces.
+Con --url se usa un servidor ya levantado; debe correr con
+RECONOCIMIENTO_MOTOR=registros.services.motor_sintetico.MotorSintetico.
+"""
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from checador.comandos import agregar_opciones_datos_prueba, exigir_entorno_de_pruebas
+from registros.services import prueba_carga
+
+MOTOR_SINTETICO = 'registros.services.motor_sintetico.MotorSintetico'
+
+_SCRIPT_RUNSERVER = """
+import django
+django.setup()
+from registros.services.prueba_carga import correr_runserver
+correr_runserver(%(direccion)r)
+"""
+
+
+def _percentil(valores, p):
+    valores = sorted(valores)
+    if not valores:
+        return 0
+    indice = min(len(valores) - 1, int(round(p / 100 * (len(valores) - 1))))
+    return valores[indice]
+
+
+class Command(BaseCommand):
+    help = 'Prueba de carga: ráfaga de checadas del kiosco con tráfico de dashboard y tickets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--empleados', type=int, default=50,
+                            help='Empleados que checan en la ráfaga (default: 50)')
+        parser.add_argument('--concurrencia', type=int, default=10,
+                            help='Kioscos/peticiones de checada simultáneas (default: 10)')
+        parser.add_argument('--ventana', type=float, default=0,
+                            help='Segundos en que se reparten las llegadas; 0 = todos a la vez (default: 0)')
+        parser.add_argument('--navegadores', type=int, default=3,
+                            help='Usuarios staff navegando dashboard y tickets durante la ráfaga (default: 3)')
+        parser.add_argument('--costo-reconocimiento-ms', type=float, default=0,
+                            help='Latencia simulada de la detección facial por imagen (default: 0)')
+        parser.add_argument('--servidor', choices=['runserver', 'gunicorn'], default='runserver',
+                            help='Servidor local a levantar (default: runserver)')
+        parser.add_argument('--workers', type=int, default=2,
+                            help='Workers de gunicorn (default: 2)')
+        parser.add_argument('--puerto', type=int, default=8765,
+                            help='Puerto del servidor local (default: 8765)')
+        parser.add_argument('--url', help='Usar un servidor ya levantado en lugar de iniciar uno')
+        parser.add_argument('--json', dest='archivo_json', help='Guardar los resultados en un archivo JSON')
+        agregar_opciones_datos_prueba(parser, 'Borrar los datos de prueba y salir')
+
+    def handle(self, *args, **options):
+        if options['limpiar']:
+            exigir_entorno_de_pruebas(options, 'Borrar los datos de la prueba de carga')
+            borrados = prueba_carga.limpiar()
+            self.stdout.write(self.style.SUCCESS(f'Datos de prueba eliminados ({borrados} objetos)'))
+            return
+
+        exigir_entorno_de_pruebas(options, 'Sembrar empleados de prueba de carga')
+
+        indices = prueba_carga.sembrar(options['empleados'])
+        reiniciados = prueba_carga.reiniciar_registros()
+        cookie = prueba_carga.sesion_staff()
+        self.stdout.write(
+            f'{len(indices)} empleados de prueba listos ({reiniciados} registros previos borrados)'
+        )
+
+        servidor = None
+        base_url = (options['url'] or '').rstrip('/')
+        if not base_url:
+            servidor, base_url = self._iniciar_servidor(options)
+        try:
+            resultados, duracion = self._ejecutar(base_url, indices, cookie, options)
+        finally:
+            if servidor:
+                servidor.terminate()
+                try:
+                    servidor.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    servidor.kill()
+
+        reporte = self._reporte(resultados, duracion)
+        self._imprimir(reporte, options)
+        if options['archivo_json']:
+            with open(options['archivo_json'], 'w', encoding='utf-8') as archivo:
+                json.dump(reporte, archivo, indent=2, ensure_ascii=False)
+            self.stdout.write(f"Resultados guardados en {options['archivo_json']}")
+
+    # ------------------------------------------------------------------
+
+    def _iniciar_servidor(self, options):
+        puerto = options['puerto']
+        env = dict(
+            os.environ,
+            RECONOCIMIENTO_MOTOR=MOTOR_SINTETICO,
+            RECONOCIMIENTO_SINTETICO_MS=str(options['costo_reconocimiento_ms']),
+            DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE),
+        )
+        if options['servidor'] == 'gunicorn':
+            comando = [
+                sys.executable, '-m', 'gunicorn', 'registros.services.prueba_carga:aplicacion_wsgi()',
+                '--bind', f'127.0.0.1:{puerto}', '--workers', str(options['workers']),
+                '--log-level', 'warning',
+            ]
+        else:
+            comando = [sys.executable, '-c', _SCRIPT_RUNSERVER % {'direccion': f'127.0.0.1:{puerto}'}]
+
+        # El log del servidor va a archivo: un PIPE sin leer lo bloquearía al llenarse
+        os.makedirs(settings.BASE_DIR / 'tmp', exist_ok=True)
+        ruta_log = settings.BASE_DIR / 'tmp' / 'prueba_carga_servidor.log'
+        self.stdout.write(f"Iniciando {options['servidor']} en el puerto {puerto} (log: {ruta_log})...")
+        with open(ruta_log, 'w') as log:
+            servidor = subprocess.Popen(
+                comando, cwd=settings.BASE_DIR, env=env, stdout=log, stderr=subprocess.STDOUT,
+            )
+        limite = time.monotonic() + 60
+        while time.monotonic() < limite:
+            if servidor.poll() is not None:
+                raise CommandError(f'El servidor terminó al iniciar; ver {ruta_log}')
+            try:
+                socket.create_connection(('127.0.0.1', puerto), timeout=1).close()
+                return servidor, f'http://127.0.0.1:{puerto}'
+            except OSError:
+                time.sleep(0.25)
+        servidor.kill()
+        raise CommandError('El servidor no respondió en 60 segundos')
+
+    def _ejecutar(self, base_url, indices, cookie, options):
+        resultados = prueba_carga.Resultados()
+        detener = threading.Event()
+        ventana = options['ventana']
+        llegadas = sorted(
+            (random.uniform(0, ventana) if ventana else 0, indice) for indice in indices
+        )
+
+        navegadores = [
+            threading.Thread(
+                target=prueba_carga.flujo_navegacion,
+                args=(resultados, base_url, cookie, detener),
+                daemon=True,
+            )
+            for _ in range(options['navegadores'])
+        ]
+        for hilo in navegadores:
+            hilo.start()
+
+        self.stdout.write(
+            f"Ráfaga: {len(indices)} checadas, concurrencia {options['concurrencia']}, "
+            f"ventana {ventana:g}s, {options['navegadores']} navegadores"
+        )
+        inicio = time.perf_counter()
+
+        def checar(llegada, indice):
+            espera = llegada - (time.perf_counter() - inicio)
+            if espera > 0:
+                time.sleep(espera)
+            prueba_carga.flujo_checada(resultados, base_url, indice)
+
+        with ThreadPoolExecutor(max_workers=max(options['concurrencia'], 1)) as pool:
+            list(pool.map(lambda llegada: checar(*llegada), llegadas))
+
+        duracion = time.perf_counter() - inicio
+        detener.set()
+        for hilo in navegadores:
+            hilo.join(timeout=35)
+        return resultados, duracion
+
+    def _reporte(self, resultados, duracion):
+        operaciones = {}
+        for operacion, latencias in sorted(resultados.latencias.items()):
+            errores = resultados.errores.get(operacion, {})
+            total_errores = sum(errores.values())
+            ms = [segundos * 1000 for segundos in latencias]
+            operaciones[operacion] = {
+                'peticiones': len(ms),
+                'errores': total_errores,
+                'tasa_error': round(total_errores / len(ms), 4),
+                'motivos_error': errores,
+                'throughput_rps': round(len(ms) / duracion, 2) if duracion else None,
+                'p50_ms': round(_percentil(ms, 50), 1),
+                'p95_ms': round(_percentil(ms, 95), 1),
+                'p99_ms': round(_percentil(ms, 99), 1),
+                'max_ms': round(max(ms), 1),
+                'promedio_ms': round(statistics.mean(ms), 1),
+            }
+        checadas = operaciones.get('marcar_entrada', {}).get('peticiones', 0)
+        exitosas = checadas - operaciones.get('marcar_entrada', {}).get('errores', 0)
+        return {
+            'duracion_s': round(duracion, 2),
+            'checadas_exitosas': exitosas,
+            'checadas_por_minuto': round(exitosas / duracion * 60, 1) if duracion else None,
+            'operaciones': operaciones,
+        }
+
+    def _imprimir(self, reporte, options):
+        self.stdout.write('')
+        self.stdout.write(self.style.HTTP_INFO(
+            f"Duración de la ráfaga: {reporte['duracion_s']}s | "
+            f"checadas exitosas: {reporte['checadas_exitosas']}/{options['empleados']} "
+            f"({reporte['checadas_por_minuto']}/min)"
+        ))
+        self.stdout.write(
+            f"{'Operación':<18}{'Pet.':>6}{'Err.':>6}{'Error%':>8}{'Req/s':>8}"
+            f"{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}  (ms)"
+        )
+        for operacion, datos in reporte['operaciones'].items():
+            linea = (
+                f"{operacion:<18}{datos['peticiones']:>6}{datos['errores']:>6}"
+                f"{datos['tasa_error'] * 100:>7.1f}%{datos['throughput_rps']:>8.1f}"
+                f"{datos['p50_ms']:>8.0f}{datos['p95_ms']:>8.0f}{datos['p99_ms']:>8.0f}{datos['max_ms']:>8.0f}"
+            )
+            self.stdout.write(self.style.ERROR(linea) if datos['errores'] else linea)
+            for motivo, veces in datos['motivos_error'].items():
+                self.stdout.write(f'    {motivo}: {veces}')
@@ -0,0 +1,26 @@
+# Generated by Django 6.0 on 2026-10-19 08:23
+
+from django.db import migrations, models
+
+from checador.migraciones import AgregarIndiceConcurrente
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY en PostgreSQL no puede ir en una transacción
+    atomic = False
+
+    dependencies = [
+        ('empleados', '0004_empleado_descansa_domingo_empleado_descansa_sabado_and_more'),
+        ('registros', '0002_registroasistencia_descripcion_incidencia_and_more'),
+    ]
+
+    operations = [
+        AgregarIndiceConcurrente(
+            model_name='registroasistencia',
+            index=models.Index(fields=['fecha', 'retardo'], name='registros_fecha_retardo_idx'),
+        ),
+        AgregarIndiceConcurrente(
+            model_name='registroasistencia',
+            index=models.Index(condition=models.Q(('incidencia', 'ninguna'), _negated=True), fields=['fecha'], name='registros_incidencia_idx'),
+        ),
+    ]
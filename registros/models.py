@@ -3,6 +3,8 @@ from django.utils import timezone
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
+from checador.cache import invalidar_con_senales
+from checador.rastreo import RastreoCambiosMixin
 from checador.storage_backends import MediaStorage
 from empleados.models import Empleado
 
@@ -15,9 +17,11 @@ def fecha_mexico():
     return timezone.now().astimezone(MEXICO_TZ).date()
 
 
-class RegistroAsistencia(models.Model):
+class RegistroAsistencia(RastreoCambiosMixin, models.Model):
     """Modelo para registrar asistencias de empleados"""
 
+    campos_rastreados = ('foto_registro',)
+
     TIPO_REGISTRO_CHOICES = [
         ('entrada', 'Entrada'),
         ('salida', 'Salida'),
@@ -138,6 +142,17 @@ class RegistroAsistencia(models.Model):
         verbose_name_plural = 'Registros de Asistencia'
         ordering = ['-fecha', '-hora_entrada']
         unique_together = ['empleado', 'fecha']
+        # Accesos frecuentes sin empleado (ver checador/planes.py): día o
+        # rango de fechas con o sin retardo (dashboard, reportes,
+        # detectar_incidencias) y los pocos registros con incidencia
+        indexes = [
+            models.Index(fields=['fecha', 'retardo'], name='registros_fecha_retardo_idx'),
+            models.Index(
+                fields=['fecha'],
+                condition=~models.Q(incidencia='ninguna'),
+                name='registros_incidencia_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.empleado.codigo_empleado} - {self.fecha}"
@@ -281,3 +296,7 @@ class RegistroAsistencia(models.Model):
             minutos = int((self.horas_trabajadas - horas) * 60)
             return f"{horas}h {minutos}m"
         return "0h 0m"
+
+
+# Estadisticas del dashboard de staff
+invalidar_con_senales('dashboard', RegistroAsistencia)
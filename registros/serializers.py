@@ -22,6 +22,9 @@ class RegistroAsistenciaSerializer(serializers.ModelSerializer):
 class VerificarRostroSerializer(serializers.Serializer):
     """Serializer para verificar rostro sin marcar asistencia"""
     foto = serializers.ImageField(required=True)
+    # Dimensiones declaradas por el kiosco (ver registros/services/imagen.py)
+    ancho = serializers.IntegerField(required=False, min_value=1)
+    alto = serializers.IntegerField(required=False, min_value=1)
 
 
 class MarcarAsistenciaSerializer(serializers.Serializer):
@@ -31,6 +34,8 @@ class MarcarAsistenciaSerializer(serializers.Serializer):
         choices=['entrada', 'salida', 'salida_comida', 'entrada_comida'], 
         required=True
     )
+    ancho = serializers.IntegerField(required=False, min_value=1)
+    alto = serializers.IntegerField(required=False, min_value=1)
     latitud = serializers.DecimalField(max_digits=9, decimal_places=6, required=False, allow_null=True)
     longitud = serializers.DecimalField(max_digits=9, decimal_places=6, required=False, allow_null=True)
     ubicacion = serializers.CharField(required=False, allow_blank=True)
@@ -1,3 +1,3 @@
-from .facial_recognition import FacialRecognitionService
+from .reconocimiento import FacialRecognitionService
 
 __all__ = ['FacialRecognitionService']
@@ -0,0 +1,62 @@
+"""
+Decodificación de la foto de checada.
+
+Contrato con el kiosco (templates/facial_recognition*.html): la foto es un
+JPEG de máximo CHECADA_FOTO_LADO_MAXIMO px por lado y se declaran sus
+dimensiones en los campos `ancho` y `alto`. En los endpoints de checada la
+foto se recibe en memoria (RegistroAsistenciaViewSet usa
+MemoryFileUploadHandler) y se decodifica con cv2.imdecode directamente del
+buffer del upload, convirtiendo BGR a RGB sobre el mismo arreglo: sin
+archivo temporal y sin la copia PIL -> numpy.
+
+Las fotos fuera del contrato (kioscos anteriores con el frame completo,
+PNG, sin dimensiones declaradas) siguen el camino del motor,
+FacialRecognitionService.load_image_from_file.
+"""
+import logging
+
+import numpy as np
+from django.conf import settings
+from django.core.files.uploadedfile import InMemoryUploadedFile
+
+from .reconocimiento import FacialRecognitionService
+
+logger = logging.getLogger(__name__)
+
+JPEG_SOI = b'\xff\xd8\xff'
+
+
+def dentro_del_contrato(foto, ancho, alto):
+    """JPEG en memoria con dimensiones declaradas dentro del límite."""
+    return (
+        isinstance(foto, InMemoryUploadedFile)
+        and bool(ancho) and bool(alto)
+        and max(ancho, alto) <= settings.CHECADA_FOTO_LADO_MAXIMO
+        and foto.file.getbuffer()[:3].tobytes() == JPEG_SOI
+    )
+
+
+def decodificar_jpeg(buffer, ancho, alto):
+    """
+    RGB (alto, ancho, 3) decodificado de `buffer` sin copiarlo; None si no
+    es un JPEG válido o sus dimensiones no son las declaradas.
+    """
+    import cv2
+
+    imagen = cv2.imdecode(np.frombuffer(buffer, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if imagen is None or imagen.shape[:2] != (alto, ancho):
+        return None
+    return cv2.cvtColor(imagen, cv2.COLOR_BGR2RGB, dst=imagen)
+
+
+def cargar_foto(foto, ancho=None, alto=None):
+    """Imagen RGB de la foto de checada (None si no se pudo cargar)."""
+    if not dentro_del_contrato(foto, ancho, alto):
+        return FacialRecognitionService.load_image_from_file(foto)
+
+    # El buffer se libera al salir: el upload no se puede cerrar mientras se exporta
+    with foto.file.getbuffer() as buffer:
+        imagen = decodificar_jpeg(buffer, ancho, alto)
+    if imagen is None:
+        logger.warning(f"Foto de checada inválida o distinta al tamaño declarado {ancho}x{alto}")
+    return imagen
@@ -0,0 +1,109 @@
+"""
+Motor de reconocimiento sintético para pruebas de carga.
+
+Tiene la misma interfaz que FacialRecognitionService pero no usa dlib: el
+encoding de una imagen se deriva de sus pixeles (sha256 -> vector de 128
+dimensiones), así que la imagen sintética de un empleado siempre produce
+el mismo encoding y el de cualquier otra imagen queda lejos (distancia
+~1.4, tolerancia 0.6).
+
+La búsqueda del empleado es la misma que la del motor real: lee los
+embeddings de todos los empleados activos y compara contra cada uno, de
+modo que el costo en base de datos y CPU de Python es representativo. El
+costo de detección de dlib se simula con RECONOCIMIENTO_SINTETICO_MS.
+
+Se activa con RECONOCIMIENTO_MOTOR=registros.services.motor_sintetico.MotorSintetico
+(lo hace `python manage.py prueba_carga` al levantar su servidor).
+"""
+import hashlib
+import io
+import os
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from empleados.models import Empleado
+
+DIMENSIONES = 128
+TAMANO_IMAGEN = (160, 160)
+
+
+def imagen_sintetica(semilla: int) -> bytes:
+    """PNG determinista para la semilla (el 'rostro' de un empleado de prueba)."""
+    rng = np.random.default_rng(semilla)
+    pixeles = rng.integers(0, 256, size=(*TAMANO_IMAGEN, 3), dtype=np.uint8)
+    salida = io.BytesIO()
+    Image.fromarray(pixeles, 'RGB').save(salida, format='PNG')
+    return salida.getvalue()
+
+
+def encoding_de_imagen(imagen: np.ndarray) -> np.ndarray:
+    """Encoding unitario derivado de los pixeles de la imagen."""
+    digest = hashlib.sha256(np.ascontiguousarray(imagen).tobytes()).digest()
+    rng = np.random.default_rng(int.from_bytes(digest[:8], 'big'))
+    vector = rng.normal(size=DIMENSIONES)
+    return vector / np.linalg.norm(vector)
+
+
+class MotorSintetico:
+    """Sustituto de FacialRecognitionService para pruebas de carga"""
+
+    FACE_TOLERANCE = 0.6
+    COSTO_DETECCION_MS = float(os.environ.get('RECONOCIMIENTO_SINTETICO_MS', '0'))
+
+    @staticmethod
+    def load_image_from_file(image_file) -> Optional[np.ndarray]:
+        try:
+            imagen = Image.open(image_file)
+            return np.array(imagen.convert('RGB'))
+        except Exception:
+            return None
+
+    @staticmethod
+    def extract_face_encoding(image: np.ndarray, validate: bool = True) -> Tuple[Optional[np.ndarray], str]:
+        if image is None or image.size == 0:
+            return None, "Imagen vacía o inválida"
+        if MotorSintetico.COSTO_DETECCION_MS:
+            time.sleep(MotorSintetico.COSTO_DETECCION_MS / 1000)
+        return encoding_de_imagen(image), "Encoding extraído exitosamente"
+
+    @staticmethod
+    def compare_faces(known_encoding: np.ndarray, unknown_encoding: np.ndarray) -> Tuple[bool, float]:
+        distancia = float(np.linalg.norm(known_encoding - unknown_encoding))
+        confianza = max(0, min(100, (1 - distancia) * 100))
+        return distancia <= MotorSintetico.FACE_TOLERANCE, confianza
+
+    @staticmethod
+    def recognize_employee(image: np.ndarray) -> Tuple[Optional[Empleado], float, str]:
+        encoding, mensaje = MotorSintetico.extract_face_encoding(image)
+        if encoding is None:
+            return None, 0.0, mensaje
+
+        empleados = Empleado.objects.filter(
+            activo=True,
+            embedding_rostro__isnull=False
+        ).exclude(embedding_rostro=b'')
+
+        mejor, mejor_confianza = None, 0.0
+        for empleado in empleados:
+            conocido = empleado.get_face_encoding()
+            if conocido is None:
+                continue
+            coincide, confianza = MotorSintetico.compare_faces(conocido, encoding)
+            if coincide and confianza > mejor_confianza:
+                mejor, mejor_confianza = empleado, confianza
+
+        if mejor:
+            return mejor, mejor_confianza, f"Empleado reconocido con {mejor_confianza:.1f}% de confianza"
+        return None, 0.0, "No se encontró coincidencia con ningún empleado registrado"
+
+    @staticmethod
+    def register_employee_face(empleado: Empleado, image_file) -> Tuple[bool, str]:
+        imagen = MotorSintetico.load_image_from_file(image_file)
+        if imagen is None:
+            return False, "No se pudo cargar la imagen"
+        empleado.set_face_encoding(encoding_de_imagen(imagen))
+        empleado.save()
+        return True, "Rostro registrado exitosamente"
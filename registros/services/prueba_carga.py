@@ -0,0 +1,250 @@
+"""
+Datos y escenarios de la prueba de carga (`python manage.py prueba_carga`).
+
+Los datos de prueba se distinguen por prefijo: usuarios 'carga_*',
+empleados 'CARGA0001'... y el horario 'CARGA'. sembrar() es idempotente y
+limpiar() borra todo lo que lleva el prefijo.
+
+Los campos de archivo usan MediaStorage (Spaces) sin importar settings;
+para correr sin red el servidor de la prueba cambia ese almacenamiento por
+uno local (usar_almacenamiento_local) antes de atender peticiones.
+"""
+import io
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from datetime import time as dt_time
+from importlib import import_module
+
+import numpy as np
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.models import Group, User
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from PIL import Image
+
+from empleados.models import Empleado
+from checador.storage_backends import MediaStorage
+from horarios.models import TipoHorario
+from it_tickets.permissions import GRUPO_IT
+from registros.models import RegistroAsistencia
+
+from .motor_sintetico import encoding_de_imagen, imagen_sintetica
+
+PREFIJO_USUARIO = 'carga_'
+PREFIJO_CODIGO = 'CARGA'
+USUARIO_STAFF = f'{PREFIJO_USUARIO}staff'
+
+
+def _codigo(indice):
+    return f'{PREFIJO_CODIGO}{indice:04d}'
+
+
+def _semilla(indice):
+    return 45_000 + indice
+
+
+def imagen_empleado(indice):
+    """PNG con el que el motor sintético reconoce al empleado `indice`."""
+    return imagen_sintetica(_semilla(indice))
+
+
+def sembrar(cantidad):
+    """
+    Crea (o completa) `cantidad` empleados de prueba con horario de 08:00 y
+    embedding sintético, más un usuario staff para el tráfico de dashboard.
+    Regresa la lista de índices de empleados.
+    """
+    with transaction.atomic():
+        horario, _ = TipoHorario.objects.get_or_create(
+            codigo=PREFIJO_CODIGO,
+            defaults={
+                'nombre': 'Prueba de carga 08:00-17:00',
+                'hora_entrada': dt_time(8, 0),
+                'hora_salida': dt_time(17, 0),
+                'hora_inicio_comida': dt_time(14, 0),
+                'hora_fin_comida': dt_time(15, 0),
+            },
+        )
+        existentes = set(
+            Empleado.objects.filter(codigo_empleado__startswith=PREFIJO_CODIGO)
+            .values_list('codigo_empleado', flat=True)
+        )
+        for indice in range(1, cantidad + 1):
+            if _codigo(indice) in existentes:
+                continue
+            user = User.objects.create_user(
+                username=f'{PREFIJO_USUARIO}{indice:04d}',
+                first_name='Carga',
+                last_name=f'{indice:04d}',
+            )
+            empleado = Empleado(
+                user=user,
+                codigo_empleado=_codigo(indice),
+                departamento='Prueba de carga',
+                horario_predeterminado=horario,
+                horario_sabado=horario,
+                descansa_sabado=False,
+                horario_domingo=horario,
+                descansa_domingo=False,
+            )
+            pixeles = np.array(Image.open(io.BytesIO(imagen_empleado(indice))).convert('RGB'))
+            empleado.set_face_encoding(encoding_de_imagen(pixeles))
+            empleado.save()
+
+        staff, creado = User.objects.get_or_create(
+            username=USUARIO_STAFF,
+            defaults={'is_staff': True, 'first_name': 'Carga', 'last_name': 'Staff'},
+        )
+        if creado:
+            staff.set_unusable_password()
+            staff.save(update_fields=['password'])
+        # En el grupo IT para que la API de tickets responda como a un técnico
+        staff.groups.add(Group.objects.get_or_create(name=GRUPO_IT)[0])
+
+    return list(range(1, cantidad + 1))
+
+
+def reiniciar_registros():
+    """Borra los registros de los empleados de prueba (cada corrida vuelve a marcar entrada)."""
+    return RegistroAsistencia.objects.filter(
+        empleado__codigo_empleado__startswith=PREFIJO_CODIGO
+    ).delete()[0]
+
+
+def limpiar():
+    """Borra usuarios, empleados, registros y horario de prueba."""
+    with transaction.atomic():
+        borrados = User.objects.filter(username__startswith=PREFIJO_USUARIO).delete()[0]
+        TipoHorario.objects.filter(codigo=PREFIJO_CODIGO).delete()
+    return borrados
+
+
+def sesion_staff():
+    """Cookie de sesión del usuario staff de prueba (sin pasar por el login)."""
+    user = User.objects.get(username=USUARIO_STAFF)
+    engine = import_module(settings.SESSION_ENGINE)
+    sesion = engine.SessionStore()
+    sesion[SESSION_KEY] = str(user.pk)
+    sesion[BACKEND_SESSION_KEY] = 'django.contrib.auth.backends.ModelBackend'
+    sesion[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    sesion.create()
+    return f'{settings.SESSION_COOKIE_NAME}={sesion.session_key}'
+
+
+def usar_almacenamiento_local():
+    """Cambia MediaStorage por disco local (tmp/prueba_carga/media) en todos los modelos."""
+    from django.apps import apps
+
+    local = FileSystemStorage(location=settings.BASE_DIR / 'tmp' / 'prueba_carga' / 'media')
+    for modelo in apps.get_models():
+        for campo in modelo._meta.fields:
+            if isinstance(getattr(campo, 'storage', None), MediaStorage):
+                campo.storage = local
+
+
+def aplicacion_wsgi():
+    """WSGI del servidor de la prueba (gunicorn 'registros.services.prueba_carga:aplicacion_wsgi()')."""
+    from django.core.wsgi import get_wsgi_application
+
+    aplicacion = get_wsgi_application()
+    usar_almacenamiento_local()
+    return aplicacion
+
+
+def correr_runserver(direccion):
+    """runserver con almacenamiento local (mismo proceso, sin recargador)."""
+    from django.core.management import call_command
+
+    usar_almacenamiento_local()
+    call_command('runserver', direccion, use_reloader=False, skip_checks=True)
+
+
+# ---------------------------------------------------------------------------
+# Cliente HTTP y escenarios
+# ---------------------------------------------------------------------------
+
+class Resultados:
+    """Latencias y errores por operación, seguros entre hilos."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencias = {}  # operacion -> [segundos]
+        self.errores = {}    # operacion -> {motivo: veces}
+
+    def registrar(self, operacion, segundos, error=None):
+        with self._lock:
+            self.latencias.setdefault(operacion, []).append(segundos)
+            if error:
+                motivos = self.errores.setdefault(operacion, {})
+                motivos[error] = motivos.get(error, 0) + 1
+
+
+def _multipart(campos, archivos):
+    limite = uuid.uuid4().hex
+    partes = []
+    for nombre, valor in campos.items():
+        partes.append(
+            f'--{limite}\r\nContent-Disposition: form-data; name="{nombre}"\r\n\r\n{valor}\r\n'.encode()
+        )
+    for nombre, (archivo, contenido, tipo) in archivos.items():
+        partes.append(
+            f'--{limite}\r\nContent-Disposition: form-data; name="{nombre}"; filename="{archivo}"\r\n'
+            f'Content-Type: {tipo}\r\n\r\n'.encode() + contenido + b'\r\n'
+        )
+    partes.append(f'--{limite}--\r\n'.encode())
+    return b''.join(partes), f'multipart/form-data; boundary={limite}'
+
+
+def peticion(resultados, operacion, url, datos=None, cabeceras=None, timeout=30):
+    """Hace la petición y registra su latencia; regresa el status (None si falló la conexión)."""
+    solicitud = urllib.request.Request(url, data=datos, headers=cabeceras or {})
+    inicio = time.perf_counter()
+    try:
+        with urllib.request.urlopen(solicitud, timeout=timeout) as respuesta:
+            respuesta.read()
+            status = respuesta.status
+        error = None
+    except urllib.error.HTTPError as e:
+        status, error = e.code, f'HTTP {e.code}'
+    except (urllib.error.URLError, OSError) as e:
+        status, error = None, type(getattr(e, 'reason', e)).__name__
+    resultados.registrar(operacion, time.perf_counter() - inicio, error)
+    return status
+
+
+def flujo_checada(resultados, base_url, indice):
+    """Lo que hace el kiosco: verificar_rostro y luego marcar_entrada con la misma foto."""
+    foto = ('rostro.png', imagen_empleado(indice), 'image/png')
+    datos, tipo = _multipart({}, {'foto': foto})
+    status = peticion(
+        resultados, 'verificar_rostro', f'{base_url}/api/registros/verificar_rostro/',
+        datos, {'Content-Type': tipo},
+    )
+    if status != 200:
+        return
+    datos, tipo = _multipart({'tipo': 'entrada'}, {'foto': foto})
+    peticion(
+        resultados, 'marcar_entrada', f'{base_url}/api/registros/marcar_entrada/',
+        datos, {'Content-Type': tipo},
+    )
+
+
+RUTAS_NAVEGACION = (
+    ('dashboard', '/dashboard/'),
+    ('tickets_api', '/api/it/tickets/'),
+    ('tickets_web', '/it/tickets/'),
+    ('dashboard_it', '/it/'),
+)
+
+
+def flujo_navegacion(resultados, base_url, cookie, detener, pausa=0.2):
+    """Usuario de oficina recargando dashboard y tickets hasta que termine la ráfaga."""
+    while not detener.is_set():
+        operacion, ruta = random.choice(RUTAS_NAVEGACION)
+        peticion(resultados, operacion, f'{base_url}{ruta}', cabeceras={'Cookie': cookie})
+        detener.wait(pausa)
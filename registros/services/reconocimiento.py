@@ -0,0 +1,70 @@
+"""
+Carga diferida del motor de reconocimiento facial.
+
+facial_recognition.py importa face_recognition (dlib y sus modelos),
+OpenCV y PIL: varios segundos y ~100MB de memoria residente. Las vistas
+importan la fachada `FacialRecognitionService` de este módulo, que no
+carga nada hasta el primer uso real (verificar rostro, registrar rostro).
+Así los procesos que nunca reconocen rostros (comandos de gestión, el
+scheduler, migraciones) no pagan ese costo.
+
+    from registros.services import FacialRecognitionService
+    FacialRecognitionService.recognize_employee(imagen)   # aquí se carga
+
+El primer reconocimiento de cada worker incluye el tiempo de carga; ver
+`python manage.py benchmark_reconocimiento`.
+
+La clase del motor se toma de settings.RECONOCIMIENTO_MOTOR; la prueba de
+carga usa el motor sintético (motor_sintetico.py), que no necesita dlib.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+_motor = None
+_segundos_carga = None
+_lock = threading.Lock()
+
+
+def obtener_motor():
+    """Clase del motor configurado (RECONOCIMIENTO_MOTOR); la importa la primera vez."""
+    global _motor, _segundos_carga
+    if _motor is None:
+        with _lock:
+            if _motor is None:
+                inicio = time.perf_counter()
+                motor = import_string(settings.RECONOCIMIENTO_MOTOR)
+                _segundos_carga = time.perf_counter() - inicio
+                _motor = motor
+                logger.info(
+                    f"Motor de reconocimiento facial {motor.__name__} cargado en {_segundos_carga:.2f}s"
+                )
+    return _motor
+
+
+def motor_cargado():
+    return _motor is not None
+
+
+def segundos_carga():
+    """Tiempo que tomó cargar el motor en este proceso (None si no se ha cargado)."""
+    return _segundos_carga
+
+
+class _FachadaReconocimiento:
+    """Delega cada atributo en el motor real, cargándolo al primer acceso."""
+
+    def __getattr__(self, nombre):
+        return getattr(obtener_motor(), nombre)
+
+    def __repr__(self):
+        estado = 'cargado' if motor_cargado() else 'sin cargar'
+        return f"<FacialRecognitionService ({estado})>"
+
+
+FacialRecognitionService = _FachadaReconocimiento()
@@ -1,3 +1,122 @@
-from django.test import TestCase
+import importlib.util
+import io
+from datetime import date, time
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.uploadedfile import InMemoryUploadedFile, SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+
+from empleados.models import Empleado
+from permisos.models import SolicitudPermiso, TipoPermiso
+from registros.models import RegistroAsistencia
+from registros.services import imagen, prueba_carga
+from registros.services.motor_sintetico import MotorSintetico
+
+
+class MotorSinteticoTests(TestCase):
+    def setUp(self):
+        prueba_carga.sembrar(3)
+
+    def test_reconoce_al_empleado_de_su_imagen(self):
+        imagen = MotorSintetico.load_image_from_file(io.BytesIO(prueba_carga.imagen_empleado(2)))
+        empleado, confianza, _ = MotorSintetico.recognize_employee(imagen)
+        self.assertEqual(empleado.codigo_empleado, 'CARGA0002')
+        self.assertGreater(confianza, 99)
+
+    def test_no_reconoce_imagen_desconocida(self):
+        imagen = MotorSintetico.load_image_from_file(io.BytesIO(prueba_carga.imagen_empleado(50)))
+        empleado, _, _ = MotorSintetico.recognize_employee(imagen)
+        self.assertIsNone(empleado)
+
+    def test_sembrar_es_idempotente_y_limpiar_borra_todo(self):
+        prueba_carga.sembrar(3)
+        self.assertEqual(Empleado.objects.filter(codigo_empleado__startswith='CARGA').count(), 3)
+        prueba_carga.limpiar()
+        self.assertFalse(Empleado.objects.filter(codigo_empleado__startswith='CARGA').exists())
+
+    @override_settings(DEBUG=False)
+    def test_limpiar_sin_debug_exige_permiso_explicito(self):
+        with self.assertRaises(CommandError):
+            call_command('prueba_carga', '--limpiar')
+        self.assertTrue(Empleado.objects.filter(codigo_empleado__startswith='CARGA').exists())
+
+        call_command('prueba_carga', '--limpiar', '--permitir-sin-debug', stdout=io.StringIO())
+        self.assertFalse(Empleado.objects.filter(codigo_empleado__startswith='CARGA').exists())
+
+
+def _jpeg(ancho, alto, color=(255, 0, 0)):
+    salida = io.BytesIO()
+    Image.new('RGB', (ancho, alto), color).save(salida, 'JPEG', quality=95)
+    return salida.getvalue()
+
+
+class FotoChecadaTests(TestCase):
+
+    def test_endpoints_de_checada_reciben_la_foto_en_memoria(self):
+        foto = SimpleUploadedFile('captura.jpg', _jpeg(64, 48), content_type='image/jpeg')
+        with mock.patch('registros.views.cargar_foto', return_value=None) as cargar:
+            response = APIClient().post(
+                '/api/registros/verificar_rostro/', {'foto': foto, 'ancho': 64, 'alto': 48},
+                format='multipart',
+            )
+        self.assertEqual(response.status_code, 400)
+        recibida, ancho, alto = cargar.call_args.args
+        self.assertIsInstance(recibida, InMemoryUploadedFile)
+        self.assertEqual((ancho, alto), (64, 48))
+
+    def test_decodifica_jpeg_en_rgb_y_valida_el_tamano_declarado(self):
+        if importlib.util.find_spec('cv2') is None:
+            self.skipTest('Requiere OpenCV (opencv-python-headless)')
+        datos = _jpeg(64, 48)
+        rgb = imagen.decodificar_jpeg(datos, 64, 48)
+        self.assertEqual(rgb.shape, (48, 64, 3))
+        self.assertGreater(rgb[0, 0, 0], 200)
+        self.assertLess(rgb[0, 0, 2], 50)
+        self.assertIsNone(imagen.decodificar_jpeg(datos, 640, 480))
+
+
+class DetectarIncidenciasTests(TestCase):
+    fecha = date(2026, 3, 4)
+
+    def setUp(self):
+        prueba_carga.sembrar(1)
+        self.empleado = Empleado.objects.get(codigo_empleado='CARGA0001')
+        self.tipo = TipoPermiso.objects.create(nombre='Personal', codigo='PER')
+
+    def _aprobar_permiso(self, hora_inicio=None, hora_fin=None):
+        solicitud = SolicitudPermiso.objects.create(
+            empleado=self.empleado, tipo_permiso=self.tipo, motivo='prueba',
+            fecha_inicio=self.fecha, fecha_fin=self.fecha,
+            hora_inicio=hora_inicio, hora_fin=hora_fin,
+        )
+        solicitud.aprobar(aprobador=None)
+
+    def _detectar(self, **horas):
+        registro = RegistroAsistencia.objects.create(
+            empleado=self.empleado, fecha=self.fecha, hora_entrada=time(8, 0), **horas
+        )
+        call_command('detectar_incidencias', fecha=self.fecha.isoformat(), stdout=io.StringIO())
+        registro.refresh_from_db()
+        return registro
+
+    def test_permiso_de_dia_completo_cubre_la_incidencia(self):
+        self._aprobar_permiso()
+        registro = self._detectar()
+        self.assertEqual(registro.incidencia, 'ninguna')
+        self.assertEqual(registro.descripcion_incidencia, 'Cubierto por permiso aprobado')
+
+    def test_permiso_por_horas_que_se_cruza_con_el_hueco_la_cubre(self):
+        # Salida anticipada: regresó de comer y se fue con permiso de 16:00 a 18:00
+        self._aprobar_permiso(time(16, 0), time(18, 0))
+        registro = self._detectar(hora_salida_comida=time(14, 0), hora_entrada_comida=time(15, 0))
+        self.assertEqual(registro.incidencia, 'ninguna')
+
+    def test_permiso_por_horas_fuera_del_hueco_no_la_cubre(self):
+        # Permiso de la mañana; la checada que falta es el regreso de comer
+        self._aprobar_permiso(time(9, 0), time(11, 0))
+        registro = self._detectar(hora_salida_comida=time(14, 0))
+        self.assertEqual(registro.incidencia, 'sin_entrada_comida')
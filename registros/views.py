@@ -2,12 +2,14 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
 from django.utils import timezone
 from datetime import datetime, date, time
 from zoneinfo import ZoneInfo
 from .models import RegistroAsistencia
 from empleados.models import Empleado
 from .services import FacialRecognitionService
+from .services.imagen import cargar_foto
 from .serializers import (
     RegistroAsistenciaSerializer,
     VerificarRostroSerializer,
@@ -17,6 +19,12 @@ from .serializers import (
 # Zona horaria de México
 MEXICO_TZ = ZoneInfo('America/Mexico_City')
 
+# Endpoints del kiosco: la foto se recibe en memoria
+ACCIONES_CHECADA = {
+    'marcar_entrada', 'marcar_salida', 'marcar_salida_comida',
+    'marcar_entrada_comida', 'verificar_rostro',
+}
+
 
 
 class RegistroAsistenciaViewSet(viewsets.ModelViewSet):
@@ -45,6 +53,18 @@ class RegistroAsistenciaViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(fecha__range=[fecha_inicio, fecha_fin])
         
         return queryset.order_by('-fecha', '-hora_entrada')
+
+    def initialize_request(self, request, *args, **kwargs):
+        drf_request = super().initialize_request(request, *args, **kwargs)
+        if self.action in ACCIONES_CHECADA:
+            # FILE_UPLOAD_HANDLERS manda todo upload a archivo temporal; la foto
+            # del kiosco (~100KB) se queda en memoria y solo una que pase
+            # FILE_UPLOAD_MAX_MEMORY_SIZE va a disco
+            request.upload_handlers = [
+                MemoryFileUploadHandler(request),
+                TemporaryFileUploadHandler(request),
+            ]
+        return drf_request
     
     @action(detail=False, methods=['post'], permission_classes=[AllowAny])
     def marcar_entrada(self, request):
@@ -75,7 +95,11 @@ class RegistroAsistenciaViewSet(viewsets.ModelViewSet):
         foto = serializer.validated_data['foto']
         
         # Cargar y reconocer rostro
-        image = FacialRecognitionService.load_image_from_file(foto)
+        image = cargar_foto(
+            foto,
+            serializer.validated_data.get('ancho'),
+            serializer.validated_data.get('alto'),
+        )
         if image is None:
             return Response({
                 'success': False,
@@ -185,7 +209,11 @@ class RegistroAsistenciaViewSet(viewsets.ModelViewSet):
         ubicacion = serializer.validated_data.get('ubicacion', '')
         
         # Cargar y reconocer rostro
-        image = FacialRecognitionService.load_image_from_file(foto)
+        image = cargar_foto(
+            foto,
+            serializer.validated_data.get('ancho'),
+            serializer.validated_data.get('alto'),
+        )
         if image is None:
             return Response({
                 'success': False,
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ConfiguracionReporte, DestinatarioReporte, LogReporte
+from .models import ConfiguracionReporte, DestinatarioReporte, LiderScheduler, LogReporte
 
 
 class DestinatarioInline(admin.TabularInline):
@@ -33,3 +33,9 @@ class LogReporteAdmin(admin.ModelAdmin):
     list_filter = ('tipo_reporte', 'estado', 'fecha_envio')
     readonly_fields = ('tipo_reporte', 'fecha_inicio_rango', 'fecha_fin_rango', 'destinatarios_enviados', 'estado', 'error_detalle', 'fecha_envio')
     date_hierarchy = 'fecha_envio'
+
+
+@admin.register(LiderScheduler)
+class LiderSchedulerAdmin(admin.ModelAdmin):
+    list_display = ('nombre', 'propietario', 'fecha_adquisicion', 'expira')
+    readonly_fields = ('nombre', 'propietario', 'fecha_adquisicion', 'expira')
@@ -0,0 +1,56 @@
+"""
+Compara el costo de obtener una conexión a la base de datos sin pool,
+con conexiones persistentes y con el pool de psycopg 3.
+
+Cada modo simula N peticiones seguidas (conectar, SELECT 1, liberar) con
+una conexión independiente de la del proceso:
+
+    python manage.py benchmark_conexiones --repeticiones 200
+    DATABASE_URL=postgresql://... python manage.py benchmark_conexiones --json tmp/conexiones.json
+
+El modo pool solo se mide contra PostgreSQL.
+"""
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from checador.conexiones import MODOS_BENCHMARK, medir_conexiones, resumir_tiempos
+
+
+class Command(BaseCommand):
+    help = 'Mide el costo de conexión a la base de datos con y sin pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeticiones', type=int, default=100,
+                            help='Peticiones simuladas por modo (default: 100)')
+        parser.add_argument('--database', default='default',
+                            help='Alias de la base de datos (default: default)')
+        parser.add_argument('--json', dest='archivo_json', help='Guardar los resultados en un archivo JSON')
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        vendor = connections[alias].vendor
+        self.stdout.write(f"Base de datos '{alias}' ({vendor}), {options['repeticiones']} peticiones por modo")
+
+        resultados = {}
+        for modo in MODOS_BENCHMARK:
+            if modo == 'pool' and vendor != 'postgresql':
+                self.stdout.write(self.style.WARNING('pool: omitido (requiere PostgreSQL)'))
+                continue
+            resultados[modo] = resumir_tiempos(medir_conexiones(modo, options['repeticiones'], alias))
+
+        self.stdout.write(f"{'Modo':<14}{'1ra':>10}{'prom.':>10}{'p50':>10}{'p95':>10}{'total':>12}  (ms)")
+        for modo, datos in resultados.items():
+            self.stdout.write(
+                f"{modo:<14}{datos['primera_ms']:>10.2f}{datos['promedio_ms']:>10.3f}"
+                f"{datos['p50_ms']:>10.3f}{datos['p95_ms']:>10.3f}{datos['total_ms']:>12.1f}"
+            )
+        if 'nueva' in resultados and 'pool' in resultados and resultados['pool']['promedio_ms']:
+            factor = resultados['nueva']['promedio_ms'] / resultados['pool']['promedio_ms']
+            self.stdout.write(self.style.SUCCESS(f'El pool reduce el costo por petición {factor:.1f}x'))
+
+        if options['archivo_json']:
+            with open(options['archivo_json'], 'w', encoding='utf-8') as archivo:
+                json.dump({'vendor': vendor, 'modos': resultados}, archivo, indent=2)
+            self.stdout.write(f"Resultados guardados en {options['archivo_json']}")
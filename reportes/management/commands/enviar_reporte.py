@@ -103,10 +103,10 @@ class Command(BaseCommand):
 
         destinatarios = self._get_destinatarios(tipo, options, ConfiguracionReporte)
         try:
-            num_enviados = enviar_reporte(tipo, datos, destinatarios, archivo_excel=archivo_excel)
-            self.stdout.write(self.style.SUCCESS(f'Reporte {tipo} enviado a {num_enviados} destinatarios'))
+            num_encolados = enviar_reporte(tipo, datos, destinatarios, archivo_excel=archivo_excel)
+            self._reporte_encolado(tipo, num_encolados)
         except Exception as e:
-            raise CommandError(f'Error al enviar reporte: {e}')
+            raise CommandError(f'Error al encolar reporte: {e}')
 
     # ------------------------------------------------------------------
     # Reporte de inventario
@@ -140,10 +140,10 @@ class Command(BaseCommand):
 
         destinatarios = self._get_destinatarios('inventario', options, ConfiguracionReporte)
         try:
-            num_enviados = enviar_reporte('inventario', datos, destinatarios, archivo_excel=archivo_excel)
-            self.stdout.write(self.style.SUCCESS(f'Reporte inventario enviado a {num_enviados} destinatarios'))
+            num_encolados = enviar_reporte('inventario', datos, destinatarios, archivo_excel=archivo_excel)
+            self._reporte_encolado('inventario', num_encolados)
         except Exception as e:
-            raise CommandError(f'Error al enviar reporte: {e}')
+            raise CommandError(f'Error al encolar reporte: {e}')
 
     # ------------------------------------------------------------------
     # Reporte de tickets IT
@@ -183,10 +183,10 @@ class Command(BaseCommand):
 
         destinatarios = self._get_destinatarios('tickets_it', options, ConfiguracionReporte)
         try:
-            num_enviados = enviar_reporte('tickets_it', datos, destinatarios, archivo_excel=archivo_excel)
-            self.stdout.write(self.style.SUCCESS(f'Reporte tickets IT enviado a {num_enviados} destinatarios'))
+            num_encolados = enviar_reporte('tickets_it', datos, destinatarios, archivo_excel=archivo_excel)
+            self._reporte_encolado('tickets IT', num_encolados)
         except Exception as e:
-            raise CommandError(f'Error al enviar reporte: {e}')
+            raise CommandError(f'Error al encolar reporte: {e}')
 
     # ------------------------------------------------------------------
     # Reporte de permisos
@@ -231,14 +231,21 @@ class Command(BaseCommand):
 
         destinatarios = self._get_destinatarios('permisos', options, ConfiguracionReporte)
         try:
-            num_enviados = enviar_reporte('permisos', datos, destinatarios, archivo_excel=archivo_excel)
-            self.stdout.write(self.style.SUCCESS(f'Reporte permisos enviado a {num_enviados} destinatarios'))
+            num_encolados = enviar_reporte('permisos', datos, destinatarios, archivo_excel=archivo_excel)
+            self._reporte_encolado('permisos', num_encolados)
         except Exception as e:
-            raise CommandError(f'Error al enviar reporte: {e}')
+            raise CommandError(f'Error al encolar reporte: {e}')
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
+    def _reporte_encolado(self, nombre, num_encolados):
+        # enviar_reporte solo deja el correo en la bandeja de salida (correos.CorreoSaliente)
+        self.stdout.write(self.style.SUCCESS(
+            f'Reporte {nombre} encolado para {num_encolados} destinatarios; lo envía el job '
+            f'despachar_correos del scheduler (o python manage.py despachar_correos)'
+        ))
+
     def _get_destinatarios(self, tipo, options, ConfiguracionReporte):
         if options['email']:
             class _Dest:
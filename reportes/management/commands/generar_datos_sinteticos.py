@@ -0,0 +1,63 @@
+"""
+Genera un conjunto de datos sintéticos a escala (ver checador/datos_sinteticos.py).
+
+    python manage.py generar_datos_sinteticos
+    python manage.py generar_datos_sinteticos --empleados 2000 --dias 730 --semilla 7
+    python manage.py generar_datos_sinteticos --limpiar
+"""
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from checador import datos_sinteticos
+from checador.comandos import agregar_opciones_datos_prueba, exigir_entorno_de_pruebas
+
+
+class Command(BaseCommand):
+    help = 'Genera empleados, asistencias, permisos, visitas, equipos y tickets sintéticos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--empleados', type=int, default=300,
+                            help='Empleados a generar (default: 300)')
+        parser.add_argument('--dias', type=int, default=365,
+                            help='Días de historia hacia atrás (default: 365)')
+        parser.add_argument('--tickets', type=int, default=None,
+                            help='Tickets a generar (default: 3 por empleado)')
+        parser.add_argument('--visitas', type=int, default=None,
+                            help='Visitas a generar (default: 2 por empleado)')
+        parser.add_argument('--semilla', type=int, default=42,
+                            help='Semilla del generador; misma semilla y fecha final = mismos datos (default: 42)')
+        parser.add_argument('--hasta', type=date.fromisoformat, default=None,
+                            help='Fecha final AAAA-MM-DD (default: hoy)')
+        parser.add_argument('--lote', type=int, default=2000,
+                            help='Filas por bulk_create (default: 2000)')
+        agregar_opciones_datos_prueba(parser, 'Borrar los datos sintéticos y salir')
+
+    def handle(self, *args, **options):
+        if options['limpiar']:
+            exigir_entorno_de_pruebas(options, 'Borrar los datos sintéticos')
+            borrados = datos_sinteticos.limpiar()
+            self.stdout.write(self.style.SUCCESS(f'Datos sintéticos eliminados ({borrados} filas)'))
+            return
+
+        exigir_entorno_de_pruebas(options, 'Generar datos sintéticos')
+        if datos_sinteticos.Empleado.objects.filter(
+            codigo_empleado__startswith=f'{datos_sinteticos.PREFIJO}-'
+        ).exists():
+            raise CommandError('Ya hay datos sintéticos; bórrelos antes con --limpiar')
+
+        resumen = datos_sinteticos.generar(
+            empleados=options['empleados'],
+            dias=options['dias'],
+            tickets=options['tickets'],
+            visitas=options['visitas'],
+            semilla=options['semilla'],
+            hasta=options['hasta'],
+            lote=options['lote'],
+        )
+        for modelo, filas in resumen.filas.items():
+            self.stdout.write(f'  {modelo:<35} {filas:>10}')
+        total = sum(resumen.filas.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} filas generadas en {resumen.segundos:.1f}s'
+        ))
@@ -0,0 +1,120 @@
+"""
+Agrega los registros de ConsultasMiddleware por vista.
+
+Lee líneas de log (archivos o stdin con '-'); toma de cada línea el JSON
+con "evento": "consultas", así que sirve tanto el archivo
+CONSULTAS_LOG_ARCHIVO como la salida de los logs de la plataforma:
+
+    python manage.py perf_report tmp/consultas.log
+    doctl apps logs <app> web | python manage.py perf_report -
+"""
+import json
+import statistics
+import sys
+from collections import Counter, defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+def _percentil(valores, p):
+    valores = sorted(valores)
+    if not valores:
+        return 0
+    indice = min(len(valores) - 1, int(round(p / 100 * (len(valores) - 1))))
+    return valores[indice]
+
+
+def _leer_registros(lineas):
+    for linea in lineas:
+        if '"evento": "consultas"' not in linea:
+            continue
+        inicio = linea.find('{')
+        try:
+            yield json.loads(linea[inicio:])
+        except ValueError:
+            continue
+
+
+class Command(BaseCommand):
+    help = 'Reporte de consultas SQL por vista a partir de los logs de ConsultasMiddleware'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'archivos',
+            nargs='+',
+            help="Archivos de log a leer ('-' para stdin)",
+        )
+        parser.add_argument(
+            '--ordenar',
+            choices=['tiempo', 'consultas', 'peticiones'],
+            default='tiempo',
+            help='tiempo: BD total; consultas: p95 de consultas; peticiones: numero de peticiones',
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=20,
+            help='Numero de vistas a mostrar (default: 20)',
+        )
+
+    def handle(self, *args, **options):
+        por_vista = defaultdict(lambda: {
+            'consultas': [],
+            'tiempo_bd_ms': [],
+            'duracion_ms': [],
+            'repetidas': Counter(),
+            'mas_lenta': None,
+            'excedidas': 0,
+        })
+
+        for nombre in options['archivos']:
+            try:
+                archivo = sys.stdin if nombre == '-' else open(nombre, encoding='utf-8', errors='replace')
+            except OSError as e:
+                raise CommandError(f'No se pudo leer {nombre}: {e}')
+            with archivo:
+                for registro in _leer_registros(archivo):
+                    datos = por_vista[registro.get('vista', 'sin_vista')]
+                    datos['consultas'].append(registro.get('consultas', 0))
+                    datos['tiempo_bd_ms'].append(registro.get('tiempo_bd_ms', 0))
+                    datos['duracion_ms'].append(registro.get('duracion_ms', 0))
+                    for repetida in registro.get('repetidas', []):
+                        datos['repetidas'][repetida['huella']] += repetida['veces']
+                    lenta = registro.get('mas_lenta')
+                    if lenta and (datos['mas_lenta'] is None or lenta['ms'] > datos['mas_lenta']['ms']):
+                        datos['mas_lenta'] = lenta
+                    if 'presupuesto' in registro:
+                        datos['excedidas'] += 1
+
+        if not por_vista:
+            self.stdout.write(self.style.WARNING('No se encontraron registros de consultas'))
+            return
+
+        claves = {
+            'tiempo': lambda item: sum(item[1]['tiempo_bd_ms']),
+            'consultas': lambda item: _percentil(item[1]['consultas'], 95),
+            'peticiones': lambda item: len(item[1]['consultas']),
+        }
+        vistas = sorted(por_vista.items(), key=claves[options['ordenar']], reverse=True)
+
+        for vista, datos in vistas[:options['top']]:
+            peticiones = len(datos['consultas'])
+            self.stdout.write(self.style.HTTP_INFO(f'{vista}  ({peticiones} peticiones)'))
+            self.stdout.write(
+                f"  Consultas: p50 {_percentil(datos['consultas'], 50)}, "
+                f"p95 {_percentil(datos['consultas'], 95)}, max {max(datos['consultas'])}"
+            )
+            self.stdout.write(
+                f"  Tiempo BD: promedio {statistics.mean(datos['tiempo_bd_ms']):.1f}ms, "
+                f"total {sum(datos['tiempo_bd_ms']) / 1000:.2f}s | "
+                f"Respuesta p95 {_percentil(datos['duracion_ms'], 95):.0f}ms"
+            )
+            if datos['excedidas']:
+                self.stdout.write(self.style.ERROR(f"  Presupuesto excedido en {datos['excedidas']} peticiones"))
+            for huella, veces in datos['repetidas'].most_common(3):
+                self.stdout.write(f'  Repetida {veces}x: {huella[:150]}')
+            if datos['mas_lenta']:
+                self.stdout.write(
+                    f"  Mas lenta ({datos['mas_lenta']['ms']:.1f}ms): {datos['mas_lenta']['sql'][:150]}"
+                )
+            self.stdout.write('')
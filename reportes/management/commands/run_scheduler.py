@@ -0,0 +1,95 @@
+"""
+Proceso dedicado del scheduler (reportes, correos e IT).
+
+    python manage.py run_scheduler
+
+Se puede levantar más de una copia: solo la que tiene el lease de
+LiderScheduler ejecuta jobs; las demás quedan en standby y toman el
+relevo si el líder deja de renovarlo.
+"""
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections
+
+from checador.conexiones import registrar_estadisticas
+from reportes.scheduler import NOMBRE_LIDER, crear_scheduler
+from reportes.services.liderazgo import adquirir_liderazgo, liberar_liderazgo
+
+logger = logging.getLogger(__name__)
+
+# Cada cuánto se registran las métricas del pool de conexiones
+INTERVALO_METRICAS_SEGUNDOS = 300
+
+
+class Command(BaseCommand):
+    help = 'Ejecuta el scheduler de jobs en un proceso dedicado con eleccion de lider'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ttl',
+            type=int,
+            default=60,
+            help='Segundos de vigencia del lease de lider (default: 60)',
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=int,
+            default=None,
+            help='Segundos entre renovaciones del lease (default: ttl / 3)',
+        )
+
+    def handle(self, *args, **options):
+        ttl = options['ttl']
+        intervalo = options['intervalo'] or max(ttl // 3, 1)
+        propietario = f"{socket.gethostname()}:{os.getpid()}"
+        detener = threading.Event()
+
+        def _senal(signum, frame):
+            logger.info(f"Senal {signum} recibida, deteniendo scheduler")
+            detener.set()
+
+        signal.signal(signal.SIGTERM, _senal)
+        signal.signal(signal.SIGINT, _senal)
+
+        self.stdout.write(f'Scheduler {propietario} en espera del lease "{NOMBRE_LIDER}"...')
+        scheduler = None
+        ultimas_metricas = time.monotonic()
+        try:
+            while not detener.is_set():
+                close_old_connections()
+                if time.monotonic() - ultimas_metricas >= INTERVALO_METRICAS_SEGUNDOS:
+                    registrar_estadisticas()
+                    ultimas_metricas = time.monotonic()
+                try:
+                    es_lider = adquirir_liderazgo(NOMBRE_LIDER, propietario, ttl)
+                except DatabaseError as e:
+                    # Sin base de datos no se puede garantizar que seamos
+                    # el único líder: se detienen los jobs hasta recuperarla
+                    logger.error(f"Error al renovar el lease del scheduler: {e}")
+                    es_lider = False
+
+                if es_lider and scheduler is None:
+                    scheduler = crear_scheduler()
+                    scheduler.start()
+                    logger.info(f"Scheduler {propietario} es lider; jobs iniciados")
+                    self.stdout.write(self.style.SUCCESS('Lider: ejecutando jobs'))
+                elif not es_lider and scheduler is not None:
+                    logger.warning(f"Scheduler {propietario} perdio el lease; jobs detenidos")
+                    scheduler.shutdown(wait=False)
+                    scheduler = None
+
+                detener.wait(intervalo)
+        finally:
+            if scheduler is not None:
+                scheduler.shutdown()
+                try:
+                    liberar_liderazgo(NOMBRE_LIDER, propietario)
+                except DatabaseError as e:
+                    logger.error(f"Error al liberar el lease del scheduler: {e}")
+            self.stdout.write('Scheduler detenido')
@@ -2,9 +2,13 @@
 Comando de gestion para el scheduler de reportes.
 Permite iniciar el scheduler manualmente y ver el estado de los jobs.
 """
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
 from django_apscheduler.models import DjangoJob, DjangoJobExecution
 
+from reportes.scheduler import NOMBRE_LIDER
+from reportes.services.liderazgo import lider_actual
+
 
 class Command(BaseCommand):
     help = 'Gestiona el scheduler de reportes automaticos'
@@ -13,7 +17,7 @@ class Command(BaseCommand):
         parser.add_argument(
             'action',
             choices=['status', 'start', 'list'],
-            help='Accion a ejecutar: status (ver estado), start (iniciar scheduler), list (listar ejecuciones)'
+            help='Accion a ejecutar: status (ver estado), start (iniciar scheduler, igual que run_scheduler), list (listar ejecuciones)'
         )
         parser.add_argument(
             '--limit',
@@ -34,15 +38,20 @@ class Command(BaseCommand):
 
     def show_status(self):
         """Muestra el estado de los jobs programados"""
+        lider = lider_actual(NOMBRE_LIDER)
+        if lider:
+            self.stdout.write(self.style.SUCCESS(f'Proceso lider: {lider.propietario} (desde {lider.fecha_adquisicion})'))
+        else:
+            self.stdout.write(self.style.WARNING('Ningun proceso run_scheduler esta activo'))
+        self.stdout.write('')
+
         jobs = DjangoJob.objects.all()
         
         if not jobs.exists():
             self.stdout.write(self.style.WARNING('No hay jobs programados'))
             self.stdout.write('')
             self.stdout.write('Para iniciar el scheduler, ejecuta:')
-            self.stdout.write('  python manage.py runserver')
-            self.stdout.write('  o')
-            self.stdout.write('  python manage.py scheduler start')
+            self.stdout.write('  python manage.py run_scheduler')
             return
 
         self.stdout.write(self.style.SUCCESS(f'Jobs programados: {jobs.count()}'))
@@ -66,18 +75,8 @@ class Command(BaseCommand):
             self.stdout.write('')
 
     def start_scheduler(self):
-        """Inicia el scheduler manualmente"""
-        self.stdout.write('Iniciando scheduler de reportes...')
-        
-        try:
-            from reportes.scheduler import start_scheduler
-            start_scheduler()
-            self.stdout.write(self.style.SUCCESS('Scheduler iniciado exitosamente'))
-            self.stdout.write('')
-            self.stdout.write('El scheduler se ejecutara en segundo plano.')
-            self.stdout.write('Para ver el estado, ejecuta: python manage.py scheduler status')
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f'Error al iniciar scheduler: {e}'))
+        """Inicia el scheduler en este proceso (equivale a run_scheduler)"""
+        call_command('run_scheduler')
 
     def list_executions(self, limit):
         """Lista las ultimas ejecuciones de jobs"""
@@ -0,0 +1,79 @@
+"""
+Verifica que las consultas calientes (checador/planes.py) se resuelvan por
+índice y no recorriendo tablas grandes completas.
+
+Corre ANALYZE y EXPLAIN sobre el catálogo; termina con error si alguna
+consulta hace un scan secuencial sobre su tabla principal. Con pocos datos
+el planificador prefiere scans secuenciales con razón, así que las tablas
+con menos de --min-filas se omiten; --sembrar genera antes los datos
+sintéticos (generar_datos_sinteticos) para medir a escala:
+
+    python manage.py verificar_planes --sembrar
+    python manage.py verificar_planes --min-filas 50000 --mostrar-planes
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from checador import datos_sinteticos, planes
+from checador.comandos import exigir_entorno_de_pruebas
+from registros.models import RegistroAsistencia
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN de las consultas calientes; falla si alguna hace scan secuencial'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-filas', type=int, default=5000,
+                            help='Filas mínimas de la tabla para verificar su consulta (default: 5000)')
+        parser.add_argument('--sembrar', action='store_true',
+                            help='Generar datos sintéticos antes si no los hay')
+        parser.add_argument('--empleados', type=int, default=2000,
+                            help='Empleados sintéticos al sembrar (default: 2000)')
+        parser.add_argument('--dias', type=int, default=365,
+                            help='Días de historia al sembrar (default: 365)')
+        parser.add_argument('--mostrar-planes', action='store_true',
+                            help='Imprimir el plan completo de cada consulta')
+
+    def handle(self, *args, **options):
+        if options['sembrar'] and RegistroAsistencia.objects.count() < options['min_filas']:
+            exigir_entorno_de_pruebas(options, '--sembrar')
+            self.stdout.write(
+                f"Sembrando {options['empleados']} empleados x {options['dias']} días de datos sintéticos..."
+            )
+            resumen = datos_sinteticos.generar(empleados=options['empleados'], dias=options['dias'])
+            self.stdout.write(f"{sum(resumen.filas.values())} filas en {resumen.segundos:.1f}s")
+
+        planes.actualizar_estadisticas()
+        try:
+            resultados = planes.verificar_planes()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        fallidas, verificadas = [], 0
+        for resultado in resultados:
+            consulta = resultado.consulta
+            if resultado.filas < options['min_filas']:
+                estado = self.style.WARNING(f'omitida ({resultado.filas} filas)')
+            elif resultado.secuencial:
+                estado = self.style.ERROR('SCAN SECUENCIAL')
+                fallidas.append(resultado)
+                verificadas += 1
+            else:
+                estado = self.style.SUCCESS('índice')
+                verificadas += 1
+            self.stdout.write(f'{consulta.nombre:<28}{consulta.tabla:<32}{estado}  [{consulta.origen}]')
+            for linea in resultado.escaneos:
+                self.stdout.write(f'    {linea}')
+            if options['mostrar_planes']:
+                for linea in resultado.plan.splitlines():
+                    self.stdout.write(f'      {linea}')
+
+        if fallidas:
+            raise CommandError(
+                f"{len(fallidas)} consulta(s) con scan secuencial: "
+                f"{', '.join(r.consulta.nombre for r in fallidas)}"
+            )
+        if not verificadas:
+            raise CommandError(
+                f"Ninguna tabla llega a {options['min_filas']} filas; use --sembrar o baje --min-filas"
+            )
+        self.stdout.write(self.style.SUCCESS(f'{verificadas} consultas verificadas, todas por índice'))
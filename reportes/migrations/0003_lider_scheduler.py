@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-10-19 07:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reportes', '0002_nuevos_tipos_reporte'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LiderScheduler',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=50, unique=True, verbose_name='Nombre')),
+                ('propietario', models.CharField(max_length=150, verbose_name='Propietario')),
+                ('expira', models.DateTimeField(verbose_name='Expira')),
+                ('fecha_adquisicion', models.DateTimeField(verbose_name='Fecha de adquisicion')),
+            ],
+            options={
+                'verbose_name': 'Lider del Scheduler',
+                'verbose_name_plural': 'Lider del Scheduler',
+            },
+        ),
+    ]
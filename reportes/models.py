@@ -108,3 +108,22 @@ class LogReporte(models.Model):
 
     def __str__(self):
         return f"{self.tipo_reporte} - {self.fecha_envio.strftime('%Y-%m-%d %H:%M')} - {self.estado}"
+
+
+class LiderScheduler(models.Model):
+    """
+    Lease del proceso que ejecuta el scheduler (ver run_scheduler).
+    Solo el propietario con lease vigente programa y ejecuta jobs; los
+    demás procesos esperan en standby hasta que expire.
+    """
+    nombre = models.CharField(max_length=50, unique=True, verbose_name='Nombre')
+    propietario = models.CharField(max_length=150, verbose_name='Propietario')
+    expira = models.DateTimeField(verbose_name='Expira')
+    fecha_adquisicion = models.DateTimeField(verbose_name='Fecha de adquisicion')
+
+    class Meta:
+        verbose_name = 'Lider del Scheduler'
+        verbose_name_plural = 'Lider del Scheduler'
+
+    def __str__(self):
+        return f"{self.nombre}: {self.propietario} (hasta {self.expira:%Y-%m-%d %H:%M:%S})"
@@ -1,6 +1,9 @@
 """
 Scheduler automatico de reportes usando Django APScheduler.
 Reemplaza la configuracion de cron por un sistema interno de Django.
+
+Los jobs corren en un proceso dedicado (python manage.py run_scheduler),
+no en los workers de gunicorn.
 """
 import logging
 from datetime import datetime, timedelta
@@ -8,8 +11,9 @@ from django.conf import settings
 from django.utils import timezone
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from django_apscheduler.jobstores import DjangoJobStore
-from django_apscheduler.models import DjangoJobExecution
+from django_apscheduler.models import DjangoJob, DjangoJobExecution
 from django_apscheduler import util
 
 logger = logging.getLogger(__name__)
@@ -358,6 +362,24 @@ def enviar_reporte_permisos():
         )
 
 
+@util.close_old_connections
+def despachar_correos_pendientes():
+    """Job frecuente: envia los correos de la bandeja de salida"""
+    from correos.services import despachar_correos
+    try:
+        despachar_correos()
+    except Exception as e:
+        logger.error(f"Error al despachar correos: {e}")
+
+
+@util.close_old_connections
+def purgar_correos_enviados():
+    """Elimina de la bandeja de salida los correos enviados hace mas de 30 dias"""
+    from correos.services import purgar_correos_enviados as purgar
+    eliminados = purgar(dias=30)
+    logger.info(f"Correos enviados purgados: {eliminados}")
+
+
 @util.close_old_connections
 def delete_old_job_executions(max_age=604_800):
     """
@@ -367,14 +389,49 @@ def delete_old_job_executions(max_age=604_800):
     DjangoJobExecution.objects.delete_old_job_executions(max_age)
 
 
-def start_scheduler():
+NOMBRE_LIDER = 'scheduler'
+
+# Un job que no pudo correr a su hora (p.ej. durante el relevo de líder)
+# se ejecuta si el nuevo líder lo detecta dentro de este margen.
+MISFIRE_GRACE_SEGUNDOS = 300
+
+
+def crear_scheduler():
     """
-    Inicializa y configura el scheduler con los jobs de reportes.
-    Se ejecuta automaticamente al iniciar Django via apps.py
+    Scheduler con el registro completo de jobs del proyecto: reportes,
+    bandeja de correos e IT. Solo lo arranca el comando run_scheduler en
+    el proceso líder; los workers web no ejecutan jobs.
     """
-    scheduler = BackgroundScheduler(timezone=settings.TIME_ZONE)
+    from it_tickets.scheduler import registrar_jobs_it
+
+    scheduler = BackgroundScheduler(
+        timezone=settings.TIME_ZONE,
+        job_defaults={'misfire_grace_time': MISFIRE_GRACE_SEGUNDOS},
+    )
     scheduler.add_jobstore(DjangoJobStore(), "default")
-    
+    registrar_jobs(scheduler)
+    registrar_jobs_it(scheduler)
+    conservar_proximas_ejecuciones(scheduler)
+    return scheduler
+
+
+def conservar_proximas_ejecuciones(scheduler):
+    """
+    Los jobs se registran con replace_existing=True para que un cambio de
+    trigger en el código se aplique, pero eso recalcula next_run_time desde
+    el arranque y se pierden las ejecuciones que vencieron con el scheduler
+    detenido (deploy, cambio de líder). Antes de arrancar se restaura el
+    next_run_time guardado en DjangoJobStore; misfire_grace_time decide si
+    la ejecución atrasada todavía corre.
+    """
+    guardadas = dict(DjangoJob.objects.values_list('id', 'next_run_time'))
+    for job in scheduler.get_jobs():
+        if job.id in guardadas:
+            job.modify(next_run_time=guardadas[job.id])
+
+
+def registrar_jobs(scheduler):
+    """Registra los jobs de reportes y correos en el scheduler."""
     # Job para reporte diario - Lunes a Sabado a las 11:50am
     scheduler.add_job(
         enviar_reporte_diario,
@@ -451,12 +508,25 @@ def start_scheduler():
         name="Limpieza de jobs antiguos"
     )
     logger.info("Job programado: Limpieza de ejecuciones antiguas (Diario 00:00am)")
-    
-    try:
-        logger.info("Iniciando scheduler de reportes...")
-        scheduler.start()
-        logger.info("Scheduler iniciado exitosamente")
-    except KeyboardInterrupt:
-        logger.info("Deteniendo scheduler...")
-        scheduler.shutdown()
-        logger.info("Scheduler detenido exitosamente")
+
+    # Despachador de la bandeja de salida de correos
+    scheduler.add_job(
+        despachar_correos_pendientes,
+        trigger=IntervalTrigger(seconds=settings.CORREOS_INTERVALO_SEGUNDOS),
+        id="despachar_correos",
+        max_instances=1,
+        coalesce=True,
+        replace_existing=True,
+        name="Despacho de correos pendientes"
+    )
+    logger.info(f"Job programado: Despacho de correos (cada {settings.CORREOS_INTERVALO_SEGUNDOS}s)")
+
+    scheduler.add_job(
+        purgar_correos_enviados,
+        trigger=CronTrigger(hour=0, minute=30),
+        id="purgar_correos_enviados",
+        max_instances=1,
+        replace_existing=True,
+        name="Limpieza de correos enviados"
+    )
+    logger.info("Job programado: Limpieza de correos enviados (Diario 00:30am)")
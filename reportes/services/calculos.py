@@ -1,32 +1,83 @@
-from datetime import timedelta
+from django.db.models import Exists, OuterRef
 
+from checador.replicas import lectura_replica
 from empleados.models import Empleado
+from horarios.services import (
+    construir_calendario_laboral,
+    contar_dias_habiles,
+    contar_fechas_laborables,
+    contar_dias_laborales_empleados,
+)
+from permisos.models import DiaPermiso
 from registros.models import RegistroAsistencia
 
 
 def contar_dias_laborales(fecha_inicio, fecha_fin):
-    """Cuenta dias laborales (lunes a viernes) en un rango"""
-    dias = 0
-    actual = fecha_inicio
-    while actual <= fecha_fin:
-        if actual.weekday() < 5:  # 0=lunes, 4=viernes
-            dias += 1
-        actual += timedelta(days=1)
-    return dias
-
-
-def obtener_datos_reporte(fecha_inicio, fecha_fin):
-    """Obtiene todos los datos necesarios para generar un reporte de asistencia"""
+    """Cuenta dias laborales generales (lunes a viernes, sin festivos) en un rango"""
+    return contar_dias_habiles(fecha_inicio, fecha_fin)
+
+
+def obtener_dias_con_permiso(fecha_inicio, fecha_fin, empleados=None):
+    """
+    Fechas cubiertas por un permiso aprobado de dia completo en las que el
+    empleado no registro entrada, agrupadas por empleado.
+    Una sola consulta contra el indice DiaPermiso.
+    """
+    dias = DiaPermiso.objects.filter(
+        fecha__range=[fecha_inicio, fecha_fin],
+        dia_completo=True,
+    ).exclude(
+        Exists(RegistroAsistencia.objects.filter(
+            empleado_id=OuterRef('empleado_id'),
+            fecha=OuterRef('fecha'),
+            hora_entrada__isnull=False
+        ))
+    )
+    if empleados is not None:
+        dias = dias.filter(empleado__in=empleados)
+
+    por_empleado = {}
+    for empleado_id, fecha in dias.values_list('empleado_id', 'fecha').distinct():
+        por_empleado.setdefault(empleado_id, []).append(fecha)
+    return por_empleado
+
+
+@lectura_replica()
+def obtener_datos_reporte(fecha_inicio, fecha_fin, departamento=None):
+    """
+    Obtiene todos los datos necesarios para generar un reporte de asistencia.
+
+    Si se indica un departamento, el reporte se limita a ese departamento y
+    todos sus subordinados (una sola condicion sobre ruta_jerarquia).
+    """
     empleados = Empleado.objects.filter(activo=True).select_related(
         'user', 'departamento_obj'
     ).order_by('codigo_empleado')
 
-    registros = list(RegistroAsistencia.objects.filter(
+    registros = RegistroAsistencia.objects.filter(
         fecha__range=[fecha_inicio, fecha_fin],
         empleado__activo=True
-    ).select_related('empleado', 'empleado__user'))
+    ).select_related('empleado', 'empleado__user')
+
+    if departamento is not None:
+        empleados = empleados.filter(
+            departamento_obj__ruta_jerarquia__startswith=departamento.ruta_jerarquia
+        )
+        registros = registros.filter(
+            empleado__departamento_obj__ruta_jerarquia__startswith=departamento.ruta_jerarquia
+        )
+    registros = list(registros)
+    empleados = list(empleados)
 
     dias_laborales = contar_dias_laborales(fecha_inicio, fecha_fin)
+    calendario = construir_calendario_laboral(empleados, fecha_inicio, fecha_fin)
+    dias_laborales_por_empleado = contar_dias_laborales_empleados(
+        calendario, fecha_inicio, fecha_fin
+    )
+    dias_permiso_por_empleado = obtener_dias_con_permiso(
+        fecha_inicio, fecha_fin,
+        [e.pk for e in empleados] if departamento is not None else None
+    )
 
     # Indexar registros por empleado
     registros_por_empleado = {}
@@ -39,7 +90,12 @@ def obtener_datos_reporte(fecha_inicio, fecha_fin):
 
         dias_trabajados = len([r for r in regs if r.hora_entrada])
         retardos = len([r for r in regs if r.retardo])
-        faltas = max(0, dias_laborales - dias_trabajados)
+        dias_permiso = contar_fechas_laborables(
+            calendario, empleado.id, dias_permiso_por_empleado.get(empleado.id, [])
+        )
+        faltas = max(
+            0, dias_laborales_por_empleado[empleado.id] - dias_trabajados - dias_permiso
+        )
         horas_totales = sum(r.horas_trabajadas or 0 for r in regs)
 
         datos_empleados.append({
@@ -50,6 +106,8 @@ def obtener_datos_reporte(fecha_inicio, fecha_fin):
             'dias_trabajados': dias_trabajados,
             'retardos': retardos,
             'faltas': faltas,
+            'dias_laborales': dias_laborales_por_empleado[empleado.id],
+            'dias_permiso': dias_permiso,
             'horas_totales': round(horas_totales, 2),
             'registros': regs,
         })
@@ -1,37 +1,45 @@
 from datetime import timedelta
+from django.db.models import Count, Exists, OuterRef
 from django.utils import timezone
 
+from checador.replicas import lectura_replica
 
+
+@lectura_replica()
 def obtener_datos_inventario():
     """
     Snapshot actual del inventario de equipos de cómputo.
     No requiere rango de fechas ya que refleja el estado presente.
+
+    Los conteos se agregan en la base de datos; solo se cargan los equipos
+    que aparecen en el reporte (vencidos, próximos y sin mantenimiento).
     """
     from it_tickets.models import EquipoComputo, MantenimientoEquipo
+    from it_tickets.services.mantenimiento import PROXIMO, VENCIDO, clasificar_equipos
 
     hoy = timezone.now().date()
     hace_30_dias = hoy - timedelta(days=30)
 
-    equipos = list(
-        EquipoComputo.objects.select_related('empleado__user').order_by('marca', 'modelo')
-    )
-
     # Conteo por estado
     por_estado = {'activo': 0, 'mantenimiento': 0, 'baja': 0}
-    for eq in equipos:
-        por_estado[eq.estado] = por_estado.get(eq.estado, 0) + 1
-
-    # Equipos con mantenimiento vencido
-    vencidos = [eq for eq in equipos if eq.mantenimiento_vencido]
-
-    # Equipos que requieren mantenimiento pronto (<=30 dias)
-    pronto = [eq for eq in equipos if eq.requiere_mantenimiento_pronto and not eq.mantenimiento_vencido]
+    for fila in EquipoComputo.objects.order_by().values('estado').annotate(total=Count('id')):
+        por_estado[fila['estado']] = fila['total']
+
+    # Equipos con mantenimiento vencido o próximo (<=7 dias), en una consulta
+    grupos = clasificar_equipos(
+        EquipoComputo.objects.select_related('empleado__user'),
+        hoy=hoy,
+        solo_atencion=True,
+    )
+    vencidos = grupos[VENCIDO]
+    pronto = grupos[PROXIMO]
 
     # Equipos sin ningún mantenimiento registrado
-    ids_con_mantenimiento = set(
-        MantenimientoEquipo.objects.values_list('equipo_id', flat=True).distinct()
+    sin_mantenimiento = list(
+        EquipoComputo.objects.select_related('empleado__user')
+        .filter(~Exists(MantenimientoEquipo.objects.filter(equipo=OuterRef('pk'))))
+        .order_by('marca', 'modelo')
     )
-    sin_mantenimiento = [eq for eq in equipos if eq.id not in ids_con_mantenimiento]
 
     # Últimos mantenimientos realizados (30 días)
     ultimos_mantenimientos = list(
@@ -42,7 +50,7 @@ def obtener_datos_inventario():
 
     return {
         'fecha_reporte': hoy,
-        'total_equipos': len(equipos),
+        'total_equipos': sum(por_estado.values()),
         'por_estado': por_estado,
         'equipos_vencidos': vencidos,
         'equipos_pronto': pronto,
@@ -1,3 +1,7 @@
+from checador.replicas import lectura_replica
+
+
+@lectura_replica()
 def obtener_datos_permisos(fecha_inicio, fecha_fin):
     """
     Datos de solicitudes de permiso cuyo período se traslapa con el rango dado.
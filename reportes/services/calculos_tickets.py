@@ -1,67 +1,118 @@
-from django.db.models import Avg, Count, F
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F
 
+from checador.replicas import lectura_replica
 
+
+def _nombre_usuario(first_name, last_name, username):
+    """Mismo resultado que User.get_full_name() or username"""
+    return f"{first_name or ''} {last_name or ''}".strip() or username
+
+
+@lectura_replica()
 def obtener_datos_tickets(fecha_inicio, fecha_fin):
     """
     Datos de tickets IT creados en el rango de fechas dado.
+
+    Los conteos y el promedio de resolución se calculan en la base de
+    datos con consultas agrupadas. 'tickets' es un queryset sin evaluar,
+    fijado con using() a la base de las demás consultas: solo se consulta
+    si se genera la hoja de detalle del Excel, que lo recorre con iterator().
     """
     from it_tickets.models import Ticket, EstadoTicket, PrioridadTicket, CategoriaTicket
 
-    tickets = list(
-        Ticket.objects.filter(fecha_creacion__date__range=[fecha_inicio, fecha_fin])
-        .select_related('empleado__user', 'asignado_a')
-        .order_by('-fecha_creacion')
-    )
+    qs = Ticket.objects.filter(fecha_creacion__date__range=[fecha_inicio, fecha_fin])
 
-    # Conteo por estado
+    # Conteo por estado, prioridad y categoría en una sola consulta
     por_estado = {estado: 0 for estado, _ in EstadoTicket.choices}
-    for t in tickets:
-        por_estado[t.estado] = por_estado.get(t.estado, 0) + 1
-
-    # Conteo por prioridad
     por_prioridad = {p: 0 for p, _ in PrioridadTicket.choices}
     por_prioridad['sin_asignar'] = 0
-    for t in tickets:
-        key = t.prioridad if t.prioridad else 'sin_asignar'
-        por_prioridad[key] = por_prioridad.get(key, 0) + 1
-
-    # Conteo por categoría
     por_categoria = {c: 0 for c, _ in CategoriaTicket.choices}
-    for t in tickets:
-        por_categoria[t.categoria] = por_categoria.get(t.categoria, 0) + 1
+    total_tickets = 0
+    for fila in (
+        qs.order_by()
+        .values('estado', 'prioridad', 'categoria')
+        .annotate(total=Count('id'))
+    ):
+        total = fila['total']
+        total_tickets += total
+        por_estado[fila['estado']] = por_estado.get(fila['estado'], 0) + total
+        key = fila['prioridad'] or 'sin_asignar'
+        por_prioridad[key] = por_prioridad.get(key, 0) + total
+        por_categoria[fila['categoria']] = por_categoria.get(fila['categoria'], 0) + total
 
     # Tiempo promedio de resolución (solo tickets concluidos)
-    concluidos = [t for t in tickets if t.estado == EstadoTicket.CONCLUIDO and t.fecha_resolucion]
-    if concluidos:
-        total_horas = sum(t.tiempo_resolucion_horas for t in concluidos)
-        promedio_horas = round(total_horas / len(concluidos), 1)
+    resolucion = qs.filter(
+        estado=EstadoTicket.CONCLUIDO, fecha_resolucion__isnull=False
+    ).aggregate(
+        concluidos=Count('id'),
+        promedio=Avg(ExpressionWrapper(
+            F('fecha_resolucion') - F('fecha_creacion'),
+            output_field=DurationField()
+        )),
+    )
+    if resolucion['concluidos'] and resolucion['promedio'] is not None:
+        promedio_horas = round(resolucion['promedio'].total_seconds() / 3600, 1)
     else:
         promedio_horas = None
 
     # Top empleados que más reportan
-    conteo_empleados = {}
-    for t in tickets:
-        nombre = t.empleado.nombre_completo if t.empleado else 'Sin asignar'
-        conteo_empleados[nombre] = conteo_empleados.get(nombre, 0) + 1
-    top_empleados = sorted(conteo_empleados.items(), key=lambda x: x[1], reverse=True)[:10]
+    top_empleados = [
+        (
+            _nombre_usuario(
+                fila['empleado__user__first_name'],
+                fila['empleado__user__last_name'],
+                fila['empleado__user__username'],
+            ) if fila['empleado'] else 'Sin asignar',
+            fila['total'],
+        )
+        for fila in (
+            qs.order_by()
+            .values(
+                'empleado', 'empleado__user__first_name',
+                'empleado__user__last_name', 'empleado__user__username',
+            )
+            .annotate(total=Count('id'))
+            .order_by('-total')[:10]
+        )
+    ]
 
     # Tickets por técnico asignado
-    conteo_tecnicos = {}
-    for t in tickets:
-        nombre = t.asignado_a.get_full_name() or t.asignado_a.username if t.asignado_a else 'Sin asignar'
-        conteo_tecnicos[nombre] = conteo_tecnicos.get(nombre, 0) + 1
-    por_tecnico = sorted(conteo_tecnicos.items(), key=lambda x: x[1], reverse=True)
+    por_tecnico = [
+        (
+            _nombre_usuario(
+                fila['asignado_a__first_name'],
+                fila['asignado_a__last_name'],
+                fila['asignado_a__username'],
+            ) if fila['asignado_a'] else 'Sin asignar',
+            fila['total'],
+        )
+        for fila in (
+            qs.order_by()
+            .values(
+                'asignado_a', 'asignado_a__first_name',
+                'asignado_a__last_name', 'asignado_a__username',
+            )
+            .annotate(total=Count('id'))
+            .order_by('-total')
+        )
+    ]
 
     return {
         'fecha_inicio': fecha_inicio,
         'fecha_fin': fecha_fin,
-        'total_tickets': len(tickets),
+        'total_tickets': total_tickets,
         'por_estado': por_estado,
         'por_prioridad': por_prioridad,
         'por_categoria': por_categoria,
-        'tickets_concluidos': len(concluidos),
+        'tickets_concluidos': resolucion['concluidos'],
         'promedio_horas_resolucion': promedio_horas,
         'top_empleados': top_empleados,
         'por_tecnico': por_tecnico,
-        'tickets': tickets,
+        # Se itera después (generador de Excel), ya fuera de lectura_replica():
+        # se fija aquí la base que eligió el router para que no cambie
+        'tickets': (
+            qs.select_related('empleado__user', 'asignado_a')
+            .order_by('-fecha_creacion')
+            .using(qs.db)
+        ),
     }
@@ -1,9 +1,9 @@
 import logging
 
-from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
 
+from correos.services import encolar_correo
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,7 +28,8 @@ _NOMBRES_ARCHIVO = {
 
 def enviar_reporte(tipo_reporte, datos, destinatarios, archivo_excel=None, asunto_custom=None):
     """
-    Envia reporte por email.
+    Envia reporte por email (lo encola en la bandeja de salida; el
+    despachador de correos hace el envio SMTP).
 
     Args:
         tipo_reporte: 'diario', 'semanal', 'quincenal', 'inventario', 'tickets_it', 'permisos'
@@ -55,22 +56,22 @@ def enviar_reporte(tipo_reporte, datos, destinatarios, archivo_excel=None, asunt
         return 0
 
     prefijo = _NOMBRES_ARCHIVO.get(tipo_reporte, f'reporte_{tipo_reporte}')
-    email = EmailMultiAlternatives(
-        subject=subject,
-        body=f'Reporte {tipo_reporte} del {fecha_inicio} al {fecha_fin}',
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        to=emails_to,
-    )
-    email.attach_alternative(html_content, "text/html")
-
+    adjuntos = []
     if archivo_excel:
         nombre = f'{prefijo}_{fecha_inicio}_{fecha_fin}.xlsx'
-        email.attach(
+        adjuntos.append((
             nombre,
             archivo_excel.getvalue(),
             'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
+        ))
 
-    email.send()
-    logger.info('Reporte %s enviado a %d destinatarios', tipo_reporte, len(emails_to))
+    encolar_correo(
+        asunto=subject,
+        cuerpo=f'Reporte {tipo_reporte} del {fecha_inicio} al {fecha_fin}',
+        destinatarios=emails_to,
+        cuerpo_html=html_content,
+        adjuntos=adjuntos,
+        categoria='reporte',
+    )
+    logger.info('Reporte %s encolado para %d destinatarios', tipo_reporte, len(emails_to))
     return len(emails_to)
@@ -397,7 +397,11 @@ def generar_reporte_tickets_excel(datos):
     headers2 = ['Folio', 'Fecha', 'Empleado', 'Categoría', 'Prioridad', 'Estado', 'Técnico', 'Hrs Resolución']
     _escribir_fila_header(ws2, 3, headers2, header_font, header_fill, header_alignment, thin_border)
 
-    for row_idx, ticket in enumerate(datos['tickets'], 4):
+    # Se recorre por bloques para no cargar todos los tickets en memoria
+    tickets = datos['tickets']
+    if hasattr(tickets, 'iterator'):
+        tickets = tickets.iterator(chunk_size=500)
+    for row_idx, ticket in enumerate(tickets, 4):
         ws2.cell(row=row_idx, column=1, value=ticket.folio).border = thin_border
         ws2.cell(row=row_idx, column=2, value=str(ticket.fecha_creacion.date())).border = thin_border
         ws2.cell(row=row_idx, column=3, value=ticket.empleado.nombre_completo if ticket.empleado else '-').border = thin_border
@@ -0,0 +1,61 @@
+"""
+Elección de líder para el proceso del scheduler.
+
+Varios procesos `run_scheduler` pueden estar corriendo (p.ej. durante un
+deploy o con más de una instancia), pero solo el que tiene el lease
+vigente en LiderScheduler ejecuta jobs. El lease se toma y se renueva con
+un UPDATE condicional, así que dos procesos nunca lo obtienen a la vez; si
+el líder muere, otro lo toma cuando expira.
+
+Los tiempos usan el reloj de cada proceso: el TTL debe ser holgado
+respecto a la diferencia de reloj entre servidores.
+"""
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from reportes.models import LiderScheduler
+
+
+def adquirir_liderazgo(nombre, propietario, ttl):
+    """
+    Renueva el lease si ya es de `propietario` o lo toma si expiró.
+    Retorna True si `propietario` es el líder durante los próximos `ttl`
+    segundos.
+    """
+    ahora = timezone.now()
+    expira = ahora + timedelta(seconds=ttl)
+
+    if LiderScheduler.objects.filter(nombre=nombre, propietario=propietario).update(expira=expira):
+        return True
+
+    if LiderScheduler.objects.filter(nombre=nombre, expira__lt=ahora).update(
+        propietario=propietario,
+        expira=expira,
+        fecha_adquisicion=ahora,
+    ):
+        return True
+
+    try:
+        with transaction.atomic():
+            LiderScheduler.objects.create(
+                nombre=nombre,
+                propietario=propietario,
+                expira=expira,
+                fecha_adquisicion=ahora,
+            )
+        return True
+    except IntegrityError:
+        # Ya existe y tiene un lease vigente de otro proceso
+        return False
+
+
+def liberar_liderazgo(nombre, propietario):
+    """Suelta el lease para que otro proceso lo tome sin esperar a que expire."""
+    LiderScheduler.objects.filter(nombre=nombre, propietario=propietario).delete()
+
+
+def lider_actual(nombre):
+    """Registro del lease vigente, o None si no hay líder."""
+    return LiderScheduler.objects.filter(nombre=nombre, expira__gte=timezone.now()).first()
@@ -1,3 +1,73 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
+from django.utils import timezone
+from django_apscheduler.models import DjangoJob
+
+from correos.models import CorreoSaliente
+
+from reportes.models import LiderScheduler
+from reportes.scheduler import crear_scheduler
+from reportes.services.liderazgo import adquirir_liderazgo, liberar_liderazgo, lider_actual
+
+
+class LiderazgoTests(TestCase):
+    nombre = 'scheduler'
+
+    def test_toma_el_lease_si_no_existe(self):
+        self.assertTrue(adquirir_liderazgo(self.nombre, 'proceso-a', ttl=60))
+        self.assertEqual(lider_actual(self.nombre).propietario, 'proceso-a')
+
+    def test_el_propietario_renueva_el_lease(self):
+        adquirir_liderazgo(self.nombre, 'proceso-a', ttl=60)
+        expira = LiderScheduler.objects.get(nombre=self.nombre).expira
+        self.assertTrue(adquirir_liderazgo(self.nombre, 'proceso-a', ttl=120))
+        self.assertGreater(LiderScheduler.objects.get(nombre=self.nombre).expira, expira)
+
+    def test_no_toma_un_lease_vigente_de_otro_proceso(self):
+        adquirir_liderazgo(self.nombre, 'proceso-a', ttl=60)
+        self.assertFalse(adquirir_liderazgo(self.nombre, 'proceso-b', ttl=60))
+        self.assertEqual(lider_actual(self.nombre).propietario, 'proceso-a')
+
+    def test_toma_un_lease_expirado(self):
+        adquirir_liderazgo(self.nombre, 'proceso-a', ttl=60)
+        LiderScheduler.objects.filter(nombre=self.nombre).update(
+            expira=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertIsNone(lider_actual(self.nombre))
+        self.assertTrue(adquirir_liderazgo(self.nombre, 'proceso-b', ttl=60))
+        self.assertEqual(lider_actual(self.nombre).propietario, 'proceso-b')
+
+    def test_liberar_solo_suelta_el_lease_propio(self):
+        adquirir_liderazgo(self.nombre, 'proceso-a', ttl=60)
+        liberar_liderazgo(self.nombre, 'proceso-b')
+        self.assertIsNotNone(lider_actual(self.nombre))
+        liberar_liderazgo(self.nombre, 'proceso-a')
+        self.assertTrue(adquirir_liderazgo(self.nombre, 'proceso-b', ttl=60))
+
+
+class CrearSchedulerTests(TestCase):
+
+    def test_conserva_la_proxima_ejecucion_guardada(self):
+        # Ejecución que venció mientras el scheduler estaba detenido
+        vencida = timezone.now() - timedelta(minutes=10)
+        DjangoJob.objects.create(id='reporte_diario', next_run_time=vencida, job_state=b'')
+
+        scheduler = crear_scheduler()
+
+        self.assertEqual(scheduler.get_job('reporte_diario').next_run_time, vencida)
+        self.assertFalse(hasattr(scheduler.get_job('reporte_semanal'), 'next_run_time'))
+
+
+class EnviarReporteComandoTests(TestCase):
+
+    def test_reporta_que_el_correo_quedo_encolado(self):
+        salida = StringIO()
+
+        call_command('enviar_reporte', 'permisos', '--email', 'prueba@example.com', stdout=salida)
 
-# Create your tests here.
+        self.assertIn('encolado para 1 destinatarios', salida.getvalue())
+        self.assertIn('despachar_correos', salida.getvalue())
+        self.assertEqual(CorreoSaliente.objects.count(), 1)
@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-19 08:23
+
+from django.db import migrations, models
+
+from checador.migraciones import AgregarIndiceConcurrente
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY en PostgreSQL no puede ir en una transacción
+    atomic = False
+
+    dependencies = [
+        ('empleados', '0004_empleado_descansa_domingo_empleado_descansa_sabado_and_more'),
+        ('organizacion', '0003_aprobadorpermiso'),
+        ('visitas', '0003_remove_visita_descripcion_motivo'),
+    ]
+
+    operations = [
+        AgregarIndiceConcurrente(
+            model_name='visita',
+            index=models.Index(fields=['fecha_programada', 'estado'], name='visitas_fecha_estado_idx'),
+        ),
+    ]
@@ -1,10 +1,10 @@
 from django.db import models
 from django.utils import timezone
 import uuid
-import qrcode
-from io import BytesIO
 from django.core.files.base import ContentFile
 
+from checador.cache import invalidar_con_senales
+from checador.rastreo import RastreoCambiosMixin
 from checador.storage_backends import MediaStorage
 
 
@@ -39,9 +39,11 @@ class MotivoVisita(models.Model):
         return self.nombre
 
 
-class Visita(models.Model):
+class Visita(RastreoCambiosMixin, models.Model):
     """Modelo para registro de visitas"""
 
+    campos_rastreados = ('estado', 'foto_visitante', 'foto_identificacion', 'codigo_qr')
+
     ESTADO_CHOICES = [
         ('pendiente', 'Pendiente'),
         ('autorizado', 'Autorizado'),
@@ -195,6 +197,9 @@ class Visita(models.Model):
         verbose_name = 'Visita'
         verbose_name_plural = 'Visitas'
         ordering = ['-fecha_programada', '-hora_programada']
+        indexes = [
+            models.Index(fields=['fecha_programada', 'estado'], name='visitas_fecha_estado_idx'),
+        ]
 
     def __str__(self):
         return f"{self.nombre_visitante} - {self.fecha_programada} ({self.get_estado_display()})"
@@ -205,24 +210,15 @@ class Visita(models.Model):
         return str(self.codigo_visita)[:8].upper()
 
     def generar_qr(self):
-        """Genera el codigo QR para la visita"""
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(str(self.codigo_visita))
-        qr.make(fit=True)
-
-        img = qr.make_image(fill_color="black", back_color="white")
-        buffer = BytesIO()
-        img.save(buffer, format='PNG')
-        buffer.seek(0)
+        """
+        Genera el codigo QR para la visita. El UUID es de un solo uso: se
+        renderiza directo, sin dejar una entrada en el cache de QRs.
+        """
+        from checador.qr import generar_qr
 
+        datos = generar_qr(str(self.codigo_visita), tamano=10, borde=4)
         filename = f"qr_{self.codigo_visita}.png"
-        self.codigo_qr.save(filename, ContentFile(buffer.read()), save=False)
-        buffer.close()
+        self.codigo_qr.save(filename, ContentFile(datos), save=False)
 
     def autorizar(self, empleado, comentarios=''):
         """Autoriza la visita"""
@@ -271,3 +267,7 @@ class Visita(models.Model):
     def puede_registrar_salida(self):
         """Verifica si se puede registrar salida"""
         return self.estado == 'en_sitio'
+
+
+# Estadisticas del dashboard de staff
+invalidar_con_senales('dashboard', Visita)